@@ -32,18 +32,20 @@ from .ffengine import (
         AABB,
         MeshObject,
         MeshFluidSource,
+        ParameterBlock,
         ForceFieldPoint,
         ForceFieldSurface,
         ForceFieldVolume,
         ForceFieldCurve,
         )
 
-from .utils import cache_utils
+from .utils import cache_utils, parameter_timeline_utils
 
 FLUIDSIM_OBJECT = None
 SIMULATION_DATA = None
 CACHE_DIRECTORY = ""
 GEOMETRY_DATABASE = None
+PARAMETER_BLOCK = None
 
 
 class LibraryVersionError(Exception):
@@ -55,7 +57,9 @@ class LibraryVersionError(Exception):
 
 def __set_simulation_object(fluidsim_object):
     global FLUIDSIM_OBJECT
+    global PARAMETER_BLOCK
     FLUIDSIM_OBJECT = fluidsim_object
+    PARAMETER_BLOCK = None
 
 
 def __get_simulation_object():
@@ -437,6 +441,7 @@ def __extract_curve_mesh(object_name, frameno=0):
 def __extract_data(data_filepath):
     with open(data_filepath, 'r', encoding='utf-8') as f:
         json_data = json.loads(f.read())
+    parameter_timeline_utils.load_parameter_timeline(json_data, data_filepath)
     data = flip_fluid_map.Map(json_data)
     return data
 
@@ -821,6 +826,8 @@ def __delete_outdated_meshes(cache_directory, savestate_id):
             except:
                 print("Error: unable to delete file <" + path + "> (skipping)")
 
+    cache_utils.truncate_finished_frames_log(bakefiles_directory, savestate_id)
+
     stats_filepath = os.path.join(cache_directory, "flipstats.data")
     with open(stats_filepath, 'r', encoding='utf-8') as f:
         stats_info = json.loads(f.read())
@@ -987,6 +994,15 @@ def __initialize_fluid_simulation_settings(fluidsim, data):
         bbox = __get_emission_boundary(whitewater, fluidsim)
         fluidsim.diffuse_emitter_generation_bounds = bbox
 
+        is_camera_lod_enabled = __get_parameter_data(whitewater.enable_camera_lod, frameno)
+        fluidsim.enable_whitewater_camera_lod = is_camera_lod_enabled
+        if is_camera_lod_enabled:
+            fluidsim.whitewater_camera_frustum_padding = \
+                __get_parameter_data(whitewater.camera_lod_frustum_padding, frameno, value_min=0.0)
+            fluidsim.whitewater_camera_lod_min_factor = \
+                __get_parameter_data(whitewater.camera_lod_min_emission_factor, frameno, value_min=0.0, value_max=1.0)
+            __set_camera_lod_property(fluidsim.set_whitewater_camera, whitewater.camera_lod_data, frameno)
+
         min_lifespan, max_lifespan = __get_parameter_data(whitewater.min_max_whitewater_lifespan, frameno)
         lifespan_variance = __get_parameter_data(whitewater.whitewater_lifespan_variance, frameno)
         fluidsim.min_diffuse_particle_lifetime = min_lifespan
@@ -1211,6 +1227,17 @@ def __initialize_fluid_simulation_settings(fluidsim, data):
         num_chunks = __get_parameter_data(surface.compute_chunks_fixed, frameno)
     fluidsim.num_polygonizer_slices = num_chunks
 
+    is_camera_lod_enabled = __get_parameter_data(surface.enable_camera_lod, frameno)
+    fluidsim.enable_surface_camera_lod = is_camera_lod_enabled
+    if is_camera_lod_enabled:
+        fluidsim.surface_camera_frustum_padding = \
+            __get_parameter_data(surface.camera_lod_frustum_padding, frameno, value_min=0.0)
+        fluidsim.surface_camera_lod_pixel_size = \
+            __get_parameter_data(surface.camera_lod_pixel_size, frameno, value_min=0.1)
+        fluidsim.surface_camera_lod_max_level = \
+            __get_parameter_data(surface.camera_lod_max_level, frameno, value_min=0, value_max=3)
+        __set_camera_lod_property(fluidsim.set_surface_camera, surface.camera_lod_data, frameno)
+
     particle_scale = __get_parameter_data(surface.particle_scale, frameno)
     particle_scale *= surface.native_particle_scale
     fluidsim.marker_particle_scale = particle_scale
@@ -1285,6 +1312,8 @@ def __initialize_fluid_simulation_settings(fluidsim, data):
         __get_parameter_data(advanced.enable_adaptive_obstacle_time_stepping, frameno)
     fluidsim.enable_adaptive_force_field_time_stepping = \
         __get_parameter_data(advanced.enable_adaptive_force_field_time_stepping, frameno)
+    fluidsim.enable_adaptive_substepping = \
+        __get_parameter_data(advanced.enable_adaptive_substepping, frameno)
 
     fluidsim.marker_particle_jitter_factor = \
         __get_parameter_data(advanced.particle_jitter_factor, frameno)
@@ -1296,6 +1325,21 @@ def __initialize_fluid_simulation_settings(fluidsim, data):
     fluidsim.viscosity_solver_max_iterations = \
         __get_parameter_data(advanced.viscosity_solver_max_iterations, frameno)
 
+    pressure_solver_preconditioner = __get_parameter_data(advanced.pressure_solver_preconditioner, frameno)
+    if pressure_solver_preconditioner == 'PRESSURE_SOLVER_PRECONDITIONER_MIC':
+        fluidsim.set_pressure_solver_preconditioner_MIC()
+    elif pressure_solver_preconditioner == 'PRESSURE_SOLVER_PRECONDITIONER_MULTIGRID':
+        fluidsim.set_pressure_solver_preconditioner_multigrid()
+    elif pressure_solver_preconditioner == 'PRESSURE_SOLVER_PRECONDITIONER_PARALLEL_MIC':
+        fluidsim.set_pressure_solver_preconditioner_parallel_MIC()
+
+    fluidsim.enable_pressure_solver_warm_start = \
+        __get_parameter_data(advanced.enable_pressure_solver_warm_start, frameno)
+    fluidsim.enable_matrix_free_pressure_solver = \
+        __get_parameter_data(advanced.enable_matrix_free_pressure_solver, frameno)
+    fluidsim.enable_matrix_free_viscosity_solver = \
+        __get_parameter_data(advanced.enable_matrix_free_viscosity_solver, frameno)
+
     velocity_transfer_method = __get_parameter_data(advanced.velocity_transfer_method, frameno)
     if velocity_transfer_method == 'VELOCITY_TRANSFER_METHOD_FLIP':
         fluidsim.set_velocity_transfer_method_FLIP()
@@ -1324,12 +1368,27 @@ def __initialize_fluid_simulation_settings(fluidsim, data):
     fluidsim.enable_fracture_optimization = \
         __get_parameter_data(advanced.enable_fracture_optimization, frameno)
 
+    fluidsim.enable_sparse_liquid_level_set = \
+        __get_parameter_data(advanced.enable_sparse_liquid_level_set, frameno)
+
+    fluidsim.enable_marker_particle_sorting = \
+        __get_parameter_data(advanced.enable_fluid_particle_sorting, frameno)
+
+    fluidsim.enable_compact_particle_attributes = \
+        __get_parameter_data(advanced.enable_compact_particle_attributes, frameno)
+
     fluidsim.enable_static_solid_levelset_precomputation = \
         __get_parameter_data(advanced.precompute_static_obstacles, frameno)
 
     fluidsim.enable_temporary_mesh_levelset = \
         __get_parameter_data(advanced.reserve_temporary_grids, frameno)
 
+    fluidsim.enable_rigid_obstacle_levelset_reuse = \
+        __get_parameter_data(advanced.reuse_rigid_obstacle_level_sets, frameno)
+
+    fluidsim.enable_obstacle_mesh_decimation = \
+        __get_parameter_data(advanced.simplify_dense_obstacle_meshes, frameno)
+
     # Debug Settings
 
     fluidsim.enable_fluid_particle_debug_output = \
@@ -1849,6 +1908,13 @@ def __set_property(obj, pname, value, value_min=None, value_max=None):
         setattr(obj, pname, value)
 
 
+def __get_parameter_block(fluidsim):
+    global PARAMETER_BLOCK
+    if PARAMETER_BLOCK is None or PARAMETER_BLOCK.fluidsim is not fluidsim:
+        PARAMETER_BLOCK = ParameterBlock(fluidsim)
+    return PARAMETER_BLOCK
+
+
 def __set_body_force_property(fluidsim, body_force):
     eps = 1e-6
     old_body_force = fluidsim.get_constant_body_force()
@@ -1868,6 +1934,21 @@ def __set_whitewater_emission_boundary_property(fluidsim, bounds):
         fluidsim.diffuse_emitter_generation_bounds = bounds
 
 
+def __set_camera_lod_property(set_camera_func, camera_lod_data, frameno):
+    # Caches exported in older versions or with camera LOD disabled
+    # do not contain camera data
+    if camera_lod_data is None:
+        return
+    camera = __get_parameter_data(camera_lod_data, frameno)
+    if camera is None:
+        return
+
+    set_camera_func(
+            camera.position, camera.right, camera.up, camera.forward,
+            camera.frame_extents, camera.resolution, camera.is_orthographic
+            )
+
+
 def __set_meshing_volume_object(fluidsim, data, frameid=0):
     init_data = data.domain_data.initialize
     surface_data = data.domain_data.surface
@@ -1899,78 +1980,92 @@ def __set_meshing_volume_object(fluidsim, data, frameid=0):
 def __update_animatable_domain_properties(fluidsim, data, frameno):
     dprops = data.domain_data
 
+    # Scalar parameters are collected into a parameter block and sent to the
+    # engine in a single call at the end of this method. Only parameters that
+    # have changed since the previous frame are sent.
+    params = __get_parameter_block(fluidsim)
+
     # Simulation Settings
     fluid_boundary_collisions = __get_parameter_data(dprops.simulation.fluid_boundary_collisions, frameno)
     __set_property(fluidsim, 'fluid_boundary_collisions', fluid_boundary_collisions)
 
     open_boundary_width = __get_parameter_data(dprops.simulation.fluid_open_boundary_width, frameno)
-    __set_property(fluidsim, 'fluid_open_boundary_width', open_boundary_width)
+    params.set('fluid_open_boundary_width', open_boundary_width)
 
     # Whitewater Simulation Settings
     whitewater = dprops.whitewater
     if __get_parameter_data(whitewater.enable_whitewater_simulation):
         is_generating_whitewater = __get_parameter_data(whitewater.enable_whitewater_emission, frameno)
-        __set_property(fluidsim, 'enable_diffuse_particle_emission', is_generating_whitewater)
+        params.set('enable_diffuse_particle_emission', is_generating_whitewater)
 
         is_foam_enabled = __get_parameter_data(whitewater.enable_foam, frameno)
         is_bubbles_enabled = __get_parameter_data(whitewater.enable_bubbles, frameno)
         is_spray_enabled = __get_parameter_data(whitewater.enable_spray, frameno)
         is_dust_enabled = __get_parameter_data(whitewater.enable_dust, frameno)
         is_dust_boundary_emission_enabled = __get_parameter_data(whitewater.enable_dust_emission_near_boundary, frameno)
-        __set_property(fluidsim, 'enable_diffuse_foam', is_foam_enabled)
-        __set_property(fluidsim, 'enable_diffuse_bubbles', is_bubbles_enabled)
-        __set_property(fluidsim, 'enable_diffuse_spray', is_spray_enabled)
-        __set_property(fluidsim, 'enable_diffuse_dust', is_dust_enabled)
-        __set_property(fluidsim, 'enable_boundary_diffuse_dust_emission', is_dust_boundary_emission_enabled)
+        params.set('enable_diffuse_foam', is_foam_enabled)
+        params.set('enable_diffuse_bubbles', is_bubbles_enabled)
+        params.set('enable_diffuse_spray', is_spray_enabled)
+        params.set('enable_diffuse_dust', is_dust_enabled)
+        params.set('enable_boundary_diffuse_dust_emission', is_dust_boundary_emission_enabled)
 
         whitewater_motion_blur = __get_parameter_data(whitewater.generate_whitewater_motion_blur_data, frameno)
-        __set_property(fluidsim, 'enable_whitewater_motion_blur', whitewater_motion_blur)
+        params.set('enable_whitewater_motion_blur', whitewater_motion_blur)
 
         emitter_pct = __get_parameter_data(whitewater.whitewater_emitter_generation_rate, frameno)
-        __set_property(fluidsim, 'diffuse_emitter_generation_rate', emitter_pct / 100)
+        params.set('diffuse_emitter_generation_rate', emitter_pct / 100)
 
         wavecrest_rate = __get_parameter_data(whitewater.wavecrest_emission_rate, frameno)
         turbulence_rate = __get_parameter_data(whitewater.turbulence_emission_rate, frameno)
         dust_rate = __get_parameter_data(whitewater.dust_emission_rate, frameno)
-        __set_property(fluidsim, 'diffuse_particle_wavecrest_emission_rate', wavecrest_rate)
-        __set_property(fluidsim, 'diffuse_particle_turbulence_emission_rate', turbulence_rate)
-        __set_property(fluidsim, 'diffuse_particle_dust_emission_rate', dust_rate)
+        params.set('diffuse_particle_wavecrest_emission_rate', wavecrest_rate)
+        params.set('diffuse_particle_turbulence_emission_rate', turbulence_rate)
+        params.set('diffuse_particle_dust_emission_rate', dust_rate)
 
         spray_emission_speed = __get_parameter_data(whitewater.spray_emission_speed, frameno)
-        __set_property(fluidsim, 'diffuse_spray_emission_speed', spray_emission_speed)
+        params.set('diffuse_spray_emission_speed', spray_emission_speed)
 
         min_speed, max_speed = __get_parameter_data(whitewater.min_max_whitewater_energy_speed, frameno)
-        __set_property(fluidsim, 'min_diffuse_emitter_energy', 0.5 * min_speed * min_speed)
-        __set_property(fluidsim, 'max_diffuse_emitter_energy', 0.5 * max_speed * max_speed)
+        params.set('min_diffuse_emitter_energy', 0.5 * min_speed * min_speed)
+        params.set('max_diffuse_emitter_energy', 0.5 * max_speed * max_speed)
 
         mink, maxk = __get_parameter_data(whitewater.min_max_whitewater_wavecrest_curvature, frameno)
-        __set_property(fluidsim, 'min_diffuse_wavecrest_curvature', mink)
-        __set_property(fluidsim, 'max_diffuse_wavecrest_curvature', maxk)
+        params.set('min_diffuse_wavecrest_curvature', mink)
+        params.set('max_diffuse_wavecrest_curvature', maxk)
 
         mint, maxt = __get_parameter_data(whitewater.min_max_whitewater_turbulence, frameno)
-        __set_property(fluidsim, 'min_diffuse_turbulence', mint)
-        __set_property(fluidsim, 'max_diffuse_turbulence', maxt)
+        params.set('min_diffuse_turbulence', mint)
+        params.set('max_diffuse_turbulence', maxt)
 
         max_particles = __get_parameter_data(whitewater.max_whitewater_particles, frameno)
-        __set_property(fluidsim, 'max_num_diffuse_particles', int(max_particles * 1e6))
+        params.set('max_num_diffuse_particles', int(max_particles * 1e6))
 
         bounds = __get_emission_boundary(whitewater, fluidsim)
         __set_whitewater_emission_boundary_property(fluidsim, bounds)
 
+        is_camera_lod_enabled = __get_parameter_data(whitewater.enable_camera_lod, frameno)
+        params.set('enable_whitewater_camera_lod', is_camera_lod_enabled)
+        if is_camera_lod_enabled:
+            padding = __get_parameter_data(whitewater.camera_lod_frustum_padding, frameno)
+            min_factor = __get_parameter_data(whitewater.camera_lod_min_emission_factor, frameno)
+            params.set('whitewater_camera_frustum_padding', padding, value_min=0.0)
+            params.set('whitewater_camera_lod_min_factor', min_factor, value_min=0.0, value_max=1.0)
+            __set_camera_lod_property(fluidsim.set_whitewater_camera, whitewater.camera_lod_data, frameno)
+
         min_lifespan, max_lifespan = __get_parameter_data(whitewater.min_max_whitewater_lifespan, frameno)
         lifespan_variance = __get_parameter_data(whitewater.whitewater_lifespan_variance, frameno)
-        __set_property(fluidsim, 'min_diffuse_particle_lifetime', min_lifespan)
-        __set_property(fluidsim, 'max_diffuse_particle_lifetime', max_lifespan)
-        __set_property(fluidsim, 'diffuse_particle_lifetime_variance', lifespan_variance)
+        params.set('min_diffuse_particle_lifetime', min_lifespan)
+        params.set('max_diffuse_particle_lifetime', max_lifespan)
+        params.set('diffuse_particle_lifetime_variance', lifespan_variance)
 
         foam_modifier = __get_parameter_data(whitewater.foam_lifespan_modifier, frameno)
         bubble_modifier = __get_parameter_data(whitewater.bubble_lifespan_modifier, frameno)
         spray_modifier = __get_parameter_data(whitewater.spray_lifespan_modifier, frameno)
         dust_modifier = __get_parameter_data(whitewater.dust_lifespan_modifier, frameno)
-        __set_property(fluidsim, 'foam_particle_lifetime_modifier', 1.0 / max(foam_modifier, 1e-6))
-        __set_property(fluidsim, 'bubble_particle_lifetime_modifier', 1.0 / max(bubble_modifier, 1e-6))
-        __set_property(fluidsim, 'spray_particle_lifetime_modifier', 1.0 / max(spray_modifier, 1e-6))
-        __set_property(fluidsim, 'dust_particle_lifetime_modifier', 1.0 / max(dust_modifier, 1e-6))
+        params.set('foam_particle_lifetime_modifier', 1.0 / max(foam_modifier, 1e-6))
+        params.set('bubble_particle_lifetime_modifier', 1.0 / max(bubble_modifier, 1e-6))
+        params.set('spray_particle_lifetime_modifier', 1.0 / max(spray_modifier, 1e-6))
+        params.set('dust_particle_lifetime_modifier', 1.0 / max(dust_modifier, 1e-6))
 
         boundary_collisions_mode = __get_parameter_data(whitewater.whitewater_boundary_collisions_mode, frameno)
         if boundary_collisions_mode == 'BOUNDARY_COLLISIONS_MODE_INHERIT':
@@ -1999,10 +2094,10 @@ def __update_animatable_domain_properties(fluidsim, data, frameno):
         bubble_behaviour = __get_limit_behaviour_enum(bubble_behaviour)
         spray_behaviour = __get_limit_behaviour_enum(spray_behaviour)
         dust_behaviour = __get_limit_behaviour_enum(dust_behaviour)
-        __set_property(fluidsim, 'diffuse_foam_limit_behaviour', foam_behaviour)
-        __set_property(fluidsim, 'diffuse_bubble_limit_behaviour', bubble_behaviour)
-        __set_property(fluidsim, 'diffuse_spray_limit_behaviour', spray_behaviour)
-        __set_property(fluidsim, 'diffuse_dust_limit_behaviour', dust_behaviour)
+        params.set('diffuse_foam_limit_behaviour', foam_behaviour)
+        params.set('diffuse_bubble_limit_behaviour', bubble_behaviour)
+        params.set('diffuse_spray_limit_behaviour', spray_behaviour)
+        params.set('diffuse_dust_limit_behaviour', dust_behaviour)
 
         foam_active_sides = __get_parameter_data(whitewater.foam_boundary_active, frameno)
         bubble_active_sides = __get_parameter_data(whitewater.bubble_boundary_active, frameno)
@@ -2017,36 +2112,36 @@ def __update_animatable_domain_properties(fluidsim, data, frameno):
         strength = __get_parameter_data(whitewater.foam_advection_strength, frameno)
         foam_depth = __get_parameter_data(whitewater.foam_layer_depth, frameno)
         foam_offset = __get_parameter_data(whitewater.foam_layer_offset, frameno)
-        __set_property(fluidsim, 'diffuse_foam_layer_depth', foam_depth)
-        __set_property(fluidsim, 'diffuse_foam_layer_offset', foam_offset)
-        __set_property(fluidsim, 'diffuse_foam_advection_strength', strength)
+        params.set('diffuse_foam_layer_depth', foam_depth)
+        params.set('diffuse_foam_layer_offset', foam_offset)
+        params.set('diffuse_foam_advection_strength', strength)
 
         preserve_foam = __get_parameter_data(whitewater.preserve_foam, frameno)
         preserve_rate = __get_parameter_data(whitewater.foam_preservation_rate, frameno)
         min_density, max_density = __get_parameter_data(whitewater.min_max_foam_density, frameno)
-        __set_property(fluidsim, 'enable_diffuse_preserve_foam', preserve_foam)
-        __set_property(fluidsim, 'diffuse_foam_preservation_rate', preserve_rate)
-        __set_property(fluidsim, 'min_diffuse_foam_density', min_density)
-        __set_property(fluidsim, 'max_diffuse_foam_density', max_density)
+        params.set('enable_diffuse_preserve_foam', preserve_foam)
+        params.set('diffuse_foam_preservation_rate', preserve_rate)
+        params.set('min_diffuse_foam_density', min_density)
+        params.set('max_diffuse_foam_density', max_density)
 
         drag = __get_parameter_data(whitewater.bubble_drag_coefficient, frameno)
         bouyancy = __get_parameter_data(whitewater.bubble_bouyancy_coefficient, frameno)
-        __set_property(fluidsim, 'diffuse_bubble_drag_coefficient', drag)
-        __set_property(fluidsim, 'diffuse_bubble_bouyancy_coefficient', bouyancy)
+        params.set('diffuse_bubble_drag_coefficient', drag)
+        params.set('diffuse_bubble_bouyancy_coefficient', bouyancy)
 
         drag = __get_parameter_data(whitewater.dust_drag_coefficient, frameno)
         bouyancy = __get_parameter_data(whitewater.dust_bouyancy_coefficient, frameno)
-        __set_property(fluidsim, 'diffuse_dust_drag_coefficient', drag)
-        __set_property(fluidsim, 'diffuse_dust_bouyancy_coefficient', bouyancy)
+        params.set('diffuse_dust_drag_coefficient', drag)
+        params.set('diffuse_dust_bouyancy_coefficient', bouyancy)
 
         drag = __get_parameter_data(whitewater.spray_drag_coefficient, frameno)
-        __set_property(fluidsim, 'diffuse_spray_drag_coefficient', drag)
+        params.set('diffuse_spray_drag_coefficient', drag)
 
         base_level = __get_parameter_data(whitewater.obstacle_influence_base_level, frameno)
-        __set_property(fluidsim, 'diffuse_obstacle_influence_base_level', base_level)
+        params.set('diffuse_obstacle_influence_base_level', base_level)
 
         decay_rate = __get_parameter_data(whitewater.obstacle_influence_decay_rate, frameno)
-        __set_property(fluidsim, 'diffuse_obstacle_influence_decay_rate', decay_rate)
+        params.set('diffuse_obstacle_influence_decay_rate', decay_rate)
 
     # World Settings
 
@@ -2063,212 +2158,240 @@ def __update_animatable_domain_properties(fluidsim, data, frameno):
     weight_whitewater_bubble = __get_parameter_data(world.force_field_weight_whitewater_bubble, frameno)
     weight_whitewater_spray = __get_parameter_data(world.force_field_weight_whitewater_spray, frameno)
     weight_whitewater_dust = __get_parameter_data(world.force_field_weight_whitewater_dust, frameno)
-    __set_property(fluidsim, 'force_field_weight_fluid_particles', weight_fluid_particles)
-    __set_property(fluidsim, 'force_field_weight_whitewater_foam', weight_whitewater_foam)
-    __set_property(fluidsim, 'force_field_weight_whitewater_bubble', weight_whitewater_bubble)
-    __set_property(fluidsim, 'force_field_weight_whitewater_spray', weight_whitewater_spray)
-    __set_property(fluidsim, 'force_field_weight_whitewater_dust', weight_whitewater_dust)
+    params.set('force_field_weight_fluid_particles', weight_fluid_particles)
+    params.set('force_field_weight_whitewater_foam', weight_whitewater_foam)
+    params.set('force_field_weight_whitewater_bubble', weight_whitewater_bubble)
+    params.set('force_field_weight_whitewater_spray', weight_whitewater_spray)
+    params.set('force_field_weight_whitewater_dust', weight_whitewater_dust)
 
     is_viscosity_enabled = __get_parameter_data(world.enable_viscosity, frameno)
     if is_viscosity_enabled:
         surface = dprops.surface
         is_variable_viscosity_enabled = __get_parameter_data(surface.enable_viscosity_attribute, frameno)
         if is_variable_viscosity_enabled:
-            __set_property(fluidsim, 'viscosity', 0.0)
+            params.set('viscosity', 0.0)
         else:
             constant_viscosity = __get_viscosity_value(world, frameno)
-            __set_property(fluidsim, 'viscosity', constant_viscosity)
+            params.set('viscosity', constant_viscosity)
 
         tolerance_int = __get_parameter_data(world.viscosity_solver_error_tolerance, frameno)
         error_tolerance = 1.0 * 10.0**(-tolerance_int)
-        __set_property(fluidsim, 'viscosity_solver_error_tolerance', error_tolerance)
+        params.set('viscosity_solver_error_tolerance', error_tolerance)
     elif fluidsim.viscosity > 0.0:
-        __set_property(fluidsim, 'viscosity', 0.0)
+        params.set('viscosity', 0.0)
 
     is_surface_tension_enabled = __get_parameter_data(world.enable_surface_tension, frameno)
     if is_surface_tension_enabled:
         surface_tension = __get_surface_tension_value(world, frameno)
-        __set_property(fluidsim, 'surface_tension', surface_tension)
+        params.set('surface_tension', surface_tension)
 
         mincfl, maxcfl = world.minimum_surface_tension_cfl, world.maximum_surface_tension_cfl
         accuracy_pct = __get_parameter_data(world.surface_tension_accuracy, frameno) / 100.0
         surface_tension_number = mincfl + (1.0 - accuracy_pct) * (maxcfl - mincfl)
-        __set_property(fluidsim, 'surface_tension_condition_number', surface_tension_number)
+        params.set('surface_tension_condition_number', surface_tension_number)
 
     elif fluidsim.surface_tension > 0.0:
-        __set_property(fluidsim, 'surface_tension', 0.0)
+        params.set('surface_tension', 0.0)
 
     is_sheet_seeding_enabled = __get_parameter_data(world.enable_sheet_seeding, frameno)
-    __set_property(fluidsim, 'enable_sheet_seeding', is_sheet_seeding_enabled)
+    params.set('enable_sheet_seeding', is_sheet_seeding_enabled)
     if is_sheet_seeding_enabled:
         sheet_fill_rate = __get_parameter_data(world.sheet_fill_rate, frameno)
         threshold = __get_parameter_data(world.sheet_fill_threshold, frameno)
-        __set_property(fluidsim, 'sheet_fill_rate', sheet_fill_rate, value_min=0, value_max=1.0)
-        __set_property(fluidsim, 'sheet_fill_threshold', threshold - 1, value_min=-1.0, value_max=0.0)
+        params.set('sheet_fill_rate', sheet_fill_rate, value_min=0, value_max=1.0)
+        params.set('sheet_fill_threshold', threshold - 1, value_min=-1.0, value_max=0.0)
 
     friction = __get_parameter_data(world.boundary_friction, frameno)
-    __set_property(fluidsim, 'boundary_friction', friction, value_min=0.0, value_max=1.0)
+    params.set('boundary_friction', friction, value_min=0.0, value_max=1.0)
 
     # Fluid Particle Settings
 
     particles = dprops.particles
 
     output_amount = __get_parameter_data(particles.fluid_particle_output_amount, frameno)
-    __set_property(fluidsim, 'fluid_particle_output_amount', output_amount,  value_min=0.0, value_max=1.0)
+    params.set('fluid_particle_output_amount', output_amount,  value_min=0.0, value_max=1.0)
 
     enable_fluid_particle_surface_output = __get_parameter_data(particles.enable_fluid_particle_surface_output, frameno)
-    __set_property(fluidsim, 'enable_fluid_particle_surface_output', enable_fluid_particle_surface_output)
+    params.set('enable_fluid_particle_surface_output', enable_fluid_particle_surface_output)
 
     enable_fluid_particle_boundary_output = __get_parameter_data(particles.enable_fluid_particle_boundary_output, frameno)
-    __set_property(fluidsim, 'enable_fluid_particle_boundary_output', enable_fluid_particle_boundary_output)
+    params.set('enable_fluid_particle_boundary_output', enable_fluid_particle_boundary_output)
 
     enable_fluid_particle_interior_output = __get_parameter_data(particles.enable_fluid_particle_interior_output, frameno)
-    __set_property(fluidsim, 'enable_fluid_particle_interior_output', enable_fluid_particle_interior_output)
+    params.set('enable_fluid_particle_interior_output', enable_fluid_particle_interior_output)
 
     source_id = __get_parameter_data(particles.fluid_particle_source_id_blacklist, frameno)
-    __set_property(fluidsim, 'fluid_particle_source_id_blacklist', source_id)
+    params.set('fluid_particle_source_id_blacklist', source_id)
     
     # Surface Settings
 
     surface = dprops.surface
 
     enable_surface_mesh_generation = __get_parameter_data(surface.enable_surface_mesh_generation, frameno)
-    __set_property(fluidsim, 'enable_surface_reconstruction', enable_surface_mesh_generation)
+    params.set('enable_surface_reconstruction', enable_surface_mesh_generation)
 
     subdivisions = __get_parameter_data(surface.subdivisions, frameno) + 1
-    __set_property(fluidsim, 'surface_subdivision_level', subdivisions)
+    params.set('surface_subdivision_level', subdivisions)
 
     compute_chunk_mode = __get_parameter_data(surface.compute_chunk_mode, frameno)
     if compute_chunk_mode == 'COMPUTE_CHUNK_MODE_AUTO':
         num_chunks = __get_parameter_data(surface.compute_chunks_auto, frameno)
     elif compute_chunk_mode == 'COMPUTE_CHUNK_MODE_FIXED':
         num_chunks = __get_parameter_data(surface.compute_chunks_fixed, frameno)
-    __set_property(fluidsim, 'num_polygonizer_slices', num_chunks)
+    params.set('num_polygonizer_slices', num_chunks)
+
+    is_camera_lod_enabled = __get_parameter_data(surface.enable_camera_lod, frameno)
+    params.set('enable_surface_camera_lod', is_camera_lod_enabled)
+    if is_camera_lod_enabled:
+        padding = __get_parameter_data(surface.camera_lod_frustum_padding, frameno)
+        pixel_size = __get_parameter_data(surface.camera_lod_pixel_size, frameno)
+        max_level = __get_parameter_data(surface.camera_lod_max_level, frameno)
+        params.set('surface_camera_frustum_padding', padding, value_min=0.0)
+        params.set('surface_camera_lod_pixel_size', pixel_size, value_min=0.1)
+        params.set('surface_camera_lod_max_level', max_level, value_min=0, value_max=3)
+        __set_camera_lod_property(fluidsim.set_surface_camera, surface.camera_lod_data, frameno)
 
     particle_scale = __get_parameter_data(surface.particle_scale, frameno)
     particle_scale *= surface.native_particle_scale
-    __set_property(fluidsim, 'marker_particle_scale', particle_scale)
+    params.set('marker_particle_scale', particle_scale)
 
     smoothing_value = __get_parameter_data(surface.smoothing_value, frameno)
     smoothing_iterations = __get_parameter_data(surface.smoothing_iterations, frameno)
-    __set_property(fluidsim, 'surface_smoothing_value', smoothing_value)
-    __set_property(fluidsim, 'surface_smoothing_iterations', smoothing_iterations)
+    params.set('surface_smoothing_value', smoothing_value)
+    params.set('surface_smoothing_iterations', smoothing_iterations)
 
     enable_meshing_offset = __get_parameter_data(surface.enable_meshing_offset, frameno)
-    __set_property(fluidsim, 'enable_obstacle_meshing_offset', enable_meshing_offset)
+    params.set('enable_obstacle_meshing_offset', enable_meshing_offset)
 
     meshing_mode = __get_parameter_data(surface.obstacle_meshing_mode, frameno)
     meshing_offset = __get_obstacle_meshing_offset(meshing_mode)
-    __set_property(fluidsim, 'obstacle_meshing_offset', meshing_offset)
+    params.set('obstacle_meshing_offset', meshing_offset)
 
     remove_near_domain = __get_parameter_data(surface.remove_mesh_near_domain, frameno)
     near_domain_distance = __get_parameter_data(surface.remove_mesh_near_domain_distance, frameno) - 1
-    __set_property(fluidsim, 'enable_remove_surface_near_domain', remove_near_domain)
-    __set_property(fluidsim, 'remove_surface_near_domain_distance', near_domain_distance)
+    params.set('enable_remove_surface_near_domain', remove_near_domain)
+    params.set('remove_surface_near_domain_distance', near_domain_distance)
 
     domain_sides = __get_parameter_data(surface.remove_mesh_near_domain_sides, frameno)
     __set_property(fluidsim, 'remove_surface_near_domain_sides', domain_sides)
 
     invert_contact = __get_parameter_data(surface.invert_contact_normals, frameno)
-    __set_property(fluidsim, 'enable_inverted_contact_normals', invert_contact)
+    params.set('enable_inverted_contact_normals', invert_contact)
 
     motion_blur = __get_parameter_data(surface.generate_motion_blur_data, frameno)
-    __set_property(fluidsim, 'enable_surface_motion_blur', motion_blur)
+    params.set('enable_surface_motion_blur', motion_blur)
 
     age_radius = __get_parameter_data(surface.age_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_age_attribute_radius', age_radius)
+    params.set('surface_age_attribute_radius', age_radius)
 
     lifetime_radius = __get_parameter_data(surface.lifetime_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_lifetime_attribute_radius', lifetime_radius)
+    params.set('surface_lifetime_attribute_radius', lifetime_radius)
 
     base_death_time = __get_parameter_data(surface.lifetime_attribute_death_time, frameno)
-    __set_property(fluidsim, 'surface_lifetime_attribute_death_time', base_death_time)
+    params.set('surface_lifetime_attribute_death_time', base_death_time)
 
     whitewater_proximity_radius = __get_parameter_data(surface.whitewater_proximity_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_whitewater_proximity_attribute_radius', whitewater_proximity_radius)
+    params.set('surface_whitewater_proximity_attribute_radius', whitewater_proximity_radius)
 
     color_radius = __get_parameter_data(surface.color_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_color_attribute_radius', color_radius)
+    params.set('surface_color_attribute_radius', color_radius)
 
     enable_mixing = __get_parameter_data(surface.enable_color_attribute_mixing, frameno)
-    __set_property(fluidsim, 'enable_surface_color_attribute_mixing', enable_mixing)
+    params.set('enable_surface_color_attribute_mixing', enable_mixing)
 
     mixing_rate = __get_parameter_data(surface.color_attribute_mixing_rate, frameno)
-    __set_property(fluidsim, 'surface_color_attribute_mixing_rate', mixing_rate)
+    params.set('surface_color_attribute_mixing_rate', mixing_rate)
 
     mixing_radius = __get_parameter_data(surface.color_attribute_mixing_radius, frameno)
-    __set_property(fluidsim, 'surface_color_attribute_mixing_radius', mixing_radius)
+    params.set('surface_color_attribute_mixing_radius', mixing_radius)
 
     # Advanced Settings
 
     advanced = dprops.advanced
     min_substeps, max_substeps = __get_parameter_data(advanced.min_max_time_steps_per_frame, frameno)
-    __set_property(fluidsim, 'min_time_steps_per_frame', min_substeps)
-    __set_property(fluidsim, 'max_time_steps_per_frame', max_substeps)
+    params.set('min_time_steps_per_frame', min_substeps)
+    params.set('max_time_steps_per_frame', max_substeps)
 
     enable_obstacle_time_stepping = \
         __get_parameter_data(advanced.enable_adaptive_obstacle_time_stepping, frameno)
-    __set_property(fluidsim, 'enable_adaptive_obstacle_time_stepping', enable_obstacle_time_stepping)
+    params.set('enable_adaptive_obstacle_time_stepping', enable_obstacle_time_stepping)
 
     enable_force_field_time_stepping = \
         __get_parameter_data(advanced.enable_adaptive_force_field_time_stepping, frameno)
-    __set_property(fluidsim, 'enable_adaptive_force_field_time_stepping', enable_force_field_time_stepping)
+    params.set('enable_adaptive_force_field_time_stepping', enable_force_field_time_stepping)
+
+    enable_adaptive_substepping = __get_parameter_data(advanced.enable_adaptive_substepping, frameno)
+    params.set('enable_adaptive_substepping', enable_adaptive_substepping)
 
     jitter_factor = __get_parameter_data(advanced.particle_jitter_factor, frameno)
-    __set_property(fluidsim, 'marker_particle_jitter_factor', jitter_factor)
+    params.set('marker_particle_jitter_factor', jitter_factor)
 
     jitter_surface = __get_parameter_data(advanced.jitter_surface_particles, frameno)
-    __set_property(fluidsim, 'jitter_surface_marker_particles', jitter_surface)
+    params.set('jitter_surface_marker_particles', jitter_surface)
 
     pressure_solver_iterations = __get_parameter_data(advanced.pressure_solver_max_iterations, frameno)
-    __set_property(fluidsim, 'pressure_solver_max_iterations', pressure_solver_iterations)
+    params.set('pressure_solver_max_iterations', pressure_solver_iterations)
 
     viscosity_solver_iterations = __get_parameter_data(advanced.viscosity_solver_max_iterations, frameno)
-    __set_property(fluidsim, 'viscosity_solver_max_iterations', viscosity_solver_iterations)
+    params.set('viscosity_solver_max_iterations', viscosity_solver_iterations)
 
     PICFLIP_ratio = __get_parameter_data(advanced.PICFLIP_ratio, frameno)
-    __set_property(fluidsim, 'PICFLIP_ratio', PICFLIP_ratio)
+    params.set('PICFLIP_ratio', PICFLIP_ratio)
 
     PICAPIC_ratio = __get_parameter_data(advanced.PICAPIC_ratio, frameno)
-    __set_property(fluidsim, 'PICAPIC_ratio', PICAPIC_ratio)
+    params.set('PICAPIC_ratio', PICAPIC_ratio)
 
     CFL_number = __get_parameter_data(advanced.CFL_condition_number, frameno)
-    __set_property(fluidsim, 'CFL_condition_number', CFL_number)
+    params.set('CFL_condition_number', CFL_number)
 
     enable_velocity_removal = __get_parameter_data(advanced.enable_extreme_velocity_removal, frameno)
-    __set_property(fluidsim, 'enable_extreme_velocity_removal', enable_velocity_removal)
+    params.set('enable_extreme_velocity_removal', enable_velocity_removal)
 
     threading_mode = __get_parameter_data(advanced.threading_mode, frameno)
     if threading_mode == 'THREADING_MODE_AUTO_DETECT':
         num_threads = __get_parameter_data(advanced.num_threads_auto_detect, frameno)
     elif threading_mode == 'THREADING_MODE_FIXED':
         num_threads = __get_parameter_data(advanced.num_threads_fixed, frameno)
-    __set_property(fluidsim, 'max_thread_count', num_threads)
+    params.set('max_thread_count', num_threads)
 
     enable_async_meshing = __get_parameter_data(advanced.enable_asynchronous_meshing, frameno)
-    __set_property(fluidsim, 'enable_asynchronous_meshing', enable_async_meshing)
+    params.set('enable_asynchronous_meshing', enable_async_meshing)
 
     enable_fracture_optimization = __get_parameter_data(advanced.enable_fracture_optimization, frameno)
-    __set_property(fluidsim, 'enable_fracture_optimization', enable_fracture_optimization)
+    params.set('enable_fracture_optimization', enable_fracture_optimization)
+
+    enable_sparse_liquid_level_set = __get_parameter_data(advanced.enable_sparse_liquid_level_set, frameno)
+    params.set('enable_sparse_liquid_level_set', enable_sparse_liquid_level_set)
+
+    enable_particle_sorting = __get_parameter_data(advanced.enable_fluid_particle_sorting, frameno)
+    params.set('enable_marker_particle_sorting', enable_particle_sorting)
 
     precomp_static_sdf = __get_parameter_data(advanced.precompute_static_obstacles, frameno)
-    __set_property(fluidsim, 'enable_static_solid_levelset_precomputation', precomp_static_sdf)
+    params.set('enable_static_solid_levelset_precomputation', precomp_static_sdf)
 
     reserve_temp_grids = __get_parameter_data(advanced.reserve_temporary_grids, frameno)
-    __set_property(fluidsim, 'enable_temporary_mesh_levelset', reserve_temp_grids)
+    params.set('enable_temporary_mesh_levelset', reserve_temp_grids)
+
+    reuse_rigid_sdf = __get_parameter_data(advanced.reuse_rigid_obstacle_level_sets, frameno)
+    params.set('enable_rigid_obstacle_levelset_reuse', reuse_rigid_sdf)
+
+    simplify_obstacles = __get_parameter_data(advanced.simplify_dense_obstacle_meshes, frameno)
+    params.set('enable_obstacle_mesh_decimation', simplify_obstacles)
 
     # Debug Settings
 
     debug = dprops.debug
     export_internal_obstacle_mesh = __get_parameter_data(debug.export_internal_obstacle_mesh, frameno)
-    __set_property(fluidsim, 'enable_internal_obstacle_mesh_output', export_internal_obstacle_mesh)
+    params.set('enable_internal_obstacle_mesh_output', export_internal_obstacle_mesh)
 
     # Caches created in older versions may not contain force field data. Ignore these features
     # if force field data cannot be found in the cache
     is_force_field_data_available = data.force_field_data is not None
     if is_force_field_data_available: 
         export_force_field = __get_parameter_data(debug.export_force_field, frameno)
-        __set_property(fluidsim, 'enable_force_field_debug_output', export_force_field)
+        params.set('enable_force_field_debug_output', export_force_field)
+
+    params.apply()
 
 
 def __update_animatable_properties(fluidsim, data, frameno):
@@ -2702,10 +2825,20 @@ def __get_timing_stats_dict(tstats):
     return stats
 
 
+def __get_memory_stats_dict(mstats):
+    stats = {}
+    stats["buffer_arena_high_water_bytes"] = mstats.buffer_arena_high_water_bytes
+    stats["buffer_arena_cached_bytes"] = mstats.buffer_arena_cached_bytes
+    stats["buffer_arena_acquired"] = mstats.buffer_arena_acquired
+    stats["buffer_arena_reused"] = mstats.buffer_arena_reused
+    return stats
+
+
 def __get_frame_stats_dict(cstats):
     stats = {}
     stats["frame"] = cstats.frame
     stats["substeps"] = cstats.substeps
+    stats["substeps_avoided"] = cstats.substeps_avoided
     stats["delta_time"] = cstats.delta_time
     stats["fluid_particles"] = cstats.fluid_particles
     stats["diffuse_particles"] = cstats.diffuse_particles
@@ -2774,6 +2907,7 @@ def __get_frame_stats_dict(cstats):
     stats["particles"] = __get_mesh_stats_dict(cstats.particles)
     stats["obstacle"] = __get_mesh_stats_dict(cstats.obstacle)
     stats["timing"] = __get_timing_stats_dict(cstats.timing)
+    stats["memory"] = __get_memory_stats_dict(cstats.memory)
     return stats
 
 
@@ -3106,6 +3240,9 @@ def __write_finished_file(cache_directory, frameno):
     with open(finished_filepath, 'w') as f:
         f.write(filestring)
 
+    bakefiles_directory = os.path.join(cache_directory, "bakefiles")
+    cache_utils.append_finished_frames_log(bakefiles_directory, frameno)
+
 
 def __write_metadata_file(domain_data, cache_directory, frameno):
     fstring = __frame_number_to_string(frameno)
@@ -23,7 +23,8 @@ from .utils import export_utils as utils
 from .objects.flip_fluid_aabb import AABB
 from .ffengine import TriangleMesh
 from .utils import version_compatibility_utils as vcu
-from .utils import cache_utils, export_utils, installation_utils
+from .utils import cache_utils, export_utils, installation_utils, parameter_timeline_utils
+from .filesystem import filesystem_protection_layer as fpl
 
 
 def __get_domain_object():
@@ -39,7 +40,13 @@ def __export_simulation_data_to_file(context, simobjects, filename):
     if not success:
         return False
 
-    jsonstr = json.dumps(data, sort_keys=True, indent=4, separators=(',', ': '))
+    timeline_filepath = parameter_timeline_utils.get_timeline_filepath(filename)
+    num_columns = parameter_timeline_utils.compile_parameter_timeline(data, timeline_filepath)
+    if num_columns == 0:
+        # Remove a timeline left behind by a previous export
+        fpl.delete_file(timeline_filepath)
+
+    jsonstr = json.dumps(data, sort_keys=True, separators=(',', ':'))
 
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     with open(filename, 'w', encoding='utf-8') as f:
@@ -143,6 +150,11 @@ def __get_domain_data_dict(context, dobj):
         meshing_volume_object_name = meshing_volume_object.name
     d['surface']['meshing_volume_object'] = meshing_volume_object_name
 
+    if dprops.whitewater.enable_camera_lod:
+        d['whitewater']['camera_lod_data'] = dprops.whitewater.get_camera_lod_data_dict()
+    if dprops.surface.enable_camera_lod:
+        d['surface']['camera_lod_data'] = dprops.surface.get_camera_lod_data_dict()
+
     installation_utils.update_mixbox_installation_status()
     is_mixbox_supported = installation_utils.is_mixbox_supported()
     is_mixbox_installed = installation_utils.is_mixbox_installation_complete()
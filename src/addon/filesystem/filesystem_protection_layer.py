@@ -41,6 +41,7 @@ __EXTENSION_WHITELIST = [
     ".sim",
     ".sqlite3",
     ".state",
+    ".timeline",
     ".txt",
     ".txt~",
     ".wwi",
@@ -223,6 +224,9 @@ def clear_cache_directory(cache_directory, clear_export=False, clear_logs=False,
     stats_filepath = os.path.join(cache_directory, "flipstats.data")
     delete_file(stats_filepath)
 
+    render_stats_filepath = os.path.join(cache_directory, "renderstats.data")
+    delete_file(render_stats_filepath)
+
     bakefiles_dir = os.path.join(cache_directory, "bakefiles")
     extensions = [".bbox", ".bobj", ".data", ".wwp", ".wwf", ".wwi", ".fpd", ".ffd", ".ffp3", ".txt", ".json"]
     delete_files_in_directory(bakefiles_dir, extensions, remove_directory=True)
@@ -248,7 +252,7 @@ def clear_cache_directory(cache_directory, clear_export=False, clear_logs=False,
     if clear_export:
         export_dir = os.path.join(cache_directory, "export")
         if os.path.isdir(export_dir):
-            extensions = [".sqlite3", ".sim"]
+            extensions = [".sqlite3", ".sim", ".timeline"]
             delete_files_in_directory(export_dir, extensions, remove_directory=True)
 
     if clear_logs:
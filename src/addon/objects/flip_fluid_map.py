@@ -14,42 +14,79 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+# Map provides attribute style access to nested dict data such as the
+# simulation data exported for the bake. Nested dicts and lists are wrapped
+# lazily on first access and the wrapped value is stored back into the Map so
+# that only the parts of the data that are used are converted. Values read as
+# attributes are also cached in the instance __dict__ so that later attribute
+# reads do not go through __getattr__.
 class Map(dict):
     def __init__(self, dict_data):
         super(Map, self).__init__(dict_data)
-        for k, v in dict_data.items():
-            if isinstance(v, dict):
-                self[k] = Map(v)
-            elif isinstance(v, list):
-                new_list = []
-                for list_element in v:
-                    if isinstance(list_element, dict):
-                        new_list.append(Map(list_element))
-                    else:
-                        new_list.append(list_element)
-                self[k] = new_list
-
-            else:
-                self[k] = v
 
 
     def __getattr__(self, attr):
-        return self.get(attr)
+        try:
+            value = dict.__getitem__(self, attr)
+        except KeyError:
+            return None
+        value = self.__wrap_item(attr, value)
+        self.__dict__[attr] = value
+        return value
 
 
     def __setattr__(self, key, value):
         self.__setitem__(key, value)
 
 
-    def __setitem__(self, key, value):
-        super(Map, self).__setitem__(key, value)
-        self.__dict__.update({key: value})
-
-
     def __delattr__(self, item):
         self.__delitem__(item)
 
 
+    def __getitem__(self, key):
+        return self.__wrap_item(key, super(Map, self).__getitem__(key))
+
+
+    def __setitem__(self, key, value):
+        super(Map, self).__setitem__(key, value)
+        self.__dict__.pop(key, None)
+
+
     def __delitem__(self, key):
         super(Map, self).__delitem__(key)
-        del self.__dict__[key]
+        self.__dict__.pop(key, None)
+
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self.__getitem__(key)
+
+
+    def values(self):
+        return [self.__getitem__(k) for k in self.keys()]
+
+
+    def items(self):
+        return [(k, self.__getitem__(k)) for k in self.keys()]
+
+
+    def __wrap_item(self, key, value):
+        if not isinstance(value, (dict, list)) or isinstance(value, (Map, MapList)):
+            return value
+
+        if isinstance(value, dict):
+            value = Map(value)
+        else:
+            value = MapList(value)
+
+        super(Map, self).__setitem__(key, value)
+        return value
+
+
+class MapList(list):
+    def __init__(self, list_data):
+        if any(isinstance(e, dict) for e in list_data):
+            super(MapList, self).__init__(Map(e) if isinstance(e, dict) else e for e in list_data)
+        else:
+            super(MapList, self).__init__(list_data)
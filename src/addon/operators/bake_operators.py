@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import bpy, os, glob, json, threading
+from bpy.props import BoolProperty
 
 from .. import bake
 from ..objects import flip_fluid_geometry_exporter
@@ -372,6 +373,13 @@ class BakeFluidSimulationCommandLine(bpy.types.Operator):
     bl_description = "Bake fluid simulation from command line"
     bl_options = {'REGISTER'}
 
+    resume_latest_savestate: BoolProperty(
+            name="Resume From Latest Savestate",
+            description="If an autosave is available, resume from the most recent savestate"
+                " instead of the savestate selected in the domain settings",
+            default=False,
+            )
+
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -515,6 +523,9 @@ class BakeFluidSimulationCommandLine(bpy.types.Operator):
         print("Running fluid simulation...")
         dprops = self._get_domain_properties()
         savestate_id = dprops.simulation.get_selected_savestate_id()
+        if self.resume_latest_savestate and dprops.bake.is_autosave_available:
+            # A negative value will default to the most recent savestate
+            savestate_id = -1
         max_baking_retries = preferences.cmd_bake_max_attempts
         cache_directory = dprops.cache.get_cache_abspath()
         dprops.bake.export_filepath = self._get_export_filepath()
@@ -544,6 +555,11 @@ class BakeFluidSimulationCommandLine(bpy.types.Operator):
             self.cancel(context)
             return {'CANCELLED'}
 
+        if self.resume_latest_savestate:
+            # The autosave state saved in the .blend file may be out of date if the
+            # bake was interrupted on another machine
+            self._get_domain_properties().bake.check_autosave()
+
         self._reset_bake(context)
         self._initialize_domain(context)
         success = self._export_simulation_data(context)
@@ -234,6 +234,7 @@ class FlipFluidExportStatsCSV(bpy.types.Operator):
             'frame_timeline',
             'timestep',
             'substeps',
+            'substeps_avoided',
             'particles_fluid',
             'particles_whitewater',
             'time_mesh_generation',
@@ -245,6 +246,7 @@ class FlipFluidExportStatsCSV(bpy.types.Operator):
             'time_simulation_objects',
             'time_other',
             'time_total',
+            'buffer_arena_peak_bytes',
             'mesh_surface_enabled',
             'mesh_surface_vertices',
             'mesh_surface_triangles',
@@ -299,6 +301,7 @@ class FlipFluidExportStatsCSV(bpy.types.Operator):
                 'frame_timeline':            int(key),
                 'timestep':                  self.format_float(frame_data['delta_time']),
                 'substeps':                  frame_data['substeps'],
+                'substeps_avoided':          frame_data.get('substeps_avoided', 0),
                 'particles_fluid':           frame_data['fluid_particles'],
                 'particles_whitewater':      frame_data['diffuse_particles'],
                 'time_mesh_generation':      self.format_float(frame_data['timing']['mesh']),
@@ -310,6 +313,7 @@ class FlipFluidExportStatsCSV(bpy.types.Operator):
                 'time_simulation_objects':   self.format_float(frame_data['timing']['objects']),
                 'time_other':                self.format_float(time_other),
                 'time_total':                self.format_float(frame_data['timing']['total']),
+                'buffer_arena_peak_bytes':   frame_data.get('memory', {}).get('buffer_arena_high_water_bytes', 0),
                 'mesh_surface_enabled':      trueval if frame_data['surface']['enabled'] else falseval,
                 'mesh_surface_vertices':     max(frame_data['surface']['vertices'], 0),
                 'mesh_surface_triangles':    max(frame_data['surface']['triangles'], 0),
@@ -27,6 +27,7 @@ from bpy.props import (
 from ..utils import version_compatibility_utils as vcu
 from ..utils import export_utils
 from ..utils import audio_utils
+from ..utils import cache_utils
 from ..objects import flip_fluid_cache
 from ..objects import flip_fluid_aabb
 from . import bake_operators
@@ -2584,7 +2585,7 @@ class FlipFluidAutoLoadBakedFramesCMD(bpy.types.Operator):
         self.modal_ups_timer = None
         self.is_modal_update_required = False
 
-        self.num_bakefiles = -1
+        self.finished_frames_reader = None
 
 
     @classmethod
@@ -2595,24 +2596,6 @@ class FlipFluidAutoLoadBakedFramesCMD(bpy.types.Operator):
         return True
 
 
-    def _count_files(self, directory):
-        return len(os.listdir(directory))
-
-
-    def _get_max_bakefile_frame(self, bakefiles_directory):
-        bakefiles = os.listdir(bakefiles_directory)
-        max_frameno = -1
-        for f in bakefiles:
-            base = f.split(".")[0]
-            try:
-                frameno = int(base[-6:])
-                max_frameno = max(frameno, max_frameno)
-            except ValueError:
-                # In the case that there is a bakefile without a number
-                pass
-        return max_frameno
-
-
     def _update_frame(self, context, frameno):
         if not context.scene.flip_fluid.is_domain_in_active_scene():
             return
@@ -2621,8 +2604,7 @@ class FlipFluidAutoLoadBakedFramesCMD(bpy.types.Operator):
             context.scene.frame_set(timeline_frame)
 
 
-    def _num_bakefiles_changed_handler(self, context, bakefiles_directory):
-        last_frame = self._get_max_bakefile_frame(bakefiles_directory)
+    def _finished_frames_changed_handler(self, context, last_frame):
         self._update_frame(context, last_frame)
         bake_operators.update_stats()
 
@@ -2641,14 +2623,16 @@ class FlipFluidAutoLoadBakedFramesCMD(bpy.types.Operator):
         if not os.path.isdir(bakefiles_directory):
             return
 
-        if self.num_bakefiles < 0:
-            # Value of -1 indicates value has not been initialized
-            self.num_bakefiles = self._count_files(bakefiles_directory)
+        reader = self.finished_frames_reader
+        if reader is None or reader.bakefiles_directory != bakefiles_directory:
+            # Frames that were finished before the operator started are skipped. Only
+            # frames appended to the finished frames log after this point trigger an update.
+            self.finished_frames_reader = cache_utils.FinishedFramesLogReader(bakefiles_directory)
+            self.finished_frames_reader.read_new_frames()
+            return
 
-        current_num_bakefiles = self._count_files(bakefiles_directory)
-        if current_num_bakefiles != self.num_bakefiles:
-            self.num_bakefiles = current_num_bakefiles
-            self._num_bakefiles_changed_handler(context, bakefiles_directory)
+        if reader.read_new_frames():
+            self._finished_frames_changed_handler(context, reader.max_frame)
 
 
     def set_running_state(self, is_running):
@@ -60,6 +60,15 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
                 " will take longer to simulate",
             default = False,
             )
+    enable_adaptive_substepping: BoolProperty(
+            name="Enable Adaptive Substepping",
+            description="Prevent a small number of fast moving fluid particles from"
+                " increasing the number of frame substeps. The number of substeps is"
+                " calculated from the remaining fluid particles and the speed of the"
+                " fast moving particles is limited. Enabling may reduce the number of"
+                " substeps in splash-heavy simulations",
+            default = False,
+            )
     particle_jitter_factor: FloatProperty(
             name="Particle Jitter",
             description="Amount of random jitter that is added to newly spawned"
@@ -87,6 +96,28 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
             min=1, soft_max=10000,
             default=900,
             )
+    pressure_solver_preconditioner: EnumProperty(
+            name="Pressure Solver Preconditioner",
+            description="Preconditioner used by the pressure solver",
+            items=types.pressure_solver_preconditioners,
+            default='PRESSURE_SOLVER_PRECONDITIONER_MIC',
+            )
+    enable_pressure_solver_warm_start: BoolProperty(
+            name="Warm Start Pressure Solver",
+            description="Start each pressure solve from the pressure of the previous"
+                " substep. Pressure changes little between substeps, so this can reduce"
+                " the number of pressure solver iterations, especially in calm to"
+                " moderate simulations. Uses additional memory to store the pressure grid",
+            default=False,
+            )
+    enable_matrix_free_pressure_solver: BoolProperty(
+            name="Matrix-Free Pressure Solver",
+            description="Solve pressure using the grid stencil directly instead of assembling"
+                " a sparse matrix. Uses less memory at high resolutions but typically requires"
+                " more solver iterations. The pressure solver preconditioner setting is overridden"
+                " with a Jacobi preconditioner while this option is enabled",
+            default=False,
+            )
     viscosity_solver_max_iterations: IntProperty(
             name="Viscosity Solver Max Iterations",
             description="Maximum number of iterations that the viscosity solver is allowed"
@@ -95,6 +126,13 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
             min=1, soft_max=10000,
             default=900,
             )
+    enable_matrix_free_viscosity_solver: BoolProperty(
+            name="Matrix-Free Viscosity Solver",
+            description="Solve viscosity using the grid stencil directly instead of assembling"
+                " a sparse matrix. Greatly reduces memory usage of high resolution viscous"
+                " simulations but typically requires more solver iterations",
+            default=False,
+            )
     velocity_transfer_method: EnumProperty(
             name="Velocity Transfer Method",
             description="Simulation method to use",
@@ -181,6 +219,35 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
             default = False,
             options={'HIDDEN'},
             )
+    enable_sparse_liquid_level_set: BoolProperty(
+            name="Sparse Liquid Level Set",
+            description="Store the liquid level set only in regions near the liquid."
+                " Reduces memory usage and computation time in large domains where the"
+                " liquid occupies a small portion of the domain, such as oceans and rivers."
+                " May be slightly slower when the liquid fills most of the domain. Only the"
+                " liquid level set is stored sparsely. Velocity, weight and other simulation"
+                " grids still use memory for the full domain",
+            default = False,
+            options={'HIDDEN'},
+            )
+    enable_fluid_particle_sorting: BoolProperty(
+            name="Sort Fluid Particles",
+            description="Periodically reorder fluid particles in memory so that particles"
+                " that are close together in the domain are stored close together. Improves"
+                " cache efficiency and simulation speed in simulations with large numbers"
+                " of fluid particles",
+            default = False,
+            options={'HIDDEN'},
+            )
+    enable_compact_particle_attributes: BoolProperty(
+            name="Compact Particle Attributes",
+            description="Store APIC fluid particle data and the density attribute at half"
+                " precision, and the source ID attribute as a 16-bit integer, to reduce the"
+                " memory usage of simulations with large numbers of fluid particles. Source"
+                " ID values are limited to 0 to 65535. May slightly change simulation results",
+            default = False,
+            options={'HIDDEN'},
+            )
     enable_asynchronous_meshing: BoolProperty(
             name="Enable Async Meshing",
             description="Run mesh generation process in a separate thread while"
@@ -203,6 +270,26 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
                 " obstacles but will use more RAM if enabled",
             default = True,
             )
+    reuse_rigid_obstacle_level_sets: BoolProperty(
+            name="Reuse Rigid Obstacle Level Sets",
+            description="Compute the level set of keyframed obstacles that only"
+                " move and rotate once and resample it"
+                " through the object transform on each substep instead of"
+                " recomputing it from the mesh. Increases simulation performance"
+                " for scenes with detailed keyframed obstacles but will use more"
+                " RAM if enabled",
+            default = True,
+            )
+    simplify_dense_obstacle_meshes: BoolProperty(
+            name="Simplify Dense Obstacle Meshes",
+            description="Merge obstacle triangles that are much smaller than a"
+                " simulation grid cell before computing obstacle data. Greatly"
+                " increases performance for very high polycount obstacles such as"
+                " scanned geometry. Detail smaller than a grid cell cannot be"
+                " resolved by the simulator, but the obstacle surface may shift"
+                " by a small fraction of a grid cell",
+            default = False,
+            )
     disable_changing_topology_warning: BoolProperty(
             name="Disable Changing Topology Warning",
             description="Disable warning that is displayed when exporting an"
@@ -229,10 +316,15 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
         add(path + ".min_max_time_steps_per_frame",              "Min-Max Time Steps",                 group_id=0)
         add(path + ".enable_adaptive_obstacle_time_stepping",    "Adaptive Obstacle Stepping",         group_id=0)
         add(path + ".enable_adaptive_force_field_time_stepping", "Adaptive Force Field Stepping",      group_id=0)
+        add(path + ".enable_adaptive_substepping",               "Adaptive Substepping",               group_id=0)
         add(path + ".particle_jitter_factor",                    "Jitter Factor",                      group_id=0)
         add(path + ".jitter_surface_particles",                  "Jitter Surface Particles",           group_id=0)
         add(path + ".pressure_solver_max_iterations",            "Pressure Solver Iterations",         group_id=0)
+        add(path + ".pressure_solver_preconditioner",            "Pressure Solver Preconditioner",     group_id=0)
+        add(path + ".enable_pressure_solver_warm_start",         "Warm Start Pressure Solver",         group_id=0)
+        add(path + ".enable_matrix_free_pressure_solver",        "Matrix-Free Pressure Solver",        group_id=0)
         add(path + ".viscosity_solver_max_iterations",           "Viscosity Solver Iterations",        group_id=0)
+        add(path + ".enable_matrix_free_viscosity_solver",       "Matrix-Free Viscosity Solver",       group_id=0)
         add(path + ".velocity_transfer_method",                  "Velocity Transfer Method",           group_id=0)
         add(path + ".PICFLIP_ratio",                             "PIC/FLIP Ratio",                     group_id=0)
         add(path + ".PICAPIC_ratio",                             "PIC/APIC Ratio",                     group_id=0)
@@ -243,8 +335,13 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
         add(path + ".num_threads_fixed",                         "Num Threads (fixed)",                group_id=1)
         add(path + ".enable_asynchronous_meshing",               "Async Meshing",                      group_id=1)
         add(path + ".enable_fracture_optimization",              "Enable Fracture Optimization",        group_id=1)
+        add(path + ".enable_sparse_liquid_level_set",            "Sparse Liquid Level Set",             group_id=1)
+        add(path + ".enable_fluid_particle_sorting",             "Sort Fluid Particles",                group_id=1)
+        add(path + ".enable_compact_particle_attributes",        "Compact Particle Attributes",         group_id=1)
         add(path + ".precompute_static_obstacles",               "Precompute Static Obstacles",        group_id=1)
         add(path + ".reserve_temporary_grids",                   "Reserve Temporary Grid Memory",      group_id=1)
+        add(path + ".reuse_rigid_obstacle_level_sets",           "Reuse Rigid Obstacle Level Sets",    group_id=1)
+        add(path + ".simplify_dense_obstacle_meshes",            "Simplify Dense Obstacle Meshes",     group_id=1)
         add(path + ".disable_changing_topology_warning",         "Disable Changing Topology Warning",  group_id=1)
 
 
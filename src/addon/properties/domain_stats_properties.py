@@ -210,6 +210,7 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
     is_frame_info_available: bpy.props.BoolProperty(default=False)
     frame_info_id: IntProperty(default=-1)
     frame_substeps: IntProperty(default=-1)
+    frame_substeps_avoided: IntProperty(default=0)
     frame_delta_time: FloatProperty(default=0.0)
     frame_fluid_particles: IntProperty(default=-1)
     frame_diffuse_particles: IntProperty(default=-1)
@@ -330,6 +331,7 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
         prop_names = [
             "frame_info_id",
             "frame_substeps",
+            "frame_substeps_avoided",
             "frame_delta_time",
             "frame_fluid_particles",
             "frame_diffuse_particles",
@@ -514,6 +516,11 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
         self.frame_fluid_particles = data['fluid_particles']
         self.frame_diffuse_particles = data['diffuse_particles']
 
+        if 'substeps_avoided' in data:
+            self.frame_substeps_avoided = data['substeps_avoided']
+        else:
+            self.frame_substeps_avoided = 0
+
         if 'performance_score' in data:
             self.frame_performance_score = data['performance_score']
 
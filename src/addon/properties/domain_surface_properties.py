@@ -28,6 +28,7 @@ from .. import types
 from ..objects.flip_fluid_aabb import AABB
 from ..objects import flip_fluid_cache
 from ..utils import version_compatibility_utils as vcu
+from ..utils import export_utils
 
 class DomainSurfaceProperties(bpy.types.PropertyGroup):
     
@@ -95,6 +96,50 @@ class DomainSurfaceProperties(bpy.types.PropertyGroup):
             default=False,
             options={'HIDDEN'},
             )
+    enable_camera_lod: BoolProperty(
+            name="Camera Adaptive Meshing",
+            description="Generate the surface mesh at a lower resolution where"
+                " it appears small to the render camera. The mesh is generated"
+                " in slices across the camera view and each slice uses the"
+                " coarsest resolution that keeps mesh cells below the LOD pixel"
+                " size. Areas outside of the padded camera view use the lowest"
+                " resolution. Reduces meshing time and cache size for wide shots."
+                " Detail will be missing if the camera is later moved closer",
+            default=False,
+            )
+    camera_lod_object: PointerProperty(
+            name="Camera",
+            description="Camera used for adaptive meshing. If not set, the scene"
+                " camera will be used",
+            type=bpy.types.Object,
+            poll=lambda self, obj: self._poll_camera_lod_object(obj),
+            )
+    camera_lod_frustum_padding: FloatProperty(
+            name="View Padding",
+            description="Expand the camera view by this fraction of the image"
+                " width and height when deciding which parts of the surface are"
+                " visible. Increase if the camera moves quickly",
+            min=0.0, soft_max=1.0,
+            default=0.1,
+            precision=2,
+            )
+    camera_lod_pixel_size: FloatProperty(
+            name="LOD Pixel Size",
+            description="Largest size in pixels that a mesh cell may appear in"
+                " the render before a finer resolution is used. Lower values"
+                " keep more detail",
+            min=0.1, soft_max=16.0,
+            default=4.0,
+            precision=1,
+            )
+    camera_lod_max_level: IntProperty(
+            name="Max LOD Level",
+            description="Maximum number of times that the mesh resolution may be"
+                " halved in areas that appear small or are outside of the camera"
+                " view",
+            min=0, max=3,
+            default=2,
+            )
     enable_meshing_offset: BoolProperty(
             name="Enable",
             description="Enable smooth meshing against obstacles. If disabled,"
@@ -378,6 +423,10 @@ class DomainSurfaceProperties(bpy.types.PropertyGroup):
         add(path + ".compute_chunks_fixed",                               "Num Compute Chunks (fixed)",                     group_id=0)
         add(path + ".meshing_volume_mode",                                "Meshing Volume Mode",                            group_id=0)
         add(path + ".export_animated_meshing_volume_object",              "Export Animated Mesh",                           group_id=0)
+        add(path + ".enable_camera_lod",                                  "Camera Adaptive Meshing",                        group_id=0)
+        add(path + ".camera_lod_frustum_padding",                         "Camera View Padding",                            group_id=0)
+        add(path + ".camera_lod_pixel_size",                              "Camera LOD Pixel Size",                          group_id=0)
+        add(path + ".camera_lod_max_level",                               "Camera Max LOD Level",                           group_id=0)
         add(path + ".enable_meshing_offset",                              "Enable Obstacle Meshing",                        group_id=0)
         add(path + ".obstacle_meshing_mode",                              "Obstacle Meshing Mode",                          group_id=0)
         add(path + ".remove_mesh_near_domain",                            "Remove Mesh Near Domain",                        group_id=0)
@@ -444,6 +493,33 @@ class DomainSurfaceProperties(bpy.types.PropertyGroup):
                 self.get_meshing_volume_object() is not None)
 
 
+    def get_camera_lod_object(self):
+        obj = None
+        try:
+            all_objects = vcu.get_all_scene_objects()
+            obj = self.camera_lod_object
+            obj = all_objects.get(obj.name)
+        except:
+            pass
+
+        if obj is None:
+            obj = bpy.context.scene.camera
+        if obj is None or obj.type != 'CAMERA' or obj.data.type == 'PANO':
+            return None
+        return obj
+
+
+    def get_camera_lod_data_dict(self):
+        camera = self.get_camera_lod_object()
+        if camera is None:
+            return {'is_animated' : False, 'data' : None}
+        return export_utils.get_camera_frustum_data_dict(camera)
+
+
+    def _poll_camera_lod_object(self, obj):
+        return obj.type == 'CAMERA'
+
+
     def _update_enable_surface_mesh_generation(self, context):
         dprops = context.scene.flip_fluid.get_domain_properties()
         if dprops is None:
@@ -20,7 +20,8 @@ from bpy.props import (
         BoolVectorProperty,
         EnumProperty,
         FloatProperty,
-        IntProperty
+        IntProperty,
+        PointerProperty
         )
 
 from .custom_properties import (
@@ -29,6 +30,7 @@ from .custom_properties import (
         )
 from .. import types
 from ..utils import version_compatibility_utils as vcu
+from ..utils import export_utils
 from ..objects import flip_fluid_cache
 
 
@@ -243,6 +245,44 @@ class DomainWhitewaterProperties(bpy.types.PropertyGroup):
                 " the domain floor",
             default=False,
             )
+    enable_camera_lod: BoolProperty(
+            name="Camera Level of Detail",
+            description="Reduce whitewater where it cannot be seen by the render"
+                " camera. Emission and the share of Max Particles available to"
+                " an area are reduced where the simulation grid appears smaller"
+                " than a pixel, and particles outside of the padded camera view"
+                " are not saved to the cache. Reduces whitewater simulation time"
+                " and cache size for shots that only view part of the domain."
+                " Whitewater will be missing if the camera is later moved to"
+                " view an area that was culled",
+            default=False,
+            )
+    camera_lod_object: PointerProperty(
+            name="Camera",
+            description="Camera used for whitewater level of detail. If not set,"
+                " the scene camera will be used",
+            type=bpy.types.Object,
+            poll=lambda self, obj: self._poll_camera_lod_object(obj),
+            )
+    camera_lod_frustum_padding: FloatProperty(
+            name="View Padding",
+            description="Expand the camera view by this fraction of the image"
+                " width and height when deciding which whitewater particles"
+                " are visible. Increase if particles are missing at the edges"
+                " of the image or if the camera moves quickly",
+            min=0.0, soft_max=1.0,
+            default=0.1,
+            precision=2,
+            )
+    camera_lod_min_emission_factor: FloatProperty(
+            name="Min Emission Factor",
+            description="Lowest fraction of whitewater emission that is kept for"
+                " areas that are far away from the camera or outside of the"
+                " padded camera view",
+            min=0.0, max=1.0,
+            default=0.05,
+            precision=3,
+            )
     min_max_whitewater_lifespan: NewMinMaxFloatProperty(
             name_min="Min Lifespan", 
             description_min="Minimum whitewater particle lifespan in seconds", 
@@ -529,6 +569,9 @@ class DomainWhitewaterProperties(bpy.types.PropertyGroup):
         add(path + ".max_whitewater_particles",                 "Max Particles",                  group_id=0)
         add(path + ".enable_whitewater_emission_near_boundary", "Emit Near Boundary",             group_id=0)
         add(path + ".enable_dust_emission_near_boundary",       "Emit Dust Near Boundary",        group_id=0)
+        add(path + ".enable_camera_lod",                        "Camera Level of Detail",         group_id=0)
+        add(path + ".camera_lod_frustum_padding",               "Camera View Padding",            group_id=0)
+        add(path + ".camera_lod_min_emission_factor",           "Camera Min Emission Factor",     group_id=0)
         add(path + ".min_max_whitewater_lifespan",              "Min-Max Lifespane",              group_id=1)
         add(path + ".whitewater_lifespan_variance",             "Lifespan Variance",              group_id=1)
         add(path + ".foam_lifespan_modifier",                   "Foam Lifespan Modifier",         group_id=1)
@@ -561,6 +604,33 @@ class DomainWhitewaterProperties(bpy.types.PropertyGroup):
         add(path + ".obstacle_influence_decay_rate",            "Obstacle Influence Base Level",  group_id=2)
 
 
+    def get_camera_lod_object(self):
+        obj = None
+        try:
+            all_objects = vcu.get_all_scene_objects()
+            obj = self.camera_lod_object
+            obj = all_objects.get(obj.name)
+        except:
+            pass
+
+        if obj is None:
+            obj = bpy.context.scene.camera
+        if obj is None or obj.type != 'CAMERA' or obj.data.type == 'PANO':
+            return None
+        return obj
+
+
+    def get_camera_lod_data_dict(self):
+        camera = self.get_camera_lod_object()
+        if camera is None:
+            return {'is_animated' : False, 'data' : None}
+        return export_utils.get_camera_frustum_data_dict(camera)
+
+
+    def _poll_camera_lod_object(self, obj):
+        return obj.type == 'CAMERA'
+
+
     def _update_enable_whitewater_simulation(self, context):
         dprops = context.scene.flip_fluid.get_domain_properties()
         if dprops is None:
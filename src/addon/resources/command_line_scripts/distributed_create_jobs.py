@@ -0,0 +1,59 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Adds a bake job and render frame range jobs for the opened .blend file to a
+# shared job directory. Run once for each domain or wedge variant .blend file:
+#
+#     blender -b variant.blend --python distributed_create_jobs.py -- <job_directory> <render_chunk_size>
+#
+# A render chunk size of 0 creates the bake job only. See distributed_jobs.py.
+
+import bpy, sys, os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import distributed_jobs
+
+argv = sys.argv
+argv = argv[argv.index("--") + 1:]
+job_directory = os.path.abspath(argv[0])
+render_chunk_size = int(argv[1]) if len(argv) > 1 else 10
+
+dprops = bpy.context.scene.flip_fluid.get_domain_properties()
+if dprops is None:
+    print("Error: no domain object found in <" + bpy.data.filepath + ">")
+    sys.exit(1)
+
+cache_directory = dprops.cache.get_cache_abspath()
+bake_frame_start, bake_frame_end = dprops.simulation.get_frame_range()
+frame_start = bpy.context.scene.frame_start
+frame_end = bpy.context.scene.frame_end
+frame_step = bpy.context.scene.frame_step
+
+job_ids = distributed_jobs.create_bake_and_render_jobs(
+        job_directory,
+        bpy.data.filepath,
+        cache_directory,
+        bake_frame_start,
+        bake_frame_end,
+        render_frame_start=frame_start,
+        render_frame_end=frame_end,
+        render_frame_step=frame_step,
+        render_chunk_size=render_chunk_size
+        )
+
+print("Created jobs in <" + job_directory + ">:")
+for job_id in job_ids:
+    print("\t" + job_id)
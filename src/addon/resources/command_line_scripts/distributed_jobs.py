@@ -0,0 +1,364 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Job queue shared between machines through a common directory, used by
+# distributed_create_jobs.py and distributed_worker.py.
+#
+# Each job is described by <job_id>.json in the job directory:
+#
+#     BAKE   - bake the simulation of a .blend file (one job per domain/wedge
+#              variant, each .blend file must use its own cache directory)
+#     RENDER - render a frame range of a .blend file from its cache. A render
+#              job can be claimed once the bake of the same .blend file has
+#              finished all frames of the range.
+#
+# A worker claims a job by atomically creating <job_id>.lock and keeps the
+# lease alive by updating the lock modification time while the job runs. If
+# the lock is not updated within the lease timeout (the machine died or lost
+# access to the shared directory), another worker breaks the lease and runs
+# the job again. A worker that finds its lock broken or replaced stops its
+# job. Bake jobs resume from the most recent savestate. A completed
+# job is marked with <job_id>.done and a job that ended in error is marked with
+# <job_id>.failed. Delete the .failed file to retry the job.
+#
+# Lease times are compared against the lock file modification time, so the
+# clocks of all machines should be reasonably in sync. The lease timeout should
+# be several times larger than the heartbeat interval.
+
+import os, sys, json, time, socket, uuid, threading
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "utils"))
+import cache_utils
+
+JOB_TYPE_BAKE = "BAKE"
+JOB_TYPE_RENDER = "RENDER"
+
+DEFAULT_HEARTBEAT_INTERVAL = 15.0
+DEFAULT_LEASE_TIMEOUT = 120.0
+
+# Delay before a missing or replaced lock is checked again. Another worker
+# briefly moves a lock aside while checking whether it is stale.
+_LEASE_RECHECK_DELAY = 1.0
+
+
+def get_max_finished_frame(cache_directory):
+    # Reads the finished frames log written by the bake into the bakefiles directory
+    reader = cache_utils.FinishedFramesLogReader(os.path.join(cache_directory, "bakefiles"))
+    reader.read_new_frames()
+    return reader.max_frame
+
+
+def write_job(job_directory, job_id, job_data):
+    os.makedirs(job_directory, exist_ok=True)
+    filepath = os.path.join(job_directory, job_id + ".json")
+    temp_filepath = filepath + "." + uuid.uuid4().hex + ".tmp"
+    with open(temp_filepath, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(job_data, sort_keys=True, indent=4))
+    os.replace(temp_filepath, filepath)
+
+
+def create_bake_and_render_jobs(job_directory, blend_filepath, cache_directory,
+                                frame_start, frame_end, render_frame_start, render_frame_end,
+                                render_frame_step=1, render_chunk_size=10):
+    # Returns the list of job IDs written to the job directory
+    blend_name = os.path.splitext(os.path.basename(blend_filepath))[0]
+    job_ids = []
+
+    bake_job_id = blend_name + "_bake"
+    bake_job = {
+        'type': JOB_TYPE_BAKE,
+        'blend_filepath': blend_filepath,
+        'cache_directory': cache_directory,
+        'frame_start': frame_start,
+        'frame_end': frame_end,
+        }
+    write_job(job_directory, bake_job_id, bake_job)
+    job_ids.append(bake_job_id)
+
+    if render_chunk_size <= 0:
+        return job_ids
+
+    frames = list(range(render_frame_start, render_frame_end + 1, render_frame_step))
+    for i in range(0, len(frames), render_chunk_size):
+        chunk = frames[i:i + render_chunk_size]
+        render_job_id = blend_name + "_render_" + str(chunk[0]).zfill(4) + "_" + str(chunk[-1]).zfill(4)
+        render_job = {
+            'type': JOB_TYPE_RENDER,
+            'blend_filepath': blend_filepath,
+            'cache_directory': cache_directory,
+            'frames': chunk,
+            'bake_frame_end': frame_end,
+            'depends_on': bake_job_id,
+            }
+        write_job(job_directory, render_job_id, render_job)
+        job_ids.append(render_job_id)
+
+    return job_ids
+
+
+class JobLease():
+    def __init__(self, lock_filepath, token, heartbeat_interval):
+        self.lock_filepath = lock_filepath
+        self.token = token
+        self.heartbeat_interval = heartbeat_interval
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._is_lost = False
+
+
+    def start_heartbeat(self):
+        self._thread = threading.Thread(target=self._heartbeat_thread)
+        self._thread.daemon = True
+        self._thread.start()
+
+
+    def is_lost(self):
+        # The lease is lost if another worker broke the lock while this job was
+        # running. Once lost, the lease stays lost even if the lock reappears.
+        if self._is_lost:
+            return True
+        if self._is_token_held():
+            return False
+        time.sleep(_LEASE_RECHECK_DELAY)
+        if self._is_token_held():
+            return False
+        self._is_lost = True
+        return True
+
+
+    def _is_token_held(self):
+        data = JobQueue.read_lock_data(self.lock_filepath)
+        return data is not None and data.get('token') == self.token
+
+
+    def release(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if not self.is_lost():
+            try:
+                os.remove(self.lock_filepath)
+            except OSError:
+                pass
+
+
+    def _heartbeat_thread(self):
+        while not self._stop_event.wait(self.heartbeat_interval):
+            if self.is_lost():
+                # The job checks is_lost() and aborts
+                print("Warning: job lease lost <" + self.lock_filepath + ">")
+                return
+            try:
+                os.utime(self.lock_filepath, None)
+            except OSError as e:
+                print("Warning: unable to update job lease <" + self.lock_filepath + ">: " + str(e))
+
+
+class JobQueue():
+    def __init__(self, job_directory,
+                 heartbeat_interval=DEFAULT_HEARTBEAT_INTERVAL,
+                 lease_timeout=DEFAULT_LEASE_TIMEOUT):
+        self.job_directory = job_directory
+        self.heartbeat_interval = heartbeat_interval
+        self.lease_timeout = lease_timeout
+        self.worker_name = socket.gethostname() + ":" + str(os.getpid())
+        self._unrestored_lock_filepaths = set()
+
+
+    @staticmethod
+    def read_lock_data(lock_filepath):
+        try:
+            with open(lock_filepath, 'r', encoding='utf-8') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+
+    def _get_filepath(self, job_id, extension):
+        return os.path.join(self.job_directory, job_id + extension)
+
+
+    def get_job_ids(self):
+        if not os.path.isdir(self.job_directory):
+            return []
+        filenames = os.listdir(self.job_directory)
+        job_ids = [f[:-len(".json")] for f in filenames if f.endswith(".json")]
+        job_ids.sort()
+        return job_ids
+
+
+    def get_job_data(self, job_id):
+        with open(self._get_filepath(job_id, ".json"), 'r', encoding='utf-8') as f:
+            return json.loads(f.read())
+
+
+    def is_job_done(self, job_id):
+        return os.path.isfile(self._get_filepath(job_id, ".done"))
+
+
+    def is_job_failed(self, job_id):
+        return os.path.isfile(self._get_filepath(job_id, ".failed"))
+
+
+    def is_job_finished(self, job_id):
+        return self.is_job_done(job_id) or self.is_job_failed(job_id)
+
+
+    def is_all_jobs_finished(self):
+        return all(self.is_job_finished(job_id) for job_id in self.get_job_ids())
+
+
+    def mark_job_done(self, job_id):
+        with open(self._get_filepath(job_id, ".done"), 'w', encoding='utf-8') as f:
+            f.write(self.worker_name)
+
+
+    def mark_job_failed(self, job_id, message):
+        with open(self._get_filepath(job_id, ".failed"), 'w', encoding='utf-8') as f:
+            f.write(self.worker_name + "\n" + message)
+
+
+    def _is_lock_stale(self, lock_filepath):
+        try:
+            mtime = os.path.getmtime(lock_filepath)
+        except OSError:
+            return False
+        return time.time() - mtime > self.lease_timeout
+
+
+    def _break_stale_lock(self, lock_filepath):
+        stale_data = self.read_lock_data(lock_filepath)
+        if stale_data is None or not self._is_lock_stale(lock_filepath):
+            return False
+
+        # Only one worker can successfully rename the stale lock
+        broken_filepath = lock_filepath + "." + uuid.uuid4().hex + ".stale"
+        try:
+            os.rename(lock_filepath, broken_filepath)
+        except OSError:
+            return False
+
+        broken_data = self.read_lock_data(broken_filepath)
+        if broken_data is None or broken_data.get('token') != stale_data.get('token'):
+            # Another worker broke the stale lock and claimed the job between reading
+            # and renaming. Put the new lock back.
+            if not self._restore_lock(broken_filepath, lock_filepath):
+                # The lock of the other worker is left in place as the broken file
+                # and is never deleted. The other worker notices the lost lease and
+                # aborts its job. This worker treats the job as held from now on.
+                print("Error: unable to restore job lease <" + lock_filepath + ">, left at <" + broken_filepath + ">")
+                self._unrestored_lock_filepaths.add(lock_filepath)
+            return False
+
+        os.remove(broken_filepath)
+        print("Recovered stale job lease from <" + str(stale_data.get('worker')) + "> <" + lock_filepath + ">")
+        return True
+
+
+    def _restore_lock(self, broken_filepath, lock_filepath):
+        # A hard link fails if a third worker has created a new lock in the meantime
+        try:
+            os.link(broken_filepath, lock_filepath)
+        except FileExistsError:
+            return False
+        except OSError:
+            # Hard links are not supported by this filesystem. The lock is only
+            # moved back if no other worker has created a new lock.
+            if os.path.exists(lock_filepath):
+                return False
+            try:
+                os.rename(broken_filepath, lock_filepath)
+            except OSError:
+                return False
+            return True
+
+        try:
+            os.remove(broken_filepath)
+        except OSError:
+            pass
+        return True
+
+
+    def try_claim_job(self, job_id):
+        # Returns a JobLease if the job was claimed by this worker, otherwise None
+        if self.is_job_finished(job_id):
+            return None
+
+        lock_filepath = self._get_filepath(job_id, ".lock")
+        if lock_filepath in self._unrestored_lock_filepaths:
+            return None
+        if os.path.exists(lock_filepath) and not self._break_stale_lock(lock_filepath):
+            return None
+
+        token = uuid.uuid4().hex
+        try:
+            fd = os.open(lock_filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+
+        lock_data = {'worker': self.worker_name, 'token': token, 'claimed_time': time.time()}
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(lock_data))
+
+        if self.is_job_finished(job_id):
+            # Job was completed by the previous lease holder before the lock was removed
+            os.remove(lock_filepath)
+            return None
+
+        lease = JobLease(lock_filepath, token, self.heartbeat_interval)
+        lease.start_heartbeat()
+        return lease
+
+
+    def is_job_ready(self, job_id, job_data):
+        if job_data['type'] == JOB_TYPE_RENDER:
+            # Frames past the end of the bake are rendered once the bake is complete
+            required_frame = min(max(job_data['frames']), job_data['bake_frame_end'])
+            max_finished_frame = get_max_finished_frame(job_data['cache_directory'])
+            return max_finished_frame >= required_frame
+        return True
+
+
+    def claim_next_job(self):
+        # Bake jobs are claimed first so that simulations start as early as
+        # possible. Render jobs become available as their frames finish baking.
+        # Returns (job_id, job_data, lease) or None if no job is ready.
+        job_list = []
+        for job_id in self.get_job_ids():
+            if self.is_job_finished(job_id):
+                continue
+            try:
+                job_data = self.get_job_data(job_id)
+            except (OSError, ValueError):
+                continue
+
+            depends_on = job_data.get('depends_on')
+            if depends_on and self.is_job_failed(depends_on):
+                self.mark_job_failed(job_id, "Dependency <" + depends_on + "> failed")
+                continue
+
+            job_list.append((job_id, job_data))
+
+        job_list.sort(key=lambda job: 0 if job[1]['type'] == JOB_TYPE_BAKE else 1)
+        for job_id, job_data in job_list:
+            if not self.is_job_ready(job_id, job_data):
+                continue
+            lease = self.try_claim_job(job_id)
+            if lease is not None:
+                return job_id, job_data, lease
+
+        return None
@@ -0,0 +1,127 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Claims and runs bake and render jobs from a shared job directory until all
+# jobs are finished. Run on each machine of the farm:
+#
+#     blender -b --python distributed_worker.py -- <job_directory> <num_render_instances>
+#
+# See distributed_jobs.py for the job directory layout.
+
+import bpy, sys, os, time, subprocess
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import distributed_jobs
+import render_worker_pool
+import render_scheduler
+
+argv = sys.argv
+argv = argv[argv.index("--") + 1:]
+job_directory = os.path.abspath(argv[0])
+num_render_instances = int(argv[1]) if len(argv) > 1 else 1
+
+_POLL_INTERVAL = 10.0
+
+
+def run_bake_job(job_data, lease):
+    # Bakes always resume from the most recent savestate so that a job recovered
+    # from a dead machine continues where it left off
+    bake_expression = "import bpy; bpy.ops.flip_fluid_operators.bake_fluid_simulation_cmd(resume_latest_savestate=True)"
+    command = [bpy.app.binary_path, "-b", job_data['blend_filepath'], "--python-expr", bake_expression]
+    process = subprocess.Popen(command, shell=False)
+    while True:
+        try:
+            process.wait(timeout=lease.heartbeat_interval)
+            break
+        except subprocess.TimeoutExpired:
+            if lease.is_lost():
+                # Another machine took over this bake, two bakes must not write to the same cache
+                process.terminate()
+                process.wait()
+                return False, "Job lease lost"
+
+    max_finished_frame = distributed_jobs.get_max_finished_frame(job_data['cache_directory'])
+    if max_finished_frame < job_data['frame_end']:
+        errmsg = "Bake ended at frame " + str(max_finished_frame) + " of " + str(job_data['frame_end'])
+        return False, errmsg
+    return True, ""
+
+
+def run_render_job(job_data, lease, pool):
+    # The pool is shared by all render jobs of this worker so that the render
+    # processes and their loaded .blend files are kept between jobs. The pool
+    # is idle between jobs, so the cost model can be swapped for this job.
+    # If another machine took over this job, frames that have not started are
+    # not rendered twice.
+    commands = [render_worker_pool.RenderCommand(job_data['blend_filepath'], frameno) for frameno in job_data['frames']]
+    pool.cost_model = render_scheduler.RenderCostModel(job_data['cache_directory'])
+    failed_commands = pool.render_batch(commands, is_cancelled=lease.is_lost, 
+                                        poll_interval=lease.heartbeat_interval)
+    if lease.is_lost():
+        return False, "Job lease lost"
+
+    if failed_commands:
+        failed_frames = [str(command.frameno) for command in failed_commands]
+        return False, "Failed to render frames: " + ", ".join(failed_frames)
+    return True, ""
+
+
+def worker_loop():
+    job_queue = distributed_jobs.JobQueue(job_directory)
+    print("Distributed worker <" + job_queue.worker_name + "> using job directory <" + job_directory + ">")
+
+    pool = render_worker_pool.RenderWorkerPool(num_render_instances, bpy.app.binary_path)
+    try:
+        _run_jobs(job_queue, pool)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _run_jobs(job_queue, pool):
+    while True:
+        claimed_job = job_queue.claim_next_job()
+        if claimed_job is None:
+            if job_queue.is_all_jobs_finished():
+                return
+            time.sleep(_POLL_INTERVAL)
+            continue
+
+        job_id, job_data, lease = claimed_job
+        print("Starting job <" + job_id + ">")
+
+        try:
+            if job_data['type'] == distributed_jobs.JOB_TYPE_BAKE:
+                is_success, errmsg = run_bake_job(job_data, lease)
+            else:
+                is_success, errmsg = run_render_job(job_data, lease, pool)
+        except Exception as e:
+            is_success, errmsg = False, str(e)
+
+        if lease.is_lost():
+            print("Job <" + job_id + "> was taken over by another worker")
+        elif is_success:
+            job_queue.mark_job_done(job_id)
+            print("Finished job <" + job_id + ">")
+        else:
+            job_queue.mark_job_failed(job_id, errmsg)
+            print("Job <" + job_id + "> failed: " + errmsg)
+        lease.release()
+
+
+worker_loop()
+
+print("\n***Distributed Worker Complete: all jobs finished***\n")
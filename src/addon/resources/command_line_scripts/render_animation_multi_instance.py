@@ -14,7 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import bpy, sys, os, threading, time, subprocess, queue
+import bpy, sys, os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import render_worker_pool
+import render_scheduler
 
 argv = sys.argv
 argv = argv[argv.index("--") + 1:]
@@ -23,51 +27,23 @@ use_overwrite_option = int(argv[1])
 
 _NUM_RENDER_INSTANCES = num_render_instances_option
 _USE_OVERWRITE = bool(use_overwrite_option)
-_RENDER_THREADS = []
-
-
-def _render_thread(settings, frameno):
-    command = [settings["blender_binary_path"], "-b", settings["blend_filepath"], "-f", str(frameno)] 
-    subprocess.call(command, shell=False)
 
 
 def render_loop(settings):
-    global _NUM_RENDER_INSTANCES
-    global _RENDER_THREADS
-    global _IS_SIMULATION_FINISHED
-
-    _RENDER_THREADS = [None] * _NUM_RENDER_INSTANCES
-
-    render_frame_queue = queue.Queue()
+    commands = []
     for frameno in settings["frameno_list"]:
-        render_frame_queue.put(frameno)
-
-    updates_per_second = 60
-    while True:
-        if not render_frame_queue.empty():
-            available_thread_id = -1
-            is_thread_available = False
-            for i in range(len(_RENDER_THREADS)):
-                if _RENDER_THREADS[i] is None or not _RENDER_THREADS[i].is_alive():
-                    available_thread_id = i
-                    is_thread_available = True
-                    break
-
-            if is_thread_available:
-                frameno = render_frame_queue.get()
-                _RENDER_THREADS[available_thread_id] = threading.Thread(target=_render_thread, args=(settings, frameno))
-                _RENDER_THREADS[available_thread_id].start()
-
-        if render_frame_queue.empty():
-            is_threads_running = False
-            for thread in _RENDER_THREADS:
-                if thread is not None and thread.is_alive():
-                    is_threads_running = True
-                    break
-            if not is_threads_running:
-                return
-
-        time.sleep(1.0/updates_per_second)
+        commands.append(render_worker_pool.RenderCommand(settings["blend_filepath"], frameno))
+
+    # Scenes without a FLIP Fluids domain are rendered without a cost model
+    cost_model = None
+    if settings["cache_directory"] is not None:
+        cost_model = render_scheduler.RenderCostModel(settings["cache_directory"])
+    pool = render_worker_pool.RenderWorkerPool(
+            _NUM_RENDER_INSTANCES,
+            settings["blender_binary_path"],
+            cost_model=cost_model
+            )
+    pool.render(commands)
 
 
 def get_render_output_info():
@@ -140,6 +116,10 @@ settings["frame_end"] = bpy.context.scene.frame_end
 settings["frame_step"] = bpy.context.scene.frame_step
 settings["use_overwrite"] = _USE_OVERWRITE
 settings["frameno_list"] = frameno_list
+settings["cache_directory"] = None
+dprops = bpy.context.scene.flip_fluid.get_domain_properties()
+if dprops is not None:
+    settings["cache_directory"] = dprops.cache.get_cache_abspath()
 
 render_loop(settings)
 
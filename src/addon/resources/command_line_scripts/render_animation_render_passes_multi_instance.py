@@ -14,7 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import bpy, sys, os, pathlib, threading, time, subprocess, queue
+import bpy, sys, os, pathlib
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import render_worker_pool
+import render_scheduler
 
 argv = sys.argv
 argv = argv[argv.index("--") + 1:]
@@ -23,53 +27,24 @@ use_overwrite_option = int(argv[1])
 
 _NUM_RENDER_INSTANCES = num_render_instances_option
 _USE_OVERWRITE = bool(use_overwrite_option)
-_RENDER_THREADS = []
-
-
-def _render_thread(command_info):
-    blend_filepath = command_info['blend_filepath']
-    frameno = command_info['frameno']
-    command = [bpy.app.binary_path, "-b", blend_filepath, "-f", str(frameno)] 
-    subprocess.call(command, shell=False)
 
 
 def render_loop(command_list):
-    global _NUM_RENDER_INSTANCES
-    global _RENDER_THREADS
-    global _IS_SIMULATION_FINISHED
-
-    _RENDER_THREADS = [None] * _NUM_RENDER_INSTANCES
-
-    render_command_queue = queue.Queue()
-    for command_text in command_list:
-        render_command_queue.put(command_text)
-
-    updates_per_second = 60
-    while True:
-        if not render_command_queue.empty():
-            available_thread_id = -1
-            is_thread_available = False
-            for i in range(len(_RENDER_THREADS)):
-                if _RENDER_THREADS[i] is None or not _RENDER_THREADS[i].is_alive():
-                    available_thread_id = i
-                    is_thread_available = True
-                    break
-
-            if is_thread_available:
-                command_info = render_command_queue.get()
-                _RENDER_THREADS[available_thread_id] = threading.Thread(target=_render_thread, args=(command_info,))
-                _RENDER_THREADS[available_thread_id].start()
-
-        if render_command_queue.empty():
-            is_threads_running = False
-            for thread in _RENDER_THREADS:
-                if thread is not None and thread.is_alive():
-                    is_threads_running = True
-                    break
-            if not is_threads_running:
-                return
-
-        time.sleep(1.0/updates_per_second)
+    commands = []
+    for command_info in command_list:
+        commands.append(render_worker_pool.RenderCommand(command_info['blend_filepath'], command_info['frameno']))
+
+    # Scenes without a FLIP Fluids domain are rendered without a cost model
+    cost_model = None
+    dprops = bpy.context.scene.flip_fluid.get_domain_properties()
+    if dprops is not None:
+        cost_model = render_scheduler.RenderCostModel(dprops.cache.get_cache_abspath())
+    pool = render_worker_pool.RenderWorkerPool(
+            _NUM_RENDER_INSTANCES,
+            bpy.app.binary_path,
+            cost_model=cost_model
+            )
+    pool.render(commands)
 
 
 def get_render_output_info():
@@ -0,0 +1,226 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Render cost and memory estimates for the multi-instance command line render
+# scripts, computed from the per-frame stats written by the bake.
+#
+# The amount of cache data loaded for a frame (surface mesh, whitewater and
+# fluid particles) is used as the estimate of render cost. The render worker
+# pool hands out the most expensive ready frame first so that the light frames
+# are left to fill in the gaps at the end of the shot.
+#
+# Peak memory of a frame is predicted from the same cache data size. The
+# prediction starts from a fixed estimate and is fitted to the peak memory
+# measured for rendered frames. Measured peaks are stored in renderstats.data
+# in the cache directory so that later renders of the same cache start from
+# measured values. Memory is measured through /proc and is only supported on
+# Linux, on other systems the number of render instances is not limited.
+
+import os, sys, json, threading
+
+# Mesh stats that are loaded into the scene at render time
+_RENDER_MESH_STATS = [
+    "surface",
+    "foam",
+    "bubble",
+    "spray",
+    "dust",
+    "fluidparticles",
+]
+
+# Loaded cache data is expanded into Blender mesh data, attributes, and render
+# acceleration structures. Memory use is roughly proportional to the size of
+# the cache data.
+_CACHE_BYTES_MEMORY_FACTOR = 8.0
+
+# Estimated memory of a render instance before any cache data is loaded
+_BASE_INSTANCE_MEMORY_BYTES = 1.0 * 1024**3
+
+# Fraction of available system memory that renders may use
+_AVAILABLE_MEMORY_FRACTION = 0.9
+
+_RENDER_STATS_FILENAME = "renderstats.data"
+
+
+def is_memory_monitoring_supported():
+    return sys.platform.startswith("linux") and os.path.isfile("/proc/meminfo")
+
+
+def get_process_memory(pid):
+    # Returns the resident memory of a process in bytes, or 0 if unknown
+    if pid is None:
+        return 0
+    try:
+        with open("/proc/" + str(pid) + "/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def get_available_system_memory():
+    # Returns available memory in bytes, or None if unknown. Only supported on Linux.
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class FrameStatsReader():
+    def __init__(self, cache_directory):
+        self.cache_directory = cache_directory
+        self._stats = {}
+
+        # Stats of frames that have been processed by the addon are stored in
+        # flipstats.data. Stats of recently baked frames are stored per-frame in
+        # the temp directory until they are merged.
+        stats_filepath = os.path.join(cache_directory, "flipstats.data")
+        try:
+            with open(stats_filepath, 'r', encoding='utf-8') as f:
+                self._stats = json.loads(f.read())
+        except (OSError, ValueError):
+            self._stats = {}
+
+
+    def get_frame_stats(self, frameno):
+        key = str(frameno)
+        if key in self._stats:
+            return self._stats[key]
+
+        filename = "framestats" + str(frameno).zfill(6) + ".data"
+        filepath = os.path.join(self.cache_directory, "temp", filename)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                frame_stats = json.loads(f.read())
+        except (OSError, ValueError):
+            # Stats may not exist or may not be finished writing
+            return None
+
+        self._stats[key] = frame_stats
+        return frame_stats
+
+
+def get_frame_cache_bytes(frame_stats):
+    if frame_stats is None:
+        return 0
+
+    num_bytes = 0
+    for name in _RENDER_MESH_STATS:
+        mesh_stats = frame_stats.get(name)
+        if mesh_stats and mesh_stats.get("enabled", False):
+            num_bytes += mesh_stats.get("bytes", 0)
+    return num_bytes
+
+
+class RenderCostModel():
+    def __init__(self, cache_directory):
+        self.stats_reader = FrameStatsReader(cache_directory)
+        self.render_stats_filepath = os.path.join(cache_directory, _RENDER_STATS_FILENAME)
+        self._lock = threading.Lock()
+        self._base_memory = _BASE_INSTANCE_MEMORY_BYTES
+        self._memory_factor = _CACHE_BYTES_MEMORY_FACTOR
+
+        # Measured peak memory by frame number
+        self._frame_peak_memory = {}
+        try:
+            with open(self.render_stats_filepath, 'r', encoding='utf-8') as f:
+                render_stats = json.loads(f.read())
+            for key, frame_stats in render_stats.items():
+                self._frame_peak_memory[int(key)] = int(frame_stats["peak_memory"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._frame_peak_memory = {}
+        self._update_memory_model()
+
+
+    def is_memory_monitoring_supported(self):
+        return is_memory_monitoring_supported()
+
+
+    def get_process_memory(self, pid):
+        return get_process_memory(pid)
+
+
+    def get_memory_budget(self):
+        available_memory = get_available_system_memory()
+        if available_memory is None:
+            return 0
+        return int(_AVAILABLE_MEMORY_FRACTION * available_memory)
+
+
+    def estimate_cost(self, frameno):
+        # Relative render cost, frames without stats are treated as the lightest frames
+        return get_frame_cache_bytes(self.stats_reader.get_frame_stats(frameno))
+
+
+    def estimate_memory(self, frameno):
+        # Predicted peak memory in bytes of a render instance rendering this frame
+        with self._lock:
+            if frameno in self._frame_peak_memory:
+                return self._frame_peak_memory[frameno]
+            base_memory, memory_factor = self._base_memory, self._memory_factor
+
+        cache_bytes = get_frame_cache_bytes(self.stats_reader.get_frame_stats(frameno))
+        return int(base_memory + memory_factor * cache_bytes)
+
+
+    def record_frame_memory(self, frameno, peak_memory):
+        with self._lock:
+            self._frame_peak_memory[frameno] = peak_memory
+            self._update_memory_model()
+            render_stats = {str(f): {"peak_memory": m} for f, m in self._frame_peak_memory.items()}
+
+            try:
+                temp_filepath = self.render_stats_filepath + ".tmp"
+                with open(temp_filepath, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(render_stats, sort_keys=True, indent=4))
+                os.replace(temp_filepath, self.render_stats_filepath)
+            except OSError as e:
+                print("Warning: unable to write render stats <" + self.render_stats_filepath + ">: " + str(e))
+
+
+    def _update_memory_model(self):
+        # Least squares fit of peak_memory = base + factor * cache_bytes over the
+        # measured frames. With too few distinct measurements, the default model
+        # is scaled to match the measured average instead.
+        samples = []
+        for frameno, peak_memory in self._frame_peak_memory.items():
+            cache_bytes = get_frame_cache_bytes(self.stats_reader.get_frame_stats(frameno))
+            samples.append((cache_bytes, peak_memory))
+        if not samples:
+            return
+
+        n = len(samples)
+        mean_x = sum(x for x, _ in samples) / n
+        mean_y = sum(y for _, y in samples) / n
+        variance_x = sum((x - mean_x)**2 for x, _ in samples)
+        if n >= 2 and variance_x > 0:
+            covariance = sum((x - mean_x) * (y - mean_y) for x, y in samples)
+            memory_factor = max(0.0, covariance / variance_x)
+            base_memory = max(0.0, mean_y - memory_factor * mean_x)
+        else:
+            default_mean = _BASE_INSTANCE_MEMORY_BYTES + _CACHE_BYTES_MEMORY_FACTOR * mean_x
+            scale = mean_y / default_mean
+            base_memory = scale * _BASE_INSTANCE_MEMORY_BYTES
+            memory_factor = scale * _CACHE_BYTES_MEMORY_FACTOR
+
+        self._base_memory = base_memory
+        self._memory_factor = memory_factor
@@ -0,0 +1,82 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Persistent render worker launched by render_worker_pool.py:
+#
+#     blender -b file.blend --python render_worker.py
+#
+# The .blend file is loaded once and the worker then renders the frames it
+# receives over stdin until stdin is closed. Each command is a single line of
+# JSON: {"blend_filepath": <str>, "frameno": <int>}. If a command references a
+# different .blend file than the one currently loaded, the file is reopened.
+# After each frame, a line starting with _MESSAGE_PREFIX is written to stdout
+# so that the coordinator can hand out the next frame.
+
+import bpy, sys, os, json, traceback
+
+_MESSAGE_PREFIX = "FLIP_FLUIDS_RENDER_WORKER"
+
+
+def send_message(message_type, frameno=-1):
+    sys.stdout.write(_MESSAGE_PREFIX + " " + message_type + " " + str(frameno) + "\n")
+    sys.stdout.flush()
+
+
+def render_frame(frameno):
+    scene = bpy.context.scene
+
+    # Video formats not supported for single frame render
+    video_formats = ["FFMPEG", "AVI_RAW", "AVI_JPEG"]
+    if scene.render.image_settings.file_format in video_formats:
+        scene.render.image_settings.file_format = "PNG"
+
+    original_output_path = scene.render.filepath
+    image_path = scene.render.frame_path(frame=frameno)
+
+    scene.frame_set(frameno)
+    scene.render.filepath = image_path
+    try:
+        bpy.ops.render.render(write_still=True)
+    finally:
+        scene.render.filepath = original_output_path
+
+
+def main():
+    current_blend_filepath = os.path.normpath(bpy.data.filepath)
+    send_message("READY")
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        frameno = -1
+        try:
+            command = json.loads(line)
+            frameno = int(command['frameno'])
+            blend_filepath = os.path.normpath(command['blend_filepath'])
+            if blend_filepath != current_blend_filepath:
+                bpy.ops.wm.open_mainfile(filepath=blend_filepath)
+                current_blend_filepath = blend_filepath
+
+            render_frame(frameno)
+            send_message("DONE", frameno)
+        except Exception:
+            traceback.print_exc()
+            send_message("ERROR", frameno)
+
+
+main()
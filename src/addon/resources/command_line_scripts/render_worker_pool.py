@@ -0,0 +1,364 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Pool of long-lived Blender render workers (render_worker.py) used by the
+# multi-instance command line render scripts. Each worker loads its .blend file
+# once and is then handed frames over a pipe, so Blender startup, file loading,
+# and addon registration are paid once per worker instead of once per frame.
+#
+# Frames are kept in a single shared queue. An idle worker takes the frame with
+# the highest estimated cost, preferring frames that use the .blend file it
+# already has loaded, so that no worker sits idle while frames remain and the
+# light frames are rendered last. If a worker process exits while rendering
+# (for example, Blender crashed or was killed), the frame is put back into the
+# queue and rendered again by a new process.
+#
+# If a cost model is given (see render_scheduler.py) and process memory can be
+# measured, a frame is only started if its predicted peak memory fits into the
+# currently available memory next to the memory that the running frames are
+# still expected to claim. A worker that cannot start its next frame stops its
+# Blender process until memory frees up. The peak memory of each frame is
+# recorded and used to improve the predictions for the remaining frames.
+
+import sys, os, json, threading, subprocess
+
+_MESSAGE_PREFIX = "FLIP_FLUIDS_RENDER_WORKER"
+
+# A frame is rendered again if the worker process exits while rendering it,
+# up to this number of attempts
+_MAX_RENDER_ATTEMPTS = 3
+
+
+class RenderCommand():
+    def __init__(self, blend_filepath, frameno):
+        self.blend_filepath = blend_filepath
+        self.frameno = frameno
+        self.cost = 0
+        self.memory_estimate = 0
+        self.peak_memory = 0
+        self.num_attempts = 0
+
+
+class RenderWorker():
+    def __init__(self, worker_id, blender_binary_path, worker_script_path):
+        self.worker_id = worker_id
+        self.blender_binary_path = blender_binary_path
+        self.worker_script_path = worker_script_path
+        self.blend_filepath = None
+        self.process = None
+
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+
+    def get_pid(self):
+        if self.is_running():
+            return self.process.pid
+        return None
+
+
+    def start(self, blend_filepath):
+        command = [self.blender_binary_path, "-b", blend_filepath, "--python", self.worker_script_path]
+        self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+                bufsize=1,
+                shell=False
+                )
+        self.blend_filepath = blend_filepath
+        message_type, _ = self._wait_for_message()
+        return message_type == "READY"
+
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+        self.process = None
+        self.blend_filepath = None
+
+
+    def _wait_for_message(self):
+        # Blender output is forwarded to the console, worker messages are consumed.
+        # Output that Blender has not yet terminated with a newline can precede
+        # a message on the same line, so the prefix is searched anywhere in the line.
+        for line in self.process.stdout:
+            prefix_index = line.find(_MESSAGE_PREFIX)
+            if prefix_index >= 0:
+                if prefix_index > 0:
+                    sys.stdout.write(line[:prefix_index] + "\n")
+                tokens = line[prefix_index:].split()
+                return tokens[1], int(tokens[2])
+            sys.stdout.write(line)
+        return None, -1
+
+
+    def render(self, command):
+        # Returns (is_success, is_process_lost). If the worker process could not
+        # be started or exited before finishing the frame, is_process_lost is
+        # True and the frame can be rendered again by a new process.
+        if not self.is_running():
+            if not self.start(command.blend_filepath):
+                self.stop()
+                return False, True
+
+        data = {'blend_filepath': command.blend_filepath, 'frameno': command.frameno}
+        try:
+            self.process.stdin.write(json.dumps(data) + "\n")
+            self.process.stdin.flush()
+        except OSError:
+            self.stop()
+            return False, True
+
+        message_type, _ = self._wait_for_message()
+        if message_type is None:
+            # Worker process exited while rendering, a new process will be
+            # started for the next frame
+            self.stop()
+            return False, True
+
+        self.blend_filepath = command.blend_filepath
+        return message_type == "DONE", False
+
+
+class RenderWorkerPool():
+    def __init__(self, num_workers, blender_binary_path, worker_script_path=None, cost_model=None):
+        if worker_script_path is None:
+            script_directory = os.path.dirname(os.path.realpath(__file__))
+            worker_script_path = os.path.join(script_directory, "render_worker.py")
+
+        self.workers = [RenderWorker(i, blender_binary_path, worker_script_path) for i in range(num_workers)]
+        self.failed_commands = []
+        self.cost_model = cost_model
+
+        self._pending_commands = []
+        self._active_commands = {}
+        self._is_closed = False
+        self._condition = threading.Condition()
+        self._threads = []
+        self._monitor_thread = None
+
+
+    def start(self):
+        for worker in self.workers:
+            thread = threading.Thread(target=self._worker_thread, args=(worker,))
+            thread.start()
+            self._threads.append(thread)
+
+        if self.cost_model is not None and self.cost_model.is_memory_monitoring_supported():
+            self._monitor_thread = threading.Thread(target=self._memory_monitor_thread)
+            self._monitor_thread.daemon = True
+            self._monitor_thread.start()
+
+
+    def add_commands(self, commands):
+        if self.cost_model is not None:
+            for command in commands:
+                command.cost = self.cost_model.estimate_cost(command.frameno)
+
+        with self._condition:
+            self._pending_commands += commands
+            self._condition.notify_all()
+
+
+    def close(self):
+        # No more commands will be added, workers exit once the queue is empty
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify_all()
+
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        with self._condition:
+            self._condition.notify_all()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join()
+            self._monitor_thread = None
+
+
+    def get_worker_pids(self):
+        return [pid for pid in (worker.get_pid() for worker in self.workers) if pid is not None]
+
+
+    def render(self, commands):
+        self.add_commands(commands)
+        self.close()
+        self.start()
+        self.join()
+
+
+    def render_batch(self, commands, is_cancelled=None, poll_interval=5.0):
+        # Render the commands and wait until they are finished. The workers keep
+        # their Blender processes for the next batch until close() and join()
+        # are called. Returns the commands of this batch that failed.
+        #
+        # If is_cancelled() returns True, frames of this batch that have not
+        # started are dropped and only the frames that are rendering are
+        # waited for. Dropped frames are not returned as failed.
+        if not self._threads:
+            self.start()
+
+        with self._condition:
+            num_failed = len(self.failed_commands)
+        self.add_commands(commands)
+
+        is_batch_cancelled = False
+        while True:
+            if not is_batch_cancelled and is_cancelled is not None and is_cancelled():
+                is_batch_cancelled = True
+                print("Render batch cancelled, waiting for rendering frames to finish")
+
+            with self._condition:
+                if is_batch_cancelled:
+                    # Frames that are retried after a lost process are dropped as well
+                    self._pending_commands = [c for c in self._pending_commands if c not in commands]
+                if not self._pending_commands and not self._active_commands:
+                    return self.failed_commands[num_failed:]
+                self._condition.wait(poll_interval if is_cancelled is not None else None)
+
+
+    def _get_memory_headroom(self):
+        # Available memory minus the memory that running frames are still
+        # expected to claim before reaching their predicted peak. Returns None
+        # if memory is not limited.
+        if self.cost_model is None or not self.cost_model.is_memory_monitoring_supported():
+            return None
+
+        committed_memory = 0
+        for active_worker, active_command in self._active_commands.values():
+            rss = self.cost_model.get_process_memory(active_worker.get_pid())
+            committed_memory += max(0, active_command.memory_estimate - rss)
+
+        return self.cost_model.get_memory_budget() - committed_memory
+
+
+    def _select_command_index(self, worker):
+        # Highest cost frame that fits into memory, preferring frames of the
+        # .blend file that the worker already has loaded
+        memory_headroom = None
+        worker_memory = 0
+        if self._active_commands:
+            # At least one frame is always allowed to render
+            memory_headroom = self._get_memory_headroom()
+            if memory_headroom is not None and worker.is_running():
+                # Memory already held by this worker counts towards the frame
+                worker_memory = self.cost_model.get_process_memory(worker.get_pid())
+
+        selected_index = -1
+        selected_key = None
+        for i, command in enumerate(self._pending_commands):
+            key = (command.blend_filepath == worker.blend_filepath, command.cost)
+            if selected_key is not None and key <= selected_key:
+                continue
+            if memory_headroom is not None:
+                required_memory = self.cost_model.estimate_memory(command.frameno) - worker_memory
+                if required_memory > memory_headroom:
+                    continue
+            selected_index = i
+            selected_key = key
+        return selected_index
+
+
+    def _take_command(self, worker):
+        # Returns (command, is_throttled). The command is None if there are no
+        # commands left, or if the next frame does not fit into memory.
+        with self._condition:
+            while not self._pending_commands and not self._is_closed:
+                self._condition.wait()
+            if not self._pending_commands:
+                return None, False
+
+            command_index = self._select_command_index(worker)
+            if command_index < 0:
+                return None, True
+
+            command = self._pending_commands.pop(command_index)
+            if self.cost_model is not None:
+                command.memory_estimate = self.cost_model.estimate_memory(command.frameno)
+            command.peak_memory = 0
+            self._active_commands[worker.worker_id] = (worker, command)
+            return command, False
+
+
+    def _finish_command(self, worker, command, is_success, is_retry):
+        with self._condition:
+            del self._active_commands[worker.worker_id]
+            if is_retry:
+                self._pending_commands.append(command)
+            elif not is_success:
+                self.failed_commands.append(command)
+            self._condition.notify_all()
+
+        if self.cost_model is not None and command.peak_memory > 0:
+            self.cost_model.record_frame_memory(command.frameno, command.peak_memory)
+
+
+    def _memory_monitor_thread(self):
+        # Sample the memory of rendering workers to record the peak memory of each frame
+        sample_interval = 0.5
+        while True:
+            with self._condition:
+                if not any(thread.is_alive() for thread in self._threads):
+                    return
+                active_commands = list(self._active_commands.values())
+
+            for worker, command in active_commands:
+                rss = self.cost_model.get_process_memory(worker.get_pid())
+                command.peak_memory = max(command.peak_memory, rss)
+
+            with self._condition:
+                self._condition.wait(sample_interval)
+
+
+    def _worker_thread(self, worker):
+        throttle_interval = 2.0
+        while True:
+            command, is_throttled = self._take_command(worker)
+            if is_throttled:
+                # Not enough memory for another frame. Stop this worker process so
+                # that its memory is available to the frames that are rendering.
+                if worker.is_running():
+                    print("Render worker " + str(worker.worker_id) + " throttled, not enough memory for the next frame")
+                    worker.stop()
+                with self._condition:
+                    self._condition.wait(throttle_interval)
+                continue
+
+            if command is None:
+                break
+
+            is_success, is_process_lost = worker.render(command)
+            command.num_attempts += 1
+            is_retry = is_process_lost and command.num_attempts < _MAX_RENDER_ATTEMPTS
+            self._finish_command(worker, command, is_success, is_retry)
+            if is_retry:
+                print("Render worker " + str(worker.worker_id) + " exited while rendering frame " + 
+                      str(command.frameno) + ", frame will be rendered again")
+            elif not is_success:
+                print("Error rendering frame " + str(command.frameno) + " <" + command.blend_filepath + ">")
+
+        worker.stop()
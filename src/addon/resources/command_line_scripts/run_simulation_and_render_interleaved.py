@@ -14,9 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import bpy, sys, os, threading, time, subprocess, pathlib
+import bpy, sys, os, threading, time, pathlib
 from collections import namedtuple
 
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "utils"))
+import render_worker_pool
+import render_scheduler
+import cache_utils
+
 argv = sys.argv
 argv = argv[argv.index("--") + 1:]
 num_render_instances_option = int(argv[0])
@@ -24,31 +30,12 @@ use_overwrite_option = int(argv[1])
 
 _NUM_RENDER_INSTANCES = num_render_instances_option
 _USE_OVERWRITE = bool(use_overwrite_option)
-_RENDER_THREADS = []
 _IS_SIMULATION_FINISHED = False
+_FALLBACK_POLL_INTERVAL = 2.0
 
 RenderCommandInfo = namedtuple('RenderCommandInfo', ['blendfile', 'frame'])
 
 
-def get_max_bakefile_frame(bakefiles_directory):
-        bakefiles = os.listdir(bakefiles_directory)
-        max_frameno = -1
-        for f in bakefiles:
-            base = f.split(".")[0]
-            if not base.startswith("finished"):
-                # a file named in the form finished######.txt is created
-                # to signal that all cache files for the frame have been generated.
-                continue
-
-            try:
-                frameno = int(base[-6:])
-                max_frameno = max(frameno, max_frameno)
-            except:
-                # In the case that there is a bakefile without a number
-                pass
-        return max_frameno
-
-
 def get_render_output_info():
     full_path = bpy.path.abspath(bpy.context.scene.render.filepath)
     directory_path = full_path
@@ -179,108 +166,48 @@ def get_render_command_list_render_passes():
     return render_command_list
 
 
-def _render_thread(command):
-    subprocess_command = [bpy.app.binary_path, "-b", command.blendfile, "-f", str(command.frame)] 
-    subprocess.call(subprocess_command, shell=False)  
-
-
-def _render_sequence_thread(command, frame_start, frame_end):
-    subprocess_command = [bpy.app.binary_path, "-b", command.blendfile, "-s", str(frame_start), "-e", str(frame_end), "-a"] 
-    subprocess.call(subprocess_command, shell=False)  
-
-
 def render_loop(render_command_list):
-    global _NUM_RENDER_INSTANCES
-    global _RENDER_THREADS
     global _IS_SIMULATION_FINISHED
 
-    _RENDER_THREADS = [None] * _NUM_RENDER_INSTANCES
-
-    frame_start = bpy.context.scene.frame_start
     frame_end = bpy.context.scene.frame_end
-    frame_step = bpy.context.scene.frame_step
-
-    hprops = bpy.context.scene.flip_fluid_helper
-    render_single_blend_file = not hprops.render_passes
-    render_single_threaded = _NUM_RENDER_INSTANCES == 1
-    is_render_sequence_optimization_available = render_single_blend_file and render_single_threaded and frame_step == 1
 
     dprops = bpy.context.scene.flip_fluid.get_domain_properties()
     cache_directory = dprops.cache.get_cache_abspath()
     bakefiles_directory = os.path.join(cache_directory, "bakefiles")
+    finished_frames_reader = cache_utils.FinishedFramesLogReader(bakefiles_directory)
+
+    # Render workers stay alive between frames and keep their .blend file loaded,
+    # frames are added to the pool as soon as they finish baking. Frames that are
+    # ready are rendered in order of estimated cost from the bake frame stats.
+    cost_model = render_scheduler.RenderCostModel(cache_directory)
+    pool = render_worker_pool.RenderWorkerPool(
+            _NUM_RENDER_INSTANCES,
+            bpy.app.binary_path,
+            cost_model=cost_model
+            )
+    pool.start()
 
-    baked_frames = []
-    render_command_queue = []
-
-    updates_per_second = 60
     while True:
-        if not os.path.isdir(bakefiles_directory):
-            continue
-
-        # Update render command queue
-        max_frameno = get_max_bakefile_frame(bakefiles_directory)
-        if max_frameno < 0:
-            continue
-
-        if max_frameno not in baked_frames:
-            if baked_frames:
-                next_frame = baked_frames[-1] + 1
-            else:
-                next_frame = frame_start
-
-            for i in range(next_frame, max_frameno + 1):
-                baked_frames.append(i)
-
-        new_commands = [command for command in render_command_list if command.frame <= max_frameno]
-        render_command_queue += new_commands
-        remaining_commands = [command for command in render_command_list if command.frame > max_frameno]
-        render_command_list = remaining_commands
-
-        # Launch render worker thread
-        if render_command_queue:
-            available_thread_id = -1
-            is_thread_available = False
-            for i in range(len(_RENDER_THREADS)):
-                if _RENDER_THREADS[i] is None or not _RENDER_THREADS[i].is_alive():
-                    available_thread_id = i
-                    is_thread_available = True
-                    break
-
-            if is_thread_available:
-                if is_render_sequence_optimization_available:
-                    # Render a continuous frame sequence instead of shutting down Blender between frames
-                    sequence_start = render_command_queue[0].frame
-                    sequence_end = sequence_start
-                    for i in range(1, len(render_command_queue)):
-                        next_frame = render_command_queue[i].frame
-                        if next_frame == sequence_end + 1:
-                            sequence_end = next_frame
-                        else:
-                            break
-
-                    next_command = render_command_queue.pop(0)
-                    render_command_queue = [command for command in render_command_queue if command.frame > sequence_end]
-
-                    _RENDER_THREADS[available_thread_id] = threading.Thread(target=_render_sequence_thread, args=(next_command, sequence_start, sequence_end,))
-                    _RENDER_THREADS[available_thread_id].start()
-                else:
-                    next_command = render_command_queue.pop(0)
-                    _RENDER_THREADS[available_thread_id] = threading.Thread(target=_render_thread, args=(next_command,))
-                    _RENDER_THREADS[available_thread_id].start()
-
-        # Check if render finished
-        if _IS_SIMULATION_FINISHED:
-            last_frameno = baked_frames[-1]
-            if last_frameno == frame_end:
-                is_threads_running = False
-                for thread in _RENDER_THREADS:
-                    if thread is not None and thread.is_alive():
-                        is_threads_running = True
-                        break
-                if not is_threads_running:
-                    return
-
-        time.sleep(1.0/updates_per_second)
+        new_frames = finished_frames_reader.read_new_frames()
+        max_frameno = finished_frames_reader.max_frame
+
+        if new_frames:
+            new_commands = [command for command in render_command_list if command.frame <= max_frameno]
+            pool_commands = [render_worker_pool.RenderCommand(c.blendfile, c.frame) for c in new_commands]
+            pool.add_commands(pool_commands)
+            remaining_commands = [command for command in render_command_list if command.frame > max_frameno]
+            render_command_list = remaining_commands
+
+        # Check if simulation finished
+        if _IS_SIMULATION_FINISHED and max_frameno == frame_end:
+            break
+
+        # Wait for the bake to finish another frame
+        finished_frames_reader.wait(_FALLBACK_POLL_INTERVAL)
+
+    finished_frames_reader.close()
+    pool.close()
+    pool.join()
 
 
 hprops = bpy.context.scene.flip_fluid_helper
@@ -190,6 +190,12 @@ velocity_transfer_methods = (
     ('VELOCITY_TRANSFER_METHOD_APIC', "APIC", "Choose APIC for high vorticity, swirly, and stable simulations. Generally better for small scale simulations where reduced surface noise is desirable or for viscous simulations.")
     )
 
+pressure_solver_preconditioners = (
+    ('PRESSURE_SOLVER_PRECONDITIONER_MIC',          "MIC(0)",          "Modified incomplete Cholesky preconditioner. Runs on a single thread and iteration counts increase with simulation resolution."),
+    ('PRESSURE_SOLVER_PRECONDITIONER_PARALLEL_MIC', "Parallel MIC(0)", "Modified incomplete Cholesky preconditioner that applies the preconditioner on all threads. Converges in the same number of iterations as MIC(0). Recommended for medium resolution simulations on CPUs with many cores."),
+    ('PRESSURE_SOLVER_PRECONDITIONER_MULTIGRID',    "Multigrid",       "Multigrid preconditioner. Runs on all threads and iteration counts stay nearly constant as simulation resolution increases. Recommended for high resolution simulations.")
+    )
+
 surface_tension_solver_methods = (
     ('SURFACE_TENSION_SOLVER_METHOD_REGULAR', "Regular", "Choose for general purpose surface tension effects."),
     ('SURFACE_TENSION_SOLVER_METHOD_SMOOTH',  "Smooth",  "Choose for improved stability and smoother results in small-scale surface tension effects. Good for thin streams/strands of liquid and for high surface tension effects. Not recommended for highly chaotic liquid motion or large volumes of liquid as this can result in volume increase issues.")
@@ -62,6 +62,7 @@ class FLIPFLUID_PT_DomainTypeAdvancedPanel(bpy.types.Panel):
             column.prop(aprops, "CFL_condition_number")
             column.prop(aprops, "enable_adaptive_obstacle_time_stepping")
             column.prop(aprops, "enable_adaptive_force_field_time_stepping")
+            column.prop(aprops, "enable_adaptive_substepping")
         else:
             row = row.row(align=True)
             row.alignment = 'RIGHT'
@@ -107,6 +108,14 @@ class FLIPFLUID_PT_DomainTypeAdvancedPanel(bpy.types.Panel):
             column = body.column(align=True)
             column.prop(aprops, "pressure_solver_max_iterations")
             column.prop(aprops, "viscosity_solver_max_iterations")
+            row = column.row(align=True)
+            row.enabled = not aprops.enable_matrix_free_pressure_solver
+            row.prop(aprops, "pressure_solver_preconditioner", text="")
+            column.prop(aprops, "enable_pressure_solver_warm_start")
+            column.prop(aprops, "enable_matrix_free_pressure_solver")
+            if aprops.enable_matrix_free_pressure_solver:
+                column.label(text="Preconditioner overridden with Jacobi", icon='INFO')
+            column.prop(aprops, "enable_matrix_free_viscosity_solver")
         else:
             row = row.row(align=True)
             row.alignment = 'RIGHT'
@@ -136,6 +145,11 @@ class FLIPFLUID_PT_DomainTypeAdvancedPanel(bpy.types.Panel):
 
             column = body.column()
             column.prop(aprops, "enable_fracture_optimization")
+            column.prop(aprops, "enable_sparse_liquid_level_set")
+            column.prop(aprops, "enable_fluid_particle_sorting")
+            column.prop(aprops, "enable_compact_particle_attributes")
+            column.prop(aprops, "reuse_rigid_obstacle_level_sets")
+            column.prop(aprops, "simplify_dense_obstacle_meshes")
         else:
             info_text = ""
             if aprops.threading_mode == 'THREADING_MODE_AUTO_DETECT':
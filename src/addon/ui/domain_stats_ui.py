@@ -70,6 +70,8 @@ def draw_frame_info_simulation_stats(self, context, box):
         column.label(text="Timeline Frame:")
         column.label(text="Timestep:")
         column.label(text="Substeps:")
+        if sprops.frame_substeps_avoided > 0:
+            column.label(text="Substeps Avoided:")
         column.label(text="Fluid Particles:")
         if sprops.display_frame_diffuse_particle_stats:
             column.label(text="Whitewater Particles:")
@@ -84,6 +86,8 @@ def draw_frame_info_simulation_stats(self, context, box):
         column.label(text=str(sprops.frame_start + sprops.frame_info_id))
         column.label(text=format_time(sprops.frame_delta_time))
         column.label(text=str(sprops.frame_substeps))
+        if sprops.frame_substeps_avoided > 0:
+            column.label(text=str(sprops.frame_substeps_avoided))
         column.label(text=format_number(sprops.frame_fluid_particles).lstrip())
         if sprops.display_frame_diffuse_particle_stats:
             column.label(text=format_number(sprops.frame_diffuse_particles).lstrip())
@@ -229,6 +229,15 @@ class FLIPFLUID_PT_DomainTypeFluidSurfacePanel(bpy.types.Panel):
             if sprops.particle_scale < 0.999:
                 row.alert = True
             row.prop(sprops, "particle_scale")
+
+            column = body.column(align=True)
+            column.prop(sprops, "enable_camera_lod")
+            column = column.column(align=True)
+            column.enabled = sprops.enable_camera_lod
+            column.prop(sprops, "camera_lod_object")
+            column.prop(sprops, "camera_lod_frustum_padding")
+            column.prop(sprops, "camera_lod_pixel_size")
+            column.prop(sprops, "camera_lod_max_level")
         else:
             info_text = "Subdivisions " + str(sprops.subdivisions) + "  /  "
             info_text += "Scale " + "{:.2f}".format(sprops.particle_scale)
@@ -202,6 +202,15 @@ class FLIPFLUID_PT_DomainTypeWhitewaterPanel(bpy.types.Panel):
             column = body.column(align=True)
             column.prop(wprops, "max_whitewater_particles")
 
+            column = body.column(align=True)
+            column.prop(wprops, "enable_camera_lod")
+            column = column.column(align=True)
+            column.enabled = wprops.enable_camera_lod
+            column.prop(wprops, "camera_lod_object")
+            column.prop(wprops, "camera_lod_frustum_padding")
+            if show_advanced_whitewater:
+                column.prop(wprops, "camera_lod_min_emission_factor")
+
             if show_advanced_whitewater:
                 column = body.column(align=True)
                 column.alert = highlight_advanced
@@ -14,7 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import hashlib
+import os, sys, time, select, hashlib, ctypes
 
 
 def string_to_cache_slug(string):
@@ -32,3 +32,173 @@ def string_to_cache_slug(string):
     slug += hexstr
 
     return slug
+
+
+# Append-only index of completed frames written to the bakefiles directory.
+# One frame number is written per line after all cache files for the frame
+# have been written so that consumers can follow bake progress by reading
+# only the newly appended bytes instead of listing the bakefiles directory.
+FINISHED_FRAMES_LOG_FILENAME = "finished_frames.txt"
+
+
+def get_finished_frames_log_filepath(bakefiles_directory):
+    return os.path.join(bakefiles_directory, FINISHED_FRAMES_LOG_FILENAME)
+
+
+def append_finished_frames_log(bakefiles_directory, frameno):
+    filepath = get_finished_frames_log_filepath(bakefiles_directory)
+    with open(filepath, 'a') as f:
+        f.write(str(frameno) + "\n")
+        f.flush()
+
+
+def truncate_finished_frames_log(bakefiles_directory, max_frameno):
+    filepath = get_finished_frames_log_filepath(bakefiles_directory)
+    if not os.path.isfile(filepath):
+        return
+
+    with open(filepath, 'r') as f:
+        lines = f.read().splitlines()
+
+    frames = []
+    for line in lines:
+        try:
+            frameno = int(line)
+        except ValueError:
+            continue
+        if frameno <= max_frameno:
+            frames.append(frameno)
+
+    temp_filepath = filepath + ".tmp"
+    with open(temp_filepath, 'w') as f:
+        f.write("".join([str(frameno) + "\n" for frameno in frames]))
+    os.replace(temp_filepath, filepath)
+
+
+class _InotifyWatch():
+    # Minimal ctypes wrapper around Linux inotify. Only used to wake up
+    # early when the bakefiles directory changes, callers always fall back
+    # to a timed poll since inotify does not see writes made by other hosts
+    # on network filesystems.
+    IN_MODIFY      = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO    = 0x00000080
+    IN_CREATE      = 0x00000100
+    IN_NONBLOCK    = 0x00000800
+
+    def __init__(self, directory):
+        self._fd = -1
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            libc = ctypes.CDLL("libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK)
+            if fd < 0:
+                return
+            mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), mask)
+            if wd < 0:
+                os.close(fd)
+                return
+            self._fd = fd
+        except (OSError, AttributeError):
+            self._fd = -1
+
+
+    def is_valid(self):
+        return self._fd >= 0
+
+
+    def wait(self, timeout):
+        if not self.is_valid():
+            time.sleep(timeout)
+            return
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            try:
+                # Drain pending events, only the wake-up matters
+                while os.read(self._fd, 4096):
+                    pass
+            except (BlockingIOError, OSError):
+                pass
+
+
+    def close(self):
+        if self.is_valid():
+            os.close(self._fd)
+            self._fd = -1
+
+
+class FinishedFramesLogReader():
+    def __init__(self, bakefiles_directory, poll_interval=2.0):
+        self.bakefiles_directory = bakefiles_directory
+        self.poll_interval = poll_interval
+        self.max_frame = -1
+        self._filepath = get_finished_frames_log_filepath(bakefiles_directory)
+        self._inode = None
+        self._offset = 0
+        self._partial_line = ""
+        self._watch = None
+
+
+    def read_new_frames(self):
+        # Returns the frame numbers appended to the log since the last call
+        try:
+            file_stat = os.stat(self._filepath)
+        except OSError:
+            return []
+
+        filesize = file_stat.st_size
+        if file_stat.st_ino != self._inode or filesize < self._offset:
+            # Log was rewritten (e.g. outdated frames removed when resuming
+            # from a savestate). Start over from the beginning.
+            self._offset = 0
+            self._partial_line = ""
+            self.max_frame = -1
+            self._inode = file_stat.st_ino
+
+        if filesize == self._offset:
+            return []
+
+        try:
+            with open(self._filepath, 'r') as f:
+                f.seek(self._offset)
+                data = f.read()
+                self._offset = f.tell()
+        except OSError:
+            return []
+
+        data = self._partial_line + data
+        lines = data.split("\n")
+        self._partial_line = lines.pop()
+
+        new_frames = []
+        for line in lines:
+            try:
+                frameno = int(line)
+            except ValueError:
+                continue
+            new_frames.append(frameno)
+            self.max_frame = max(self.max_frame, frameno)
+
+        return new_frames
+
+
+    def wait(self, timeout=None):
+        # Block until the bakefiles directory changes or the timeout expires
+        if timeout is None:
+            timeout = self.poll_interval
+
+        if self._watch is None:
+            if not os.path.isdir(self.bakefiles_directory):
+                time.sleep(timeout)
+                return
+            self._watch = _InotifyWatch(self.bakefiles_directory)
+
+        self._watch.wait(timeout)
+
+
+    def close(self):
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
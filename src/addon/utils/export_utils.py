@@ -427,6 +427,68 @@ def get_object_world_matrix_data_dict(obj):
         return {'is_animated' : False, 'data' : m}
 
 
+def get_camera_frustum_data_dict(camera):
+    scene = bpy.context.scene
+    render = scene.render
+    resolution = [int(render.resolution_x * render.resolution_percentage / 100),
+                  int(render.resolution_y * render.resolution_percentage / 100)]
+    view_frame = camera.data.view_frame(scene=scene)
+
+    if camera.parent is None and len(camera.constraints) == 0:
+        matrix_data = get_object_world_matrix_data_dict(camera)
+    else:
+        # Parented or constrained cameras can only be evaluated by the scene
+        dprops = scene.flip_fluid.get_domain_properties()
+        frame_start, frame_end = dprops.simulation.get_frame_range()
+        original_frame = scene.frame_current
+        matrices = []
+        for frameno in range(frame_start, frame_end + 1):
+            scene.frame_set(frameno)
+            matrices.append(camera.matrix_world.copy())
+        scene.frame_set(original_frame)
+        matrix_data = {'is_animated' : True, 'data' : matrices}
+
+    if matrix_data['is_animated']:
+        data = []
+        for m in matrix_data['data']:
+            data.append(get_camera_frustum_description(camera, m, view_frame, resolution))
+        return {'is_animated' : True, 'data' : data}
+    else:
+        m = matrix_data['data']
+        data = get_camera_frustum_description(camera, m, view_frame, resolution)
+        return {'is_animated' : False, 'data' : data}
+
+
+def get_camera_frustum_description(camera, matrix_world, view_frame, resolution):
+    mat3 = matrix_world.to_3x3()
+    position = matrix_world.to_translation()
+    right = vcu.element_multiply(mat3, Vector((1.0, 0.0, 0.0))).normalized()
+    up = vcu.element_multiply(mat3, Vector((0.0, 1.0, 0.0))).normalized()
+    forward = vcu.element_multiply(mat3, Vector((0.0, 0.0, -1.0))).normalized()
+    is_orthographic = camera.data.type == 'ORTHO'
+
+    # Frame extents are measured at unit depth for perspective cameras
+    # and in world units for orthographic cameras
+    xvals, yvals = [], []
+    for corner in view_frame:
+        d = vcu.element_multiply(matrix_world, corner) - position
+        x, y, z = d.dot(right), d.dot(up), d.dot(forward)
+        if not is_orthographic:
+            x, y = x / z, y / z
+        xvals.append(x)
+        yvals.append(y)
+
+    camera_data = {}
+    camera_data['position'] = list(position)
+    camera_data['right'] = list(right)
+    camera_data['up'] = list(up)
+    camera_data['forward'] = list(forward)
+    camera_data['frame_extents'] = [min(xvals), max(xvals), min(yvals), max(yvals)]
+    camera_data['resolution'] = resolution
+    camera_data['is_orthographic'] = is_orthographic
+    return camera_data
+
+
 def get_object_bbox_center(obj):
         local_bbox_center = 0.125 * sum((Vector(b) for b in obj.bound_box), Vector())
         global_bbox_center = vcu.element_multiply(obj.matrix_world, local_bbox_center)
@@ -0,0 +1,191 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os, numpy
+
+
+# Animated parameters are exported as {'is_animated': True, 'data': [...]} with
+# one value per frame. A parameter timeline moves the per-frame values of
+# animated numeric parameters out of the simulation data JSON and into typed
+# columns stored in a binary file. In the JSON, the parameter is replaced by
+# {'is_animated': True, 'timeline_id': column_index} and the column layout is
+# stored in data['parameter_timeline'].
+#
+# Each column holds one value per frame, or a fixed width vector of values per
+# frame. Only columns where every value has the same type (bool, int, or float)
+# are compiled so that loaded values have the same Python types as values read
+# from the JSON. Other animated parameters are left in the JSON.
+
+TIMELINE_VERSION = 1
+TIMELINE_KEY = 'parameter_timeline'
+
+__DTYPES = {
+    bool:  '|b1',
+    int:   '<i8',
+    float: '<f8',
+}
+
+
+class TimelineColumn():
+    def __init__(self, values):
+        self._values = values
+        self._is_vector = values.ndim > 1
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, frameno):
+        if self._is_vector:
+            return self._values[frameno].tolist()
+        return self._values[frameno].item()
+
+
+def get_timeline_filepath(data_filepath):
+    return os.path.splitext(data_filepath)[0] + ".timeline"
+
+
+def __get_value_type(values):
+    value_type = type(values[0])
+    if value_type not in __DTYPES:
+        return None
+    for v in values:
+        if type(v) is not value_type:
+            return None
+    return value_type
+
+
+def __get_column_layout(values):
+    if not isinstance(values, list) or not values:
+        return None
+
+    num_frames = len(values)
+    if not isinstance(values[0], (list, tuple)):
+        value_type = __get_value_type(values)
+        if value_type is None:
+            return None
+        return value_type, [num_frames]
+
+    width = len(values[0])
+    if width == 0:
+        return None
+    for v in values:
+        if not isinstance(v, (list, tuple)) or len(v) != width:
+            return None
+
+    value_type = __get_value_type([c for v in values for c in v])
+    if value_type is None:
+        return None
+    return value_type, [num_frames, width]
+
+
+def __compile_node(node, columns, chunks, offset):
+    if isinstance(node, list):
+        for element in node:
+            offset = __compile_node(element, columns, chunks, offset)
+        return offset
+
+    if not isinstance(node, dict):
+        return offset
+
+    if node.get('is_animated') is True and 'data' in node:
+        layout = __get_column_layout(node['data'])
+        if layout is not None:
+            value_type, shape = layout
+            dtype = __DTYPES[value_type]
+            chunk = numpy.asarray(node['data'], dtype=dtype).tobytes()
+            columns.append({'dtype': dtype, 'shape': shape, 'offset': offset})
+            chunks.append(chunk)
+
+            del node['data']
+            node['timeline_id'] = len(columns) - 1
+            return offset + len(chunk)
+
+    for value in node.values():
+        offset = __compile_node(value, columns, chunks, offset)
+    return offset
+
+
+def compile_parameter_timeline(data, timeline_filepath):
+    """
+    Move animated numeric parameters in the data dict into a timeline file. The
+    data dict is modified in place and references the timeline file by name.
+    Returns the number of compiled parameters.
+    """
+    columns = []
+    chunks = []
+    __compile_node(data, columns, chunks, 0)
+    if not columns:
+        return 0
+
+    os.makedirs(os.path.dirname(timeline_filepath), exist_ok=True)
+    with open(timeline_filepath, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+    data[TIMELINE_KEY] = {
+        'version': TIMELINE_VERSION,
+        'filename': os.path.basename(timeline_filepath),
+        'columns': columns,
+    }
+    return len(columns)
+
+
+def __resolve_node(node, columns):
+    if isinstance(node, list):
+        for element in node:
+            __resolve_node(element, columns)
+        return
+
+    if not isinstance(node, dict):
+        return
+
+    if node.get('is_animated') is True and 'timeline_id' in node:
+        node['data'] = columns[node.pop('timeline_id')]
+        return
+
+    for value in node.values():
+        __resolve_node(value, columns)
+
+
+def load_parameter_timeline(data, data_filepath):
+    """
+    Replace timeline references in data loaded from the simulation data JSON
+    with TimelineColumn objects. TimelineColumn values are indexed by frame in
+    the same way as the per-frame lists in the JSON. Data that does not contain
+    a parameter timeline is left unchanged.
+    """
+    timeline_info = data.pop(TIMELINE_KEY, None)
+    if timeline_info is None:
+        return
+
+    if timeline_info['version'] != TIMELINE_VERSION:
+        errmsg = ("Unsupported parameter timeline version <" + str(timeline_info['version']) +
+                  ">. Re-export the simulation data to continue.")
+        raise ValueError(errmsg)
+
+    timeline_filepath = os.path.join(os.path.dirname(data_filepath), timeline_info['filename'])
+    with open(timeline_filepath, 'rb') as f:
+        buffer = f.read()
+
+    columns = []
+    for info in timeline_info['columns']:
+        dtype = numpy.dtype(info['dtype'])
+        shape = tuple(info['shape'])
+        count = int(numpy.prod(shape))
+        values = numpy.frombuffer(buffer, dtype=dtype, count=count, offset=info['offset'])
+        columns.append(TimelineColumn(values.reshape(shape)))
+
+    __resolve_node(data, columns)
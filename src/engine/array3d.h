@@ -28,6 +28,7 @@ SOFTWARE.
 #include <sstream>
 #include <vector>
 #include <cmath>
+#include <utility>
 
 struct GridIndex {
     int i, j, k;
@@ -95,15 +96,21 @@ public:
         }
     }
 
-    Array3d operator=(const Array3d &rhs) {
-        delete[] _grid;
+    Array3d& operator=(const Array3d &rhs) {
+        if (this == &rhs) {
+            return *this;
+        }
 
         width = rhs.width;
         height = rhs.height;
         depth = rhs.depth;
-        _numElements = rhs._numElements;
 
-        _initializeGrid();
+        // Grid storage is reused if the number of elements is unchanged
+        if (rhs._numElements != _numElements) {
+            delete[] _grid;
+            _numElements = rhs._numElements;
+            _initializeGrid();
+        }
 
         for (int i = 0; i < _numElements; i++) {
             _grid[i] = rhs._grid[i];
@@ -121,6 +128,16 @@ public:
         delete[] _grid;
     }
 
+    void swap(Array3d &other) {
+        std::swap(width, other.width);
+        std::swap(height, other.height);
+        std::swap(depth, other.depth);
+        std::swap(_grid, other._grid);
+        std::swap(_isOutOfRangeValueSet, other._isOutOfRangeValueSet);
+        std::swap(_outOfRangeValue, other._outOfRangeValue);
+        std::swap(_numElements, other._numElements);
+    }
+
     void fill(T value) {
         for (int idx = 0; idx < _numElements; idx++) {
             _grid[idx] = value;
@@ -792,6 +809,6 @@ private:
     T *_grid;
 
     bool _isOutOfRangeValueSet = false;
-    T _outOfRangeValue;
+    T _outOfRangeValue = T();
     int _numElements = 0;
 };
@@ -63,6 +63,13 @@ public:
         _initialize(params);
     }
 
+    // Initializes the block data within the storage of data. The storage
+    // of this grid is swapped into data.
+    BlockArray3d(BlockArray3dParameters &params, std::vector<T> &data) {
+        _arraydata.swap(data);
+        _initialize(params);
+    }
+
     static Dims3d getBlockDimensions(BlockArray3dParameters &params) {
         return Dims3d((params.isize + params.blockwidth - 1) / params.blockwidth,
                       (params.jsize + params.blockwidth - 1) / params.blockwidth,
@@ -193,6 +200,12 @@ public:
         return _arraydata.size() / _blocksize;
     }
 
+    // Exchanges the block data storage with data so that the storage
+    // can be recycled after the grid is no longer needed
+    void swapData(std::vector<T> &data) {
+        _arraydata.swap(data);
+    }
+
     int width = 0;
     int height = 0;
     int depth = 0;
@@ -229,8 +242,8 @@ private:
         }
 
         _blocksize = blockwidth * blockwidth * blockwidth;
-        _arraydata = std::vector<T>(_blocksize * idcounter);
-        fill(T());
+        _arraydata.assign(_blocksize * idcounter, T());
+        setBackgroundValue(T());
     }
 
     bool _isIndexInRange(int i, int j, int k) {
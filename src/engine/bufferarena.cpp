@@ -0,0 +1,84 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#include "bufferarena.h"
+
+BufferArena::BufferArena() {
+}
+
+BufferArena::BufferArena(const BufferArena &) {
+}
+
+BufferArena& BufferArena::operator=(const BufferArena &other) {
+    if (this != &other) {
+        clear();
+        resetHighWaterMark();
+    }
+    return *this;
+}
+
+BufferArena::~BufferArena() {
+}
+
+void BufferArena::trim() {
+    std::lock_guard<std::mutex> lock(_mutex);
+    for (auto it = _pools.begin(); it != _pools.end(); ++it) {
+        _bytesCached -= it->second->trim();
+    }
+}
+
+void BufferArena::clear() {
+    std::lock_guard<std::mutex> lock(_mutex);
+    for (auto it = _pools.begin(); it != _pools.end(); ++it) {
+        _bytesCached -= it->second->clear();
+    }
+}
+
+void BufferArena::resetHighWaterMark() {
+    std::lock_guard<std::mutex> lock(_mutex);
+    _highWaterBytes = _bytesInUse + _bytesCached;
+    _buffersAcquired = 0;
+    _buffersReused = 0;
+}
+
+BufferArenaStats BufferArena::getStats() {
+    std::lock_guard<std::mutex> lock(_mutex);
+    BufferArenaStats stats;
+    stats.bytesInUse = _bytesInUse;
+    stats.bytesCached = _bytesCached;
+    stats.highWaterBytes = _highWaterBytes;
+    stats.buffersAcquired = _buffersAcquired;
+    stats.buffersReused = _buffersReused;
+    return stats;
+}
+
+void BufferArena::_addBytesInUse(long long bytes) {
+    std::lock_guard<std::mutex> lock(_mutex);
+    _bytesInUse += bytes;
+    _updateHighWaterMark();
+}
+
+void BufferArena::_updateHighWaterMark() {
+    _highWaterBytes = std::max(_highWaterBytes, _bytesInUse + _bytesCached);
+}
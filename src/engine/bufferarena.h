@@ -0,0 +1,256 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#pragma once
+
+#if __MINGW32__ && !_WIN64
+    #include <mutex>
+    #include "mingw32_threads/mingw.mutex.h"
+#else
+    #include <mutex>
+#endif
+
+#include <vector>
+#include <list>
+#include <map>
+#include <memory>
+#include <typeindex>
+#include <algorithm>
+
+#include "array3d.h"
+
+struct BufferArenaStats {
+    long long bytesInUse = 0;
+    long long bytesCached = 0;
+    long long highWaterBytes = 0;
+    int buffersAcquired = 0;
+    int buffersReused = 0;
+};
+
+/*
+    BufferArena recycles large transient buffers between simulation substeps.
+
+    A buffer is acquired at the start of a stage and released back into the
+    arena when the stage is done with it. Released buffers are cached and
+    handed out to later requests of a matching size instead of being freed and
+    allocated again, which avoids repeated page faults when the buffers are
+    very large.
+
+        std::vector<T>: a cached vector is reused if its capacity is at least
+                        the requested number of elements and no more than
+                        twice the requested number. Acquired vectors are empty.
+
+        Array3d<T>:     a cached grid is reused if it has the same dimensions.
+                        Acquired grid values are not initialized.
+
+    Copying an arena creates a new empty arena. Cached buffers are never shared.
+
+    trim() frees cached buffers that have not been released since the previous
+    call to trim(), and is intended to be called once per frame. The high
+    water mark is the peak number of bytes held by the arena (in use and
+    cached) since the last call to resetHighWaterMark().
+
+    Methods are thread safe.
+*/
+class BufferArena
+{
+public:
+    BufferArena();
+    BufferArena(const BufferArena &other);
+    BufferArena& operator=(const BufferArena &other);
+    ~BufferArena();
+
+    template <class T>
+    void acquire(size_t n, std::vector<T> &buffer) {
+        std::vector<T> cached;
+        {
+            std::lock_guard<std::mutex> lock(_mutex);
+            Pool<std::vector<T> > *pool = _getPool<std::vector<T> >();
+            auto best = pool->entries.end();
+            for (auto it = pool->entries.begin(); it != pool->entries.end(); ++it) {
+                size_t capacity = it->buffer.capacity();
+                if (capacity < n || capacity > 2 * n) {
+                    continue;
+                }
+                if (best == pool->entries.end() || capacity < best->buffer.capacity()) {
+                    best = it;
+                }
+            }
+
+            _buffersAcquired++;
+            if (best != pool->entries.end()) {
+                cached.swap(best->buffer);
+                _bytesCached -= best->bytes;
+                pool->entries.erase(best);
+                _buffersReused++;
+            }
+        }
+
+        if (cached.capacity() < n) {
+            // Extra capacity so that slowly growing requests (ex: particle
+            // counts) can continue to reuse the buffer
+            cached.reserve(n + n / 8);
+        }
+        cached.clear();
+
+        _addBytesInUse((long long)(cached.capacity() * sizeof(T)));
+        buffer.swap(cached);
+    }
+
+    template <class T>
+    void release(std::vector<T> &buffer) {
+        if (buffer.capacity() == 0) {
+            return;
+        }
+
+        long long bytes = (long long)(buffer.capacity() * sizeof(T));
+        std::lock_guard<std::mutex> lock(_mutex);
+        Pool<std::vector<T> > *pool = _getPool<std::vector<T> >();
+        pool->entries.emplace_back();
+        pool->entries.back().buffer.swap(buffer);
+        pool->entries.back().bytes = bytes;
+        _bytesInUse = std::max(_bytesInUse - bytes, 0LL);
+        _bytesCached += bytes;
+        _updateHighWaterMark();
+    }
+
+    template <class T>
+    void acquire(int isize, int jsize, int ksize, Array3d<T> &grid) {
+        Array3d<T> cached;
+        bool isCached = false;
+        {
+            std::lock_guard<std::mutex> lock(_mutex);
+            Pool<Array3d<T> > *pool = _getPool<Array3d<T> >();
+            for (auto it = pool->entries.begin(); it != pool->entries.end(); ++it) {
+                if (it->buffer.width == isize && it->buffer.height == jsize && it->buffer.depth == ksize) {
+                    cached.swap(it->buffer);
+                    _bytesCached -= it->bytes;
+                    pool->entries.erase(it);
+                    isCached = true;
+                    _buffersReused++;
+                    break;
+                }
+            }
+            _buffersAcquired++;
+        }
+
+        if (!isCached) {
+            Array3d<T> newGrid(isize, jsize, ksize);
+            cached.swap(newGrid);
+        }
+        cached.setOutOfRangeValue();
+
+        _addBytesInUse((long long)isize * (long long)jsize * (long long)ksize * (long long)sizeof(T));
+        grid.swap(cached);
+    }
+
+    template <class T>
+    void release(Array3d<T> &grid) {
+        long long bytes = (long long)grid.width * (long long)grid.height *
+                          (long long)grid.depth * (long long)sizeof(T);
+        if (bytes == 0) {
+            return;
+        }
+
+        std::lock_guard<std::mutex> lock(_mutex);
+        Pool<Array3d<T> > *pool = _getPool<Array3d<T> >();
+        pool->entries.emplace_back();
+        pool->entries.back().buffer.swap(grid);
+        pool->entries.back().bytes = bytes;
+        _bytesInUse = std::max(_bytesInUse - bytes, 0LL);
+        _bytesCached += bytes;
+        _updateHighWaterMark();
+    }
+
+    void trim();
+    void clear();
+    void resetHighWaterMark();
+    BufferArenaStats getStats();
+
+private:
+
+    class PoolBase {
+    public:
+        virtual ~PoolBase() {}
+        virtual long long trim() = 0;
+        virtual long long clear() = 0;
+    };
+
+    template <class Buffer>
+    class Pool : public PoolBase {
+    public:
+        struct Entry {
+            Buffer buffer;
+            long long bytes = 0;
+            bool isReleasedSinceTrim = true;
+        };
+
+        long long trim() {
+            long long bytesFreed = 0;
+            for (auto it = entries.begin(); it != entries.end();) {
+                if (it->isReleasedSinceTrim) {
+                    it->isReleasedSinceTrim = false;
+                    ++it;
+                } else {
+                    bytesFreed += it->bytes;
+                    it = entries.erase(it);
+                }
+            }
+            return bytesFreed;
+        }
+
+        long long clear() {
+            long long bytesFreed = 0;
+            for (auto it = entries.begin(); it != entries.end(); ++it) {
+                bytesFreed += it->bytes;
+            }
+            entries.clear();
+            return bytesFreed;
+        }
+
+        // A list is used so that cached buffers are never copied
+        std::list<Entry> entries;
+    };
+
+    template <class Buffer>
+    Pool<Buffer>* _getPool() {
+        std::unique_ptr<PoolBase> &pool = _pools[std::type_index(typeid(Buffer))];
+        if (!pool) {
+            pool.reset(new Pool<Buffer>());
+        }
+        return static_cast<Pool<Buffer>*>(pool.get());
+    }
+
+    void _addBytesInUse(long long bytes);
+    void _updateHighWaterMark();
+
+    std::mutex _mutex;
+    std::map<std::type_index, std::unique_ptr<PoolBase> > _pools;
+
+    long long _bytesInUse = 0;
+    long long _bytesCached = 0;
+    long long _highWaterBytes = 0;
+    int _buffersAcquired = 0;
+    int _buffersReused = 0;
+};
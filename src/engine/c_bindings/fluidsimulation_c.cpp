@@ -330,6 +330,90 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_set_pressure_solver_preconditioner_MIC(FluidSimulation* obj,
+                                                                          int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::setPressureSolverPreconditionerMIC, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_pressure_solver_preconditioner_multigrid(FluidSimulation* obj,
+                                                                                int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::setPressureSolverPreconditionerMultigrid, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_pressure_solver_preconditioner_parallel_MIC(FluidSimulation* obj,
+                                                                                   int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::setPressureSolverPreconditionerParallelMIC, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_pressure_solver_preconditioner_MIC(FluidSimulation* obj,
+                                                                        int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isPressureSolverPreconditionerMIC, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_pressure_solver_preconditioner_multigrid(FluidSimulation* obj,
+                                                                              int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isPressureSolverPreconditionerMultigrid, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_pressure_solver_preconditioner_parallel_MIC(FluidSimulation* obj,
+                                                                                 int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isPressureSolverPreconditionerParallelMIC, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_enable_pressure_solver_warm_start(FluidSimulation* obj,
+                                                                     int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enablePressureSolverWarmStart, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_pressure_solver_warm_start(FluidSimulation* obj,
+                                                                      int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disablePressureSolverWarmStart, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_pressure_solver_warm_start_enabled(FluidSimulation* obj,
+                                                                        int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isPressureSolverWarmStartEnabled, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_enable_matrix_free_pressure_solver(FluidSimulation* obj,
+                                                                      int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableMatrixFreePressureSolver, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_matrix_free_pressure_solver(FluidSimulation* obj,
+                                                                       int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableMatrixFreePressureSolver, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_matrix_free_pressure_solver_enabled(FluidSimulation* obj,
+                                                                         int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isMatrixFreePressureSolverEnabled, err
+        );
+    }
+
     EXPORTDLL int FluidSimulation_get_viscosity_solver_max_iterations(FluidSimulation* obj, 
                                                                       int *err) {
         return CBindings::safe_execute_method_ret_0param(
@@ -345,6 +429,27 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_enable_matrix_free_viscosity_solver(FluidSimulation* obj,
+                                                                       int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableMatrixFreeViscositySolver, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_matrix_free_viscosity_solver(FluidSimulation* obj,
+                                                                        int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableMatrixFreeViscositySolver, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_matrix_free_viscosity_solver_enabled(FluidSimulation* obj,
+                                                                          int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isMatrixFreeViscositySolverEnabled, err
+        );
+    }
+
     EXPORTDLL void FluidSimulation_enable_fluid_particle_output(FluidSimulation* obj,
                                                                 int *err) {
         CBindings::safe_execute_method_void_0param(
@@ -486,6 +591,87 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_enable_surface_camera_lod(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableSurfaceCameraLOD, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_surface_camera_lod(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableSurfaceCameraLOD, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_surface_camera_lod_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isSurfaceCameraLODEnabled, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_surface_camera(FluidSimulation* obj,
+                                                      Vector3_t position,
+                                                      Vector3_t right,
+                                                      Vector3_t up,
+                                                      Vector3_t forward,
+                                                      double frame_left, double frame_right,
+                                                      double frame_bottom, double frame_top,
+                                                      int resolution_x, int resolution_y,
+                                                      int is_orthographic,
+                                                      int *err) {
+        CameraFrustum camera(CBindings::to_class(position),
+                             CBindings::to_class(right),
+                             CBindings::to_class(up),
+                             CBindings::to_class(forward),
+                             frame_left, frame_right, frame_bottom, frame_top,
+                             resolution_x, resolution_y, (bool)is_orthographic);
+        CBindings::safe_execute_method_void_1param(
+            obj, &FluidSimulation::setSurfaceCamera, camera, err
+        );
+    }
+
+    EXPORTDLL double FluidSimulation_get_surface_camera_frustum_padding(FluidSimulation* obj,
+                                                                        int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::getSurfaceCameraFrustumPadding, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_surface_camera_frustum_padding(FluidSimulation* obj,
+                                                                      double padding, int *err) {
+        CBindings::safe_execute_method_void_1param(
+            obj, &FluidSimulation::setSurfaceCameraFrustumPadding, padding, err
+        );
+    }
+
+    EXPORTDLL double FluidSimulation_get_surface_camera_lod_pixel_size(FluidSimulation* obj,
+                                                                       int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::getSurfaceCameraLODPixelSize, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_surface_camera_lod_pixel_size(FluidSimulation* obj,
+                                                                     double size, int *err) {
+        CBindings::safe_execute_method_void_1param(
+            obj, &FluidSimulation::setSurfaceCameraLODPixelSize, size, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_get_surface_camera_lod_max_level(FluidSimulation* obj,
+                                                                   int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::getSurfaceCameraLODMaxLevel, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_surface_camera_lod_max_level(FluidSimulation* obj,
+                                                                    int level, int *err) {
+        CBindings::safe_execute_method_void_1param(
+            obj, &FluidSimulation::setSurfaceCameraLODMaxLevel, level, err
+        );
+    }
+
     EXPORTDLL double FluidSimulation_get_surface_smoothing_value(FluidSimulation* obj, 
                                                                  int *err) {
         return CBindings::safe_execute_method_ret_0param(
@@ -1890,6 +2076,73 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_enable_whitewater_camera_lod(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableWhitewaterCameraLOD, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_whitewater_camera_lod(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableWhitewaterCameraLOD, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_whitewater_camera_lod_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isWhitewaterCameraLODEnabled, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_whitewater_camera(FluidSimulation* obj,
+                                                         Vector3_t position,
+                                                         Vector3_t right,
+                                                         Vector3_t up,
+                                                         Vector3_t forward,
+                                                         double frame_left, double frame_right,
+                                                         double frame_bottom, double frame_top,
+                                                         int resolution_x, int resolution_y,
+                                                         int is_orthographic,
+                                                         int *err) {
+        CameraFrustum camera(CBindings::to_class(position),
+                             CBindings::to_class(right),
+                             CBindings::to_class(up),
+                             CBindings::to_class(forward),
+                             frame_left, frame_right, frame_bottom, frame_top,
+                             resolution_x, resolution_y, (bool)is_orthographic);
+        CBindings::safe_execute_method_void_1param(
+            obj, &FluidSimulation::setWhitewaterCamera, camera, err
+        );
+    }
+
+    EXPORTDLL double FluidSimulation_get_whitewater_camera_frustum_padding(FluidSimulation* obj,
+                                                                           int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::getWhitewaterCameraFrustumPadding, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_whitewater_camera_frustum_padding(FluidSimulation* obj,
+                                                                         double padding, int *err) {
+        CBindings::safe_execute_method_void_1param(
+            obj, &FluidSimulation::setWhitewaterCameraFrustumPadding, padding, err
+        );
+    }
+
+    EXPORTDLL double FluidSimulation_get_whitewater_camera_lod_min_factor(FluidSimulation* obj,
+                                                                          int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::getWhitewaterCameraLODMinFactor, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_whitewater_camera_lod_min_factor(FluidSimulation* obj,
+                                                                        double factor, int *err) {
+        CBindings::safe_execute_method_void_1param(
+            obj, &FluidSimulation::setWhitewaterCameraLODMinFactor, factor, err
+        );
+    }
+
     EXPORTDLL double FluidSimulation_get_min_diffuse_particle_lifetime(FluidSimulation* obj,
                                                                        int *err) {
         return CBindings::safe_execute_method_ret_0param(
@@ -2970,6 +3223,27 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_enable_adaptive_substepping(FluidSimulation* obj,
+                                                               int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableAdaptiveSubstepping, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_adaptive_substepping(FluidSimulation* obj,
+                                                                int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableAdaptiveSubstepping, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_adaptive_substepping_enabled(FluidSimulation* obj,
+                                                                  int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isAdaptiveSubsteppingEnabled, err
+        );
+    }
+
     EXPORTDLL void FluidSimulation_set_velocity_transfer_method_FLIP(FluidSimulation* obj,
                                                                      int *err) {
         CBindings::safe_execute_method_void_0param(
@@ -3044,6 +3318,60 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_enable_sparse_liquid_level_set(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableSparseLiquidLevelSet, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_sparse_liquid_level_set(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableSparseLiquidLevelSet, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_sparse_liquid_level_set_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isSparseLiquidLevelSetEnabled, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_enable_marker_particle_sorting(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableMarkerParticleSorting, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_marker_particle_sorting(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableMarkerParticleSorting, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_marker_particle_sorting_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isMarkerParticleSortingEnabled, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_enable_compact_particle_attributes(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableCompactParticleAttributes, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_compact_particle_attributes(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableCompactParticleAttributes, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_compact_particle_attributes_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isCompactParticleAttributesEnabled, err
+        );
+    }
+
     EXPORTDLL void FluidSimulation_enable_static_solid_levelset_precomputation(FluidSimulation* obj,
                                                                                int *err) {
         CBindings::safe_execute_method_void_0param(
@@ -3086,6 +3414,42 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_enable_rigid_obstacle_levelset_reuse(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableRigidObstacleLevelSetReuse, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_rigid_obstacle_levelset_reuse(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableRigidObstacleLevelSetReuse, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_rigid_obstacle_levelset_reuse_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isRigidObstacleLevelSetReuseEnabled, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_enable_obstacle_mesh_decimation(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableObstacleMeshDecimation, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_obstacle_mesh_decimation(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableObstacleMeshDecimation, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_obstacle_mesh_decimation_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isObstacleMeshDecimationEnabled, err
+        );
+    }
+
 
     EXPORTDLL void FluidSimulation_add_mesh_fluid_source(FluidSimulation* obj, 
                                                          MeshFluidSource *source,
@@ -4956,4 +5320,55 @@ extern "C" {
             obj, &FluidSimulation::loadDiffuseParticleData, data, err
         );
     }
+
+    EXPORTDLL int FluidSimulation_get_parameter_block_version(FluidSimulation* obj, 
+                                                              int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::getParameterBlockVersion, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_get_parameter_block_id(FluidSimulation* obj, 
+                                                         char *name,
+                                                         int *err) {
+        std::string namestr(name);
+        return CBindings::safe_execute_method_ret_1param(
+            obj, &FluidSimulation::getParameterBlockID, namestr, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_get_parameter_block_values(FluidSimulation* obj, 
+                                                              int *ids,
+                                                              int num_parameters,
+                                                              double *values,
+                                                              int *err) {
+        *err = CBindings::SUCCESS;
+        try {
+            std::vector<int> idvect(ids, ids + num_parameters);
+            std::vector<double> valuevect = obj->getParameterBlockValues(idvect);
+            for (size_t i = 0; i < valuevect.size(); i++) {
+                values[i] = valuevect[i];
+            }
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+    }
+
+    EXPORTDLL void FluidSimulation_apply_parameter_block(FluidSimulation* obj, 
+                                                         int version,
+                                                         int *ids,
+                                                         double *values,
+                                                         int num_parameters,
+                                                         int *err) {
+        *err = CBindings::SUCCESS;
+        try {
+            std::vector<int> idvect(ids, ids + num_parameters);
+            std::vector<double> valuevect(values, values + num_parameters);
+            obj->applyParameterBlock(version, idvect, valuevect);
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+    }
 }
@@ -0,0 +1,122 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#include "camerafrustum.h"
+
+#include <limits>
+
+CameraFrustum::CameraFrustum() {
+}
+
+CameraFrustum::CameraFrustum(vmath::vec3 position, 
+                             vmath::vec3 right, vmath::vec3 up, vmath::vec3 forward,
+                             double frameLeft, double frameRight, 
+                             double frameBottom, double frameTop,
+                             int resolutionX, int resolutionY, 
+                             bool isOrthographic) : 
+                                _position(position),
+                                _right(vmath::normalize(right)),
+                                _up(vmath::normalize(up)),
+                                _forward(vmath::normalize(forward)),
+                                _frameLeft(fmin(frameLeft, frameRight)),
+                                _frameRight(fmax(frameLeft, frameRight)),
+                                _frameBottom(fmin(frameBottom, frameTop)),
+                                _frameTop(fmax(frameBottom, frameTop)),
+                                _resolutionX(resolutionX),
+                                _resolutionY(resolutionY),
+                                _isOrthographic(isOrthographic) {
+}
+
+CameraFrustum::~CameraFrustum() {
+}
+
+bool CameraFrustum::isEmpty() {
+    return _resolutionX <= 0 || _resolutionY <= 0 || 
+           _frameRight - _frameLeft <= 0.0 || _frameTop - _frameBottom <= 0.0;
+}
+
+bool CameraFrustum::isOrthographic() {
+    return _isOrthographic;
+}
+
+vmath::vec3 CameraFrustum::getPosition() {
+    return _position;
+}
+
+vmath::vec3 CameraFrustum::getForward() {
+    return _forward;
+}
+
+int CameraFrustum::getResolutionX() {
+    return _resolutionX;
+}
+
+int CameraFrustum::getResolutionY() {
+    return _resolutionY;
+}
+
+double CameraFrustum::getDepth(vmath::vec3 p) {
+    return vmath::dot(p - _position, _forward);
+}
+
+bool CameraFrustum::isPointInside(vmath::vec3 p, double padding) {
+    if (isEmpty()) {
+        return false;
+    }
+
+    vmath::vec3 d = p - _position;
+    double z = vmath::dot(d, _forward);
+    double x = vmath::dot(d, _right);
+    double y = vmath::dot(d, _up);
+    if (!_isOrthographic) {
+        if (z <= 0.0) {
+            return false;
+        }
+        x /= z;
+        y /= z;
+    }
+
+    double padx = padding * (_frameRight - _frameLeft);
+    double pady = padding * (_frameTop - _frameBottom);
+    return x >= _frameLeft - padx && x <= _frameRight + padx &&
+           y >= _frameBottom - pady && y <= _frameTop + pady;
+}
+
+double CameraFrustum::getPixelSize(vmath::vec3 p) {
+    if (isEmpty()) {
+        return std::numeric_limits<double>::infinity();
+    }
+
+    double width = (_frameRight - _frameLeft) / (double)_resolutionX;
+    if (_isOrthographic) {
+        return width;
+    }
+
+    double z = getDepth(p);
+    if (z <= 0.0) {
+        return std::numeric_limits<double>::infinity();
+    }
+
+    return width * z;
+}
@@ -0,0 +1,80 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#pragma once
+
+#include "vmath.h"
+
+/*
+    Description of a render camera used to estimate how large simulation 
+    features appear in the final image. The camera is described by its 
+    position, an orthonormal basis and the extents of the image frame. For
+    perspective cameras the frame extents are measured on the plane at unit 
+    distance in front of the camera, for orthographic cameras they are 
+    measured in world units.
+*/
+class CameraFrustum
+{
+public:
+    CameraFrustum();
+    CameraFrustum(vmath::vec3 position, 
+                  vmath::vec3 right, vmath::vec3 up, vmath::vec3 forward,
+                  double frameLeft, double frameRight, 
+                  double frameBottom, double frameTop,
+                  int resolutionX, int resolutionY, 
+                  bool isOrthographic);
+    ~CameraFrustum();
+
+    bool isEmpty();
+    bool isOrthographic();
+    vmath::vec3 getPosition();
+    vmath::vec3 getForward();
+    int getResolutionX();
+    int getResolutionY();
+
+    // Distance from the camera along the viewing direction
+    double getDepth(vmath::vec3 p);
+
+    // Returns true if p projects into the image frame. The frame is expanded
+    // on each side by padding times the frame width and height.
+    bool isPointInside(vmath::vec3 p, double padding = 0.0);
+
+    // Width of a single pixel in world units at the depth of p. Returns 
+    // infinity for points behind a perspective camera.
+    double getPixelSize(vmath::vec3 p);
+
+private:
+
+    vmath::vec3 _position;
+    vmath::vec3 _right;
+    vmath::vec3 _up;
+    vmath::vec3 _forward;
+    double _frameLeft = 0.0;
+    double _frameRight = 0.0;
+    double _frameBottom = 0.0;
+    double _frameTop = 0.0;
+    int _resolutionX = 0;
+    int _resolutionY = 0;
+    bool _isOrthographic = false;
+};
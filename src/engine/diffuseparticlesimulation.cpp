@@ -84,6 +84,8 @@ void DiffuseParticleSimulation::update(DiffuseParticleSimulationParameters param
         std::vector<DiffuseParticleEmitter> normalEmitters;
         std::vector<DiffuseParticleEmitter> dustEmitters;
         _getDiffuseParticleEmitters(normalEmitters, dustEmitters);
+        _updateEmitterCameraLODFactors(normalEmitters);
+        _updateEmitterCameraLODFactors(dustEmitters);
         _emitNormalDiffuseParticles(normalEmitters, params.deltaTime);
         _emitDustDiffuseParticles(dustEmitters, params.deltaTime);
     }
@@ -629,6 +631,44 @@ void DiffuseParticleSimulation::setDiffuseOpenBoundaryWidth(int width) {
     _openBoundaryWidth = width;
 }
 
+void DiffuseParticleSimulation::enableCameraLOD() {
+    _isCameraLODEnabled = true;
+}
+
+void DiffuseParticleSimulation::disableCameraLOD() {
+    _isCameraLODEnabled = false;
+}
+
+bool DiffuseParticleSimulation::isCameraLODEnabled() {
+    return _isCameraLODEnabled;
+}
+
+void DiffuseParticleSimulation::setCamera(CameraFrustum camera) {
+    _camera = camera;
+}
+
+CameraFrustum DiffuseParticleSimulation::getCamera() {
+    return _camera;
+}
+
+double DiffuseParticleSimulation::getCameraFrustumPadding() {
+    return _cameraFrustumPadding;
+}
+
+void DiffuseParticleSimulation::setCameraFrustumPadding(double padding) {
+    FLUIDSIM_ASSERT(padding >= 0.0);
+    _cameraFrustumPadding = padding;
+}
+
+double DiffuseParticleSimulation::getCameraLODMinFactor() {
+    return _cameraLODMinFactor;
+}
+
+void DiffuseParticleSimulation::setCameraLODMinFactor(double factor) {
+    FLUIDSIM_ASSERT(factor >= 0.0 && factor <= 1.0);
+    _cameraLODMinFactor = factor;
+}
+
 void DiffuseParticleSimulation::setDomainOffset(vmath::vec3 offset) {
     _domainOffset = offset;
 }
@@ -656,11 +696,10 @@ void DiffuseParticleSimulation::getDiffuseParticleFileDataWWP(std::vector<char>
     _diffuseParticles.getAttributeValues("POSITION", particlePositions);
     _diffuseParticles.getAttributeValues("ID", particleIds);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < particlePositions->size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             positions.push_back(particlePositions->at(i) * _domainScale + _domainOffset);
@@ -689,11 +728,10 @@ void DiffuseParticleSimulation::getFoamParticleFileDataWWP(std::vector<char> &da
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (int i = 0; i < (int)_diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::foam) {
@@ -726,11 +764,10 @@ void DiffuseParticleSimulation::getBubbleParticleFileDataWWP(std::vector<char> &
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::bubble) {
@@ -764,11 +801,10 @@ void DiffuseParticleSimulation::getSprayParticleFileDataWWP(std::vector<char> &d
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::spray) {
@@ -801,11 +837,10 @@ void DiffuseParticleSimulation::getDustParticleFileDataWWP(std::vector<char> &da
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::dust) {
@@ -838,11 +873,10 @@ void DiffuseParticleSimulation::getFoamParticleBlurFileDataWWP(std::vector<char>
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::foam) {
@@ -879,11 +913,10 @@ void DiffuseParticleSimulation::getBubbleParticleBlurFileDataWWP(std::vector<cha
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::bubble) {
@@ -920,11 +953,10 @@ void DiffuseParticleSimulation::getSprayParticleBlurFileDataWWP(std::vector<char
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::spray) {
@@ -961,11 +993,10 @@ void DiffuseParticleSimulation::getDustParticleBlurFileDataWWP(std::vector<char>
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::dust) {
@@ -1004,11 +1035,10 @@ void DiffuseParticleSimulation::getFoamParticleVelocityAttributeFileDataWWP(std:
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::foam) {
@@ -1045,11 +1075,10 @@ void DiffuseParticleSimulation::getBubbleParticleVelocityAttributeFileDataWWP(st
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::bubble) {
@@ -1086,11 +1115,10 @@ void DiffuseParticleSimulation::getSprayParticleVelocityAttributeFileDataWWP(std
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::spray) {
@@ -1127,11 +1155,10 @@ void DiffuseParticleSimulation::getDustParticleVelocityAttributeFileDataWWP(std:
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::dust) {
@@ -1166,11 +1193,10 @@ void DiffuseParticleSimulation::getFoamParticleIDAttributeFileDataWWI(std::vecto
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::foam) {
@@ -1205,11 +1231,10 @@ void DiffuseParticleSimulation::getBubbleParticleIDAttributeFileDataWWI(std::vec
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::bubble) {
@@ -1244,11 +1269,10 @@ void DiffuseParticleSimulation::getSprayParticleIDAttributeFileDataWWI(std::vect
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::spray) {
@@ -1283,11 +1307,10 @@ void DiffuseParticleSimulation::getDustParticleIDAttributeFileDataWWI(std::vecto
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::dust) {
@@ -1324,11 +1347,10 @@ void DiffuseParticleSimulation::getFoamParticleLifetimeAttributeFileDataWWF(std:
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::foam) {
@@ -1365,11 +1387,10 @@ void DiffuseParticleSimulation::getBubbleParticleLifetimeAttributeFileDataWWF(st
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::bubble) {
@@ -1406,11 +1427,10 @@ void DiffuseParticleSimulation::getSprayParticleLifetimeAttributeFileDataWWF(std
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::spray) {
@@ -1447,11 +1467,10 @@ void DiffuseParticleSimulation::getDustParticleLifetimeAttributeFileDataWWF(std:
     _diffuseParticles.getAttributeValues("ID", particleIds);
     _diffuseParticles.getAttributeValues("TYPE", particleTypes);
 
-    if (_isMeshingVolumeSet) {
-        std::vector<bool> isSolid;
-        _meshingVolumeSDF->trilinearInterpolateSolidPoints(*particlePositions, isSolid);
+    std::vector<bool> isCulled;
+    if (_getCulledOutputParticles(*particlePositions, isCulled)) {
         for (size_t i = 0; i < _diffuseParticles.size(); i++) {
-            if (isSolid[i]) {
+            if (isCulled[i]) {
                 continue;
             }
             if ((DiffuseParticleType)particleTypes->at(i) == DiffuseParticleType::dust) {
@@ -1545,9 +1564,12 @@ void DiffuseParticleSimulation::_trilinearInterpolateThread(int startidx, int en
                                                             std::vector<vmath::vec3> *input, 
                                                             MACVelocityField *vfield, 
                                                             std::vector<vmath::vec3> *output) {
-    for (int i = startidx; i < endidx; i++) {
-        (*output)[i] = vfield->evaluateVelocityAtPositionLinear(input->at(i));
+    if (startidx >= endidx) {
+        return;
     }
+
+    vfield->evaluateVelocityAtPositionsLinear(input->data() + startidx, endidx - startidx, 
+                                              output->data() + startidx);
 }
 
 double DiffuseParticleSimulation::_getParticleJitter() {
@@ -1859,6 +1881,72 @@ void DiffuseParticleSimulation::
     }
 }
 
+bool DiffuseParticleSimulation::_isCameraLODActive() {
+    return _isCameraLODEnabled && !_camera.isEmpty();
+}
+
+double DiffuseParticleSimulation::_getCameraLODFactor(vmath::vec3 p) {
+    vmath::vec3 worldp = p * _domainScale + _domainOffset;
+    if (!_camera.isPointInside(worldp, _cameraFrustumPadding)) {
+        return _cameraLODMinFactor;
+    }
+
+    // Particles emitted within a cell that covers less than the full detail 
+    // size on screen are merged into fewer pixels, so the number of 
+    // particles needed scales with the projected area of the cell.
+    double cellSize = _dx * _domainScale;
+    double cellPixels = cellSize / _camera.getPixelSize(worldp);
+    double r = cellPixels / _cameraLODFullDetailCellSize;
+    double factor = fmin(r * r, 1.0);
+
+    return fmax(factor, _cameraLODMinFactor);
+}
+
+void DiffuseParticleSimulation::
+        _updateEmitterCameraLODFactors(std::vector<DiffuseParticleEmitter> &emitters) {
+    if (!_isCameraLODActive()) {
+        return;
+    }
+
+    ThreadUtils::parallelFor(0, (int)emitters.size(), [&](int startidx, int endidx) {
+        _updateEmitterCameraLODFactorsThread(startidx, endidx, &emitters);
+    });
+}
+
+void DiffuseParticleSimulation::
+        _updateEmitterCameraLODFactorsThread(int startidx, int endidx,
+                                             std::vector<DiffuseParticleEmitter> *emitters) {
+    for (int i = startidx; i < endidx; i++) {
+        DiffuseParticleEmitter *em = &(emitters->at(i));
+        em->lodFactor = _getCameraLODFactor(em->position);
+    }
+}
+
+bool DiffuseParticleSimulation::_getCulledOutputParticles(std::vector<vmath::vec3> &positions, 
+                                                          std::vector<bool> &isCulled) {
+    bool isCameraCulling = _isCameraLODActive();
+    if (!_isMeshingVolumeSet && !isCameraCulling) {
+        return false;
+    }
+
+    if (_isMeshingVolumeSet) {
+        _meshingVolumeSDF->trilinearInterpolateSolidPoints(positions, isCulled);
+    } else {
+        isCulled = std::vector<bool>(positions.size(), false);
+    }
+
+    if (isCameraCulling) {
+        for (size_t i = 0; i < positions.size(); i++) {
+            vmath::vec3 worldp = positions[i] * _domainScale + _domainOffset;
+            if (!_camera.isPointInside(worldp, _cameraFrustumPadding)) {
+                isCulled[i] = true;
+            }
+        }
+    }
+
+    return true;
+}
+
 void DiffuseParticleSimulation::_addNewDiffuseParticles(std::vector<DiffuseParticle> &newDiffuseParticles) {
     DiffuseParticleAttributes atts = _getDiffuseParticleAttributes();
     for (size_t i = 0; i < newDiffuseParticles.size(); i++) {
@@ -1880,6 +1968,12 @@ void DiffuseParticleSimulation::_emitNormalDiffuseParticles(std::vector<DiffuseP
             return;
         }
 
+        // Emitters with a reduced level of detail may only use their share 
+        // of the particle budget
+        if (_diffuseParticles.size() >= emitters[i].lodFactor * _maxNumDiffuseParticles) {
+            continue;
+        }
+
         _emitDiffuseParticles(emitters[i], dt, newdps);
     }
 
@@ -1894,6 +1988,12 @@ void DiffuseParticleSimulation::_emitDustDiffuseParticles(std::vector<DiffusePar
             return;
         }
 
+        // Emitters with a reduced level of detail may only use their share 
+        // of the particle budget
+        if (_diffuseParticles.size() >= emitters[i].lodFactor * _maxNumDiffuseParticles) {
+            continue;
+        }
+
         _emitDiffuseParticles(emitters[i], dt, newdps);
     }
 
@@ -1997,6 +2097,13 @@ int DiffuseParticleSimulation::
         return 0;
     }
 
+    if (emitter.lodFactor < 1.0) {
+        // Randomized rounding so that the expected number of emitted particles
+        // is preserved when the reduced count is only a fraction of a particle
+        n *= emitter.lodFactor;
+        return (int)(n + _randomDouble(0.0, 1.0));
+    }
+
     return (int)(n + 0.5);
 }
 
@@ -38,6 +38,7 @@ SOFTWARE.
 #include "turbulencefield.h"
 #include "particlesystem.h"
 #include "diffuseparticle.h"
+#include "camerafrustum.h"
 
 struct MarkerParticle;
 enum class DiffuseParticleType : char;
@@ -248,6 +249,23 @@ public:
 
     void setDiffuseOpenBoundaryWidth(int width);
 
+    /*
+        Camera level of detail. When enabled, emission and the share of the 
+        particle budget available to an emitter are scaled by how large a 
+        grid cell appears in the image at the emitter position, and particles 
+        outside of the padded camera frustum are left out of the output 
+        files. The camera is described in world space.
+    */
+    void enableCameraLOD();
+    void disableCameraLOD();
+    bool isCameraLODEnabled();
+    void setCamera(CameraFrustum camera);
+    CameraFrustum getCamera();
+    double getCameraFrustumPadding();
+    void setCameraFrustumPadding(double padding);
+    double getCameraLODMinFactor();
+    void setCameraLODMinFactor(double factor);
+
     void setDomainOffset(vmath::vec3 offset);
     vmath::vec3 getDomainOffset();
     void setDomainScale(double scale);
@@ -285,6 +303,7 @@ private:
         double wavecrestPotential;
         double turbulencePotential;
         double dustPotential;
+        double lodFactor = 1.0;
 
         DiffuseParticleEmitter() : energyPotential(0.0),
                                    wavecrestPotential(0.0),
@@ -347,6 +366,13 @@ private:
     void _getDiffuseDustParticleEmitters(std::vector<vmath::vec3> &particles, 
                                          std::vector<DiffuseParticleEmitter> &dustEmitters);
     void _shuffleDiffuseParticleEmitters(std::vector<DiffuseParticleEmitter> &emitters);
+    bool _isCameraLODActive();
+    double _getCameraLODFactor(vmath::vec3 p);
+    void _updateEmitterCameraLODFactors(std::vector<DiffuseParticleEmitter> &emitters);
+    void _updateEmitterCameraLODFactorsThread(int startidx, int endidx,
+                                              std::vector<DiffuseParticleEmitter> *emitters);
+    bool _getCulledOutputParticles(std::vector<vmath::vec3> &positions, 
+                                   std::vector<bool> &isCulled);
 
     void _addNewDiffuseParticles(std::vector<DiffuseParticle> &newDiffuseParticles);
     void _emitNormalDiffuseParticles(std::vector<DiffuseParticleEmitter> &emitters, double dt);
@@ -517,6 +543,12 @@ private:
     std::vector<bool> _dustBoundaryCollisions{true, true, true, true, true, true};
     int _openBoundaryWidth = 2;    // in # of voxels
 
+    bool _isCameraLODEnabled = false;
+    CameraFrustum _camera;
+    double _cameraFrustumPadding = 0.1;      // fraction of the image width and height
+    double _cameraLODMinFactor = 0.05;
+    double _cameraLODFullDetailCellSize = 1.0; // in pixels
+
     ParticleSystem *_markerParticles;
     MACVelocityField *_vfield;
     ParticleLevelSet *_liquidSDF;
@@ -26,6 +26,7 @@ from .fluidsimulation import FluidSimulation, MarkerParticle_t, DiffuseParticle_
 from .meshobject import MeshObject
 from .meshfluidsource import MeshFluidSource
 from .forcefieldgrid import ForceFieldGrid
+from .parameterblock import ParameterBlock
 from .forcefield import ForceField
 from .forcefieldpoint import ForceFieldPoint
 from .forcefieldsurface import ForceFieldSurface
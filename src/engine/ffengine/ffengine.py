@@ -54,7 +54,11 @@ class FFEngineLib():
         if self.__dict__['_lib'] is None:
             self._lib = self._load_library("ffengine")
 
-        return getattr(self._lib, name)
+        # Cache the resolved function on the instance so that later lookups
+        # are plain attribute accesses and do not go through __getattr__
+        libfunc = getattr(self._lib, name)
+        self.__dict__[name] = libfunc
+        return libfunc
 
     def _load_library(self, name):
         libname_release_prefix = "libffengine"
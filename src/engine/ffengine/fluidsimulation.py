@@ -332,6 +332,66 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_int, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), int(n)])
 
+    def set_pressure_solver_preconditioner_MIC(self):
+        libfunc = lib.FluidSimulation_set_pressure_solver_preconditioner_MIC
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def set_pressure_solver_preconditioner_multigrid(self):
+        libfunc = lib.FluidSimulation_set_pressure_solver_preconditioner_multigrid
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def set_pressure_solver_preconditioner_parallel_MIC(self):
+        libfunc = lib.FluidSimulation_set_pressure_solver_preconditioner_parallel_MIC
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def is_pressure_solver_preconditioner_MIC(self):
+        libfunc = lib.FluidSimulation_is_pressure_solver_preconditioner_MIC
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    def is_pressure_solver_preconditioner_multigrid(self):
+        libfunc = lib.FluidSimulation_is_pressure_solver_preconditioner_multigrid
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    def is_pressure_solver_preconditioner_parallel_MIC(self):
+        libfunc = lib.FluidSimulation_is_pressure_solver_preconditioner_parallel_MIC
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @property
+    def enable_pressure_solver_warm_start(self):
+        libfunc = lib.FluidSimulation_is_pressure_solver_warm_start_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_pressure_solver_warm_start.setter
+    def enable_pressure_solver_warm_start(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_pressure_solver_warm_start
+        else:
+            libfunc = lib.FluidSimulation_disable_pressure_solver_warm_start
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    @property
+    def enable_matrix_free_pressure_solver(self):
+        libfunc = lib.FluidSimulation_is_matrix_free_pressure_solver_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_matrix_free_pressure_solver.setter
+    def enable_matrix_free_pressure_solver(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_matrix_free_pressure_solver
+        else:
+            libfunc = lib.FluidSimulation_disable_matrix_free_pressure_solver
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
     @property
     def viscosity_solver_max_iterations(self):
         libfunc = lib.FluidSimulation_get_viscosity_solver_max_iterations
@@ -345,6 +405,21 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_int, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), int(n)])
 
+    @property
+    def enable_matrix_free_viscosity_solver(self):
+        libfunc = lib.FluidSimulation_is_matrix_free_viscosity_solver_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_matrix_free_viscosity_solver.setter
+    def enable_matrix_free_viscosity_solver(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_matrix_free_viscosity_solver
+        else:
+            libfunc = lib.FluidSimulation_disable_matrix_free_viscosity_solver
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
     @property
     def enable_fluid_particle_output(self):
         libfunc = lib.FluidSimulation_is_fluid_particle_output_enabled
@@ -456,6 +531,77 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_int, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), int(slices)])
 
+    @property
+    def enable_surface_camera_lod(self):
+        libfunc = lib.FluidSimulation_is_surface_camera_lod_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_surface_camera_lod.setter
+    def enable_surface_camera_lod(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_surface_camera_lod
+        else:
+            libfunc = lib.FluidSimulation_disable_surface_camera_lod
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def set_surface_camera(self, position, right, up, forward, 
+                           frame_extents, resolution, is_orthographic=False):
+        left, right_extent, bottom, top = frame_extents
+        resx, resy = resolution
+        libfunc = lib.FluidSimulation_set_surface_camera
+        pb.init_lib_func(
+            libfunc, 
+            [c_void_p, Vector3_t, Vector3_t, Vector3_t, Vector3_t, 
+             c_double, c_double, c_double, c_double, c_int, c_int, c_int, c_void_p], None
+        )
+        args = [self()]
+        for v in [position, right, up, forward]:
+            args.append(Vector3_t(v[0], v[1], v[2]))
+        args += [left, right_extent, bottom, top, int(resx), int(resy), int(is_orthographic)]
+        pb.execute_lib_func(libfunc, args)
+
+    @property
+    def surface_camera_frustum_padding(self):
+        libfunc = lib.FluidSimulation_get_surface_camera_frustum_padding
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_double)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    @surface_camera_frustum_padding.setter
+    @decorators.check_ge_zero
+    def surface_camera_frustum_padding(self, padding):
+        libfunc = lib.FluidSimulation_set_surface_camera_frustum_padding
+        pb.init_lib_func(libfunc, [c_void_p, c_double, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), padding])
+
+    @property
+    def surface_camera_lod_pixel_size(self):
+        libfunc = lib.FluidSimulation_get_surface_camera_lod_pixel_size
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_double)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    @surface_camera_lod_pixel_size.setter
+    @decorators.check_gt_zero
+    def surface_camera_lod_pixel_size(self, size):
+        libfunc = lib.FluidSimulation_set_surface_camera_lod_pixel_size
+        pb.init_lib_func(libfunc, [c_void_p, c_double, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), size])
+
+    @property
+    def surface_camera_lod_max_level(self):
+        libfunc = lib.FluidSimulation_get_surface_camera_lod_max_level
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    @surface_camera_lod_max_level.setter
+    @decorators.check_ge_zero
+    @decorators.check_le(3)
+    def surface_camera_lod_max_level(self, level):
+        libfunc = lib.FluidSimulation_set_surface_camera_lod_max_level
+        pb.init_lib_func(libfunc, [c_void_p, c_int, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), int(level)])
+
     @property
     def surface_smoothing_value(self):
         libfunc = lib.FluidSimulation_get_surface_smoothing_value
@@ -1550,6 +1696,64 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, AABB_t, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), bounds.to_struct()])
 
+    @property
+    def enable_whitewater_camera_lod(self):
+        libfunc = lib.FluidSimulation_is_whitewater_camera_lod_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_whitewater_camera_lod.setter
+    def enable_whitewater_camera_lod(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_whitewater_camera_lod
+        else:
+            libfunc = lib.FluidSimulation_disable_whitewater_camera_lod
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def set_whitewater_camera(self, position, right, up, forward, 
+                              frame_extents, resolution, is_orthographic=False):
+        left, right_extent, bottom, top = frame_extents
+        resx, resy = resolution
+        libfunc = lib.FluidSimulation_set_whitewater_camera
+        pb.init_lib_func(
+            libfunc, 
+            [c_void_p, Vector3_t, Vector3_t, Vector3_t, Vector3_t, 
+             c_double, c_double, c_double, c_double, c_int, c_int, c_int, c_void_p], None
+        )
+        args = [self()]
+        for v in [position, right, up, forward]:
+            args.append(Vector3_t(v[0], v[1], v[2]))
+        args += [left, right_extent, bottom, top, int(resx), int(resy), int(is_orthographic)]
+        pb.execute_lib_func(libfunc, args)
+
+    @property
+    def whitewater_camera_frustum_padding(self):
+        libfunc = lib.FluidSimulation_get_whitewater_camera_frustum_padding
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_double)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    @whitewater_camera_frustum_padding.setter
+    @decorators.check_ge_zero
+    def whitewater_camera_frustum_padding(self, padding):
+        libfunc = lib.FluidSimulation_set_whitewater_camera_frustum_padding
+        pb.init_lib_func(libfunc, [c_void_p, c_double, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), padding])
+
+    @property
+    def whitewater_camera_lod_min_factor(self):
+        libfunc = lib.FluidSimulation_get_whitewater_camera_lod_min_factor
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_double)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    @whitewater_camera_lod_min_factor.setter
+    @decorators.check_ge_zero
+    @decorators.check_le(1.0)
+    def whitewater_camera_lod_min_factor(self, factor):
+        libfunc = lib.FluidSimulation_set_whitewater_camera_lod_min_factor
+        pb.init_lib_func(libfunc, [c_void_p, c_double, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), factor])
+
     @property
     def min_diffuse_particle_lifetime(self):
         libfunc = lib.FluidSimulation_get_min_diffuse_particle_lifetime
@@ -2478,6 +2682,21 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
         pb.execute_lib_func(libfunc, [self()])
 
+    @property
+    def enable_adaptive_substepping(self):
+        libfunc = lib.FluidSimulation_is_adaptive_substepping_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_adaptive_substepping.setter
+    def enable_adaptive_substepping(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_adaptive_substepping
+        else:
+            libfunc = lib.FluidSimulation_disable_adaptive_substepping
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
     def set_velocity_transfer_method_FLIP(self):
         libfunc = lib.FluidSimulation_set_velocity_transfer_method_FLIP
         pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
@@ -2541,6 +2760,51 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
         pb.execute_lib_func(libfunc, [self()])
 
+    @property
+    def enable_sparse_liquid_level_set(self):
+        libfunc = lib.FluidSimulation_is_sparse_liquid_level_set_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_sparse_liquid_level_set.setter
+    def enable_sparse_liquid_level_set(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_sparse_liquid_level_set
+        else:
+            libfunc = lib.FluidSimulation_disable_sparse_liquid_level_set
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    @property
+    def enable_marker_particle_sorting(self):
+        libfunc = lib.FluidSimulation_is_marker_particle_sorting_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_marker_particle_sorting.setter
+    def enable_marker_particle_sorting(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_marker_particle_sorting
+        else:
+            libfunc = lib.FluidSimulation_disable_marker_particle_sorting
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    @property
+    def enable_compact_particle_attributes(self):
+        libfunc = lib.FluidSimulation_is_compact_particle_attributes_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_compact_particle_attributes.setter
+    def enable_compact_particle_attributes(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_compact_particle_attributes
+        else:
+            libfunc = lib.FluidSimulation_disable_compact_particle_attributes
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
     @property
     def enable_static_solid_levelset_precomputation(self):
         libfunc = lib.FluidSimulation_is_static_solid_levelset_precomputation_enabled
@@ -2571,6 +2835,36 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
         pb.execute_lib_func(libfunc, [self()])
 
+    @property
+    def enable_rigid_obstacle_levelset_reuse(self):
+        libfunc = lib.FluidSimulation_is_rigid_obstacle_levelset_reuse_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_rigid_obstacle_levelset_reuse.setter
+    def enable_rigid_obstacle_levelset_reuse(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_rigid_obstacle_levelset_reuse
+        else:
+            libfunc = lib.FluidSimulation_disable_rigid_obstacle_levelset_reuse
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    @property
+    def enable_obstacle_mesh_decimation(self):
+        libfunc = lib.FluidSimulation_is_obstacle_mesh_decimation_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_obstacle_mesh_decimation.setter
+    def enable_obstacle_mesh_decimation(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_obstacle_mesh_decimation
+        else:
+            libfunc = lib.FluidSimulation_disable_obstacle_mesh_decimation
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
     def add_mesh_fluid_source(self, mesh_fluid_source):
         libfunc = lib.FluidSimulation_add_mesh_fluid_source
         pb.init_lib_func(libfunc, [c_void_p, c_void_p, c_void_p], None)
@@ -3225,6 +3519,39 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, FluidSimulationDiffuseParticleData_t, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), pdata])
 
+    def get_parameter_block_version(self):
+        libfunc = lib.FluidSimulation_get_parameter_block_version
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    def get_parameter_block_id(self, name):
+        libfunc = lib.FluidSimulation_get_parameter_block_id
+        pb.init_lib_func(libfunc, [c_void_p, c_char_p, c_void_p], c_int)
+        return pb.execute_lib_func(libfunc, [self(), name.encode("utf-8")])
+
+    def get_parameter_block_values(self, ids):
+        num_parameters = len(ids)
+        c_ids = (c_int * num_parameters)(*ids)
+        c_values = (c_double * num_parameters)()
+
+        libfunc = lib.FluidSimulation_get_parameter_block_values
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p, c_int, c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), c_ids, num_parameters, c_values])
+
+        return list(c_values)
+
+    def apply_parameter_block(self, version, ids, values):
+        if len(ids) != len(values):
+            raise ValueError("Parameter block ids and values must be the same length")
+
+        num_parameters = len(ids)
+        c_ids = (c_int * num_parameters)(*ids)
+        c_values = (c_double * num_parameters)(*values)
+
+        libfunc = lib.FluidSimulation_apply_parameter_block
+        pb.init_lib_func(libfunc, [c_void_p, c_int, c_void_p, c_void_p, c_int, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), version, c_ids, c_values, num_parameters])
+
 
 
 class MarkerParticle_t(ctypes.Structure):
@@ -3253,9 +3580,16 @@ class FluidSimulationTimingStats_t(ctypes.Structure):
                 ("viscosity", c_double),
                 ("objects", c_double)]
 
+class FluidSimulationMemoryStats_t(ctypes.Structure):
+    _fields_ = [("buffer_arena_high_water_bytes", c_ulonglong),
+                ("buffer_arena_cached_bytes", c_ulonglong),
+                ("buffer_arena_acquired", c_int),
+                ("buffer_arena_reused", c_int)]
+
 class FluidSimulationFrameStats_t(ctypes.Structure):
     _fields_ = [("frame", c_int),
                 ("substeps", c_int),
+                ("substeps_avoided", c_int),
                 ("delta_time", c_double),
                 ("fluid_particles", c_int),
                 ("diffuse_particles", c_int),
@@ -3320,7 +3654,8 @@ class FluidSimulationFrameStats_t(ctypes.Structure):
                 ("particles", FluidSimulationMeshStats_t),
                 ("obstacle", FluidSimulationMeshStats_t),
                 ("forcefield", FluidSimulationMeshStats_t),
-                ("timing", FluidSimulationTimingStats_t)]
+                ("timing", FluidSimulationTimingStats_t),
+                ("memory", FluidSimulationMemoryStats_t)]
 
 class FluidSimulationMarkerParticleData_t(ctypes.Structure):
     _fields_ = [("size", c_int),
@@ -0,0 +1,102 @@
+# MIT License
+# 
+# Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# A ParameterBlock collects scalar FluidSimulation parameters (floats, ints, 
+# and bools) and sends them to the engine in a single call. Parameters are 
+# referenced by their FluidSimulation property name.
+#
+# The block tracks the last value that was sent to the engine for each 
+# parameter. Only parameters whose value has changed are included when the 
+# block is applied. The engine applies the block atomically: if any parameter
+# fails to be set, the parameters in the block are restored to their previous
+# values and an error is raised.
+#
+# Note: values set directly through FluidSimulation properties after a 
+# parameter has been applied through a block are not tracked. Call 
+# invalidate() if a parameter may have been modified outside of the block.
+class ParameterBlock(object):
+
+    VERSION = 1
+
+    def __init__(self, fluidsim, eps=1e-6):
+        self._fluidsim = fluidsim
+        self._eps = eps
+        self._parameter_ids = {}
+        self._engine_values = {}
+        self._pending_values = {}
+
+    @property
+    def fluidsim(self):
+        return self._fluidsim
+
+    def is_parameter(self, name):
+        return self._get_parameter_id(name) >= 0
+
+    def set(self, name, value, value_min=None, value_max=None):
+        if self._get_parameter_id(name) < 0:
+            raise ValueError("Unknown parameter block parameter: <" + name + ">")
+
+        if value_min is not None:
+            value = max(value, value_min)
+        if value_max is not None:
+            value = min(value, value_max)
+        self._pending_values[name] = float(value)
+
+    def invalidate(self):
+        self._engine_values = {}
+
+    def apply(self):
+        if not self._pending_values:
+            return 0
+
+        unknown_names = [n for n in self._pending_values if n not in self._engine_values]
+        if unknown_names:
+            unknown_ids = [self._parameter_ids[n] for n in unknown_names]
+            unknown_values = self._fluidsim.get_parameter_block_values(unknown_ids)
+            for name, value in zip(unknown_names, unknown_values):
+                self._engine_values[name] = value
+
+        changed_names = []
+        changed_ids = []
+        changed_values = []
+        for name, value in self._pending_values.items():
+            if abs(value - self._engine_values[name]) > self._eps:
+                changed_names.append(name)
+                changed_ids.append(self._parameter_ids[name])
+                changed_values.append(value)
+        self._pending_values = {}
+
+        if not changed_ids:
+            return 0
+
+        self._fluidsim.apply_parameter_block(self.VERSION, changed_ids, changed_values)
+        for name, value in zip(changed_names, changed_values):
+            self._engine_values[name] = value
+
+        return len(changed_ids)
+
+    def _get_parameter_id(self, name):
+        parameter_id = self._parameter_ids.get(name)
+        if parameter_id is None:
+            parameter_id = self._fluidsim.get_parameter_block_id(name)
+            self._parameter_ids[name] = parameter_id
+        return parameter_id
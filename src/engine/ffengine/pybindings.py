@@ -21,20 +21,26 @@
 # SOFTWARE.
 
 from .ffengine import ffengine as lib
-from ctypes import c_char_p, c_int, byref
+from ctypes import c_char_p, c_int, byref, ArgumentError
 
-def check_success(success, errprefix):
+def get_error_message():
     libfunc = lib.CBindings_get_error_message
     init_lib_func(libfunc, [], c_char_p)
+    return str(libfunc().decode("utf-8"))
+
+def check_success(success, errprefix):
     if not success:
-        raise RuntimeError(errprefix + str(libfunc().decode("utf-8")))
+        raise RuntimeError(errprefix + get_error_message())
 
 def init_lib_func(libfunc, argtypes, restype):
     if libfunc.argtypes is None:
         libfunc.argtypes = argtypes
         libfunc.restype = restype
 
-def execute_lib_func(libfunc, params):
+# Parameters are passed straight to the typed library function and ctypes
+# performs the argtypes/restype conversion. Explicit per-argument conversion
+# is only needed for the rare parameter that from_param will not accept.
+def _convert_params(libfunc, params):
     args = []
     for idx, arg in enumerate(params):
         try:
@@ -42,19 +48,15 @@ def execute_lib_func(libfunc, params):
         except:
             cval = arg
         args.append(cval)
-    success = c_int();
-    args.append(byref(success))
+    return args
 
-    result = None
-    if libfunc.restype:
-        funcresult = libfunc(*args)
-        check_success(success, libfunc.__name__ + " - ")
-        try:
-            return libfunc.restype(funcresult).value
-        except:
-            return funcresult
-    else:
-        libfunc(*args)
+def execute_lib_func(libfunc, params):
+    success = c_int()
+    try:
+        result = libfunc(*params, byref(success))
+    except ArgumentError:
+        result = libfunc(*_convert_params(libfunc, params), byref(success))
 
-    check_success(success, libfunc.__name__ + " - ")
-    return result
\ No newline at end of file
+    if not success.value:
+        raise RuntimeError(libfunc.__name__ + " - " + get_error_message())
+    return result
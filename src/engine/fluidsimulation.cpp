@@ -300,6 +300,90 @@ void FluidSimulation::setPressureSolverMaxIterations(int n) {
     _maxPressureSolveIterations = n;
 }
 
+void FluidSimulation::setPressureSolverPreconditionerMIC() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setPressureSolverPreconditionerMIC" << std::endl);
+
+    _pressureSolverPreconditioner = PressureSolverPreconditioner::MIC;
+}
+
+void FluidSimulation::setPressureSolverPreconditionerMultigrid() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setPressureSolverPreconditionerMultigrid" << std::endl);
+
+    _pressureSolverPreconditioner = PressureSolverPreconditioner::Multigrid;
+}
+
+void FluidSimulation::setPressureSolverPreconditionerParallelMIC() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setPressureSolverPreconditionerParallelMIC" << std::endl);
+
+    _pressureSolverPreconditioner = PressureSolverPreconditioner::ParallelMIC;
+}
+
+bool FluidSimulation::isPressureSolverPreconditionerMIC() {
+    return _pressureSolverPreconditioner == PressureSolverPreconditioner::MIC;
+}
+
+bool FluidSimulation::isPressureSolverPreconditionerMultigrid() {
+    return _pressureSolverPreconditioner == PressureSolverPreconditioner::Multigrid;
+}
+
+bool FluidSimulation::isPressureSolverPreconditionerParallelMIC() {
+    return _pressureSolverPreconditioner == PressureSolverPreconditioner::ParallelMIC;
+}
+
+void FluidSimulation::enablePressureSolverWarmStart() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enablePressureSolverWarmStart" << std::endl);
+
+    _isPressureSolverWarmStartEnabled = true;
+}
+
+void FluidSimulation::disablePressureSolverWarmStart() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disablePressureSolverWarmStart" << std::endl);
+
+    _isPressureSolverWarmStartEnabled = false;
+    _previousPressureGrid = Array3d<float>();
+}
+
+bool FluidSimulation::isPressureSolverWarmStartEnabled() {
+    return _isPressureSolverWarmStartEnabled;
+}
+
+void FluidSimulation::enableMatrixFreePressureSolver() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableMatrixFreePressureSolver" << std::endl);
+
+    if (!_isMatrixFreePressureSolverEnabled) {
+        _logfile.log(std::ostringstream().flush() << 
+                     "Matrix-free pressure solver enabled, the pressure solver " << 
+                     "preconditioner is overridden with Jacobi" << std::endl);
+    }
+    _isMatrixFreePressureSolverEnabled = true;
+}
+
+void FluidSimulation::disableMatrixFreePressureSolver() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableMatrixFreePressureSolver" << std::endl);
+
+    _isMatrixFreePressureSolverEnabled = false;
+}
+
+bool FluidSimulation::isMatrixFreePressureSolverEnabled() {
+    return _isMatrixFreePressureSolverEnabled;
+}
+
+PressureSolverPreconditioner FluidSimulation::_getPressureSolverPreconditioner() {
+    // The matrix-free solver has no assembled matrix to factor, so the 
+    // preconditioner setting is overridden with Jacobi
+    if (_isMatrixFreePressureSolverEnabled) {
+        return PressureSolverPreconditioner::Jacobi;
+    }
+    return _pressureSolverPreconditioner;
+}
+
 int FluidSimulation::getViscositySolverMaxIterations() {
     return _maxViscositySolveIterations;
 }
@@ -311,6 +395,24 @@ void FluidSimulation::setViscositySolverMaxIterations(int n) {
     _maxViscositySolveIterations = n;
 }
 
+void FluidSimulation::enableMatrixFreeViscositySolver() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableMatrixFreeViscositySolver" << std::endl);
+
+    _isMatrixFreeViscositySolverEnabled = true;
+}
+
+void FluidSimulation::disableMatrixFreeViscositySolver() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableMatrixFreeViscositySolver" << std::endl);
+
+    _isMatrixFreeViscositySolverEnabled = false;
+}
+
+bool FluidSimulation::isMatrixFreeViscositySolverEnabled() {
+    return _isMatrixFreeViscositySolverEnabled;
+}
+
 void FluidSimulation::enableFluidParticleOutput() {
     _logfile.log(std::ostringstream().flush() << 
                  _logfile.getTime() << " enableFluidParticleOutput" << std::endl);
@@ -449,6 +551,90 @@ void FluidSimulation::setNumPolygonizerSlices(int n) {
     _numSurfaceReconstructionPolygonizerSlices = n;
 }
 
+void FluidSimulation::enableSurfaceCameraLOD() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableSurfaceCameraLOD" << std::endl);
+
+    _isSurfaceCameraLODEnabled = true;
+}
+
+void FluidSimulation::disableSurfaceCameraLOD() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableSurfaceCameraLOD" << std::endl);
+
+    _isSurfaceCameraLODEnabled = false;
+}
+
+bool FluidSimulation::isSurfaceCameraLODEnabled() {
+    return _isSurfaceCameraLODEnabled;
+}
+
+CameraFrustum FluidSimulation::getSurfaceCamera() {
+    return _surfaceCamera;
+}
+
+void FluidSimulation::setSurfaceCamera(CameraFrustum camera) {
+    vmath::vec3 p = camera.getPosition();
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setSurfaceCamera: " << 
+                 p.x << " " << p.y << " " << p.z << " " << 
+                 camera.getResolutionX() << " " << camera.getResolutionY() << " " <<
+                 camera.isOrthographic() << std::endl);
+
+    _surfaceCamera = camera;
+}
+
+double FluidSimulation::getSurfaceCameraFrustumPadding() {
+    return _surfaceCameraFrustumPadding;
+}
+
+void FluidSimulation::setSurfaceCameraFrustumPadding(double padding) {
+    if (padding < 0.0) {
+        std::string msg = "Error: camera frustum padding must be greater than or equal to 0.\n";
+        msg += "padding: " + _toString(padding) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setSurfaceCameraFrustumPadding: " << padding << std::endl);
+
+    _surfaceCameraFrustumPadding = padding;
+}
+
+double FluidSimulation::getSurfaceCameraLODPixelSize() {
+    return _surfaceCameraLODPixelSize;
+}
+
+void FluidSimulation::setSurfaceCameraLODPixelSize(double size) {
+    if (size <= 0.0) {
+        std::string msg = "Error: camera LOD pixel size must be greater than 0.\n";
+        msg += "size: " + _toString(size) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setSurfaceCameraLODPixelSize: " << size << std::endl);
+
+    _surfaceCameraLODPixelSize = size;
+}
+
+int FluidSimulation::getSurfaceCameraLODMaxLevel() {
+    return _surfaceCameraLODMaxLevel;
+}
+
+void FluidSimulation::setSurfaceCameraLODMaxLevel(int level) {
+    if (level < 0 || level > 3) {
+        std::string msg = "Error: camera LOD max level must be in range [0, 3].\n";
+        msg += "level: " + _toString(level) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setSurfaceCameraLODMaxLevel: " << level << std::endl);
+
+    _surfaceCameraLODMaxLevel = level;
+}
+
 double FluidSimulation::getSurfaceSmoothingValue() {
     return _surfaceReconstructionSmoothingValue;
 }
@@ -1783,6 +1969,73 @@ void FluidSimulation::setDiffuseEmitterGenerationBounds(AABB bbox) {
     _diffuseMaterial.setEmitterGenerationBounds(bbox);
 }
 
+void FluidSimulation::enableWhitewaterCameraLOD() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableWhitewaterCameraLOD" << std::endl);
+
+    _diffuseMaterial.enableCameraLOD();
+}
+
+void FluidSimulation::disableWhitewaterCameraLOD() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableWhitewaterCameraLOD" << std::endl);
+
+    _diffuseMaterial.disableCameraLOD();
+}
+
+bool FluidSimulation::isWhitewaterCameraLODEnabled() {
+    return _diffuseMaterial.isCameraLODEnabled();
+}
+
+CameraFrustum FluidSimulation::getWhitewaterCamera() {
+    return _diffuseMaterial.getCamera();
+}
+
+void FluidSimulation::setWhitewaterCamera(CameraFrustum camera) {
+    vmath::vec3 p = camera.getPosition();
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setWhitewaterCamera: " << 
+                 p.x << " " << p.y << " " << p.z << " " << 
+                 camera.getResolutionX() << " " << camera.getResolutionY() << " " <<
+                 camera.isOrthographic() << std::endl);
+
+    _diffuseMaterial.setCamera(camera);
+}
+
+double FluidSimulation::getWhitewaterCameraFrustumPadding() {
+    return _diffuseMaterial.getCameraFrustumPadding();
+}
+
+void FluidSimulation::setWhitewaterCameraFrustumPadding(double padding) {
+    if (padding < 0.0) {
+        std::string msg = "Error: camera frustum padding must be greater than or equal to 0.\n";
+        msg += "padding: " + _toString(padding) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setWhitewaterCameraFrustumPadding: " << padding << std::endl);
+
+    _diffuseMaterial.setCameraFrustumPadding(padding);
+}
+
+double FluidSimulation::getWhitewaterCameraLODMinFactor() {
+    return _diffuseMaterial.getCameraLODMinFactor();
+}
+
+void FluidSimulation::setWhitewaterCameraLODMinFactor(double factor) {
+    if (factor < 0.0 || factor > 1.0) {
+        std::string msg = "Error: camera LOD min factor must be in range [0.0, 1.0].\n";
+        msg += "factor: " + _toString(factor) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setWhitewaterCameraLODMinFactor: " << factor << std::endl);
+
+    _diffuseMaterial.setCameraLODMinFactor(factor);
+}
+
 double FluidSimulation::getMinDiffuseParticleLifetime() {
     return _diffuseMaterial.getMinDiffuseParticleLifetime();
 }   
@@ -2834,6 +3087,24 @@ bool FluidSimulation::isExtremeVelocityRemovalEnabled() {
     return _isExtremeVelocityRemovalEnabled;
 }
 
+void FluidSimulation::enableAdaptiveSubstepping() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableAdaptiveSubstepping" << std::endl);
+
+    _isAdaptiveSubsteppingEnabled = true;
+}
+
+void FluidSimulation::disableAdaptiveSubstepping() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableAdaptiveSubstepping" << std::endl);
+
+    _isAdaptiveSubsteppingEnabled = false;
+}
+
+bool FluidSimulation::isAdaptiveSubsteppingEnabled() {
+    return _isAdaptiveSubsteppingEnabled;
+}
+
 void FluidSimulation::setVelocityTransferMethodFLIP() {
     _logfile.log(std::ostringstream().flush() << 
                  _logfile.getTime() << " setVelocityTransferMethodFLIP" << std::endl);
@@ -2910,6 +3181,60 @@ bool FluidSimulation::isFractureOptimizationEnabled() {
     return _isFractureOptimizationEnabled;
 }
 
+void FluidSimulation::enableSparseLiquidLevelSet() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableSparseLiquidLevelSet" << std::endl);
+
+    _isSparseLiquidLevelSetEnabled = true;
+}
+
+void FluidSimulation::disableSparseLiquidLevelSet() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableSparseLiquidLevelSet" << std::endl);
+
+    _isSparseLiquidLevelSetEnabled = false;
+}
+
+bool FluidSimulation::isSparseLiquidLevelSetEnabled() {
+    return _isSparseLiquidLevelSetEnabled;
+}
+
+void FluidSimulation::enableMarkerParticleSorting() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableMarkerParticleSorting" << std::endl);
+
+    _isMarkerParticleSortingEnabled = true;
+}
+
+void FluidSimulation::disableMarkerParticleSorting() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableMarkerParticleSorting" << std::endl);
+
+    _isMarkerParticleSortingEnabled = false;
+}
+
+bool FluidSimulation::isMarkerParticleSortingEnabled() {
+    return _isMarkerParticleSortingEnabled;
+}
+
+void FluidSimulation::enableCompactParticleAttributes() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableCompactParticleAttributes" << std::endl);
+
+    _isCompactParticleAttributesEnabled = true;
+}
+
+void FluidSimulation::disableCompactParticleAttributes() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableCompactParticleAttributes" << std::endl);
+
+    _isCompactParticleAttributesEnabled = false;
+}
+
+bool FluidSimulation::isCompactParticleAttributesEnabled() {
+    return _isCompactParticleAttributesEnabled;
+}
+
 void FluidSimulation::enableStaticSolidLevelSetPrecomputation() {
     _logfile.log(std::ostringstream().flush() << 
                  _logfile.getTime() << " enableStaticSolidLevelSetPrecomputation" << std::endl);
@@ -2946,6 +3271,48 @@ bool FluidSimulation::isTemporaryMeshLevelSetEnabled() {
     return _isTempSolidLevelSetEnabled;
 }
 
+void FluidSimulation::enableRigidObstacleLevelSetReuse() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableRigidObstacleLevelSetReuse" << std::endl);
+
+    _isRigidObstacleLevelSetReuseEnabled = true;
+}
+
+void FluidSimulation::disableRigidObstacleLevelSetReuse() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableRigidObstacleLevelSetReuse" << std::endl);
+
+    _isRigidObstacleLevelSetReuseEnabled = false;
+
+    for (size_t i = 0; i < _obstacles.size(); i++) {
+        _obstacles[i]->clearRigidBodyMeshLevelSet();
+    }
+}
+
+bool FluidSimulation::isRigidObstacleLevelSetReuseEnabled() {
+    return _isRigidObstacleLevelSetReuseEnabled;
+}
+
+void FluidSimulation::enableObstacleMeshDecimation() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableObstacleMeshDecimation" << std::endl);
+
+    _isObstacleMeshDecimationEnabled = true;
+    _updateObstacleMeshDecimation();
+}
+
+void FluidSimulation::disableObstacleMeshDecimation() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableObstacleMeshDecimation" << std::endl);
+
+    _isObstacleMeshDecimationEnabled = false;
+    _updateObstacleMeshDecimation();
+}
+
+bool FluidSimulation::isObstacleMeshDecimationEnabled() {
+    return _isObstacleMeshDecimationEnabled;
+}
+
 void FluidSimulation::addMeshFluidSource(MeshFluidSource *source) {
     for (size_t i = 0; i < _meshFluidSources.size(); i++) {
         if (source->getID() == _meshFluidSources[i]->getID()) {
@@ -2999,6 +3366,7 @@ void FluidSimulation::addMeshObstacle(MeshObject *obstacle) {
                  _logfile.getTime() << " addMeshObstacle: " << obstacle << std::endl);
 
     _obstacles.push_back(obstacle);
+    _updateObstacleMeshDecimation();
 
     _isSolidLevelSetUpToDate = false;
 }
@@ -3456,51 +3824,73 @@ void FluidSimulation::getMarkerParticleVelocityDataRange(int start_idx, int end_
 }
 
 void FluidSimulation::getMarkerParticleAffineXDataRange(int start_idx, int end_idx, char *data) {
-    if (start_idx < 0 || end_idx > (int)_markerParticles.size() || start_idx > end_idx) {
-        std::string msg = "Error: invalid range.\n";
-        msg += "range: [" + _toString(start_idx) + ", " + _toString(end_idx) + "]\n";
-        throw std::domain_error(msg);
-    }
+    _getMarkerParticleAffineDataRange("AFFINEX", start_idx, end_idx, data);
+}
 
-    std::vector<vmath::vec3> *values;
-    _markerParticles.getAttributeValues("AFFINEX", values);
+void FluidSimulation::getMarkerParticleAffineYDataRange(int start_idx, int end_idx, char *data) {
+    _getMarkerParticleAffineDataRange("AFFINEY", start_idx, end_idx, data);
+}
 
-    vmath::vec3 *dataValues = (vmath::vec3*)data;
-    for (int i = start_idx; i < end_idx; i++) {
-        dataValues[i - start_idx] = values->at(i);
-    }
+void FluidSimulation::getMarkerParticleAffineZDataRange(int start_idx, int end_idx, char *data) {
+    _getMarkerParticleAffineDataRange("AFFINEZ", start_idx, end_idx, data);
 }
 
-void FluidSimulation::getMarkerParticleAffineYDataRange(int start_idx, int end_idx, char *data) {
+void FluidSimulation::_getMarkerParticleAffineDataRange(std::string attributeName, 
+                                                         int start_idx, int end_idx, char *data) {
     if (start_idx < 0 || end_idx > (int)_markerParticles.size() || start_idx > end_idx) {
         std::string msg = "Error: invalid range.\n";
         msg += "range: [" + _toString(start_idx) + ", " + _toString(end_idx) + "]\n";
         throw std::domain_error(msg);
     }
 
-    std::vector<vmath::vec3> *values;
-    _markerParticles.getAttributeValues("AFFINEY", values);
-
     vmath::vec3 *dataValues = (vmath::vec3*)data;
+    if (_isCompactParticleAttributesEnabled) {
+        std::vector<HalfVector3> *values;
+        _markerParticles.getAttributeValues(attributeName, values);
+        for (int i = start_idx; i < end_idx; i++) {
+            dataValues[i - start_idx] = values->at(i).toVec3();
+        }
+        return;
+    }
+
+    std::vector<vmath::vec3> *values;
+    _markerParticles.getAttributeValues(attributeName, values);
     for (int i = start_idx; i < end_idx; i++) {
         dataValues[i - start_idx] = values->at(i);
     }
 }
 
-void FluidSimulation::getMarkerParticleAffineZDataRange(int start_idx, int end_idx, char *data) {
-    if (start_idx < 0 || end_idx > (int)_markerParticles.size() || start_idx > end_idx) {
-        std::string msg = "Error: invalid range.\n";
-        msg += "range: [" + _toString(start_idx) + ", " + _toString(end_idx) + "]\n";
-        throw std::domain_error(msg);
+std::vector<int>* FluidSimulation::_getMarkerParticleSourceIDValues(std::vector<int> &tempValues) {
+    if (!_isCompactParticleAttributesEnabled) {
+        std::vector<int> *values;
+        _markerParticles.getAttributeValues("SOURCEID", values);
+        return values;
     }
 
-    std::vector<vmath::vec3> *values;
-    _markerParticles.getAttributeValues("AFFINEZ", values);
+    std::vector<uint16_t> *values;
+    _markerParticles.getAttributeValues("SOURCEID", values);
+    tempValues.assign(values->begin(), values->end());
+    return &tempValues;
+}
 
-    vmath::vec3 *dataValues = (vmath::vec3*)data;
-    for (int i = start_idx; i < end_idx; i++) {
-        dataValues[i - start_idx] = values->at(i);
+std::vector<float>* FluidSimulation::_getMarkerParticleDensityValues(std::vector<float> &tempValues) {
+    if (!_isCompactParticleAttributesEnabled) {
+        std::vector<float> *values;
+        _markerParticles.getAttributeValues("DENSITY", values);
+        return values;
     }
+
+    std::vector<HalfFloat16> *values;
+    _markerParticles.getAttributeValues("DENSITY", values);
+    tempValues.resize(values->size());
+    for (size_t i = 0; i < values->size(); i++) {
+        tempValues[i] = values->at(i).toFloat();
+    }
+    return &tempValues;
+}
+
+uint16_t FluidSimulation::_getCompactSourceID(int sourceID) {
+    return (uint16_t)std::min(std::max(sourceID, 0), 65535);
 }
 
 void FluidSimulation::getMarkerParticleAgeDataRange(int start_idx, int end_idx, char *data) {
@@ -3558,10 +3948,18 @@ void FluidSimulation::getMarkerParticleSourceIDDataRange(int start_idx, int end_
         throw std::domain_error(msg);
     }
 
+    int *dataValues = (int*)data;
+    if (_isCompactParticleAttributesEnabled) {
+        std::vector<uint16_t> *values;
+        _markerParticles.getAttributeValues("SOURCEID", values);
+        for (int i = start_idx; i < end_idx; i++) {
+            dataValues[i - start_idx] = values->at(i);
+        }
+        return;
+    }
+
     std::vector<int> *values;
     _markerParticles.getAttributeValues("SOURCEID", values);
-
-    int *dataValues = (int*)data;
     for (int i = start_idx; i < end_idx; i++) {
         dataValues[i - start_idx] = values->at(i);
     }
@@ -3606,10 +4004,18 @@ void FluidSimulation::getMarkerParticleDensityDataRange(int start_idx, int end_i
         throw std::domain_error(msg);
     }
 
+    float *dataValues = (float*)data;
+    if (_isCompactParticleAttributesEnabled) {
+        std::vector<HalfFloat16> *values;
+        _markerParticles.getAttributeValues("DENSITY", values);
+        for (int i = start_idx; i < end_idx; i++) {
+            dataValues[i - start_idx] = values->at(i).toFloat();
+        }
+        return;
+    }
+
     std::vector<float> *values;
     _markerParticles.getAttributeValues("DENSITY", values);
-
-    float *dataValues = (float*)data;
     for (int i = start_idx; i < end_idx; i++) {
         dataValues[i - start_idx] = values->at(i);
     }
@@ -4070,6 +4476,241 @@ void FluidSimulation::loadDiffuseParticleData(FluidSimulationDiffuseParticleData
     _isDiffuseParticleLoadPending = true;
 }
 
+int FluidSimulation::getParameterBlockVersion() {
+    return _parameterBlockVersion;
+}
+
+int FluidSimulation::getParameterBlockID(std::string name) {
+    const std::vector<ParameterBlockEntry> &table = _getParameterBlockTable();
+    for (size_t i = 0; i < table.size(); i++) {
+        if (name == table[i].name) {
+            return (int)i;
+        }
+    }
+
+    return -1;
+}
+
+std::vector<double> FluidSimulation::getParameterBlockValues(std::vector<int> &ids) {
+    _validateParameterBlockIDs(ids);
+
+    const std::vector<ParameterBlockEntry> &table = _getParameterBlockTable();
+    std::vector<double> values;
+    values.reserve(ids.size());
+    for (size_t i = 0; i < ids.size(); i++) {
+        values.push_back(table[ids[i]].get(this));
+    }
+
+    return values;
+}
+
+void FluidSimulation::applyParameterBlock(int version, 
+                                          std::vector<int> &ids, 
+                                          std::vector<double> &values) {
+    if (version != _parameterBlockVersion) {
+        std::string msg = "Error: parameter block version does not match engine version.\n";
+        msg += "block version: " + _toString(version) + 
+               " engine version: " + _toString(_parameterBlockVersion) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    if (ids.size() != values.size()) {
+        std::string msg = "Error: parameter block IDs and values must be the same size.\n";
+        msg += "ids: " + _toString(ids.size()) + " values: " + _toString(values.size()) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " applyParameterBlock: " << ids.size() << std::endl);
+
+    const std::vector<ParameterBlockEntry> &table = _getParameterBlockTable();
+    std::vector<double> previousValues = getParameterBlockValues(ids);
+
+    size_t numApplied = 0;
+    try {
+        for (; numApplied < ids.size(); numApplied++) {
+            table[ids[numApplied]].set(this, values[numApplied]);
+        }
+    } catch (std::exception &ex) {
+        for (size_t i = numApplied; i > 0; i--) {
+            table[ids[i - 1]].set(this, previousValues[i - 1]);
+        }
+        throw;
+    }
+}
+
+#define FLUIDSIM_DOUBLE_PARAMETER(name, getter, setter)                         \
+    {name,                                                                      \
+     [](FluidSimulation *sim) -> double { return (double)sim->getter(); },      \
+     [](FluidSimulation *sim, double value) { sim->setter(value); }}
+
+#define FLUIDSIM_INT_PARAMETER(name, getter, setter)                            \
+    {name,                                                                      \
+     [](FluidSimulation *sim) -> double { return (double)sim->getter(); },      \
+     [](FluidSimulation *sim, double value) { sim->setter((int)std::round(value)); }}
+
+#define FLUIDSIM_BOOL_PARAMETER(name, getter, enabler, disabler)                \
+    {name,                                                                      \
+     [](FluidSimulation *sim) -> double { return sim->getter() ? 1.0 : 0.0; },  \
+     [](FluidSimulation *sim, double value) {                                   \
+        if (value != 0.0) { sim->enabler(); } else { sim->disabler(); }         \
+     }}
+
+// Limit behaviours are passed as 0 = kill, 1 = ballistic, 2 = collide to 
+// match the values used by the Python bindings
+#define FLUIDSIM_LIMIT_BEHAVIOUR_PARAMETER(name, getter, setter)                \
+    {name,                                                                      \
+     [](FluidSimulation *sim) -> double {                                       \
+        LimitBehaviour b = sim->getter();                                       \
+        return b == LimitBehaviour::ballistic ? 1.0 :                           \
+               (b == LimitBehaviour::collide ? 2.0 : 0.0);                      \
+     },                                                                         \
+     [](FluidSimulation *sim, double value) {                                   \
+        int enumValue = (int)std::round(value);                                 \
+        sim->setter(enumValue == 1 ? LimitBehaviour::ballistic :                \
+                    (enumValue == 2 ? LimitBehaviour::collide :                 \
+                                      LimitBehaviour::kill));                   \
+     }}
+
+const std::vector<FluidSimulation::ParameterBlockEntry>& FluidSimulation::_getParameterBlockTable() {
+    // Entries must only be appended to this table. Removing or reordering
+    // entries requires incrementing _parameterBlockVersion.
+    static const std::vector<ParameterBlockEntry> table = {
+        FLUIDSIM_INT_PARAMETER("fluid_open_boundary_width", getFluidOpenBoundaryWidth, setFluidOpenBoundaryWidth),
+        FLUIDSIM_BOOL_PARAMETER("enable_diffuse_particle_emission", isDiffuseParticleEmissionEnabled, enableDiffuseParticleEmission, disableDiffuseParticleEmission),
+        FLUIDSIM_BOOL_PARAMETER("enable_diffuse_foam", isDiffuseFoamEnabled, enableDiffuseFoam, disableDiffuseFoam),
+        FLUIDSIM_BOOL_PARAMETER("enable_diffuse_bubbles", isDiffuseBubblesEnabled, enableDiffuseBubbles, disableDiffuseBubbles),
+        FLUIDSIM_BOOL_PARAMETER("enable_diffuse_spray", isDiffuseSprayEnabled, enableDiffuseSpray, disableDiffuseSpray),
+        FLUIDSIM_BOOL_PARAMETER("enable_diffuse_dust", isDiffuseDustEnabled, enableDiffuseDust, disableDiffuseDust),
+        FLUIDSIM_BOOL_PARAMETER("enable_boundary_diffuse_dust_emission", isBoundaryDustDiffuseEmissionEnabled, enableBoundaryDiffuseDustEmission, disableBoundaryDiffuseDustEmission),
+        FLUIDSIM_BOOL_PARAMETER("enable_whitewater_motion_blur", isWhitewaterMotionBlurEnabled, enableWhitewaterMotionBlur, disableWhitewaterMotionBlur),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_emitter_generation_rate", getDiffuseEmitterGenerationRate, setDiffuseEmitterGenerationRate),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_particle_wavecrest_emission_rate", getDiffuseParticleWavecrestEmissionRate, setDiffuseParticleWavecrestEmissionRate),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_particle_turbulence_emission_rate", getDiffuseParticleTurbulenceEmissionRate, setDiffuseParticleTurbulenceEmissionRate),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_particle_dust_emission_rate", getDiffuseParticleDustEmissionRate, setDiffuseParticleDustEmissionRate),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_spray_emission_speed", getDiffuseSprayEmissionSpeed, setDiffuseSprayEmissionSpeed),
+        FLUIDSIM_DOUBLE_PARAMETER("min_diffuse_emitter_energy", getMinDiffuseEmitterEnergy, setMinDiffuseEmitterEnergy),
+        FLUIDSIM_DOUBLE_PARAMETER("max_diffuse_emitter_energy", getMaxDiffuseEmitterEnergy, setMaxDiffuseEmitterEnergy),
+        FLUIDSIM_DOUBLE_PARAMETER("min_diffuse_wavecrest_curvature", getMinDiffuseWavecrestCurvature, setMinDiffuseWavecrestCurvature),
+        FLUIDSIM_DOUBLE_PARAMETER("max_diffuse_wavecrest_curvature", getMaxDiffuseWavecrestCurvature, setMaxDiffuseWavecrestCurvature),
+        FLUIDSIM_DOUBLE_PARAMETER("min_diffuse_turbulence", getMinDiffuseTurbulence, setMinDiffuseTurbulence),
+        FLUIDSIM_DOUBLE_PARAMETER("max_diffuse_turbulence", getMaxDiffuseTurbulence, setMaxDiffuseTurbulence),
+        FLUIDSIM_INT_PARAMETER("max_num_diffuse_particles", getMaxNumDiffuseParticles, setMaxNumDiffuseParticles),
+        FLUIDSIM_BOOL_PARAMETER("enable_whitewater_camera_lod", isWhitewaterCameraLODEnabled, enableWhitewaterCameraLOD, disableWhitewaterCameraLOD),
+        FLUIDSIM_DOUBLE_PARAMETER("whitewater_camera_frustum_padding", getWhitewaterCameraFrustumPadding, setWhitewaterCameraFrustumPadding),
+        FLUIDSIM_DOUBLE_PARAMETER("whitewater_camera_lod_min_factor", getWhitewaterCameraLODMinFactor, setWhitewaterCameraLODMinFactor),
+        FLUIDSIM_DOUBLE_PARAMETER("min_diffuse_particle_lifetime", getMinDiffuseParticleLifetime, setMinDiffuseParticleLifetime),
+        FLUIDSIM_DOUBLE_PARAMETER("max_diffuse_particle_lifetime", getMaxDiffuseParticleLifetime, setMaxDiffuseParticleLifetime),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_particle_lifetime_variance", getDiffuseParticleLifetimeVariance, setDiffuseParticleLifetimeVariance),
+        FLUIDSIM_DOUBLE_PARAMETER("foam_particle_lifetime_modifier", getFoamParticleLifetimeModifier, setFoamParticleLifetimeModifier),
+        FLUIDSIM_DOUBLE_PARAMETER("bubble_particle_lifetime_modifier", getBubbleParticleLifetimeModifier, setBubbleParticleLifetimeModifier),
+        FLUIDSIM_DOUBLE_PARAMETER("spray_particle_lifetime_modifier", getSprayParticleLifetimeModifier, setSprayParticleLifetimeModifier),
+        FLUIDSIM_DOUBLE_PARAMETER("dust_particle_lifetime_modifier", getDustParticleLifetimeModifier, setDustParticleLifetimeModifier),
+        FLUIDSIM_LIMIT_BEHAVIOUR_PARAMETER("diffuse_foam_limit_behaviour", getDiffuseFoamLimitBehaviour, setDiffuseFoamLimitBehaviour),
+        FLUIDSIM_LIMIT_BEHAVIOUR_PARAMETER("diffuse_bubble_limit_behaviour", getDiffuseBubbleLimitBehaviour, setDiffuseBubbleLimitBehaviour),
+        FLUIDSIM_LIMIT_BEHAVIOUR_PARAMETER("diffuse_spray_limit_behaviour", getDiffuseSprayLimitBehaviour, setDiffuseSprayLimitBehaviour),
+        FLUIDSIM_LIMIT_BEHAVIOUR_PARAMETER("diffuse_dust_limit_behaviour", getDiffuseDustLimitBehaviour, setDiffuseDustLimitBehaviour),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_foam_layer_depth", getDiffuseFoamLayerDepth, setDiffuseFoamLayerDepth),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_foam_layer_offset", getDiffuseFoamLayerOffset, setDiffuseFoamLayerOffset),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_foam_advection_strength", getDiffuseFoamAdvectionStrength, setDiffuseFoamAdvectionStrength),
+        FLUIDSIM_BOOL_PARAMETER("enable_diffuse_preserve_foam", isDiffusePreserveFoamEnabled, enableDiffusePreserveFoam, disableDiffusePreserveFoam),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_foam_preservation_rate", getDiffuseFoamPreservationRate, setDiffuseFoamPreservationRate),
+        FLUIDSIM_DOUBLE_PARAMETER("min_diffuse_foam_density", getMinDiffuseFoamDensity, setMinDiffuseFoamDensity),
+        FLUIDSIM_DOUBLE_PARAMETER("max_diffuse_foam_density", getMaxDiffuseFoamDensity, setMaxDiffuseFoamDensity),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_bubble_drag_coefficient", getDiffuseBubbleDragCoefficient, setDiffuseBubbleDragCoefficient),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_bubble_bouyancy_coefficient", getDiffuseBubbleBouyancyCoefficient, setDiffuseBubbleBouyancyCoefficient),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_dust_drag_coefficient", getDiffuseDustDragCoefficient, setDiffuseDustDragCoefficient),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_dust_bouyancy_coefficient", getDiffuseDustBouyancyCoefficient, setDiffuseDustBouyancyCoefficient),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_spray_drag_coefficient", getDiffuseSprayDragCoefficient, setDiffuseSprayDragCoefficient),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_obstacle_influence_base_level", getDiffuseObstacleInfluenceBaseLevel, setDiffuseObstacleInfluenceBaseLevel),
+        FLUIDSIM_DOUBLE_PARAMETER("diffuse_obstacle_influence_decay_rate", getDiffuseObstacleInfluenceDecayRate, setDiffuseObstacleInfluenceDecayRate),
+        FLUIDSIM_DOUBLE_PARAMETER("force_field_weight_fluid_particles", getForceFieldWeightFluidParticles, setForceFieldWeightFluidParticles),
+        FLUIDSIM_DOUBLE_PARAMETER("force_field_weight_whitewater_foam", getForceFieldWeightWhitewaterFoam, setForceFieldWeightWhitewaterFoam),
+        FLUIDSIM_DOUBLE_PARAMETER("force_field_weight_whitewater_bubble", getForceFieldWeightWhitewaterBubble, setForceFieldWeightWhitewaterBubble),
+        FLUIDSIM_DOUBLE_PARAMETER("force_field_weight_whitewater_spray", getForceFieldWeightWhitewaterSpray, setForceFieldWeightWhitewaterSpray),
+        FLUIDSIM_DOUBLE_PARAMETER("force_field_weight_whitewater_dust", getForceFieldWeightWhitewaterDust, setForceFieldWeightWhitewaterDust),
+        FLUIDSIM_DOUBLE_PARAMETER("viscosity", getViscosity, setViscosity),
+        FLUIDSIM_DOUBLE_PARAMETER("viscosity_solver_error_tolerance", getViscositySolverErrorTolerance, setViscositySolverErrorTolerance),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_tension", getSurfaceTension, setSurfaceTension),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_tension_condition_number", getSurfaceTensionConditionNumber, setSurfaceTensionConditionNumber),
+        FLUIDSIM_BOOL_PARAMETER("enable_sheet_seeding", isSheetSeedingEnabled, enableSheetSeeding, disableSheetSeeding),
+        FLUIDSIM_DOUBLE_PARAMETER("sheet_fill_rate", getSheetFillRate, setSheetFillRate),
+        FLUIDSIM_DOUBLE_PARAMETER("sheet_fill_threshold", getSheetFillThreshold, setSheetFillThreshold),
+        FLUIDSIM_DOUBLE_PARAMETER("boundary_friction", getBoundaryFriction, setBoundaryFriction),
+        FLUIDSIM_DOUBLE_PARAMETER("fluid_particle_output_amount", getFluidParticleOutputAmount, setFluidParticleOutputAmount),
+        FLUIDSIM_BOOL_PARAMETER("enable_fluid_particle_surface_output", isFluidParticleSurfaceOutputEnabled, enableFluidParticleSurfaceOutput, disableFluidParticleSurfaceOutput),
+        FLUIDSIM_BOOL_PARAMETER("enable_fluid_particle_boundary_output", isFluidParticleBoundaryOutputEnabled, enableFluidParticleBoundaryOutput, disableFluidParticleBoundaryOutput),
+        FLUIDSIM_BOOL_PARAMETER("enable_fluid_particle_interior_output", isFluidParticleInteriorOutputEnabled, enableFluidParticleInteriorOutput, disableFluidParticleInteriorOutput),
+        FLUIDSIM_INT_PARAMETER("fluid_particle_source_id_blacklist", getFluidParticleSourceIDBlacklist, setFluidParticleSourceIDBlacklist),
+        FLUIDSIM_BOOL_PARAMETER("enable_surface_reconstruction", isSurfaceReconstructionEnabled, enableSurfaceReconstruction, disableSurfaceReconstruction),
+        FLUIDSIM_INT_PARAMETER("surface_subdivision_level", getSurfaceSubdivisionLevel, setSurfaceSubdivisionLevel),
+        FLUIDSIM_INT_PARAMETER("num_polygonizer_slices", getNumPolygonizerSlices, setNumPolygonizerSlices),
+        FLUIDSIM_BOOL_PARAMETER("enable_surface_camera_lod", isSurfaceCameraLODEnabled, enableSurfaceCameraLOD, disableSurfaceCameraLOD),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_camera_frustum_padding", getSurfaceCameraFrustumPadding, setSurfaceCameraFrustumPadding),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_camera_lod_pixel_size", getSurfaceCameraLODPixelSize, setSurfaceCameraLODPixelSize),
+        FLUIDSIM_INT_PARAMETER("surface_camera_lod_max_level", getSurfaceCameraLODMaxLevel, setSurfaceCameraLODMaxLevel),
+        FLUIDSIM_DOUBLE_PARAMETER("marker_particle_scale", getMarkerParticleScale, setMarkerParticleScale),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_smoothing_value", getSurfaceSmoothingValue, setSurfaceSmoothingValue),
+        FLUIDSIM_INT_PARAMETER("surface_smoothing_iterations", getSurfaceSmoothingIterations, setSurfaceSmoothingIterations),
+        FLUIDSIM_BOOL_PARAMETER("enable_obstacle_meshing_offset", isObstacleMeshingOffsetEnabled, enableObstacleMeshingOffset, disableObstacleMeshingOffset),
+        FLUIDSIM_DOUBLE_PARAMETER("obstacle_meshing_offset", getObstacleMeshingOffset, setObstacleMeshingOffset),
+        FLUIDSIM_BOOL_PARAMETER("enable_remove_surface_near_domain", isRemoveSurfaceNearDomainEnabled, enableRemoveSurfaceNearDomain, disableRemoveSurfaceNearDomain),
+        FLUIDSIM_INT_PARAMETER("remove_surface_near_domain_distance", getRemoveSurfaceNearDomainDistance, setRemoveSurfaceNearDomainDistance),
+        FLUIDSIM_BOOL_PARAMETER("enable_inverted_contact_normals", isInvertedContactNormalsEnabled, enableInvertedContactNormals, disableInvertedContactNormals),
+        FLUIDSIM_BOOL_PARAMETER("enable_surface_motion_blur", isSurfaceMotionBlurEnabled, enableSurfaceMotionBlur, disableSurfaceMotionBlur),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_age_attribute_radius", getSurfaceAgeAttributeRadius, setSurfaceAgeAttributeRadius),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_lifetime_attribute_radius", getSurfaceLifetimeAttributeRadius, setSurfaceLifetimeAttributeRadius),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_lifetime_attribute_death_time", getSurfaceLifetimeAttributeDeathTime, setSurfaceLifetimeAttributeDeathTime),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_whitewater_proximity_attribute_radius", getSurfaceWhitewaterProximityAttributeRadius, setSurfaceWhitewaterProximityAttributeRadius),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_color_attribute_radius", getSurfaceColorAttributeRadius, setSurfaceColorAttributeRadius),
+        FLUIDSIM_BOOL_PARAMETER("enable_surface_color_attribute_mixing", isSurfaceColorAttributeMixingEnabled, enableSurfaceColorAttributeMixing, disableSurfaceColorAttributeMixing),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_color_attribute_mixing_rate", getSurfaceColorAttributeMixingRate, setSurfaceColorAttributeMixingRate),
+        FLUIDSIM_DOUBLE_PARAMETER("surface_color_attribute_mixing_radius", getSurfaceColorAttributeMixingRadius, setSurfaceColorAttributeMixingRadius),
+        FLUIDSIM_INT_PARAMETER("min_time_steps_per_frame", getMinTimeStepsPerFrame, setMinTimeStepsPerFrame),
+        FLUIDSIM_INT_PARAMETER("max_time_steps_per_frame", getMaxTimeStepsPerFrame, setMaxTimeStepsPerFrame),
+        FLUIDSIM_BOOL_PARAMETER("enable_adaptive_obstacle_time_stepping", isAdaptiveObstacleTimeSteppingEnabled, enableAdaptiveObstacleTimeStepping, disableAdaptiveObstacleTimeStepping),
+        FLUIDSIM_BOOL_PARAMETER("enable_adaptive_force_field_time_stepping", isAdaptiveForceFieldTimeSteppingEnabled, enableAdaptiveForceFieldTimeStepping, disableAdaptiveForceFieldTimeStepping),
+        FLUIDSIM_DOUBLE_PARAMETER("marker_particle_jitter_factor", getMarkerParticleJitterFactor, setMarkerParticleJitterFactor),
+        FLUIDSIM_BOOL_PARAMETER("jitter_surface_marker_particles", isJitterSurfaceMarkerParticlesEnabled, enableJitterSurfaceMarkerParticles, disableJitterSurfaceMarkerParticles),
+        FLUIDSIM_INT_PARAMETER("pressure_solver_max_iterations", getPressureSolverMaxIterations, setPressureSolverMaxIterations),
+        FLUIDSIM_INT_PARAMETER("viscosity_solver_max_iterations", getViscositySolverMaxIterations, setViscositySolverMaxIterations),
+        FLUIDSIM_DOUBLE_PARAMETER("PICFLIP_ratio", getPICFLIPRatio, setPICFLIPRatio),
+        FLUIDSIM_DOUBLE_PARAMETER("PICAPIC_ratio", getPICAPICRatio, setPICAPICRatio),
+        FLUIDSIM_INT_PARAMETER("CFL_condition_number", getCFLConditionNumber, setCFLConditionNumber),
+        FLUIDSIM_BOOL_PARAMETER("enable_extreme_velocity_removal", isExtremeVelocityRemovalEnabled, enableExtremeVelocityRemoval, disableExtremeVelocityRemoval),
+        FLUIDSIM_INT_PARAMETER("max_thread_count", getMaxThreadCount, setMaxThreadCount),
+        FLUIDSIM_BOOL_PARAMETER("enable_asynchronous_meshing", isAsynchronousMeshingEnabled, enableAsynchronousMeshing, disableAsynchronousMeshing),
+        FLUIDSIM_BOOL_PARAMETER("enable_fracture_optimization", isFractureOptimizationEnabled, enableFractureOptimization, disableFractureOptimization),
+        FLUIDSIM_BOOL_PARAMETER("enable_sparse_liquid_level_set", isSparseLiquidLevelSetEnabled, enableSparseLiquidLevelSet, disableSparseLiquidLevelSet),
+        FLUIDSIM_BOOL_PARAMETER("enable_marker_particle_sorting", isMarkerParticleSortingEnabled, enableMarkerParticleSorting, disableMarkerParticleSorting),
+        FLUIDSIM_BOOL_PARAMETER("enable_static_solid_levelset_precomputation", isStaticSolidLevelSetPrecomputationEnabled, enableStaticSolidLevelSetPrecomputation, disableStaticSolidLevelSetPrecomputation),
+        FLUIDSIM_BOOL_PARAMETER("enable_temporary_mesh_levelset", isTemporaryMeshLevelSetEnabled, enableTemporaryMeshLevelSet, disableTemporaryMeshLevelSet),
+        FLUIDSIM_BOOL_PARAMETER("enable_rigid_obstacle_levelset_reuse", isRigidObstacleLevelSetReuseEnabled, enableRigidObstacleLevelSetReuse, disableRigidObstacleLevelSetReuse),
+        FLUIDSIM_BOOL_PARAMETER("enable_obstacle_mesh_decimation", isObstacleMeshDecimationEnabled, enableObstacleMeshDecimation, disableObstacleMeshDecimation),
+        FLUIDSIM_BOOL_PARAMETER("enable_internal_obstacle_mesh_output", isInternalObstacleMeshOutputEnabled, enableInternalObstacleMeshOutput, disableInternalObstacleMeshOutput),
+        FLUIDSIM_BOOL_PARAMETER("enable_force_field_debug_output", isForceFieldDebugOutputEnabled, enableForceFieldDebugOutput, disableForceFieldDebugOutput),
+        FLUIDSIM_BOOL_PARAMETER("enable_adaptive_substepping", isAdaptiveSubsteppingEnabled, enableAdaptiveSubstepping, disableAdaptiveSubstepping)
+    };
+
+    return table;
+}
+
+#undef FLUIDSIM_DOUBLE_PARAMETER
+#undef FLUIDSIM_INT_PARAMETER
+#undef FLUIDSIM_BOOL_PARAMETER
+#undef FLUIDSIM_LIMIT_BEHAVIOUR_PARAMETER
+
+void FluidSimulation::_validateParameterBlockIDs(std::vector<int> &ids) {
+    int numParameters = (int)_getParameterBlockTable().size();
+    for (size_t i = 0; i < ids.size(); i++) {
+        if (ids[i] < 0 || ids[i] >= numParameters) {
+            std::string msg = "Error: invalid parameter block ID.\n";
+            msg += "id: " + _toString(ids[i]) + "\n";
+            throw std::domain_error(msg);
+        }
+    }
+}
+
 
 /********************************************************************************
     Initializing the Fluid Simulator
@@ -4148,9 +4789,15 @@ void FluidSimulation::_initializeParticleSystems() {
     _markerParticles.addAttributeVector3("VELOCITY");
 
     if (_velocityTransferMethod == VelocityTransferMethod::APIC) {
-        _markerParticles.addAttributeVector3("AFFINEX");
-        _markerParticles.addAttributeVector3("AFFINEY");
-        _markerParticles.addAttributeVector3("AFFINEZ");
+        if (_isCompactParticleAttributesEnabled) {
+            _markerParticles.addAttributeVector3Half("AFFINEX");
+            _markerParticles.addAttributeVector3Half("AFFINEY");
+            _markerParticles.addAttributeVector3Half("AFFINEZ");
+        } else {
+            _markerParticles.addAttributeVector3("AFFINEX");
+            _markerParticles.addAttributeVector3("AFFINEY");
+            _markerParticles.addAttributeVector3("AFFINEZ");
+        }
     }
 
     if (_isSurfaceAgeAttributeEnabled || _isFluidParticleAgeAttributeEnabled) {
@@ -4166,7 +4813,11 @@ void FluidSimulation::_initializeParticleSystems() {
     }
 
     if (_isSurfaceSourceIDAttributeEnabled || _isFluidParticleSourceIDAttributeEnabled) {
-        _markerParticles.addAttributeInt("SOURCEID");
+        if (_isCompactParticleAttributesEnabled) {
+            _markerParticles.addAttributeUInt16("SOURCEID");
+        } else {
+            _markerParticles.addAttributeInt("SOURCEID");
+        }
     }
 
     if (_isSurfaceSourceViscosityAttributeEnabled) {
@@ -4174,7 +4825,11 @@ void FluidSimulation::_initializeParticleSystems() {
     }
 
     if (_isSurfaceDensityAttributeEnabled || _isFluidParticleDensityAttributeEnabled) {
-        _markerParticles.addAttributeFloat("DENSITY", 1.0);
+        if (_isCompactParticleAttributesEnabled) {
+            _markerParticles.addAttributeFloatHalf("DENSITY", 1.0);
+        } else {
+            _markerParticles.addAttributeFloat("DENSITY", 1.0);
+        }
     }
 
     if (_isFluidParticleIDAttributeEnabled) {
@@ -4264,7 +4919,11 @@ void FluidSimulation::_addMarkerParticles(std::vector<MarkerParticle> &particles
     int idLimit = _getFluidParticleOutputIDLimit();
 
     std::vector<int> *sourceids = nullptr;
-    if (_isSurfaceSourceIDAttributeEnabled || _isFluidParticleSourceIDAttributeEnabled) {
+    std::vector<uint16_t> *sourceidsCompact = nullptr;
+    if ((_isSurfaceSourceIDAttributeEnabled || _isFluidParticleSourceIDAttributeEnabled) && 
+            _isCompactParticleAttributesEnabled) {
+        _markerParticles.getAttributeValues("SOURCEID", sourceidsCompact);
+    } else if (_isSurfaceSourceIDAttributeEnabled || _isFluidParticleSourceIDAttributeEnabled) {
         _markerParticles.getAttributeValues("SOURCEID", sourceids);
     }
 
@@ -4274,7 +4933,11 @@ void FluidSimulation::_addMarkerParticles(std::vector<MarkerParticle> &particles
     }
 
     std::vector<float> *sourcedensities = nullptr;
-    if (_isSurfaceDensityAttributeEnabled || _isFluidParticleDensityAttributeEnabled) {
+    std::vector<HalfFloat16> *sourcedensitiesCompact = nullptr;
+    if ((_isSurfaceDensityAttributeEnabled || _isFluidParticleDensityAttributeEnabled) && 
+            _isCompactParticleAttributesEnabled) {
+        _markerParticles.getAttributeValues("DENSITY", sourcedensitiesCompact);
+    } else if (_isSurfaceDensityAttributeEnabled || _isFluidParticleDensityAttributeEnabled) {
         _markerParticles.getAttributeValues("DENSITY", sourcedensities);
     }
 
@@ -4305,7 +4968,9 @@ void FluidSimulation::_addMarkerParticles(std::vector<MarkerParticle> &particles
             positions->push_back(mp.position);
             velocities->push_back(mp.velocity);
 
-            if (_isSurfaceSourceIDAttributeEnabled || _isFluidParticleSourceIDAttributeEnabled) {
+            if (sourceidsCompact != nullptr) {
+                sourceidsCompact->push_back(_getCompactSourceID(attributes.sourceID));
+            } else if (sourceids != nullptr) {
                 sourceids->push_back(attributes.sourceID);
             }
 
@@ -4313,7 +4978,9 @@ void FluidSimulation::_addMarkerParticles(std::vector<MarkerParticle> &particles
                 sourceviscosities->push_back(attributes.sourceViscosity);
             }
 
-            if (_isSurfaceDensityAttributeEnabled) {
+            if (_isSurfaceDensityAttributeEnabled && sourcedensitiesCompact != nullptr) {
+                sourcedensitiesCompact->push_back(HalfFloat16(attributes.sourceDensity));
+            } else if (_isSurfaceDensityAttributeEnabled) {
                 sourcedensities->push_back(attributes.sourceDensity);
             }
 
@@ -4364,6 +5031,21 @@ void FluidSimulation::_initializeSimulation() {
     _logfile.log(std::ostringstream().flush() << 
                  "Initializing Simulation:" << std::endl);
 
+    _logfile.log("Thread Count:                \t", ThreadUtils::getMaxThreadCount(), 1);
+    _logfile.log("Interpolation Kernel:        \t",
+                 std::string(Interpolation::getTrilinearInterpolationKernelName()), 1);
+
+    std::string preconditionerName = "MIC";
+    if (_pressureSolverPreconditioner == PressureSolverPreconditioner::Multigrid) {
+        preconditionerName = "Multigrid";
+    } else if (_pressureSolverPreconditioner == PressureSolverPreconditioner::ParallelMIC) {
+        preconditionerName = "Parallel MIC";
+    }
+    if (_getPressureSolverPreconditioner() == PressureSolverPreconditioner::Jacobi) {
+        preconditionerName = "Jacobi (matrix-free solver, overrides " + preconditionerName + " setting)";
+    }
+    _logfile.log("Pressure Preconditioner:     \t", preconditionerName, 1);
+
     _initializeSimulationGrids(_isize, _jsize, _ksize, _dx);
     _initializeParticleSystems();
 
@@ -4962,7 +5644,14 @@ void FluidSimulation::_loadMarkerParticles(MarkerParticleLoadData &particleData,
     std::vector<vmath::vec3> *affineX = nullptr;
     std::vector<vmath::vec3> *affineY = nullptr;
     std::vector<vmath::vec3> *affineZ = nullptr;
-    if (loadAffineData) {
+    std::vector<HalfVector3> *affineHalfX = nullptr;
+    std::vector<HalfVector3> *affineHalfY = nullptr;
+    std::vector<HalfVector3> *affineHalfZ = nullptr;
+    if (loadAffineData && _isCompactParticleAttributesEnabled) {
+        _markerParticles.getAttributeValues("AFFINEX", affineHalfX);
+        _markerParticles.getAttributeValues("AFFINEY", affineHalfY);
+        _markerParticles.getAttributeValues("AFFINEZ", affineHalfZ);
+    } else if (loadAffineData) {
         _markerParticles.getAttributeValues("AFFINEX", affineX);
         _markerParticles.getAttributeValues("AFFINEY", affineY);
         _markerParticles.getAttributeValues("AFFINEZ", affineZ);
@@ -4984,7 +5673,10 @@ void FluidSimulation::_loadMarkerParticles(MarkerParticleLoadData &particleData,
     }
 
     std::vector<int> *sourceid = nullptr;
-    if (loadSourceIDData) {
+    std::vector<uint16_t> *sourceidCompact = nullptr;
+    if (loadSourceIDData && _isCompactParticleAttributesEnabled) {
+        _markerParticles.getAttributeValues("SOURCEID", sourceidCompact);
+    } else if (loadSourceIDData) {
         _markerParticles.getAttributeValues("SOURCEID", sourceid);
     }
 
@@ -4994,7 +5686,10 @@ void FluidSimulation::_loadMarkerParticles(MarkerParticleLoadData &particleData,
     }
 
     std::vector<float> *density = nullptr;
-    if (loadDensityData) {
+    std::vector<HalfFloat16> *densityCompact = nullptr;
+    if (loadDensityData && _isCompactParticleAttributesEnabled) {
+        _markerParticles.getAttributeValues("DENSITY", densityCompact);
+    } else if (loadDensityData) {
         _markerParticles.getAttributeValues("DENSITY", density);
     }
 
@@ -5016,7 +5711,12 @@ void FluidSimulation::_loadMarkerParticles(MarkerParticleLoadData &particleData,
             positions->push_back(mp.position);
             velocities->push_back(mp.velocity);
 
-            if (loadAffineData) {
+            if (loadAffineData && _isCompactParticleAttributesEnabled) {
+                MarkerParticleAffine ap = affineData.particles[i];
+                affineHalfX->push_back(HalfVector3(ap.affineX));
+                affineHalfY->push_back(HalfVector3(ap.affineY));
+                affineHalfZ->push_back(HalfVector3(ap.affineZ));
+            } else if (loadAffineData) {
                 MarkerParticleAffine ap = affineData.particles[i];
                 affineX->push_back(ap.affineX);
                 affineY->push_back(ap.affineY);
@@ -5038,7 +5738,10 @@ void FluidSimulation::_loadMarkerParticles(MarkerParticleLoadData &particleData,
                 color->push_back(c.color);
             }
 
-            if (loadSourceIDData) {
+            if (loadSourceIDData && _isCompactParticleAttributesEnabled) {
+                MarkerParticleSourceID sid = sourceIDData.particles[i];
+                sourceidCompact->push_back(_getCompactSourceID(sid.sourceid));
+            } else if (loadSourceIDData) {
                 MarkerParticleSourceID sid = sourceIDData.particles[i];
                 sourceid->push_back(sid.sourceid);
             }
@@ -5048,7 +5751,10 @@ void FluidSimulation::_loadMarkerParticles(MarkerParticleLoadData &particleData,
                 viscosity->push_back(vd.viscosity);
             }
 
-            if (loadDensityData) {
+            if (loadDensityData && _isCompactParticleAttributesEnabled) {
+                MarkerParticleDensity vd = densityData.particles[i];
+                densityCompact->push_back(HalfFloat16(vd.density));
+            } else if (loadDensityData) {
                 MarkerParticleDensity vd = densityData.particles[i];
                 density->push_back(vd.density);
             }
@@ -5216,6 +5922,36 @@ void FluidSimulation::_updatePrecomputedSolidLevelSet(double dt,
     _isPrecomputedSolidLevelSetUpToDate = true;
 }
 
+void FluidSimulation::_updateObstacleMeshDecimation() {
+    bool isChanged = false;
+    for (size_t i = 0; i < _obstacles.size(); i++) {
+        if (_obstacles[i]->isMeshDecimationEnabled() == _isObstacleMeshDecimationEnabled) {
+            continue;
+        }
+
+        if (_isObstacleMeshDecimationEnabled) {
+            _obstacles[i]->enableMeshDecimation();
+        } else {
+            _obstacles[i]->disableMeshDecimation();
+        }
+        isChanged = true;
+    }
+
+    if (isChanged) {
+        _isSolidLevelSetUpToDate = false;
+        _isPrecomputedSolidLevelSetUpToDate = false;
+    }
+}
+
+void FluidSimulation::_getAnimatedObstacleMeshLevelSet(MeshObject *obstacle, double dt, 
+                                                       float frameProgress, MeshLevelSet &levelset) {
+    if (_isRigidObstacleLevelSetReuseEnabled && obstacle->isRigidBody()) {
+        obstacle->getRigidBodyMeshLevelSet(dt, frameProgress, _solidLevelSetExactBand, levelset);
+    } else {
+        obstacle->getMeshLevelSet(dt, frameProgress, _solidLevelSetExactBand, levelset);
+    }
+}
+
 void FluidSimulation::_addAnimatedObjectsToSolidSDF(double dt) {
     std::vector<MeshObject*> inversedObstacles;
     std::vector<MeshObject*> normalObstacles;
@@ -5246,7 +5982,7 @@ void FluidSimulation::_addAnimatedObjectsToSolidSDF(double dt) {
     } else {
         for (size_t i = 0; i < normalObstacles.size(); i++) {
             _tempSolidSDF.reset();
-            normalObstacles[i]->getMeshLevelSet(dt, frameProgress, _solidLevelSetExactBand, _tempSolidSDF);
+            _getAnimatedObstacleMeshLevelSet(normalObstacles[i], dt, frameProgress, _tempSolidSDF);
             _solidSDF.calculateUnion(_tempSolidSDF);
         }
     }
@@ -5258,7 +5994,7 @@ void FluidSimulation::_addAnimatedObjectsToSolidSDF(double dt) {
         for (size_t i = 0; i < inversedObstacles.size(); i++) {
             _tempSolidSDF.reset();
             _tempSolidSDF.disableVelocityData();
-            inversedObstacles[i]->getMeshLevelSet(dt, frameProgress, _solidLevelSetExactBand, _tempSolidSDF);
+            _getAnimatedObstacleMeshLevelSet(inversedObstacles[i], dt, frameProgress, _tempSolidSDF);
             tempSolidInversedSDF.calculateUnion(_tempSolidSDF);
         }
 
@@ -5570,15 +6306,6 @@ void FluidSimulation::_updateObstacleObjects(double) {
     _logfile.logString(_logfile.getTime() + " COMPLETE    Update Obstacle Objects");
 }
 
-void FluidSimulation::_launchUpdateObstacleObjectsThread(double dt) {
-    _updateObstacleObjectsThread = std::thread(&FluidSimulation::_updateObstacleObjects, 
-                                               this, dt);
-}
-    
-void FluidSimulation::_joinUpdateObstacleObjectsThread() {
-    _updateObstacleObjectsThread.join();
-}
-
 /********************************************************************************
     #. Update Fluid Material
 ********************************************************************************/
@@ -5589,6 +6316,12 @@ void FluidSimulation::_updateLiquidLevelSet() {
     StopWatch t;
     t.start();
 
+    if (_isSparseLiquidLevelSetEnabled && !_liquidSDF.isSparseStorageEnabled()) {
+        _liquidSDF.enableSparseStorage();
+    } else if (!_isSparseLiquidLevelSetEnabled && _liquidSDF.isSparseStorageEnabled()) {
+        _liquidSDF.disableSparseStorage();
+    }
+
     if (_isFluidInSimulation()) {
 
         double radius = _liquidSDFParticleRadius;
@@ -5602,6 +6335,13 @@ void FluidSimulation::_updateLiquidLevelSet() {
 
     t.stop();
 
+    if (_liquidSDF.isSparseStorageEnabled()) {
+        _logfile.log(std::ostringstream().flush() << 
+                     _logfile.getTime() << " Liquid level set tiles allocated:\t" << 
+                     _liquidSDF.getNumAllocatedTiles() << " (" << 
+                     _liquidSDF.getMemoryUsage() / 1048576.0 << " MB)" << std::endl);
+    }
+
     _timingData.updateLiquidLevelSet += t.getTime();
 
     _logfile.logString(_logfile.getTime() + " COMPLETE    Update Liquid Level Set");
@@ -5613,6 +6353,10 @@ void FluidSimulation::_launchUpdateLiquidLevelSetThread() {
 
 void FluidSimulation::_joinUpdateLiquidLevelSetThread() {
     _updateLiquidLevelSetThread.join();
+    _postProcessLiquidLevelSet();
+}
+
+void FluidSimulation::_postProcessLiquidLevelSet() {
     _liquidSDF.postProcessSignedDistanceField(_solidSDF);
 }
 
@@ -5642,6 +6386,7 @@ _logfile.logString(_logfile.getTime() + " BEGIN       Advect Velocity Field");
         params.vfield = &_MACVelocity;
         params.validVelocities = &_validVelocities;
         params.particleRadius = radius;
+        params.bufferArena = &_bufferArena;
 
         if (_velocityTransferMethod == VelocityTransferMethod::FLIP) {
             params.velocityTransferMethod = VelocityAdvectorTransferMethod::FLIP;
@@ -5660,14 +6405,6 @@ _logfile.logString(_logfile.getTime() + " BEGIN       Advect Velocity Field");
     _logfile.logString(_logfile.getTime() + " COMPLETE    Advect Velocity Field");
 }
 
-void FluidSimulation::_launchAdvectVelocityFieldThread() {
-    _advectVelocityFieldThread = std::thread(&FluidSimulation::_advectVelocityField, this);
-}
-
-void FluidSimulation::_joinAdvectVelocityFieldThread() {
-    _advectVelocityFieldThread.join();
-}
-
 void FluidSimulation::_saveVelocityField() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Save Velocity Field");
 
@@ -5675,6 +6412,11 @@ void FluidSimulation::_saveVelocityField() {
     t.start();
 
     if (_isFluidOrWhitewaterInSimulation() || _isFluidGeneratingThisFrame()) {
+        // Saved velocity grids are recycled between substeps so that
+        // the copy does not need to allocate new grids
+        _bufferArena.acquire(_isize + 1, _jsize, _ksize, *(_savedVelocityField.getArray3dU()));
+        _bufferArena.acquire(_isize, _jsize + 1, _ksize, *(_savedVelocityField.getArray3dV()));
+        _bufferArena.acquire(_isize, _jsize, _ksize + 1, *(_savedVelocityField.getArray3dW()));
         _savedVelocityField = _MACVelocity;
     }
 
@@ -5689,6 +6431,9 @@ void FluidSimulation::_deleteSavedVelocityField() {
 
     StopWatch t;
     t.start();
+    _bufferArena.release(*(_savedVelocityField.getArray3dU()));
+    _bufferArena.release(*(_savedVelocityField.getArray3dV()));
+    _bufferArena.release(*(_savedVelocityField.getArray3dW()));
     _savedVelocityField = MACVelocityField();
     t.stop();
     _timingData.deleteSavedVelocityField += t.getTime();
@@ -5896,18 +6641,9 @@ void FluidSimulation::_applyForceFieldGridForcesMT(ValidVelocityComponentGrid &e
         gridsize = _isize * _jsize * (_ksize + 1);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_applyForceFieldGridForcesThread, this,
-                                 intervals[i], intervals[i + 1], &ex, dt, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)gridsize, [&](int startidx, int endidx) {
+        _applyForceFieldGridForcesThread(startidx, endidx, &ex, dt, dir);
+    });
 }
 
 void FluidSimulation::_applyForceFieldGridForcesThread(int startidx, int endidx, 
@@ -6032,6 +6768,8 @@ void FluidSimulation::_applyViscosityToVelocityField(double dt) {
     params.viscosity = &_viscosity;
     params.errorTolerance = _viscositySolverErrorTolerance;
     params.maxIterations = _maxViscositySolveIterations;
+    params.isMatrixFree = _isMatrixFreeViscositySolverEnabled;
+    params.bufferArena = &_bufferArena;
 
     _viscositySolver = ViscositySolver();
     bool success = _viscositySolver.applyViscosityToVelocityField(params);
@@ -6093,18 +6831,9 @@ void FluidSimulation::_updateWeightGridMT(int dir) {
         gridsize = _isize * _jsize * _ksize;
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_updateWeightGridThread, this,
-                                 intervals[i], intervals[i + 1], dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)gridsize, [&](int startidx, int endidx) {
+        _updateWeightGridThread(startidx, endidx, dir);
+    });
 }
 
 void FluidSimulation::_updateWeightGridThread(int startidx, int endidx, int dir) {
@@ -6220,6 +6949,9 @@ void FluidSimulation::_pressureSolve(double dt) {
         }
 
         Array3d<float> pressureGrid(_isize, _jsize, _ksize, 0.0f);
+        if (_isPressureSolverWarmStartEnabled) {
+            _initializePressureSolverWarmStart(pressureGrid, dt);
+        }
 
         PressureSolverParameters params;
         params.cellwidth = _dx;
@@ -6227,11 +6959,14 @@ void FluidSimulation::_pressureSolve(double dt) {
         params.tolerance = _pressureSolveTolerance;
         params.acceptableTolerance = _pressureSolveAcceptableTolerance;
         params.maxIterations = _maxPressureSolveIterations;
+        params.preconditioner = _getPressureSolverPreconditioner();
+        params.isMatrixFree = _isMatrixFreePressureSolverEnabled;
+        params.bufferArena = &_bufferArena;
 
         params.velocityFieldFluid = &_MACVelocity;
         params.velocityFieldSolid = &(_solidSDF.getVelocityDataGrid()->field);
         params.validVelocities = &_validVelocities;
-        params.liquidSDF = _liquidSDF.getPhiGrid();
+        params.liquidSDF = &_liquidSDF;
         params.weightGrid = &_weightGrid;
         params.pressureGrid = &pressureGrid;
         params.densityGrid = &densityGrid;
@@ -6248,6 +6983,12 @@ void FluidSimulation::_pressureSolve(double dt) {
             psolver.applySolutionToVelocityField();
         }
 
+        if (_isPressureSolverWarmStartEnabled) {
+            // A failed solve is not used as the initial guess of the next substep
+            _previousPressureGrid = success ? pressureGrid : Array3d<float>();
+            _previousPressureDeltaTime = dt;
+        }
+
         _pressureSolverStatus = psolver.getSolverStatus();
         if (_currentFrameTimeStepNumber == 0) {
             _pressureSolverSuccess = success;
@@ -6275,6 +7016,29 @@ void FluidSimulation::_pressureSolve(double dt) {
     _logfile.logString(_logfile.getTime() + " COMPLETE    Solve Pressure System");
 }
 
+void FluidSimulation::_initializePressureSolverWarmStart(Array3d<float> &pressureGrid, double dt) {
+    if (_previousPressureGrid.width != pressureGrid.width || 
+            _previousPressureGrid.height != pressureGrid.height || 
+            _previousPressureGrid.depth != pressureGrid.depth || 
+            _previousPressureDeltaTime <= 0.0 || dt <= 0.0) {
+        return;
+    }
+
+    // The pressure system is scaled by the timestep, so pressure for the
+    // same divergence is inversely proportional to the timestep. Cells that 
+    // were not fluid in the previous substep start from a pressure of zero.
+    // The pressure solver maps the grid onto its matrix ordering through
+    // its GridIndexKeyMap.
+    float scale = (float)(_previousPressureDeltaTime / dt);
+    size_t gridsize = (size_t)pressureGrid.width * pressureGrid.height * pressureGrid.depth;
+    ThreadUtils::parallelFor(0, (int)gridsize, [&](int startidx, int endidx) {
+        for (int idx = startidx; idx < endidx; idx++) {
+            GridIndex g = Grid3d::getUnflattenedIndex(idx, pressureGrid.width, pressureGrid.height);
+            pressureGrid.set(g, scale * _previousPressureGrid(g));
+        }
+    });
+}
+
 /********************************************************************************
     #. Extrapolate Velocity Field
 ********************************************************************************/
@@ -6374,18 +7138,9 @@ void FluidSimulation::_constrainVelocityFieldMT(MACVelocityField &MACGrid, int d
         gridsize = _isize * _jsize * (_ksize + 1);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_constrainVelocityFieldThread, this,
-                                 intervals[i], intervals[i + 1], &MACGrid, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)gridsize, [&](int startidx, int endidx) {
+        _constrainVelocityFieldThread(startidx, endidx, &MACGrid, dir);
+    });
 }
 
 void FluidSimulation::_constrainVelocityFieldThread(int startidx, int endidx, 
@@ -6472,8 +7227,6 @@ void FluidSimulation::_updateDiffuseMaterial(double dt) {
     StopWatch t;
     t.start();
 
-    _updateDiffuseInfluenceGrid(dt);
-
     DiffuseParticleSimulationParameters params;
     params.isize = _isize;
     params.jsize = _jsize;
@@ -6516,6 +7269,15 @@ void FluidSimulation::_updateDiffuseMaterial(double dt) {
 }
 
 void FluidSimulation::_updateDiffuseInfluenceGrid(double dt) {
+    if (!_isDiffuseMaterialOutputEnabled) {
+        return;
+    }
+
+    _logfile.logString(_logfile.getTime() + " BEGIN       Update Diffuse Influence Grid");
+
+    StopWatch t;
+    t.start();
+
     int infi, infj, infk;
     _obstacleInfluenceGrid.getGridDimensions(&infi, &infj, &infk);
     if (infi != _isize + 1 || infj != _jsize + 1 || infk != _ksize + 1) {
@@ -6527,6 +7289,11 @@ void FluidSimulation::_updateDiffuseInfluenceGrid(double dt) {
     _obstacleInfluenceGrid.setBaseLevel(_diffuseObstacleInfluenceBaseLevel);
     _obstacleInfluenceGrid.setDecayRate(_diffuseObstacleInfluenceDecayRate);
     _obstacleInfluenceGrid.update(&_solidSDF, dt);
+
+    t.stop();
+    _timingData.updateDiffuseMaterial += t.getTime();
+
+    _logfile.logString(_logfile.getTime() + " COMPLETE    Update Diffuse Influence Grid");
 }
 
 /********************************************************************************
@@ -6592,13 +7359,18 @@ void FluidSimulation::_updateSheetSeeding() {
             _updateMarkerParticleViscosityAttributeGrid(tempViscosityAttributeGrid, tempViscosityAttributeValidGrid);
         }
 
-        std::vector<float> *densities;
+        std::vector<float> *densities = nullptr;
+        std::vector<HalfFloat16> *densitiesCompact = nullptr;
         Array3d<float> tempDensityAttributeGrid;
         Array3d<bool> tempDensityAttributeValidGrid;
         if (_isSurfaceDensityAttributeEnabled || _isFluidParticleDensityAttributeEnabled) {
             tempDensityAttributeGrid = _densityAttributeGrid;
             tempDensityAttributeValidGrid = _densityAttributeValidGrid;
-            _markerParticles.getAttributeValues("DENSITY", densities);
+            if (_isCompactParticleAttributesEnabled) {
+                _markerParticles.getAttributeValues("DENSITY", densitiesCompact);
+            } else {
+                _markerParticles.getAttributeValues("DENSITY", densities);
+            }
             _updateMarkerParticleDensityAttributeGrid(tempDensityAttributeGrid, tempDensityAttributeValidGrid);
         }
 
@@ -6669,7 +7441,11 @@ void FluidSimulation::_updateSheetSeeding() {
 
             if (_isSurfaceDensityAttributeEnabled || _isSurfaceDensityAttributeEnabled) {
                 float density = Interpolation::trilinearInterpolate(p, _dx, tempDensityAttributeGrid);
-                densities->push_back(density);
+                if (densitiesCompact != nullptr) {
+                    densitiesCompact->push_back(HalfFloat16(density));
+                } else {
+                    densities->push_back(density);
+                }
             }
 
             uint16_t idval = 0;
@@ -6773,13 +7549,24 @@ void FluidSimulation::_updatePICFLIPMarkerParticleVelocitiesThread(int startidx,
     _markerParticles.getAttributeValues("POSITION", positions);
     _markerParticles.getAttributeValues("VELOCITY", velocities);
 
-    for (int i = startidx; i < endidx; i++) {
-        vmath::vec3 pos = positions->at(i);
-        vmath::vec3 vel = velocities->at(i);
-        vmath::vec3 vPIC = _MACVelocity.evaluateVelocityAtPositionLinear(pos);
-        vmath::vec3 vFLIP = vel + vPIC - _savedVelocityField.evaluateVelocityAtPositionLinear(pos);
-        vmath::vec3 v = (float)_ratioPICFLIP * vPIC + (float)(1 - _ratioPICFLIP) * vFLIP;
-        velocities->at(i) = v;
+    // Grid velocities are evaluated in chunks using the batched interpolation
+    // kernels before blending
+    const int chunksize = 256;
+    vmath::vec3 vPICBuffer[chunksize];
+    vmath::vec3 vSavedBuffer[chunksize];
+    for (int chunkidx = startidx; chunkidx < endidx; chunkidx += chunksize) {
+        int n = std::min(chunksize, endidx - chunkidx);
+        const vmath::vec3 *chunkPositions = positions->data() + chunkidx;
+        _MACVelocity.evaluateVelocityAtPositionsLinear(chunkPositions, n, vPICBuffer);
+        _savedVelocityField.evaluateVelocityAtPositionsLinear(chunkPositions, n, vSavedBuffer);
+
+        for (int i = 0; i < n; i++) {
+            vmath::vec3 vel = velocities->at(chunkidx + i);
+            vmath::vec3 vPIC = vPICBuffer[i];
+            vmath::vec3 vFLIP = vel + vPIC - vSavedBuffer[i];
+            vmath::vec3 v = (float)_ratioPICFLIP * vPIC + (float)(1 - _ratioPICFLIP) * vFLIP;
+            velocities->at(chunkidx + i) = v;
+        }
     }
 }
 
@@ -6790,12 +7577,19 @@ void FluidSimulation::_updatePICFLIPMarkerParticleVelocitiesThread(int startidx,
 */
 void FluidSimulation::_updatePICAPICMarkerParticleVelocitiesThread(int startidx, int endidx) {
     std::vector<vmath::vec3> *positions, *velocities;
-    std::vector<vmath::vec3> *affineValuesX, *affineValuesY, *affineValuesZ;
+    std::vector<vmath::vec3> *affineValuesX = nullptr, *affineValuesY = nullptr, *affineValuesZ = nullptr;
+    std::vector<HalfVector3> *affineHalfValuesX = nullptr, *affineHalfValuesY = nullptr, *affineHalfValuesZ = nullptr;
     _markerParticles.getAttributeValues("POSITION", positions);
     _markerParticles.getAttributeValues("VELOCITY", velocities);
-    _markerParticles.getAttributeValues("AFFINEX", affineValuesX);
-    _markerParticles.getAttributeValues("AFFINEY", affineValuesY);
-    _markerParticles.getAttributeValues("AFFINEZ", affineValuesZ);
+    if (_isCompactParticleAttributesEnabled) {
+        _markerParticles.getAttributeValues("AFFINEX", affineHalfValuesX);
+        _markerParticles.getAttributeValues("AFFINEY", affineHalfValuesY);
+        _markerParticles.getAttributeValues("AFFINEZ", affineHalfValuesZ);
+    } else {
+        _markerParticles.getAttributeValues("AFFINEX", affineValuesX);
+        _markerParticles.getAttributeValues("AFFINEY", affineValuesY);
+        _markerParticles.getAttributeValues("AFFINEZ", affineValuesZ);
+    }
 
     int U = 0; int V = 1; int W = 2; 
 
@@ -6836,9 +7630,15 @@ void FluidSimulation::_updatePICAPICMarkerParticleVelocitiesThread(int startidx,
         }
 
         velocities->at(i) = _MACVelocity.evaluateVelocityAtPositionLinear(pos);
-        affineValuesX->at(i) = affineX;
-        affineValuesY->at(i) = affineY;
-        affineValuesZ->at(i) = affineZ;
+        if (_isCompactParticleAttributesEnabled) {
+            affineHalfValuesX->at(i) = HalfVector3(affineX);
+            affineHalfValuesY->at(i) = HalfVector3(affineY);
+            affineHalfValuesZ->at(i) = HalfVector3(affineZ);
+        } else {
+            affineValuesX->at(i) = affineX;
+            affineValuesY->at(i) = affineY;
+            affineValuesZ->at(i) = affineZ;
+        }
     }
 }
 
@@ -6961,6 +7761,7 @@ void FluidSimulation::_updateMarkerParticleVelocityAttributeGrid() {
     params.vfield = &_velocityAttributeGrid;
     params.validVelocities = &_velocityAttributeValidGrid;
     params.particleRadius = _liquidSDFParticleRadius;
+    params.bufferArena = &_bufferArena;
 
     if (_velocityTransferMethod == VelocityTransferMethod::FLIP) {
         params.velocityTransferMethod = VelocityAdvectorTransferMethod::FLIP;
@@ -7120,9 +7921,9 @@ void FluidSimulation::_updateMarkerParticleDensityAttributeGrid(Array3d<float> &
     densityAttributeValidGrid.fill(false);
 
     std::vector<vmath::vec3> *positions;
-    std::vector<float> *densities;
+    std::vector<float> densityValues;
     _markerParticles.getAttributeValues("POSITION", positions);
-    _markerParticles.getAttributeValues("DENSITY", densities);
+    std::vector<float> *densities = _getMarkerParticleDensityValues(densityValues);
     float radius = _densityAttributeRadius * _dx;
 
     AttributeTransferParameters<float> params;
@@ -7593,14 +8394,18 @@ void FluidSimulation::_updateMarkerParticleAttributes(double dt) {
     t.start();
 
     if (_isFluidInSimulation()) {
-        _updateMarkerParticleVelocityBasedAttributes();
-        _updateMarkerParticleAgeAttribute(dt);
-        _updateMarkerParticleLifetimeAttribute(dt);
-        _updateMarkerParticleWhitewaterProximityAttribute();
-        _updateMarkerParticleViscosityAttribute();
-        _updateMarkerParticleDensityAttribute();
-        _updateMarkerParticleColorAttribute(dt);
+        // Each update only modifies its own particle attribute and attribute 
+        // grid, so the updates can run concurrently
+        ThreadUtils::TaskGroup group;
+        group.run([this]() { _updateMarkerParticleVelocityBasedAttributes(); });
+        group.run([this, dt]() { _updateMarkerParticleAgeAttribute(dt); });
+        group.run([this, dt]() { _updateMarkerParticleLifetimeAttribute(dt); });
+        group.run([this]() { _updateMarkerParticleWhitewaterProximityAttribute(); });
+        group.run([this]() { _updateMarkerParticleViscosityAttribute(); });
+        group.run([this]() { _updateMarkerParticleDensityAttribute(); });
+        group.run([this, dt]() { _updateMarkerParticleColorAttribute(dt); });
         _updateMarkerParticleUIDAttribute();
+        group.wait();
     }
 
     t.stop();
@@ -7890,6 +8695,7 @@ void FluidSimulation::_advanceMarkerParticles(double dt) {
         }
 
         _removeMarkerParticles(_currentFrameDeltaTime);
+        _sortMarkerParticles();
 
     }
 
@@ -8355,6 +9161,93 @@ void FluidSimulation::_updateOutflowBoundary() {
     _markerParticles.removeParticles(isRemoved);
 }
 
+void FluidSimulation::_initializeMarkerParticleSortBlockRank() {
+    int bw = _markerParticleSortBlockWidth;
+    int bisize = (_isize + bw - 1) / bw;
+    int bjsize = (_jsize + bw - 1) / bw;
+    int bksize = (_ksize + bw - 1) / bw;
+    if (_markerParticleSortBlockRank.width == bisize && 
+            _markerParticleSortBlockRank.height == bjsize && 
+            _markerParticleSortBlockRank.depth == bksize) {
+        return;
+    }
+
+    std::vector<std::pair<unsigned long long int, int> > codes;
+    codes.reserve(bisize * bjsize * bksize);
+    for (int k = 0; k < bksize; k++) {
+        for (int j = 0; j < bjsize; j++) {
+            for (int i = 0; i < bisize; i++) {
+                int flatidx = Grid3d::getFlatIndex(i, j, k, bisize, bjsize);
+                codes.push_back(std::make_pair(Grid3d::getMortonCode(i, j, k), flatidx));
+            }
+        }
+    }
+    std::sort(codes.begin(), codes.end());
+
+    _markerParticleSortBlockRank = Array3d<int>(bisize, bjsize, bksize);
+    for (size_t rank = 0; rank < codes.size(); rank++) {
+        _markerParticleSortBlockRank.set(codes[rank].second, (int)rank);
+    }
+}
+
+void FluidSimulation::_sortMarkerParticles() {
+    if (!_isMarkerParticleSortingEnabled || _markerParticles.size() < 2) {
+        return;
+    }
+
+    _initializeMarkerParticleSortBlockRank();
+
+    std::vector<vmath::vec3> *positions;
+    _markerParticles.getAttributeValues("POSITION", positions);
+
+    int numParticles = (int)positions->size();
+    double blockdx = _markerParticleSortBlockWidth * _dx;
+    Array3d<int> *blockRank = &_markerParticleSortBlockRank;
+    std::vector<int> ranks(numParticles);
+    ThreadUtils::parallelFor(0, numParticles, [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            GridIndex b = Grid3d::positionToGridIndex(positions->at(i), blockdx);
+            b.i = std::max(0, std::min(b.i, blockRank->width - 1));
+            b.j = std::max(0, std::min(b.j, blockRank->height - 1));
+            b.k = std::max(0, std::min(b.k, blockRank->depth - 1));
+            ranks[i] = blockRank->get(b);
+        }
+    }, 100000);
+
+    // Disorder is measured as the fraction of neighbouring particles in
+    // memory that are out of block order
+    int numOutOfOrder = 0;
+    for (int i = 1; i < numParticles; i++) {
+        if (ranks[i] < ranks[i - 1]) {
+            numOutOfOrder++;
+        }
+    }
+
+    double disorder = (double)numOutOfOrder / (double)(numParticles - 1);
+    if (disorder < _markerParticleSortDisorderThreshold) {
+        return;
+    }
+
+    // Stable counting sort by block rank
+    std::vector<int> blockStart(blockRank->getNumElements() + 1, 0);
+    for (int i = 0; i < numParticles; i++) {
+        blockStart[ranks[i] + 1]++;
+    }
+    for (size_t i = 1; i < blockStart.size(); i++) {
+        blockStart[i] += blockStart[i - 1];
+    }
+
+    std::vector<size_t> order(numParticles);
+    for (int i = 0; i < numParticles; i++) {
+        order[blockStart[ranks[i]]++] = i;
+    }
+
+    _markerParticles.reorder(order);
+
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " Sorted marker particles (disorder: " << disorder << ")" << std::endl);
+}
+
 void FluidSimulation::_updateMeshFluidSources() {
     _updateInflowMeshFluidSources();
     _updateOutflowMeshFluidSources();
@@ -8767,6 +9660,14 @@ void FluidSimulation::_generateOutputSurface(TriangleMesh &surface, TriangleMesh
     if (_isPreviewSurfaceMeshEnabled) {
         params.previewdx = _previewdx;
     }
+    params.isCameraAdaptive = _isSurfaceCameraLODEnabled;
+    params.camera = _surfaceCamera;
+    params.cameraFrustumPadding = _surfaceCameraFrustumPadding;
+    params.cameraLODPixelSize = _surfaceCameraLODPixelSize;
+    params.cameraLODMaxLevel = _surfaceCameraLODMaxLevel;
+    params.domainScale = _domainScale;
+    params.domainOffset = _domainOffset;
+    params.bufferArena = &_bufferArena;
 
     ParticleMesher mesher;
     surface = mesher.meshParticles(params);
@@ -9302,12 +10203,9 @@ void FluidSimulation::_launchOutputSurfaceMeshThread() {
     // SourceID will be deleted within the thread after use
     std::vector<int> *sourceID = new std::vector<int>();
     if (_isSurfaceSourceIDAttributeEnabled) {
-        std::vector<int> *ids = nullptr;
-        _markerParticles.getAttributeValues("SOURCEID", ids);
-
-        sourceID->reserve(ids->size());
-        for (size_t i = 0; i < ids->size(); i++) {
-            sourceID->push_back(ids->at(i));
+        std::vector<int> *ids = _getMarkerParticleSourceIDValues(*sourceID);
+        if (ids != sourceID) {
+            *sourceID = *ids;
         }
     }
 
@@ -9566,8 +10464,9 @@ void FluidSimulation::_generateFluidParticleDataFFP3(ParticleSystem &fluidPartic
     int idLimit = _getFluidParticleOutputIDLimit();
 
     std::vector<int> *source_ids = NULL;
+    std::vector<int> sourceIDValues;
     if (isSourceIDEnabled) {
-        _markerParticles.getAttributeValues("SOURCEID", source_ids);
+        source_ids = _getMarkerParticleSourceIDValues(sourceIDValues);
     }
 
     int numsurface = 0;
@@ -9849,8 +10748,8 @@ void FluidSimulation::_outputFluidParticles() {
         Fluid Particle Density
     */
     if (_isFluidParticleDensityAttributeEnabled) {
-        std::vector<float> *densities;
-        _markerParticles.getAttributeValues("DENSITY", densities);
+        std::vector<float> compactDensityValues;
+        std::vector<float> *densities = _getMarkerParticleDensityValues(compactDensityValues);
         _generateFluidParticleFFP3FileData(densities, dataFFP3, _outputData.fluidParticleDensityAttributeData);
 
         _outputData.frameData.fluidparticlesdensity.enabled = 1;
@@ -9897,8 +10796,8 @@ void FluidSimulation::_outputFluidParticles() {
         Fluid Particle Source ID
     */
     if (_isFluidParticleSourceIDAttributeEnabled) {
-        std::vector<int> *ids;
-        _markerParticles.getAttributeValues("SOURCEID", ids);
+        std::vector<int> sourceIDValues;
+        std::vector<int> *ids = _getMarkerParticleSourceIDValues(sourceIDValues);
         _generateFluidParticleFFP3FileData(ids, dataFFP3, _outputData.fluidParticleSourceIDAttributeData);
 
         _outputData.frameData.fluidparticlessourceid.enabled = 1;
@@ -10054,12 +10953,20 @@ void FluidSimulation::_outputSimulationData() {
 
         StopWatch t;
         t.start();
+
+        // Output data is written to separate buffers. The internal obstacle 
+        // mesh and force field debug data share the obstacle frame stats.
+        ThreadUtils::TaskGroup group;
+        group.run([this]() { _outputDiffuseMaterial(); });
+        group.run([this]() { _outputFluidParticles(); });
+        group.run([this]() { _outputFluidParticleDebug(); });
+        group.run([this]() { 
+            _outputInternalObstacleMesh();
+            _outputForceFieldDebugData();
+        });
         _launchOutputSurfaceMeshThread();
-        _outputDiffuseMaterial();
-        _outputFluidParticles();
-        _outputFluidParticleDebug();
-        _outputInternalObstacleMesh();
-        _outputForceFieldDebugData();
+        group.wait();
+
         t.stop();
 
         _timingData.outputNonMeshSimulationData += t.getTime();
@@ -10078,46 +10985,111 @@ void FluidSimulation::_outputSimulationData() {
 void FluidSimulation::_stepFluid(double dt) {
     srand(_currentFrame + _currentFrameTimeStepNumber);
     if (!_isSkippedFrame) {
-        _launchUpdateObstacleObjectsThread(dt);
-        _joinUpdateObstacleObjectsThread();
-        _launchUpdateLiquidLevelSetThread();
-        _joinUpdateLiquidLevelSetThread();
-        _launchAdvectVelocityFieldThread();
-        _joinAdvectVelocityFieldThread();
+        ThreadUtils::TaskGraph graph;
+        _initializeStepStageGraph(graph, dt);
+        graph.run();
 
-        if (_isSurfaceTensionEnabled or _isSheetSeedingEnabled or _isDiffuseMaterialOutputEnabled) {
-            _launchCalculateFluidCurvatureGridThread();
-        }
+        _stepStageGraphInfo = graph.getTaskInfo();
+        _stepStageGraphRunTime = graph.getRunTime();
+    }
+}
+
+/*
+    Stages of a time step and the stages that each depends on. Stages that do
+    not depend on each other run concurrently on the thread pool. Stages that 
+    generate random numbers are kept in a single chain so that results do not 
+    depend on scheduling order.
+*/
+void FluidSimulation::_initializeStepStageGraph(ThreadUtils::TaskGraph &graph, double dt) {
+    bool isCurvatureGridRequired = _isSurfaceTensionEnabled || 
+                                   _isSheetSeedingEnabled || 
+                                   _isDiffuseMaterialOutputEnabled;
+    int none = -1;
+
+    int obstacles = graph.addTask("Update Obstacle Objects", [this, dt]() { 
+        _updateObstacleObjects(dt); 
+    });
 
-        _saveVelocityField();
-        _applyBodyForcesToVelocityField(dt);
-        _applyViscosityToVelocityField(dt);
+    int liquidLevelSet = graph.addTask("Update Liquid Level Set", [this]() { 
+        _updateLiquidLevelSet();
+        _postProcessLiquidLevelSet();
+    }, {obstacles});
 
-        if (_isSurfaceTensionEnabled) {
-            _joinCalculateFluidCurvatureGridThread();
-        }
+    int advectVelocity = graph.addTask("Advect Velocity Field", [this]() { 
+        _advectVelocityField(); 
+    }, {obstacles});
 
-        _pressureSolve(dt);
-        _constrainVelocityFields();
+    int curvature = none;
+    if (isCurvatureGridRequired) {
+        curvature = graph.addTask("Calculate Surface Curvature", [this]() { 
+            _calculateFluidCurvatureGridThread(); 
+        }, {liquidLevelSet});
+    }
 
-        if (_isDiffuseMaterialOutputEnabled) {
-            _joinCalculateFluidCurvatureGridThread();
-        }
+    int influenceGrid = none;
+    if (_isDiffuseMaterialOutputEnabled) {
+        influenceGrid = graph.addTask("Update Diffuse Influence Grid", [this, dt]() { 
+            _updateDiffuseInfluenceGrid(dt); 
+        }, {obstacles});
+    }
 
-        _updateDiffuseMaterial(dt);
+    int saveVelocity = graph.addTask("Save Velocity Field", [this]() { 
+        _saveVelocityField(); 
+    }, {advectVelocity});
 
-        if (_isSheetSeedingEnabled) {
-            _joinCalculateFluidCurvatureGridThread();
-        }
+    int bodyForces = graph.addTask("Apply Force Fields", [this, dt]() { 
+        _applyBodyForcesToVelocityField(dt); 
+    }, {saveVelocity});
+
+    int viscosity = graph.addTask("Apply Viscosity", [this, dt]() { 
+        _applyViscosityToVelocityField(dt); 
+    }, {bodyForces, liquidLevelSet});
+
+    int pressure = graph.addTask("Solve Pressure System", [this, dt]() { 
+        _pressureSolve(dt); 
+    }, {viscosity, _isSurfaceTensionEnabled ? curvature : none});
+
+    int constrainVelocity = graph.addTask("Constrain Velocity Fields", [this]() { 
+        _constrainVelocityFields(); 
+    }, {pressure});
+
+    int diffuse = none;
+    if (_isDiffuseMaterialOutputEnabled) {
+        diffuse = graph.addTask("Simulate Diffuse Material", [this, dt]() { 
+            _updateDiffuseMaterial(dt); 
+        }, {constrainVelocity, curvature, influenceGrid});
+    }
 
-        _updateSheetSeeding();
-        _updateMarkerParticleVelocities();
-        _deleteSavedVelocityField();
-        _advanceMarkerParticles(dt);
-        _updateFluidObjects();
-        _updateMarkerParticleAttributes(dt);
-        _outputSimulationData();
+    int sheetSeeding = none;
+    if (_isSheetSeedingEnabled) {
+        sheetSeeding = graph.addTask("Update Sheet Seeding", [this]() { 
+            _updateSheetSeeding(); 
+        }, {constrainVelocity, curvature, diffuse});
     }
+
+    int particleVelocities = graph.addTask("Update Marker Particle Velocities", [this]() { 
+        _updateMarkerParticleVelocities(); 
+    }, {constrainVelocity, diffuse, sheetSeeding});
+
+    graph.addTask("Delete Saved Velocity Field", [this]() { 
+        _deleteSavedVelocityField(); 
+    }, {particleVelocities});
+
+    int advanceParticles = graph.addTask("Advance Marker Particles", [this, dt]() { 
+        _advanceMarkerParticles(dt); 
+    }, {particleVelocities});
+
+    int fluidObjects = graph.addTask("Update Fluid Objects", [this]() { 
+        _updateFluidObjects(); 
+    }, {advanceParticles});
+
+    int particleAttributes = graph.addTask("Update Marker Particle Attributes", [this, dt]() { 
+        _updateMarkerParticleAttributes(dt); 
+    }, {fluidObjects});
+
+    graph.addTask("Output Simulation Data", [this]() { 
+        _outputSimulationData(); 
+    }, {particleAttributes});
 }
 
 bool FluidSimulation::_isFluidGeneratingThisFrame() {
@@ -10228,20 +11200,28 @@ double FluidSimulation::_getMaximumObstacleSpeed(double dt) {
     return maxu;
 }
 
-double FluidSimulation::_calculateNextTimeStep(double dt) {
-    double maxu = 0.0;
+double FluidSimulation::_getNextTimeStepParticleSpeed(double dt) {
     if (_currentFrame == 0 && _currentFrameTimeStepNumber == 0) {
         // Fluid has not yet been added to the simulation, so estimate the
         // fluid speed
-        maxu = _predictMaximumMarkerParticleSpeed(dt);
-    } else {
-        maxu = _getMaximumMarkerParticleSpeed();
+        return _predictMaximumMarkerParticleSpeed(dt);
     }
 
+    return _getMaximumMarkerParticleSpeed();
+}
+
+double FluidSimulation::_getNextTimeStepObstacleSpeed(double dt) {
     if (_isFluidInSimulation() || _isFluidGeneratingThisFrame()) {
-        maxu = std::max(_getMaximumObstacleSpeed(dt), maxu);
+        return _getMaximumObstacleSpeed(dt);
     }
 
+    return 0.0;
+}
+
+double FluidSimulation::_calculateNextTimeStep(double dt, double maxParticleSpeed, 
+                                               double maxObstacleSpeed) {
+    double maxu = std::max(maxParticleSpeed, maxObstacleSpeed);
+
     double eps = 1e-6;
     double timeStep = _CFLConditionNumber * _dx / (maxu + eps);
 
@@ -10262,6 +11242,115 @@ double FluidSimulation::_calculateNextTimeStep(double dt) {
     return timeStep;
 }
 
+/*
+    Adaptive substepping
+
+    The time step is calculated from the particle speed that is exceeded by
+    at most a small number of outlier particles. A single fast droplet or 
+    emitter spike would otherwise force every stage of the substep to run
+    more often over the full domain. A larger time step is only used if it
+    reduces the number of frame substeps. In this case the velocities of the
+    outlier particles are clamped to the CFL speed limit of the substep, 
+    which costs a single pass over the particles.
+*/
+double FluidSimulation::_calculateAdaptiveTimeStep(double dt, double timeStep,
+                                                   double maxParticleSpeed, 
+                                                   double maxObstacleSpeed) {
+    _currentAdaptiveSubstepParticleSpeed = -1.0;
+    if (_currentFrame == 0 && _currentFrameTimeStepNumber == 0) {
+        // Time step was calculated from a predicted fluid speed
+        return timeStep;
+    }
+
+    double speed = _getAdaptiveSubstepParticleSpeed(maxParticleSpeed);
+    double adaptiveTimeStep = _calculateNextTimeStep(dt, speed, maxObstacleSpeed);
+    double eps = 1e-9;
+    if (adaptiveTimeStep <= timeStep + eps) {
+        return timeStep;
+    }
+
+    _currentAdaptiveSubstepParticleSpeed = speed;
+
+    return adaptiveTimeStep;
+}
+
+double FluidSimulation::_getAdaptiveSubstepParticleSpeed(double maxParticleSpeed) {
+    double maxspeed = maxParticleSpeed;
+    double maxpct = _maxAdaptiveSubstepOutlierPercent;
+    int maxabs = _maxAdaptiveSubstepOutlierAbsolute;
+    int maxOutlierCount = fmin((int)((double)_markerParticles.size() * maxpct), maxabs);
+    if (maxOutlierCount <= 0 || maxspeed <= 0.0) {
+        return maxspeed;
+    }
+
+    std::vector<vmath::vec3> *velocities;
+    _markerParticles.getAttributeValues("VELOCITY", velocities);
+
+    int numBins = _numAdaptiveSubstepSpeedBins;
+    double binWidth = maxspeed / numBins;
+    std::vector<int> speedCounts(numBins, 0);
+    for (size_t i = 0; i < velocities->size(); i++) {
+        double speed = (double)velocities->at(i).length();
+        int binIndex = std::min((int)(speed / binWidth), numBins - 1);
+        speedCounts[binIndex]++;
+    }
+
+    double speedLimit = maxspeed;
+    int currentOutlierCount = 0;
+    for (int i = numBins - 1; i > 0; i--) {
+        if (currentOutlierCount + speedCounts[i] > maxOutlierCount) {
+            break;
+        }
+
+        currentOutlierCount += speedCounts[i];
+        speedLimit = i * binWidth;
+    }
+
+    return speedLimit;
+}
+
+void FluidSimulation::_clampAdaptiveSubstepOutlierVelocities(double dt) {
+    _currentAdaptiveSubstepOutliersClamped = 0;
+    if (_currentAdaptiveSubstepParticleSpeed < 0.0) {
+        return;
+    }
+
+    // The last substep of a frame may be longer than the CFL time step if the
+    // maximum number of substeps has been reached. Clamping is limited to the
+    // outlier particles in this case.
+    double speedLimit = std::max(_CFLConditionNumber * _dx / dt, 
+                                 _currentAdaptiveSubstepParticleSpeed);
+    double speedLimitSq = speedLimit * speedLimit;
+
+    std::vector<vmath::vec3> *velocities;
+    _markerParticles.getAttributeValues("VELOCITY", velocities);
+
+    int numClamped = 0;
+    for (size_t i = 0; i < velocities->size(); i++) {
+        vmath::vec3 v = velocities->at(i);
+        double speedsq = vmath::dot(v, v);
+        if (speedsq > speedLimitSq) {
+            velocities->at(i) = v * (float)(speedLimit / sqrt(speedsq));
+            numClamped++;
+        }
+    }
+
+    _currentAdaptiveSubstepOutliersClamped = numClamped;
+}
+
+int FluidSimulation::_getFrameSubstepsAvoided() {
+    if (!_isAdaptiveSubsteppingEnabled) {
+        return 0;
+    }
+
+    double eps = 1e-6;
+    int requiredSubsteps = (int)std::ceil(_currentFrameRequiredSubsteps - eps);
+    requiredSubsteps = std::max(requiredSubsteps, _minFrameTimeSteps);
+    requiredSubsteps = std::min(requiredSubsteps, _maxFrameTimeSteps);
+
+    return std::max(requiredSubsteps - _currentFrameTimeStepNumber, 0);
+}
+
 double FluidSimulation::_getFrameInterpolation() {
     double frameTime = _currentFrameDeltaTimeRemaining + _currentFrameTimeStep;
     return 1.0 - (frameTime / _currentFrameDeltaTime);
@@ -10354,6 +11443,20 @@ void FluidSimulation::_logFrameInfo() {
     _logfile.newline();
     _logfile.log("Performance Score:   ", _currentPerformanceScore, 0);
     _logfile.newline();
+    if (_isAdaptiveSubsteppingEnabled) {
+        int substepsAvoided = _getFrameSubstepsAvoided();
+        double substepTime = tdata.frameTime / std::max(_currentFrameTimeStepNumber, 1);
+        _logfile.log("Substeps Avoided:       ", substepsAvoided, 0);
+        _logfile.log("Estimated Time Saved:   ", substepsAvoided * substepTime, 3);
+        _logfile.newline();
+    }
+    double bytesToMB = 1.0 / (1024.0 * 1024.0);
+    BufferArenaStats arenaStats = _currentFrameBufferArenaStats;
+    _logfile.log("Buffer Arena Peak (MB):   ", arenaStats.highWaterBytes * bytesToMB, 1);
+    _logfile.log("Buffer Arena Cached (MB): ", arenaStats.bytesCached * bytesToMB, 1);
+    _logfile.log("Buffers Acquired:         ", arenaStats.buffersAcquired, 0);
+    _logfile.log("Buffers Reused:           ", arenaStats.buffersReused, 0);
+    _logfile.newline();
     _logfile.log("Frame Time:   ", tdata.frameTime, 3);
     _logfile.log("Total Time:   ", _totalSimulationTime, 3);
     _logfile.newline();
@@ -10370,6 +11473,9 @@ void FluidSimulation::_logStepInfo() {
     if (_currentExtremeVelocityParticlesRemoved > 0) {
         ss << std::endl << "Extreme Velocity Fluid Particles Removed: " << _currentExtremeVelocityParticlesRemoved;
     }
+    if (_currentAdaptiveSubstepOutliersClamped > 0) {
+        ss << std::endl << "Adaptive Substep Outlier Velocities Clamped: " << _currentAdaptiveSubstepOutliersClamped;
+    }
     _logfile.logString(ss.str());
 
     if (_isDiffuseMaterialOutputEnabled) {
@@ -10397,6 +11503,50 @@ void FluidSimulation::_logStepInfo() {
         _logfile.logString(_viscositySolverStatus);
     }
     _logfile.newline();
+
+    _logStepStageGraph();
+}
+
+void FluidSimulation::_logStepStageGraph() {
+    if (_stepStageGraphInfo.empty()) {
+        return;
+    }
+
+    _logfile.logString("*** Time Step Stage Graph ***");
+    _logfile.newline();
+
+    std::stringstream ss;
+    ss << std::left << std::setw(37) << "Stage" << 
+          std::right << std::setw(8) << "Start" << std::setw(9) << "End" << 
+          "    Depends On" << std::endl;
+
+    double totalStageTime = 0.0;
+    for (size_t i = 0; i < _stepStageGraphInfo.size(); i++) {
+        ThreadUtils::TaskGraph::TaskInfo info = _stepStageGraphInfo[i];
+        totalStageTime += info.endTime - info.startTime;
+
+        std::string dependencies;
+        for (size_t didx = 0; didx < info.dependencies.size(); didx++) {
+            if (didx > 0) {
+                dependencies += ", ";
+            }
+            dependencies += _stepStageGraphInfo[info.dependencies[didx]].name;
+        }
+
+        ss << std::left << std::setw(37) << info.name << std::right << 
+              std::fixed << std::setprecision(3) << 
+              std::setw(8) << info.startTime << std::setw(9) << info.endTime << 
+              "    " << dependencies << std::endl;
+    }
+
+    double concurrency = 1.0;
+    if (_stepStageGraphRunTime > 1e-9) {
+        concurrency = totalStageTime / _stepStageGraphRunTime;
+    }
+    ss << std::endl << "Stage Concurrency: " << std::setprecision(2) << concurrency;
+
+    _logfile.logString(ss.str());
+    _logfile.newline();
 }
 
 void FluidSimulation::_logGreeting() {
@@ -10420,6 +11570,7 @@ void FluidSimulation::update(double dt) {
     }
 
     _timingData = TimingData();
+    _bufferArena.resetHighWaterMark();
 
     StopWatch frameTimer;
     frameTimer.start();
@@ -10433,6 +11584,8 @@ void FluidSimulation::update(double dt) {
     _currentFrameDeltaTime = dt;
     _currentFrameDeltaTimeRemaining = dt;
     _currentFrameTimeStepNumber = 0;
+    _currentFrameRequiredSubsteps = 0.0;
+    _currentAdaptiveSubstepOutliersClamped = 0;
     bool isDebuggingEnabled = _isFluidParticleDebugOutputEnabled || _isInternalObstacleMeshOutputEnabled || _isForceFieldDebugOutputEnabled;
     _isSkippedFrame = _isZeroLengthDeltaTime && _outputData.isInitialized && !isDebuggingEnabled;
     double substepTime = _currentFrameDeltaTime / (double)_minFrameTimeSteps;
@@ -10454,8 +11607,15 @@ void FluidSimulation::update(double dt) {
         StopWatch stepTimer;
         stepTimer.start();
 
-        _currentFrameTimeStep = fmin(_calculateNextTimeStep(dt), 
-                                     _currentFrameDeltaTimeRemaining);
+        double maxParticleSpeed = _getNextTimeStepParticleSpeed(dt);
+        double maxObstacleSpeed = _getNextTimeStepObstacleSpeed(dt);
+        double timeStep = _calculateNextTimeStep(dt, maxParticleSpeed, maxObstacleSpeed);
+        double nextTimeStep = timeStep;
+        if (_isAdaptiveSubsteppingEnabled) {
+            nextTimeStep = _calculateAdaptiveTimeStep(dt, timeStep, maxParticleSpeed, maxObstacleSpeed);
+        }
+
+        _currentFrameTimeStep = fmin(nextTimeStep, _currentFrameDeltaTimeRemaining);
 
         double timeCompleted = _currentFrameDeltaTime - _currentFrameDeltaTimeRemaining;
         double stepLimit = (_currentFrameTimeStepNumber + 1) * substepTime;
@@ -10467,6 +11627,13 @@ void FluidSimulation::update(double dt) {
             _currentFrameTimeStep = _currentFrameDeltaTimeRemaining;
         }
 
+        if (_isAdaptiveSubsteppingEnabled) {
+            // Fraction of the substeps that the global time step would have 
+            // required to cover this substep
+            _currentFrameRequiredSubsteps += _currentFrameTimeStep / timeStep;
+            _clampAdaptiveSubstepOutlierVelocities(_currentFrameTimeStep);
+        }
+
         _currentFrameDeltaTimeRemaining -= _currentFrameTimeStep;
         _isLastFrameTimeStep = fabs(_currentFrameDeltaTimeRemaining) < eps;
 
@@ -10510,11 +11677,17 @@ void FluidSimulation::update(double dt) {
         _currentPerformanceScore = (int)(((double)totalFluidParticlesProcessed / totalFluidParticlesProcessedTime) / 1000.0);
     }
 
+    // Buffers cached by the arena are kept between substeps and buffers 
+    // that have not been reused for a full frame are freed
+    _currentFrameBufferArenaStats = _bufferArena.getStats();
+    _bufferArena.trim();
+
     _updateTimingData();
     _logFrameInfo();
 
     _outputData.frameData.frame = _currentFrame;
     _outputData.frameData.substeps = _currentFrameTimeStepNumber;
+    _outputData.frameData.substepsAvoided = _getFrameSubstepsAvoided();
     _outputData.frameData.deltaTime = dt;
     _outputData.frameData.timing.total = frameTimer.getTime();
     _outputData.frameData.fluidParticles = (int)_markerParticles.size();
@@ -10533,6 +11706,12 @@ void FluidSimulation::update(double dt) {
     _outputData.frameData.viscositySolverIterations = _viscositySolverIterations;
     _outputData.frameData.viscositySolverMaxIterations = getViscositySolverMaxIterations();
 
+    BufferArenaStats arenaStats = _currentFrameBufferArenaStats;
+    _outputData.frameData.memory.bufferArenaHighWaterBytes = (unsigned long long)arenaStats.highWaterBytes;
+    _outputData.frameData.memory.bufferArenaCachedBytes = (unsigned long long)arenaStats.bytesCached;
+    _outputData.frameData.memory.bufferArenaAcquired = arenaStats.buffersAcquired;
+    _outputData.frameData.memory.bufferArenaReused = arenaStats.buffersReused;
+
     _outputData.isInitialized = true;
 
     _outputSimulationLogFile();
@@ -39,6 +39,7 @@ SOFTWARE.
 #include "meshobject.h"
 #include "fragmentedvector.h"
 #include "logfile.h"
+#include "threadutils.h"
 #include "particlelevelset.h"
 #include "pressuresolver.h"
 #include "diffuseparticlesimulation.h"
@@ -49,6 +50,7 @@ SOFTWARE.
 #include "particlesystem.h"
 #include "markerparticle.h"
 #include "viscositysolver.h"
+#include "bufferarena.h"
 #include "spatialpointgrid.h"
 
 class AABB;
@@ -77,9 +79,17 @@ struct FluidSimulationTimingStats {
     double objects = 0.0;
 };
 
+struct FluidSimulationMemoryStats {
+    unsigned long long bufferArenaHighWaterBytes = 0;
+    unsigned long long bufferArenaCachedBytes = 0;
+    int bufferArenaAcquired = 0;
+    int bufferArenaReused = 0;
+};
+
 struct FluidSimulationFrameStats {
     int frame = 0;
     int substeps = 0;
+    int substepsAvoided = 0;
     double deltaTime = 0.0;
     int fluidParticles = 0;
     int diffuseParticles = 0;
@@ -148,6 +158,7 @@ struct FluidSimulationFrameStats {
     FluidSimulationMeshStats obstacle;
     FluidSimulationMeshStats forcefield;
     FluidSimulationTimingStats timing;
+    FluidSimulationMemoryStats memory;
 };
 
 struct FluidSimulationMarkerParticleData {
@@ -347,9 +358,54 @@ public:
     int getPressureSolverMaxIterations();
     void setPressureSolverMaxIterations(int n);
 
+    /*
+        Preconditioner used by the pressure solver. The multigrid preconditioner
+        runs in parallel and requires far fewer iterations on high resolution
+        domains. The parallel MIC(0) preconditioner gives the same iterations 
+        as MIC(0) and runs the preconditioner triangular solves in parallel. 
+        MIC(0) by default.
+    */
+    void setPressureSolverPreconditionerMIC();
+    void setPressureSolverPreconditionerMultigrid();
+    void setPressureSolverPreconditionerParallelMIC();
+    bool isPressureSolverPreconditionerMIC();
+    bool isPressureSolverPreconditionerMultigrid();
+    bool isPressureSolverPreconditionerParallelMIC();
+
+    /*
+        Start each pressure solve from the pressure of the previous substep.
+        Consecutive substeps usually have similar pressure, so fewer solver 
+        iterations are needed. Disabled by default.
+    */
+    void enablePressureSolverWarmStart();
+    void disablePressureSolverWarmStart();
+    bool isPressureSolverWarmStartEnabled();
+
+    /*
+        Solve pressure without assembling the pressure matrix. Only the matrix
+        diagonal is stored, off-diagonal coefficients are computed from the 
+        liquid SDF, weight, and density grids each time the matrix is applied.
+        The matrix-free solver overrides the preconditioner setting with a 
+        Jacobi preconditioner. Uses less memory but may require more solver
+        iterations. Disabled by default.
+    */
+    void enableMatrixFreePressureSolver();
+    void disableMatrixFreePressureSolver();
+    bool isMatrixFreePressureSolverEnabled();
+
     int getViscositySolverMaxIterations();
     void setViscositySolverMaxIterations(int n);
 
+    /*
+        Solve viscosity without assembling the viscosity matrix. The matrix is
+        applied from the stencil coefficients of each face and a Jacobi 
+        preconditioner is used. Uses a fraction of the memory of the assembled
+        system but may be slower. Disabled by default.
+    */
+    void enableMatrixFreeViscositySolver();
+    void disableMatrixFreeViscositySolver();
+    bool isMatrixFreeViscositySolverEnabled();
+
     /*
         Output fluid particle data to the simulation cache.
         Disabled by default.
@@ -405,6 +461,31 @@ public:
     int getNumPolygonizerSlices();
     void setNumPolygonizerSlices(int n);
 
+    /*
+        Camera adaptive meshing. The surface is polygonized in slices
+        perpendicular to the camera viewing direction and each slice is 
+        polygonized at the coarsest level where a polygonizer cell covers at 
+        most the LOD pixel size on screen. Each level doubles the polygonizer
+        cell size, up to the maximum LOD level. Slices outside of the camera 
+        frustum expanded by the frustum padding (a fraction of the image width
+        and height) are polygonized at the maximum level. Seams between slices
+        of different levels are stitched so that the surface remains closed.
+
+        The camera is described in world space and may be updated every frame.
+        Camera adaptive meshing has no effect until a camera has been set.
+    */
+    void enableSurfaceCameraLOD();
+    void disableSurfaceCameraLOD();
+    bool isSurfaceCameraLODEnabled();
+    CameraFrustum getSurfaceCamera();
+    void setSurfaceCamera(CameraFrustum camera);
+    double getSurfaceCameraFrustumPadding();
+    void setSurfaceCameraFrustumPadding(double padding);
+    double getSurfaceCameraLODPixelSize();
+    void setSurfaceCameraLODPixelSize(double size);
+    int getSurfaceCameraLODMaxLevel();
+    void setSurfaceCameraLODMaxLevel(int level);
+
 
     /*
         Smoothing Value: Amount of smoothing in range of [0.0, 1.0], although
@@ -866,6 +947,28 @@ public:
     AABB getDiffuseEmitterGenerationBounds();
     void setDiffuseEmitterGenerationBounds(AABB bbox);
 
+    /*
+        Reduce whitewater detail where it cannot be seen by the render camera.
+        Emission and the particle budget available to an emitter are scaled 
+        by the on-screen size of a grid cell at the emitter, and particles 
+        outside of the camera frustum expanded by the frustum padding (a 
+        fraction of the image width and height) are not written to the 
+        whitewater output files. Emission outside of the padded frustum is 
+        reduced to the minimum LOD factor.
+
+        The camera is described in world space and may be updated every frame.
+        Camera LOD has no effect until a camera has been set.
+    */
+    void enableWhitewaterCameraLOD();
+    void disableWhitewaterCameraLOD();
+    bool isWhitewaterCameraLODEnabled();
+    CameraFrustum getWhitewaterCamera();
+    void setWhitewaterCamera(CameraFrustum camera);
+    double getWhitewaterCameraFrustumPadding();
+    void setWhitewaterCameraFrustumPadding(double padding);
+    double getWhitewaterCameraLODMinFactor();
+    void setWhitewaterCameraLODMinFactor(double factor);
+
     /*
         The minimum/maximum lifetime of a diffuse particle is spawned for in 
         seconds. Set this value to control how quickly/slowly diffuse
@@ -1222,6 +1325,19 @@ public:
     void disableExtremeVelocityRemoval();
     bool isExtremeVelocityRemovalEnabled();
 
+    /*
+        Enable/Disable adaptive substepping
+
+        If enabled, a small number of fast moving outlier particles will not
+        force the frame to be divided into more substeps. The time step is
+        calculated from the speed of the remaining particles and the velocities
+        of the outlier particles are clamped to the CFL speed limit of the
+        substep. The number of substeps avoided is reported in the frame stats.
+    */
+    void enableAdaptiveSubstepping();
+    void disableAdaptiveSubstepping();
+    bool isAdaptiveSubsteppingEnabled();
+
     /*
         Set FLIP (splashy) or APIC (swirly) velocity transfer method
     */
@@ -1252,6 +1368,42 @@ public:
     void disableFractureOptimization();
     bool isFractureOptimizationEnabled();
 
+    /*
+        Store the liquid level set in tiles that are only allocated where the
+        liquid surface is present. Reduces memory and grid traversal time for
+        domains that are mostly empty. Only the liquid level set is stored
+        sparsely; velocity, weight and other grids remain dense. Disabled by
+        default.
+    */
+    void enableSparseLiquidLevelSet();
+    void disableSparseLiquidLevelSet();
+    bool isSparseLiquidLevelSetEnabled();
+
+    /*
+        Periodically reorder marker particles and their attributes along a
+        Z-order curve of grid blocks so that particles that are close in space
+        are close in memory. The reorder is performed when the particle order
+        has become sufficiently scattered. Disabled by default.
+    */
+    void enableMarkerParticleSorting();
+    void disableMarkerParticleSorting();
+    bool isMarkerParticleSortingEnabled();
+
+    /*
+        Store marker particle attributes in compact types:
+
+            APIC affine: half precision vectors, saves 18 bytes per particle
+            Density:     half precision, saves 2 bytes per particle
+            Source ID:   16-bit unsigned integer, saves 2 bytes per particle.
+                         Source IDs are clamped to [0, 65535].
+
+        Values are converted to full precision when read back or saved. Must be set
+        before initialization. Disabled by default.
+    */
+    void enableCompactParticleAttributes();
+    void disableCompactParticleAttributes();
+    bool isCompactParticleAttributesEnabled();
+
     /*
         Enable/Disable precomputation of static obstacle MeshLevelSet
     */
@@ -1266,6 +1418,25 @@ public:
     void disableTemporaryMeshLevelSet();
     bool isTemporaryMeshLevelSetEnabled();
 
+    /*
+        Enable/Disable reuse of the MeshLevelSet of rigid animated obstacles.
+        When enabled, the level set of an obstacle that only moves by a rigid 
+        transform is computed once and resampled through the transform each 
+        time step instead of being re-rasterized.
+    */
+    void enableRigidObstacleLevelSetReuse();
+    void disableRigidObstacleLevelSetReuse();
+    bool isRigidObstacleLevelSetReuseEnabled();
+
+    /*
+        Enable/Disable simplification of obstacle mesh regions made of 
+        triangles much smaller than the grid cell size before the obstacle 
+        MeshLevelSet is computed
+    */
+    void enableObstacleMeshDecimation();
+    void disableObstacleMeshDecimation();
+    bool isObstacleMeshDecimationEnabled();
+
     /*
         Add a mesh shaped fluid source to the fluid domain. 
         See meshfluidsource.h header for more information.
@@ -1528,6 +1699,26 @@ public:
     void loadMarkerParticleIDData(FluidSimulationMarkerParticleIDData data);
     void loadDiffuseParticleData(FluidSimulationDiffuseParticleData data);
 
+    /*
+        Parameter blocks set many scalar simulation parameters in a single
+        call. A parameter is referenced by the ID returned from 
+        getParameterBlockID(name), where name is the parameter's property name
+        in the Python bindings (ex: "surface_subdivision_level"). Returns -1 if 
+        the name is not a parameter block parameter.
+
+        Values are passed as doubles. Boolean parameters are 0.0 or 1.0 and
+        integer parameters are rounded to the nearest integer.
+
+        Parameters in a block are applied in order. If any parameter fails to
+        be set, the parameters that were already applied are restored to their
+        previous values and the exception is rethrown. The version must match 
+        getParameterBlockVersion().
+    */
+    int getParameterBlockVersion();
+    int getParameterBlockID(std::string name);
+    std::vector<double> getParameterBlockValues(std::vector<int> &ids);
+    void applyParameterBlock(int version, std::vector<int> &ids, std::vector<double> &values);
+
 private:   
 
     enum class VelocityTransferMethod : char { 
@@ -1762,6 +1953,11 @@ private:
     void _initializeForceFieldGrid(int isize, int jsize, int ksize, double dx);
     void _initializeAttributeGrids(int isize, int jsize, int ksize);
     void _initializeParticleSystems();
+    void _getMarkerParticleAffineDataRange(std::string attributeName, 
+                                           int start_idx, int end_idx, char *data);
+    std::vector<int>* _getMarkerParticleSourceIDValues(std::vector<int> &tempValues);
+    std::vector<float>* _getMarkerParticleDensityValues(std::vector<float> &tempValues);
+    uint16_t _getCompactSourceID(int sourceID);
     void _initializeSimulation();
     void _initializeParticleRadii();
     void _initializeRandomGenerator();
@@ -1786,7 +1982,14 @@ private:
     /*
         Advancing the State of the Fluid Simulation
     */
-    double _calculateNextTimeStep(double dt);
+    double _getNextTimeStepParticleSpeed(double dt);
+    double _getNextTimeStepObstacleSpeed(double dt);
+    double _calculateNextTimeStep(double dt, double maxParticleSpeed, double maxObstacleSpeed);
+    double _calculateAdaptiveTimeStep(double dt, double timeStep, 
+                                      double maxParticleSpeed, double maxObstacleSpeed);
+    double _getAdaptiveSubstepParticleSpeed(double maxParticleSpeed);
+    void _clampAdaptiveSubstepOutlierVelocities(double dt);
+    int _getFrameSubstepsAvoided();
     double _getFrameInterpolation();
     double _getMaximumMeshObjectFluidVelocity(MeshObject *object, 
                                               vmath::vec3 fluidVelocity);
@@ -1795,12 +1998,14 @@ private:
     double _getMaximumObstacleSpeed(double dt);
     void _updateTimingData();
     void _logStepInfo();
+    void _logStepStageGraph();
     void _logFrameInfo();
     void _logGreeting();
     bool _isFluidGeneratingThisFrame();
     bool _isFluidOrWhitewaterInSimulation();
     bool _isFluidInSimulation();
     void _stepFluid(double dt);
+    void _initializeStepStageGraph(ThreadUtils::TaskGraph &graph, double dt);
 
     /*
         Update Solid Material
@@ -1808,6 +2013,9 @@ private:
     TriangleMesh _getTriangleMeshFromAABB(AABB bbox);
     AABB _getBoundaryAABB();
     TriangleMesh _getBoundaryTriangleMesh();
+    void _updateObstacleMeshDecimation();
+    void _getAnimatedObstacleMeshLevelSet(MeshObject *obstacle, double dt, 
+                                          float frameProgress, MeshLevelSet &levelset);
     void _addAnimatedObjectsToSolidSDF(double dt);
     void _updatePrecomputedSolidLevelSet(double dt, std::vector<MeshObjectStatus> &objectStatus);
     void _addStaticObjectsToSolidSDF(double dt, std::vector<MeshObjectStatus> &objectStatus);
@@ -1822,21 +2030,18 @@ private:
     void _resolveSolidLevelSetUpdateCollisionsThread(int startidx, int endidx);
     void _resolveSolidLevelSetUpdateCollisions();
     void _updateObstacleObjects(double dt);
-    void _launchUpdateObstacleObjectsThread(double dt);
-    void _joinUpdateObstacleObjectsThread();
 
     /*
         Update Fluid Levelset
     */
     void _launchUpdateLiquidLevelSetThread();
     void _joinUpdateLiquidLevelSetThread();
+    void _postProcessLiquidLevelSet();
     void _updateLiquidLevelSet();
 
     /*
         Advect Velocity Field
     */
-    void _launchAdvectVelocityFieldThread();
-    void _joinAdvectVelocityFieldThread();
     void _advectVelocityField();
     void _saveVelocityField();
     void _deleteSavedVelocityField();
@@ -1873,6 +2078,8 @@ private:
     void _updateWeightGridMT(int dir);
     void _updateWeightGridThread(int startidx, int endidx, int dir);
     void _pressureSolve(double dt);
+    void _initializePressureSolverWarmStart(Array3d<float> &pressureGrid, double dt);
+    PressureSolverPreconditioner _getPressureSolverPreconditioner();
 
     /*
         Extrapolate Velocity Field
@@ -1963,6 +2170,8 @@ private:
                                   AABB &boundary);
     float _getMarkerParticleSpeedLimit(double dt);
     void _removeMarkerParticles(double dt);
+    void _sortMarkerParticles();
+    void _initializeMarkerParticleSortBlockRank();
 
     /*
         #. Update Fluid Objects
@@ -2102,6 +2311,18 @@ private:
     void _outputSimulationLogFile();
 
 
+    /*
+        Parameter Blocks
+    */
+    struct ParameterBlockEntry {
+        const char *name;
+        double (*get)(FluidSimulation *sim);
+        void (*set)(FluidSimulation *sim, double value);
+    };
+
+    static const std::vector<ParameterBlockEntry>& _getParameterBlockTable();
+    void _validateParameterBlockIDs(std::vector<int> &ids);
+
     /*
         Misc Methods
     */
@@ -2180,6 +2401,9 @@ private:
     int _currentNumFluidCells = 0;
     int _currentPerformanceScore = 0;
     int _currentExtremeVelocityParticlesRemoved = 0;
+    int _currentAdaptiveSubstepOutliersClamped = 0;
+    double _currentAdaptiveSubstepParticleSpeed = -1.0;
+    double _currentFrameRequiredSubsteps = 0.0;
     bool _isLastFrameTimeStep = false;
     bool _isZeroLengthDeltaTime = false;
     bool _isSkippedFrame = false;
@@ -2216,11 +2440,18 @@ private:
 
     // Update obstacles
     std::vector<MeshObject*> _obstacles;
-    std::thread _updateObstacleObjectsThread;
     Array3d<bool> _nearSolidGrid;
     int _nearSolidGridCellSizeFactor = 3;
     double _nearSolidGridCellSize = 0.0f;
     bool _isFractureOptimizationEnabled = false;
+    bool _isSparseLiquidLevelSetEnabled = false;
+
+    bool _isMarkerParticleSortingEnabled = false;
+    int _markerParticleSortBlockWidth = 4;
+    double _markerParticleSortDisorderThreshold = 0.1;
+    Array3d<int> _markerParticleSortBlockRank;
+
+    bool _isCompactParticleAttributesEnabled = false;
 
     // Compute levelset signed distance field
     MeshLevelSet _solidSDF;
@@ -2230,6 +2461,8 @@ private:
     float _domainBoundaryFriction = 0.0f;
     bool _isStaticSolidLevelSetPrecomputed = false;
     bool _isTempSolidLevelSetEnabled = true;
+    bool _isRigidObstacleLevelSetReuseEnabled = false;
+    bool _isObstacleMeshDecimationEnabled = false;
     bool _isSolidLevelSetUpToDate = false;
     bool _isPrecomputedSolidLevelSetUpToDate = false;
     int _solidLevelSetExactBand = 3;
@@ -2317,6 +2550,11 @@ private:
     bool _isDiffuseMaterialFilesSeparated = false;
     int _outputFluidSurfaceSubdivisionLevel = 1;
     int _numSurfaceReconstructionPolygonizerSlices = 1;
+    bool _isSurfaceCameraLODEnabled = false;
+    CameraFrustum _surfaceCamera;
+    double _surfaceCameraFrustumPadding = 0.1;
+    double _surfaceCameraLODPixelSize = 4.0;
+    int _surfaceCameraLODMaxLevel = 2;
     double _surfaceReconstructionSmoothingValue = 0.5;
     int _surfaceReconstructionSmoothingIterations = 2;
     int _minimumSurfacePolyhedronTriangleCount = 0;
@@ -2327,6 +2565,8 @@ private:
     TriangleMeshFormat _meshOutputFormat = TriangleMeshFormat::ply;
     FluidSimulationOutputData _outputData;
     TimingData _timingData;
+    std::vector<ThreadUtils::TaskGraph::TaskInfo> _stepStageGraphInfo;
+    double _stepStageGraphRunTime = 0.0;
 
     MeshObject *_meshingVolume = NULL;
     MeshLevelSet _meshingVolumeSDF;
@@ -2339,7 +2579,6 @@ private:
     // Advect velocity field
     VelocityAdvector _velocityAdvector;
     int _maxParticlesPerVelocityAdvection = 5e6;
-    std::thread _advectVelocityFieldThread;
     VelocityTransferMethod _velocityTransferMethod = VelocityTransferMethod::FLIP;
 
     // Calculate fluid curvature
@@ -2363,6 +2602,7 @@ private:
     double _constantViscosityValue = 0.0;
     double _viscositySolverErrorTolerance = 1e-4;
     double _maxViscositySolveIterations = 900;
+    bool _isMatrixFreeViscositySolverEnabled = false;
     std::string _viscositySolverStatus;
     bool _pressureSolverSuccess = true;
     int _pressureSolverIterations = 0;
@@ -2378,6 +2618,11 @@ private:
     double _pressureSolveTolerance = 1e-9;
     double _pressureSolveAcceptableTolerance = 1.0;
     double _maxPressureSolveIterations = 900;
+    PressureSolverPreconditioner _pressureSolverPreconditioner = PressureSolverPreconditioner::MIC;
+    bool _isPressureSolverWarmStartEnabled = false;
+    bool _isMatrixFreePressureSolverEnabled = false;
+    Array3d<float> _previousPressureGrid;
+    double _previousPressureDeltaTime = 0.0;
     std::string _pressureSolverStatus;
     bool _viscositySolverSuccess = true;
     int _viscositySolverIterations = 0;
@@ -2404,6 +2649,10 @@ private:
     MACVelocityField _MACVelocity;
     MACVelocityField _savedVelocityField;
 
+    // Recycles large transient grids and vectors between substeps
+    BufferArena _bufferArena;
+    BufferArenaStats _currentFrameBufferArenaStats;
+
     // Update Attributes
     bool _isSurfaceVelocityAttributeAgainstObstaclesEnabled = false;
     MACVelocityField _velocityAttributeGrid;
@@ -2455,6 +2704,10 @@ private:
     int _maxExtremeVelocityRemovalAbsolute = 35;
     int _maxExtremeVelocityOutlierRemovalAbsolute = 6;
     int _minTimeStepIncreaseForRemoval = 4;
+    bool _isAdaptiveSubsteppingEnabled = false;
+    double _maxAdaptiveSubstepOutlierPercent = 0.0005;
+    int _maxAdaptiveSubstepOutlierAbsolute = 200;
+    int _numAdaptiveSubstepSpeedBins = 256;
     float _markerParticleStepDistanceFactor = 0.1f;
 
     bool _openBoundaryXNeg = false;
@@ -2465,6 +2718,9 @@ private:
     bool _openBoundaryZPos = false;
     int _openBoundaryWidth = 2;    // In # of voxels
 
+    // Parameter Blocks
+    int _parameterBlockVersion = 1;
+
     std::random_device _randomDevice;
     std::mt19937 _randomSeed;
     std::uniform_real_distribution<> _random;
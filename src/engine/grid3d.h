@@ -511,6 +511,20 @@ namespace Grid3d {
                    ((unsigned int)j + (unsigned int)jsize * (unsigned int)k);
     }
 
+    // Interleave the bits of i, j, k (up to 21 bits each) into a Z-order curve key
+    inline unsigned long long int getMortonCode(int i, int j, int k) {
+        auto spread = [](unsigned long long int x) {
+            x &= 0x1fffff;
+            x = (x | x << 32) & 0x1f00000000ffffULL;
+            x = (x | x << 16) & 0x1f0000ff0000ffULL;
+            x = (x | x << 8)  & 0x100f00f00f00f00fULL;
+            x = (x | x << 4)  & 0x10c30c30c30c30c3ULL;
+            x = (x | x << 2)  & 0x1249249249249249ULL;
+            return x;
+        };
+        return spread(i) | (spread(j) << 1) | (spread(k) << 2);
+    }
+
     inline GridIndex getUnflattenedIndex(unsigned int flatidx, int isize, int jsize) {
         int i = flatidx % isize;
         int j = (flatidx / isize) % jsize;
@@ -0,0 +1,139 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+
+#pragma once
+
+#include <cstdint>
+#include <algorithm>
+#include <cstring>
+#include <ostream>
+
+#include "vmath.h"
+
+/*
+    IEEE 754 binary16 conversion. Float to half conversion rounds to nearest
+    even. Finite values that are too large to be represented saturate to the
+    largest finite half value instead of becoming infinite.
+
+    Conversion method adapted from Fabian Giesen's public domain half precision
+    conversion routines:
+        https://gist.github.com/rygorous/2156668
+*/
+namespace HalfFloat {
+
+    inline uint16_t fromFloat(float value) {
+        uint32_t f;
+        std::memcpy(&f, &value, sizeof(uint32_t));
+
+        uint32_t sign = f & 0x80000000u;
+        f ^= sign;
+
+        uint16_t h = 0;
+        if (f >= 0x47800000u) {
+            // Out of half range, Inf or NaN
+            h = f > 0x7f800000u ? 0x7e00 : (f == 0x7f800000u ? 0x7c00 : 0x7bff);
+        } else if (f < 0x38800000u) {
+            // Subnormal half or zero
+            const uint32_t denormMagicBits = ((127 - 15) + (23 - 10) + 1) << 23;
+            float denormMagic, fval;
+            std::memcpy(&denormMagic, &denormMagicBits, sizeof(float));
+            std::memcpy(&fval, &f, sizeof(float));
+            fval += denormMagic;
+            std::memcpy(&f, &fval, sizeof(uint32_t));
+            h = (uint16_t)(f - denormMagicBits);
+        } else {
+            uint32_t mantissaOdd = (f >> 13) & 1;
+            f += ((uint32_t)(15 - 127) << 23) + 0xfff;
+            f += mantissaOdd;
+            h = (uint16_t)std::min(f >> 13, (uint32_t)0x7bff);
+        }
+
+        return h | (uint16_t)(sign >> 16);
+    }
+
+    inline float toFloat(uint16_t h) {
+        const uint32_t shiftedExponent = 0x7c00u << 13;
+        uint32_t f = ((uint32_t)h & 0x7fff) << 13;
+        uint32_t exponent = shiftedExponent & f;
+        f += (uint32_t)(127 - 15) << 23;
+
+        if (exponent == shiftedExponent) {
+            // Inf or NaN
+            f += (uint32_t)(128 - 16) << 23;
+        } else if (exponent == 0) {
+            // Zero or subnormal
+            const uint32_t magicBits = 113 << 23;
+            float magic, fval;
+            f += 1 << 23;
+            std::memcpy(&magic, &magicBits, sizeof(float));
+            std::memcpy(&fval, &f, sizeof(float));
+            fval -= magic;
+            std::memcpy(&f, &fval, sizeof(uint32_t));
+        }
+
+        f |= ((uint32_t)h & 0x8000) << 16;
+
+        float value;
+        std::memcpy(&value, &f, sizeof(float));
+        return value;
+    }
+
+}
+
+struct HalfFloat16 {
+    uint16_t value = 0;
+
+    HalfFloat16() {}
+    HalfFloat16(float v) : value(HalfFloat::fromFloat(v)) {}
+
+    float toFloat() const {
+        return HalfFloat::toFloat(value);
+    }
+};
+
+struct HalfVector3 {
+    uint16_t x = 0;
+    uint16_t y = 0;
+    uint16_t z = 0;
+
+    HalfVector3() {}
+    HalfVector3(vmath::vec3 v) : x(HalfFloat::fromFloat(v.x)), 
+                                 y(HalfFloat::fromFloat(v.y)), 
+                                 z(HalfFloat::fromFloat(v.z)) {}
+
+    vmath::vec3 toVec3() const {
+        return vmath::vec3(HalfFloat::toFloat(x), HalfFloat::toFloat(y), HalfFloat::toFloat(z));
+    }
+};
+
+inline std::ostream& operator<<(std::ostream& os, const HalfFloat16& v) {
+    os << v.toFloat();
+    return os;
+}
+
+inline std::ostream& operator<<(std::ostream& os, const HalfVector3& v) {
+    os << v.toVec3();
+    return os;
+}
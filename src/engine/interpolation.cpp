@@ -256,4 +256,206 @@ void Interpolation::trilinearInterpolateGradient(
     grad->x = dv_dx;
     grad->y = dv_dy;
     grad->z = dv_dz;
-}
\ No newline at end of file
+}
+
+/*
+    Batched trilinear interpolation
+
+    Points are processed in blocks of TRILINEAR_BLOCK_SIZE. Each block is
+    loaded into structure-of-arrays buffers so that the grid coordinate,
+    weight, and blending loops operate on contiguous arrays and can be
+    vectorized by the compiler. Cells that are fully inside of the grid
+    are gathered without per-corner range checks.
+
+    The kernel is compiled once for the baseline instruction set and, on
+    x86 GCC/Clang builds, once more for AVX2/FMA. The AVX2 kernel is only
+    selected if the CPU reports support at runtime.
+*/
+
+#if defined(_MSC_VER)
+    #define INTERPOLATION_FORCE_INLINE __forceinline
+#else
+    #define INTERPOLATION_FORCE_INLINE inline __attribute__((always_inline))
+#endif
+
+#if (defined(__GNUC__) || defined(__clang__)) && (defined(__x86_64__) || defined(__i386__))
+    #define INTERPOLATION_AVX2_KERNEL_ENABLED
+#endif
+
+namespace {
+
+const int TRILINEAR_BLOCK_SIZE = 8;
+
+struct TrilinearGridView {
+    float *data;
+    int isize, jsize, ksize;
+    float outOfRangeValue;
+    double offsetx, offsety, offsetz;
+    double invdx;
+};
+
+typedef void (*TrilinearInterpolatePointsFunc)(const vmath::vec3 *points, int count, 
+                                               const TrilinearGridView &grid, float *results);
+
+INTERPOLATION_FORCE_INLINE float _getGridValue(const TrilinearGridView &grid, int i, int j, int k) {
+    if (!Grid3d::isGridIndexInRange(i, j, k, grid.isize, grid.jsize, grid.ksize)) {
+        return grid.outOfRangeValue;
+    }
+    return grid.data[(size_t)i + (size_t)grid.isize * ((size_t)j + (size_t)grid.jsize * (size_t)k)];
+}
+
+INTERPOLATION_FORCE_INLINE void _trilinearInterpolateBlock(const vmath::vec3 *points, int count, 
+                                                           const TrilinearGridView &grid, 
+                                                           float *results) {
+    const int bsize = TRILINEAR_BLOCK_SIZE;
+
+    // Structure-of-arrays load. Partial blocks are padded with the last point.
+    double px[bsize], py[bsize], pz[bsize];
+    for (int n = 0; n < bsize; n++) {
+        const vmath::vec3 &p = points[n < count ? n : count - 1];
+        px[n] = p.x;
+        py[n] = p.y;
+        pz[n] = p.z;
+    }
+
+    int ci[bsize], cj[bsize], ck[bsize];
+    double ix[bsize], iy[bsize], iz[bsize];
+    for (int n = 0; n < bsize; n++) {
+        double gx = (px[n] - grid.offsetx) * grid.invdx;
+        double gy = (py[n] - grid.offsety) * grid.invdx;
+        double gz = (pz[n] - grid.offsetz) * grid.invdx;
+        double fx = floor(gx);
+        double fy = floor(gy);
+        double fz = floor(gz);
+        ci[n] = (int)fx;
+        cj[n] = (int)fy;
+        ck[n] = (int)fz;
+        ix[n] = gx - fx;
+        iy[n] = gy - fy;
+        iz[n] = gz - fz;
+    }
+
+    // vertices c are ordered {(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), 
+    //                         (1, 0, 1), (0, 1, 1), (1, 1, 0), (1, 1, 1)}
+    size_t istride = 1;
+    size_t jstride = (size_t)grid.isize;
+    size_t kstride = (size_t)grid.isize * (size_t)grid.jsize;
+    double c0[bsize], c1[bsize], c2[bsize], c3[bsize], c4[bsize], c5[bsize], c6[bsize], c7[bsize];
+    for (int n = 0; n < bsize; n++) {
+        int i = ci[n];
+        int j = cj[n];
+        int k = ck[n];
+        bool isInterior = i >= 0 && j >= 0 && k >= 0 && 
+                          i + 1 < grid.isize && j + 1 < grid.jsize && k + 1 < grid.ksize;
+        if (isInterior) {
+            const float *v = grid.data + (size_t)i + jstride * (size_t)j + kstride * (size_t)k;
+            c0[n] = v[0];
+            c1[n] = v[istride];
+            c2[n] = v[jstride];
+            c3[n] = v[kstride];
+            c4[n] = v[istride + kstride];
+            c5[n] = v[jstride + kstride];
+            c6[n] = v[istride + jstride];
+            c7[n] = v[istride + jstride + kstride];
+        } else {
+            c0[n] = _getGridValue(grid, i,     j,     k);
+            c1[n] = _getGridValue(grid, i + 1, j,     k);
+            c2[n] = _getGridValue(grid, i,     j + 1, k);
+            c3[n] = _getGridValue(grid, i,     j,     k + 1);
+            c4[n] = _getGridValue(grid, i + 1, j,     k + 1);
+            c5[n] = _getGridValue(grid, i,     j + 1, k + 1);
+            c6[n] = _getGridValue(grid, i + 1, j + 1, k);
+            c7[n] = _getGridValue(grid, i + 1, j + 1, k + 1);
+        }
+    }
+
+    double out[bsize];
+    for (int n = 0; n < bsize; n++) {
+        double x = ix[n];
+        double y = iy[n];
+        double z = iz[n];
+        out[n] = c0[n] * (1 - x) * (1 - y) * (1 - z) +
+                 c1[n] * x * (1 - y) * (1 - z) + 
+                 c2[n] * (1 - x) * y * (1 - z) + 
+                 c3[n] * (1 - x) * (1 - y) * z +
+                 c4[n] * x * (1 - y) * z + 
+                 c5[n] * (1 - x) * y * z + 
+                 c6[n] * x * y * (1 - z) + 
+                 c7[n] * x * y * z;
+    }
+
+    for (int n = 0; n < count; n++) {
+        results[n] = (float)out[n];
+    }
+}
+
+INTERPOLATION_FORCE_INLINE void _trilinearInterpolatePointsKernel(const vmath::vec3 *points, int count, 
+                                                                  const TrilinearGridView &grid, 
+                                                                  float *results) {
+    for (int i = 0; i < count; i += TRILINEAR_BLOCK_SIZE) {
+        int blockCount = count - i < TRILINEAR_BLOCK_SIZE ? count - i : TRILINEAR_BLOCK_SIZE;
+        _trilinearInterpolateBlock(points + i, blockCount, grid, results + i);
+    }
+}
+
+void _trilinearInterpolatePointsGeneric(const vmath::vec3 *points, int count, 
+                                        const TrilinearGridView &grid, float *results) {
+    _trilinearInterpolatePointsKernel(points, count, grid, results);
+}
+
+#if defined(INTERPOLATION_AVX2_KERNEL_ENABLED)
+__attribute__((target("avx2,fma")))
+void _trilinearInterpolatePointsAVX2(const vmath::vec3 *points, int count, 
+                                     const TrilinearGridView &grid, float *results) {
+    _trilinearInterpolatePointsKernel(points, count, grid, results);
+}
+#endif
+
+struct TrilinearInterpolationKernel {
+    TrilinearInterpolatePointsFunc func;
+    const char *name;
+};
+
+TrilinearInterpolationKernel _selectTrilinearInterpolationKernel() {
+    #if defined(INTERPOLATION_AVX2_KERNEL_ENABLED)
+        __builtin_cpu_init();
+        if (__builtin_cpu_supports("avx2") && __builtin_cpu_supports("fma")) {
+            return TrilinearInterpolationKernel{_trilinearInterpolatePointsAVX2, "AVX2"};
+        }
+    #endif
+
+    return TrilinearInterpolationKernel{_trilinearInterpolatePointsGeneric, "Generic"};
+}
+
+const TrilinearInterpolationKernel& _getTrilinearInterpolationKernel() {
+    static const TrilinearInterpolationKernel kernel = _selectTrilinearInterpolationKernel();
+    return kernel;
+}
+
+}
+
+void Interpolation::trilinearInterpolatePoints(const vmath::vec3 *points, int count, 
+                                               vmath::vec3 offset, double dx, 
+                                               float outOfRangeValue, Array3d<float> &grid, 
+                                               float *results) {
+    if (count <= 0) {
+        return;
+    }
+
+    TrilinearGridView view;
+    view.data = grid.getRawArray();
+    view.isize = grid.width;
+    view.jsize = grid.height;
+    view.ksize = grid.depth;
+    view.outOfRangeValue = outOfRangeValue;
+    view.offsetx = offset.x;
+    view.offsety = offset.y;
+    view.offsetz = offset.z;
+    view.invdx = 1.0 / dx;
+
+    _getTrilinearInterpolationKernel().func(points, count, view, results);
+}
+
+const char* Interpolation::getTrilinearInterpolationKernelName() {
+    return _getTrilinearInterpolationKernel().name;
+}
@@ -41,4 +41,14 @@ namespace Interpolation {
     extern vmath::vec3 trilinearInterpolate(vmath::vec3 p, double dx, Array3d<vmath::vec3> &grid);
     extern void trilinearInterpolateGradient(
             vmath::vec3 p, double dx, Array3d<float> &grid, vmath::vec3 *grad);
+
+    // Batched trilinear interpolation of count points. Each point p is sampled
+    // at grid position p - offset. Grid values that are out of range are
+    // replaced by outOfRangeValue. Points are processed in blocks and the
+    // fastest kernel supported by the CPU is selected at runtime.
+    extern void trilinearInterpolatePoints(const vmath::vec3 *points, int count,
+                                           vmath::vec3 offset, double dx,
+                                           float outOfRangeValue, Array3d<float> &grid,
+                                           float *results);
+    extern const char* getTrilinearInterpolationKernelName();
 }
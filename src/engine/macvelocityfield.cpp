@@ -644,6 +644,34 @@ vmath::vec3 MACVelocityField::evaluateVelocityAtPositionLinear(double x, double
     return vmath::vec3(xvel, yvel, zvel);
 }
 
+void MACVelocityField::evaluateVelocityAtPositionsLinear(const vmath::vec3 *positions, int count, 
+                                                         vmath::vec3 *velocities) {
+    const int chunksize = 256;
+    float ubuffer[chunksize];
+    float vbuffer[chunksize];
+    float wbuffer[chunksize];
+
+    float hdx = (float)(0.5 * _dx);
+    vmath::vec3 offsetU(0.0f, hdx, hdx);
+    vmath::vec3 offsetV(hdx, 0.0f, hdx);
+    vmath::vec3 offsetW(hdx, hdx, 0.0f);
+    for (int startidx = 0; startidx < count; startidx += chunksize) {
+        int n = std::min(chunksize, count - startidx);
+        const vmath::vec3 *p = positions + startidx;
+        Interpolation::trilinearInterpolatePoints(p, n, offsetU, _dx, _outOfRangeVector.x, _u, ubuffer);
+        Interpolation::trilinearInterpolatePoints(p, n, offsetV, _dx, _outOfRangeVector.y, _v, vbuffer);
+        Interpolation::trilinearInterpolatePoints(p, n, offsetW, _dx, _outOfRangeVector.z, _w, wbuffer);
+
+        for (int i = 0; i < n; i++) {
+            if (Grid3d::isPositionInGrid(p[i].x, p[i].y, p[i].z, _dx, _isize, _jsize, _ksize)) {
+                velocities[startidx + i] = vmath::vec3(ubuffer[i], vbuffer[i], wbuffer[i]);
+            } else {
+                velocities[startidx + i] = vmath::vec3();
+            }
+        }
+    }
+}
+
 float MACVelocityField::evaluateVelocityAtPositionLinearU(double x, double y, double z) {
     if (!Grid3d::isPositionInGrid(x, y, z, _dx, _isize, _jsize, _ksize)) {
         return 0.0f;
@@ -133,6 +133,8 @@ public:
     float evaluateVelocityAtPositionLinearV(double x, double y, double z);
     float evaluateVelocityAtPositionLinearW(double x, double y, double z);
     vmath::vec3 evaluateVelocityAtPositionLinear(vmath::vec3 pos);
+    void evaluateVelocityAtPositionsLinear(const vmath::vec3 *positions, int count, 
+                                           vmath::vec3 *velocities);
 
     vmath::vec3 velocityIndexToPositionU(int i, int j, int k);
     vmath::vec3 velocityIndexToPositionV(int i, int j, int k);
@@ -266,26 +266,21 @@ void MeshLevelSet::trilinearInterpolatePoints(std::vector<vmath::vec3> &points,
                                               std::vector<float> &results) {
     results = std::vector<float>(points.size(), 0.0f);
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, points.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, points.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_trilinearInterpolatePointsThread, this,
-                                 intervals[i], intervals[i + 1], &points, &results);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)points.size(), [&](int startidx, int endidx) {
+        _trilinearInterpolatePointsThread(startidx, endidx, &points, &results);
+    });
 }
 
 void MeshLevelSet::_trilinearInterpolatePointsThread(int startidx, int endidx,
                                                      std::vector<vmath::vec3> *points, 
                                                      std::vector<float> *results) {
-    for (int i = startidx; i < endidx; i++) {
-        (*results)[i] = trilinearInterpolate(points->at(i));
+    if (startidx >= endidx) {
+        return;
     }
+
+    Interpolation::trilinearInterpolatePoints(points->data() + startidx, endidx - startidx, 
+                                              vmath::vec3(), _dx, 0.0f, _phi, 
+                                              results->data() + startidx);
 }
 
 void MeshLevelSet::trilinearInterpolateSolidGridPoints(vmath::vec3 offset, double dx, 
@@ -552,6 +547,10 @@ void MeshLevelSet::calculateSignedDistanceField(TriangleMesh &m,
     _mesh = m;
     _vertexVelocities = vertexVelocities;
 
+    if (_isMeshDecimationEnabled) {
+        MeshUtils::decimateSmallTriangles(_mesh, _vertexVelocities, _meshDecimationClusterWidth * _dx);
+    }
+
     // we begin by initializing distances near the mesh, and figuring out intersection counts
     _computeExactBandDistanceField(bandwidth);
 
@@ -582,6 +581,10 @@ void MeshLevelSet::fastCalculateSignedDistanceField(TriangleMesh &m,
     _mesh = m;
     _vertexVelocities = vertexVelocities;
 
+    if (_isMeshDecimationEnabled) {
+        MeshUtils::decimateSmallTriangles(_mesh, _vertexVelocities, _meshDecimationClusterWidth * _dx);
+    }
+
     // we begin by initializing distances near the mesh, and figuring out intersection counts
     _computeExactBandDistanceField(bandwidth);
 
@@ -600,6 +603,63 @@ void MeshLevelSet::fastCalculateSignedDistanceField(TriangleMesh &m,
     }
 }
 
+void MeshLevelSet::resampleSignedDistanceField(MeshLevelSet &sourceLevelSet,
+                                               RigidBodyTransform &transform,
+                                               TriangleMesh &m,
+                                               std::vector<vmath::vec3> &vertexVelocities) {
+    FLUIDSIM_ASSERT(vertexVelocities.size() == m.vertices.size());
+
+    _mesh = m;
+    _vertexVelocities = vertexVelocities;
+
+    Array3d<float> *sourcePhi = sourceLevelSet.getPhiArray3d();
+    vmath::vec3 sourceOffset = sourceLevelSet.getPositionOffset();
+    double sourcedx = sourceLevelSet.getCellSize();
+    float upperBound = getDistanceUpperBound();
+    int meshObjectIdx = (int)_meshObjects.size() - 1;
+
+    int gridsize = (int)_phi.getNumElements();
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        for (int idx = startidx; idx < endidx; idx++) {
+            GridIndex g = Grid3d::getUnflattenedIndex(idx, _phi.width, _phi.height);
+            vmath::vec3 p = Grid3d::GridIndexToPosition(g, _dx) + _positionOffset;
+            vmath::vec3 sp = transform.inverseTransformPoint(p) - sourceOffset;
+
+            // Nodes outside of the source grid are outside of the exact band
+            GridIndex sg = Grid3d::positionToGridIndex(sp, sourcedx);
+            if (sg.i < 0 || sg.j < 0 || sg.k < 0 || 
+                    sg.i + 1 >= sourcePhi->width || 
+                    sg.j + 1 >= sourcePhi->height || 
+                    sg.k + 1 >= sourcePhi->depth) {
+                _phi.set(g, upperBound);
+                if (!_isMinimalLevelSet) {
+                    _closestTriangles.set(g, -1);
+                    _closestMeshObjects.set(g, -1);
+                }
+                continue;
+            }
+
+            float d = (float)Interpolation::trilinearInterpolate(sp, sourcedx, *sourcePhi);
+            _phi.set(g, _clamp(d, -upperBound, upperBound));
+
+            if (_isMinimalLevelSet) {
+                continue;
+            }
+
+            GridIndex nearest((int)floor(sp.x / sourcedx + 0.5),
+                              (int)floor(sp.y / sourcedx + 0.5),
+                              (int)floor(sp.z / sourcedx + 0.5));
+            int tidx = sourceLevelSet.getClosestTriangleIndex(nearest);
+            _closestTriangles.set(g, tidx);
+            _closestMeshObjects.set(g, tidx != -1 ? meshObjectIdx : -1);
+        }
+    });
+
+    if (_isVelocityDataEnabled && !_isMinimalLevelSet) {
+        _computeVelocityGrids();
+    }
+}
+
 void MeshLevelSet::calculateUnion(MeshLevelSet &levelset) {
     // Merge mesh data
     TriangleMesh *meshOther = levelset.getTriangleMesh();
@@ -766,11 +826,35 @@ bool MeshLevelSet::isSignCaclulationEnabled() {
     return _isSignCalculationEnabled;
 }
 
+void MeshLevelSet::enableMeshDecimation() {
+    _isMeshDecimationEnabled = true;
+}
+
+void MeshLevelSet::disableMeshDecimation() {
+    _isMeshDecimationEnabled = false;
+}
+
+bool MeshLevelSet::isMeshDecimationEnabled() {
+    return _isMeshDecimationEnabled;
+}
+
+void MeshLevelSet::setMeshDecimationClusterWidth(double cellFraction) {
+    _meshDecimationClusterWidth = cellFraction;
+}
+
+double MeshLevelSet::getMeshDecimationClusterWidth() {
+    return _meshDecimationClusterWidth;
+}
+
 float MeshLevelSet::getDistanceUpperBound() {
     return (_phi.width + _phi.height + _phi.depth) * _dx;
 }
 
 void MeshLevelSet::_computeExactBandDistanceField(int bandwidth) {
+    if (_computeExactBandDistanceFieldBVH(bandwidth)) {
+        return;
+    }
+
     if (_isMultiThreadingEnabled) {
         _computeExactBandDistanceFieldMultiThreaded(bandwidth);
     } else {
@@ -778,6 +862,183 @@ void MeshLevelSet::_computeExactBandDistanceField(int bandwidth) {
     }
 }
 
+bool MeshLevelSet::_computeExactBandDistanceFieldBVH(int bandwidth) {
+    if ((int)_mesh.triangles.size() < _minTrianglesForBVH) {
+        return false;
+    }
+
+    Array3d<bool> bandNodes(_phi.width, _phi.height, _phi.depth, false);
+    double rasterCost = _initializeBVHBandNodes(bandwidth, bandNodes);
+    _dilateBVHBandNodes(bandwidth, bandNodes);
+
+    int numBandNodes = 0;
+    int size = bandNodes.getNumElements();
+    bool *bandNodesArray = bandNodes.getRawArray();
+    for (int i = 0; i < size; i++) {
+        if (bandNodesArray[i]) {
+            numBandNodes++;
+        }
+    }
+
+    double logn = log2((double)_mesh.triangles.size());
+    double bvhCost = logn * (_bvhQueryCostFactor * numBandNodes + 
+                             _bvhBuildCostFactor * _mesh.triangles.size());
+    if (bvhCost >= rasterCost) {
+        return false;
+    }
+
+    TriangleBVH bvh;
+    bvh.build(_mesh.vertices, _mesh.triangles, _positionOffset);
+
+    _phi.fill(getDistanceUpperBound());
+    _closestTriangles.fill(-1);
+    _closestMeshObjects.fill(-1);
+
+    if (_isMultiThreadingEnabled) {
+        ThreadUtils::parallelFor(0, _phi.depth, [this, &bvh, &bandNodes](int startidx, int endidx) {
+            _computeExactBandDistanceFieldBVHThread(startidx, endidx, &bvh, &bandNodes);
+        });
+    } else {
+        _computeExactBandDistanceFieldBVHThread(0, _phi.depth, &bvh, &bandNodes);
+    }
+
+    return true;
+}
+
+double MeshLevelSet::_initializeBVHBandNodes(int bandwidth, Array3d<bool> &bandNodes) {
+    int isize = _phi.width;
+    int jsize = _phi.height;
+    int ksize = _phi.depth;
+
+    // Nodes overlapped by each triangle's bounds are marked. The band is
+    // added afterwards by dilation, matching the extent of the nodes that
+    // triangle rasterization would visit. 
+    double rasterCost = 0.0;
+    for (size_t tidx = 0; tidx < _mesh.triangles.size(); tidx++) {
+        AABB bbox(_mesh.triangles[tidx], _mesh.vertices);
+        bbox.position -= _positionOffset;
+        GridIndex gmin = Grid3d::positionToGridIndex(bbox.getMinPoint(), _dx);
+        GridIndex gmax = Grid3d::positionToGridIndex(bbox.getMaxPoint(), _dx);
+
+        if (gmax.i + bandwidth + 1 < 0 || gmin.i - bandwidth >= isize || 
+                gmax.j + bandwidth + 1 < 0 || gmin.j - bandwidth >= jsize || 
+                gmax.k + bandwidth + 1 < 0 || gmin.k - bandwidth >= ksize) {
+            continue;
+        }
+
+        rasterCost += (double)(gmax.i - gmin.i + 2 * bandwidth + 2) * 
+                      (double)(gmax.j - gmin.j + 2 * bandwidth + 2) * 
+                      (double)(gmax.k - gmin.k + 2 * bandwidth + 2);
+
+        // Triangles just outside of the grid are clamped onto the grid 
+        // boundary. This may add a few extra band nodes but never misses one.
+        gmin = GridIndex(_clamp(gmin.i, 0, isize - 1), 
+                         _clamp(gmin.j, 0, jsize - 1), 
+                         _clamp(gmin.k, 0, ksize - 1));
+        gmax = GridIndex(_clamp(gmax.i, 0, isize - 1), 
+                         _clamp(gmax.j, 0, jsize - 1), 
+                         _clamp(gmax.k, 0, ksize - 1));
+        for (int k = gmin.k; k <= gmax.k; k++) {
+            for (int j = gmin.j; j <= gmax.j; j++) {
+                for (int i = gmin.i; i <= gmax.i; i++) {
+                    bandNodes.set(i, j, k, true);
+                }
+            }
+        }
+    }
+
+    return rasterCost;
+}
+
+void MeshLevelSet::_dilateBVHBandNodes(int bandwidth, Array3d<bool> &bandNodes) {
+    // Separable dilation along each axis. A node is in the band if a marked
+    // node lies within [n - bandwidth - 1, n + bandwidth] on every axis.
+    int dims[3] = {bandNodes.width, bandNodes.height, bandNodes.depth};
+    for (int axis = 0; axis < 3; axis++) {
+        int u = (axis + 1) % 3;
+        int v = (axis + 2) % 3;
+        int linesize = dims[axis];
+        int numlines = dims[u] * dims[v];
+
+        auto getNodeIndex = [&dims, axis, u, v](int lineidx, int n) {
+            int g[3];
+            g[axis] = n;
+            g[u] = lineidx % dims[u];
+            g[v] = lineidx / dims[u];
+            return GridIndex(g[0], g[1], g[2]);
+        };
+
+        auto dilateLines = [&bandNodes, &getNodeIndex, bandwidth, linesize](int startidx, int endidx) {
+            std::vector<int> prefix(linesize + 1);
+            for (int lidx = startidx; lidx < endidx; lidx++) {
+                prefix[0] = 0;
+                for (int n = 0; n < linesize; n++) {
+                    prefix[n + 1] = prefix[n] + (bandNodes(getNodeIndex(lidx, n)) ? 1 : 0);
+                }
+
+                for (int n = 0; n < linesize; n++) {
+                    int lo = std::max(n - bandwidth - 1, 0);
+                    int hi = std::min(n + bandwidth, linesize - 1);
+                    bandNodes.set(getNodeIndex(lidx, n), prefix[hi + 1] - prefix[lo] > 0);
+                }
+            }
+        };
+
+        if (_isMultiThreadingEnabled) {
+            ThreadUtils::parallelFor(0, numlines, dilateLines, 64);
+        } else {
+            dilateLines(0, numlines);
+        }
+    }
+}
+
+void MeshLevelSet::_computeExactBandDistanceFieldBVHThread(int startidx, int endidx,
+                                                           TriangleBVH *bvh,
+                                                           Array3d<bool> *bandNodes) {
+    float maxDistance = getDistanceUpperBound();
+    int meshObjectIdx = (int)_meshObjects.size() - 1;
+    for (int k = startidx; k < endidx; k++) {
+        for (int j = 0; j < _phi.height; j++) {
+            int previousTriangle = -1;
+            for (int i = 0; i < _phi.width; i++) {
+                if (!bandNodes->get(i, j, k)) {
+                    previousTriangle = -1;
+                    continue;
+                }
+
+                // The closest triangle of the previous node bounds the search
+                // radius, which lets the BVH discard most of the tree early
+                vmath::vec3 gpos = Grid3d::GridIndexToPosition(i, j, k, _dx);
+                float searchDistance = maxDistance;
+                if (previousTriangle != -1) {
+                    Triangle t = _mesh.triangles[previousTriangle];
+                    searchDistance = _pointToTriangleDistance(gpos, 
+                                                              _mesh.vertices[t.tri[0]] - _positionOffset, 
+                                                              _mesh.vertices[t.tri[1]] - _positionOffset, 
+                                                              _mesh.vertices[t.tri[2]] - _positionOffset);
+                }
+
+                float dist;
+                int tidx = bvh->getClosestTriangle(gpos, searchDistance, &dist);
+                if (tidx == -1) {
+                    tidx = previousTriangle;
+                    dist = searchDistance;
+                }
+                if (tidx == -1) {
+                    continue;
+                }
+                previousTriangle = tidx;
+
+                _phi.set(i, j, k, dist);
+                if (!_isMinimalLevelSet) {
+                    _closestTriangles.set(i, j, k, tidx);
+                    _closestMeshObjects.set(i, j, k, meshObjectIdx);
+                }
+            }
+        }
+    }
+}
+
 void MeshLevelSet::_computeExactBandDistanceFieldMultiThreaded(int bandwidth) {
     _phi.fill(getDistanceUpperBound());
     _closestTriangles.fill(-1);
@@ -64,6 +64,7 @@ USE OR OTHER DEALINGS IN THE SOFTWARE.
 #include "threadutils.h"
 #include "blockarray3d.h"
 #include "boundedbuffer.h"
+#include "trianglebvh.h"
 
 struct VelocityDataGrid {
     MACVelocityField field;
@@ -85,6 +86,31 @@ struct VelocityDataGrid {
     }
 };
 
+/*
+    Rigid transform stored as an orthonormal frame attached to an object, 
+    given in the source space and in the target space.
+*/
+struct RigidBodyTransform {
+    vmath::vec3 sourceOrigin;
+    vmath::vec3 sourceBasis[3];
+    vmath::vec3 targetOrigin;
+    vmath::vec3 targetBasis[3];
+
+    vmath::vec3 transformPoint(vmath::vec3 p) {
+        vmath::vec3 d = p - sourceOrigin;
+        return targetOrigin + vmath::dot(d, sourceBasis[0]) * targetBasis[0] + 
+                              vmath::dot(d, sourceBasis[1]) * targetBasis[1] + 
+                              vmath::dot(d, sourceBasis[2]) * targetBasis[2];
+    }
+
+    vmath::vec3 inverseTransformPoint(vmath::vec3 p) {
+        vmath::vec3 d = p - targetOrigin;
+        return sourceOrigin + vmath::dot(d, targetBasis[0]) * sourceBasis[0] + 
+                              vmath::dot(d, targetBasis[1]) * sourceBasis[1] + 
+                              vmath::dot(d, targetBasis[2]) * sourceBasis[2];
+    }
+};
+
 class MeshObject;
 
 class MeshLevelSet {
@@ -160,6 +186,17 @@ public:
     void fastCalculateSignedDistanceField(TriangleMesh &m, 
                                           std::vector<vmath::vec3> &vertexVelocities, 
                                           int bandwidth = 1);
+
+    /*
+        Calculate the signed distance field by resampling a level set that 
+        was computed for the mesh in its source space. m is the mesh 
+        transformed into this level set's space and must have the same 
+        triangles as the source mesh.
+    */
+    void resampleSignedDistanceField(MeshLevelSet &sourceLevelSet,
+                                     RigidBodyTransform &transform,
+                                     TriangleMesh &m,
+                                     std::vector<vmath::vec3> &vertexVelocities);
     void calculateUnion(MeshLevelSet &levelset);
     void normalizeVelocityGrid();
     void negate();
@@ -180,6 +217,17 @@ public:
     bool isSignCaclulationEnabled();
     float getDistanceUpperBound();
 
+    /*
+        Enable/Disable simplification of mesh regions made of triangles much 
+        smaller than the grid cell size before computing the signed distance
+        field. Cluster width is given as a fraction of the cell size.
+    */
+    void enableMeshDecimation();
+    void disableMeshDecimation();
+    bool isMeshDecimationEnabled();
+    void setMeshDecimationClusterWidth(double cellFraction);
+    double getMeshDecimationClusterWidth();
+
 
     template<class T>
     void trilinearInterpolateSolidPoints(FragmentedVector<T> &points, 
@@ -254,6 +302,13 @@ private:
 
     void _computeExactBandDistanceField(int bandwidth);
 
+    bool _computeExactBandDistanceFieldBVH(int bandwidth);
+    double _initializeBVHBandNodes(int bandwidth, Array3d<bool> &bandNodes);
+    void _dilateBVHBandNodes(int bandwidth, Array3d<bool> &bandNodes);
+    void _computeExactBandDistanceFieldBVHThread(int startidx, int endidx,
+                                                 TriangleBVH *bvh,
+                                                 Array3d<bool> *bandNodes);
+
     void _computeExactBandDistanceFieldMultiThreaded(int bandwidth);
     void _initializeTriangleData(int bandwidth, std::vector<TriangleData> &data);
     void _initializeBlockGrid(std::vector<TriangleData> &triangleData, 
@@ -365,6 +420,15 @@ private:
     bool _isMultiThreadingEnabled = true;
     bool _isSignCalculationEnabled = true;
     bool _isMinimalLevelSet = false;
+    bool _isMeshDecimationEnabled = false;
+    double _meshDecimationClusterWidth = 0.25;
+
+    // The BVH is used when rasterizing every triangle with its band would 
+    // cost more than querying the band nodes. Query and build costs are
+    // in units of point-triangle distance evaluations per log2(triangles).
+    int _minTrianglesForBVH = 10000;
+    double _bvhQueryCostFactor = 2.0;
+    double _bvhBuildCostFactor = 1.0;
 
     int _blockwidth = 10;
     int _numComputeBlocksPerJob = 10;
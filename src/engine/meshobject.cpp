@@ -56,6 +56,7 @@ void MeshObject::updateMeshStatic(TriangleMesh meshCurrent) {
     _isAnimated = false;
     _isChangingTopology = false;
     _isRigid = true;
+    _isRigidBodyFrameMeshesInitialized = false;
 }
 
 void MeshObject::updateMeshAnimated(TriangleMesh meshPrevious, 
@@ -92,6 +93,7 @@ void MeshObject::updateMeshAnimated(TriangleMesh meshPrevious,
     }
 
     _isAnimated = true;
+    _isRigidBodyFrameMeshesInitialized = false;
 }
 
 void MeshObject::getCells(std::vector<GridIndex> &cells) {
@@ -303,6 +305,65 @@ void MeshObject::getMeshLevelSetFractureOptimization(std::vector<MeshObject*> ob
 
 }
 
+void MeshObject::getRigidBodyMeshLevelSet(double dt, float frameInterpolation, int exactBand, 
+                                          MeshLevelSet &levelset) {
+    if (!_updateRigidBodyMeshLevelSet(levelset, exactBand)) {
+        getMeshLevelSet(dt, frameInterpolation, exactBand, levelset);
+        return;
+    }
+
+    float f = fmin(fmax(frameInterpolation, 0.0f), 1.0f);
+    TriangleMesh m = _rigidBodyMeshCurrent;
+    for (size_t i = 0; i < m.vertices.size(); i++) {
+        vmath::vec3 v1 = _rigidBodyMeshCurrent.vertices[i];
+        vmath::vec3 v2 = _rigidBodyMeshNext.vertices[i];
+        m.vertices[i] = v1 + f * (v2 - v1);
+    }
+
+    std::vector<vmath::vec3> vertexVelocities = getVertexVelocities(dt, frameInterpolation);
+    for (int i = _rigidBodyRemovedVertices.size() - 1; i >= 0; i--) {
+        vertexVelocities.erase(vertexVelocities.begin() + _rigidBodyRemovedVertices[i]);
+    }
+
+    int isize, jsize, ksize;
+    levelset.getGridDimensions(&isize, &jsize, &ksize);
+    double dx = levelset.getCellSize();
+
+    AABB meshAABB(m.vertices);
+    GridIndex gmin = Grid3d::positionToGridIndex(meshAABB.getMinPoint(), dx);
+    GridIndex gmax = Grid3d::positionToGridIndex(meshAABB.getMaxPoint(), dx);
+    gmin.i = (int)fmax(gmin.i - exactBand, 0);
+    gmin.j = (int)fmax(gmin.j - exactBand, 0);
+    gmin.k = (int)fmax(gmin.k - exactBand, 0);
+    gmax.i = (int)fmin(gmax.i + exactBand + 1, isize - 1);
+    gmax.j = (int)fmin(gmax.j + exactBand + 1, jsize - 1);
+    gmax.k = (int)fmin(gmax.k + exactBand + 1, ksize - 1);
+
+    int gwidth = gmax.i - gmin.i;
+    int gheight = gmax.j - gmin.j;
+    int gdepth = gmax.k - gmin.k;
+    if (gwidth <= 0 || gheight <= 0 || gdepth <= 0) {
+        return;
+    }
+
+    RigidBodyTransform transform = _getRigidBodyTransform(frameInterpolation);
+    MeshLevelSet objectLevelSet(gwidth, gheight, gdepth, dx, this);
+    objectLevelSet.setGridOffset(gmin);
+    objectLevelSet.resampleSignedDistanceField(_rigidBodyMeshLevelSet, transform, 
+                                               m, vertexVelocities);
+    levelset.calculateUnion(objectLevelSet);
+}
+
+void MeshObject::clearRigidBodyMeshLevelSet() {
+    _isRigidBodyMeshLevelSetInitialized = false;
+    _rigidBodyMeshLevelSet = MeshLevelSet();
+    _rigidBodyReferenceMesh = TriangleMesh();
+    _isRigidBodyFrameMeshesInitialized = false;
+    _rigidBodyMeshCurrent = TriangleMesh();
+    _rigidBodyMeshNext = TriangleMesh();
+    _rigidBodyRemovedVertices.clear();
+}
+
 void MeshObject::enable() {
     if (!_isEnabled) {
         _isObjectStateChanged = true;
@@ -394,6 +455,18 @@ float MeshObject::getMeshExpansion() {
     return _meshExpansion;
 }
 
+void MeshObject::enableMeshDecimation() {
+    _isMeshDecimationEnabled = true;
+}
+
+void MeshObject::disableMeshDecimation() {
+    _isMeshDecimationEnabled = false;
+}
+
+bool MeshObject::isMeshDecimationEnabled() {
+    return _isMeshDecimationEnabled;
+}
+
 void MeshObject::enableAppendObjectVelocity() {
     _isAppendObjectVelocityEnabled = true;
 }
@@ -694,6 +767,9 @@ MeshLevelSet MeshObject::_getMeshIslandLevelSet(TriangleMesh &m,
 
     MeshLevelSet islandLevelSet(gwidth, gheight, gdepth, dx, this);
     islandLevelSet.setGridOffset(gmin);
+    if (_isMeshDecimationEnabled) {
+        islandLevelSet.enableMeshDecimation();
+    }
     islandLevelSet.fastCalculateSignedDistanceField(m, velocities, exactBand);
 
     *success = true;
@@ -830,6 +906,9 @@ void MeshObject::_islandMeshLevelSetProducerThread(BoundedBuffer<MeshIslandWorkI
 
             MeshLevelSet *islandLevelSet = new MeshLevelSet(gwidth, gheight, gdepth, dx, this);
             islandLevelSet->setGridOffset(gmin);
+            if (_isMeshDecimationEnabled) {
+                islandLevelSet->enableMeshDecimation();
+            }
             islandLevelSet->disableMultiThreading();
             islandLevelSet->fastCalculateSignedDistanceField(w.mesh, w.vertexVelocities, exactBand);
 
@@ -881,6 +960,9 @@ void MeshObject::_obstacleMeshLevelSetProducerThread(BoundedBuffer<MeshObject*>
             MeshLevelSet *islandLevelSet = new MeshLevelSet(gwidth, gheight, gdepth, dx, obstacle);
 
             islandLevelSet->setGridOffset(gmin);
+            if (obstacle->isMeshDecimationEnabled()) {
+                islandLevelSet->enableMeshDecimation();
+            }
             islandLevelSet->disableMultiThreading();
             islandLevelSet->fastCalculateSignedDistanceField(mesh, vertexVelocities, exactBand);
 
@@ -890,6 +972,209 @@ void MeshObject::_obstacleMeshLevelSetProducerThread(BoundedBuffer<MeshObject*>
     }
 }
 
+bool MeshObject::_updateRigidBodyMeshLevelSet(MeshLevelSet &domainLevelSet, int exactBand) {
+    if (!_isAnimated || !_isRigid || _isChangingTopology) {
+        clearRigidBodyMeshLevelSet();
+        return false;
+    }
+
+    _updateRigidBodyFrameMeshes();
+    TriangleMesh &currentMesh = _rigidBodyMeshCurrent;
+    TriangleMesh &nextMesh = _rigidBodyMeshNext;
+
+    double dx = domainLevelSet.getCellSize();
+    bool isReferenceValid = _isRigidBodyMeshLevelSetInitialized && 
+                            _rigidBodyExactBand == exactBand &&
+                            fabs(_rigidBodyMeshLevelSet.getCellSize() - dx) < 1e-9 &&
+                            _rigidBodyReferenceMesh.vertices.size() == currentMesh.vertices.size() &&
+                            _rigidBodyReferenceMesh.triangles.size() == currentMesh.triangles.size();
+
+    if (isReferenceValid) {
+        // The reference mesh must map onto the mesh at both ends of the frame
+        RigidBodyTransform t0 = _getRigidBodyTransform(0.0f);
+        RigidBodyTransform t1 = _getRigidBodyTransform(1.0f);
+        double tolerance = _rigidBodyTransformTolerance * dx;
+        isReferenceValid = _isRigidBodyTransformValid(t0, currentMesh, tolerance) && 
+                           _isRigidBodyTransformValid(t1, nextMesh, tolerance);
+    }
+
+    if (!isReferenceValid && !_initializeRigidBodyMeshLevelSet(domainLevelSet, exactBand)) {
+        clearRigidBodyMeshLevelSet();
+        return false;
+    }
+
+    // Mesh expansion is applied per island when the mesh is split into
+    // many islands, which a single resampled level set cannot represent
+    float eps = 1e-9f;
+    if (_rigidBodyNumMeshIslands >= _numIslandsForFractureOptimizationTrigger && 
+            fabs(_meshExpansion) > eps) {
+        return false;
+    }
+
+    return true;
+}
+
+bool MeshObject::_initializeRigidBodyMeshLevelSet(MeshLevelSet &domainLevelSet, int exactBand) {
+    _isRigidBodyMeshLevelSetInitialized = false;
+
+    TriangleMesh &m = _rigidBodyMeshCurrent;
+    if (m.vertices.empty() || !_initializeRigidBodyFrame(m)) {
+        return false;
+    }
+
+    int isize, jsize, ksize;
+    domainLevelSet.getGridDimensions(&isize, &jsize, &ksize);
+    double dx = domainLevelSet.getCellSize();
+
+    // The reference level set is not clipped to the domain and covers the 
+    // mesh with a band wide enough to be resampled at any orientation
+    int band = exactBand + _rigidBodyExtraBand;
+    AABB meshAABB(m.vertices);
+    GridIndex gmin = Grid3d::positionToGridIndex(meshAABB.getMinPoint(), dx);
+    GridIndex gmax = Grid3d::positionToGridIndex(meshAABB.getMaxPoint(), dx);
+    gmin = GridIndex(gmin.i - band, gmin.j - band, gmin.k - band);
+    gmax = GridIndex(gmax.i + band + 1, gmax.j + band + 1, gmax.k + band + 1);
+
+    int gwidth = gmax.i - gmin.i;
+    int gheight = gmax.j - gmin.j;
+    int gdepth = gmax.k - gmin.k;
+    double referenceSize = (double)gwidth * (double)gheight * (double)gdepth;
+    double domainSize = (double)isize * (double)jsize * (double)ksize;
+    if (referenceSize > domainSize) {
+        // Objects much larger than the domain are cheaper to rasterize 
+        // within the domain each frame
+        return false;
+    }
+
+    std::vector<vmath::vec3> vertexVelocities(m.vertices.size());
+    std::vector<TriangleMesh> islands;
+    std::vector<std::vector<vmath::vec3> > islandVertexVelocities;
+    MeshUtils::splitIntoMeshIslands(m, vertexVelocities, islands, islandVertexVelocities);
+
+    _rigidBodyMeshLevelSet = MeshLevelSet(gwidth, gheight, gdepth, dx, this);
+    _rigidBodyMeshLevelSet.setGridOffset(gmin);
+    _rigidBodyMeshLevelSet.disableVelocityData();
+    _rigidBodyMeshLevelSet.fastCalculateSignedDistanceField(m, band);
+
+    _rigidBodyReferenceMesh = m;
+    _rigidBodyNumMeshIslands = (int)islands.size();
+    _rigidBodyExactBand = exactBand;
+    _isRigidBodyMeshLevelSetInitialized = true;
+
+    return true;
+}
+
+void MeshObject::_updateRigidBodyFrameMeshes() {
+    if (_isRigidBodyFrameMeshesInitialized) {
+        return;
+    }
+
+    // The current and next meshes share topology for a rigid mesh, so the 
+    // same vertices are removed from both
+    _rigidBodyMeshCurrent = _meshCurrent;
+    _rigidBodyMeshNext = _meshNext;
+    _rigidBodyRemovedVertices = _rigidBodyMeshCurrent.removeExtraneousVertices();
+    _rigidBodyMeshNext.removeExtraneousVertices();
+    _isRigidBodyFrameMeshesInitialized = true;
+}
+
+bool MeshObject::_initializeRigidBodyFrame(TriangleMesh &m) {
+    vmath::vec3 c = m.getCentroid();
+
+    // Frame vertices are chosen so that the frame is well conditioned: the
+    // vertex furthest from the centroid and the vertex furthest from the 
+    // line through the centroid and the first vertex
+    int v1idx = 0;
+    float maxdist = -1.0f;
+    for (size_t i = 0; i < m.vertices.size(); i++) {
+        float d = vmath::length(m.vertices[i] - c);
+        if (d > maxdist) {
+            maxdist = d;
+            v1idx = (int)i;
+        }
+    }
+
+    float eps = 1e-6f;
+    if (maxdist < eps) {
+        return false;
+    }
+
+    vmath::vec3 axis = vmath::normalize(m.vertices[v1idx] - c);
+    int v2idx = 0;
+    maxdist = -1.0f;
+    for (size_t i = 0; i < m.vertices.size(); i++) {
+        vmath::vec3 v = m.vertices[i] - c;
+        float d = vmath::length(v - vmath::dot(v, axis) * axis);
+        if (d > maxdist) {
+            maxdist = d;
+            v2idx = (int)i;
+        }
+    }
+
+    if (maxdist < eps * vmath::length(m.vertices[v1idx] - c)) {
+        return false;
+    }
+
+    _rigidBodyFrameVertices[0] = v1idx;
+    _rigidBodyFrameVertices[1] = v2idx;
+
+    return true;
+}
+
+void MeshObject::_getRigidBodyFrame(TriangleMesh &m, vmath::vec3 &origin, vmath::vec3 basis[3]) {
+    origin = m.getCentroid();
+    vmath::vec3 v1 = m.vertices[_rigidBodyFrameVertices[0]] - origin;
+    vmath::vec3 v2 = m.vertices[_rigidBodyFrameVertices[1]] - origin;
+    basis[0] = vmath::normalize(v1);
+    basis[1] = vmath::normalize(v2 - vmath::dot(v2, basis[0]) * basis[0]);
+    basis[2] = vmath::cross(basis[0], basis[1]);
+}
+
+bool MeshObject::_isRigidBodyTransformValid(RigidBodyTransform &transform, 
+                                            TriangleMesh &m, double tolerance) {
+    if (m.vertices.size() != _rigidBodyReferenceMesh.vertices.size()) {
+        return false;
+    }
+
+    for (size_t i = 0; i < m.vertices.size(); i++) {
+        vmath::vec3 p = transform.transformPoint(_rigidBodyReferenceMesh.vertices[i]);
+        if (vmath::length(p - m.vertices[i]) > tolerance) {
+            return false;
+        }
+    }
+
+    return true;
+}
+
+RigidBodyTransform MeshObject::_getRigidBodyTransform(float frameInterpolation) {
+    frameInterpolation = fmax(0.0f, frameInterpolation);
+    frameInterpolation = fmin(1.0f, frameInterpolation);
+
+    _updateRigidBodyFrameMeshes();
+    TriangleMesh &currentMesh = _rigidBodyMeshCurrent;
+    TriangleMesh &nextMesh = _rigidBodyMeshNext;
+
+    RigidBodyTransform transform;
+    _getRigidBodyFrame(_rigidBodyReferenceMesh, transform.sourceOrigin, transform.sourceBasis);
+
+    vmath::vec3 origin0, origin1;
+    vmath::vec3 basis0[3], basis1[3];
+    _getRigidBodyFrame(currentMesh, origin0, basis0);
+    _getRigidBodyFrame(nextMesh, origin1, basis1);
+
+    // The interpolated frame is re-orthonormalized so that the object moves
+    // rigidly within the frame
+    float f = frameInterpolation;
+    vmath::vec3 b0 = basis0[0] + f * (basis1[0] - basis0[0]);
+    vmath::vec3 b1 = basis0[1] + f * (basis1[1] - basis0[1]);
+    transform.targetOrigin = origin0 + f * (origin1 - origin0);
+    transform.targetBasis[0] = vmath::normalize(b0);
+    transform.targetBasis[1] = vmath::normalize(b1 - vmath::dot(b1, transform.targetBasis[0]) * transform.targetBasis[0]);
+    transform.targetBasis[2] = vmath::cross(transform.targetBasis[0], transform.targetBasis[1]);
+
+    return transform;
+}
+
 bool MeshObject::_isMeshChanged() {
     if (!isAnimated()) {
         return false;
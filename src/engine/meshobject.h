@@ -90,6 +90,16 @@ public:
                                              double dt, float frameInterpolation, int exactBand, 
                                              MeshLevelSet &levelset);
 
+    /*
+        Same result as getMeshLevelSet, but for rigid animated meshes the level
+        set is computed once in the object's reference frame and resampled
+        through the object's transform. Falls back to getMeshLevelSet if the
+        mesh is not moving rigidly.
+    */
+    void getRigidBodyMeshLevelSet(double dt, float frameInterpolation, int exactBand, 
+                                  MeshLevelSet &levelset);
+    void clearRigidBodyMeshLevelSet();
+
     void enable();
     void disable();
     bool isEnabled();
@@ -113,6 +123,9 @@ public:
     float getSheetingStrength();
     void setMeshExpansion(float exp);
     float getMeshExpansion();
+    void enableMeshDecimation();
+    void disableMeshDecimation();
+    bool isMeshDecimationEnabled();
 
     void enableAppendObjectVelocity();
     void disableAppendObjectVelocity();
@@ -174,6 +187,14 @@ private:
                                              double dt, float frameInterpolation, int exactBand);
     bool _isMeshChanged();
 
+    bool _updateRigidBodyMeshLevelSet(MeshLevelSet &domainLevelSet, int exactBand);
+    bool _initializeRigidBodyMeshLevelSet(MeshLevelSet &domainLevelSet, int exactBand);
+    void _updateRigidBodyFrameMeshes();
+    bool _initializeRigidBodyFrame(TriangleMesh &m);
+    void _getRigidBodyFrame(TriangleMesh &m, vmath::vec3 &origin, vmath::vec3 basis[3]);
+    bool _isRigidBodyTransformValid(RigidBodyTransform &transform, TriangleMesh &m, double tolerance);
+    RigidBodyTransform _getRigidBodyTransform(float frameInterpolation);
+
     void _sortTriangleIndices(Triangle &t);
     bool _isTriangleEqual(Triangle &t1, Triangle &t2);
     bool _isTopologyConsistent(TriangleMesh &m1, TriangleMesh &m2);
@@ -207,6 +228,7 @@ private:
     float _dustEmissionStrength = 1.0f;
     float _sheetingStrength = 1.0f;
     float _meshExpansion = 0.0f;
+    bool _isMeshDecimationEnabled = false;
     bool _isAppendObjectVelocityEnabled = false;
     float _objectVelocityInfluence = 1.0f;
     bool _isObjectStateChanged = false;
@@ -219,6 +241,23 @@ private:
     vmath::vec3 _sourceColor;
 
 
+    // Level set of a rigid animated mesh in its reference frame
+    bool _isRigidBodyMeshLevelSetInitialized = false;
+    MeshLevelSet _rigidBodyMeshLevelSet;
+    TriangleMesh _rigidBodyReferenceMesh;
+    int _rigidBodyFrameVertices[2] = {0, 0};
+
+    // Current and next frame meshes with extraneous vertices removed. These
+    // are computed once per frame and shared by every substep
+    bool _isRigidBodyFrameMeshesInitialized = false;
+    TriangleMesh _rigidBodyMeshCurrent;
+    TriangleMesh _rigidBodyMeshNext;
+    std::vector<int> _rigidBodyRemovedVertices;
+    int _rigidBodyNumMeshIslands = 0;
+    int _rigidBodyExactBand = 0;
+    int _rigidBodyExtraBand = 2;
+    double _rigidBodyTransformTolerance = 0.05;
+
     int _numIslandsForFractureOptimizationTrigger = 25;
     int _numIslandsPerThreadForFractureOptimization = 25;
     int _finishedWorkQueueSize = 25;
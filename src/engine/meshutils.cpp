@@ -25,6 +25,7 @@ SOFTWARE.
 #include "meshutils.h"
 
 #include <limits>
+#include <algorithm>
 
 #include "grid3d.h"
 #include "collision.h"
@@ -706,4 +707,116 @@ void extrapolateGrid(Array3d<float> *grid, Array3d<bool> *valid, int numLayers)
 
 }
 
-}
\ No newline at end of file
+int decimateSmallTriangles(TriangleMesh &mesh, 
+                           std::vector<vmath::vec3> &vertexVelocities,
+                           double clusterWidth) {
+    FLUIDSIM_ASSERT(vertexVelocities.size() == mesh.vertices.size());
+    if (mesh.triangles.empty() || clusterWidth <= 0.0) {
+        return 0;
+    }
+
+    std::vector<float> maxEdgeLengths(mesh.vertices.size(), 0.0f);
+    for (size_t i = 0; i < mesh.triangles.size(); i++) {
+        Triangle t = mesh.triangles[i];
+        for (int eidx = 0; eidx < 3; eidx++) {
+            int v1 = t.tri[eidx];
+            int v2 = t.tri[(eidx + 1) % 3];
+            float len = vmath::length(mesh.vertices[v1] - mesh.vertices[v2]);
+            maxEdgeLengths[v1] = fmax(maxEdgeLengths[v1], len);
+            maxEdgeLengths[v2] = fmax(maxEdgeLengths[v2], len);
+        }
+    }
+
+    // Vertices are sorted by cluster key so that each cluster is a 
+    // contiguous run. Vertices that are not clustered keep a unique key.
+    AABB bbox(mesh.vertices);
+    double invw = 1.0 / clusterWidth;
+    long long ni = (long long)(bbox.width * invw) + 1;
+    long long nj = (long long)(bbox.height * invw) + 1;
+    long long nk = (long long)(bbox.depth * invw) + 1;
+    long long numClusterKeys = ni * nj * nk;
+
+    std::vector<std::pair<long long, int> > vertexKeys(mesh.vertices.size());
+    for (size_t i = 0; i < mesh.vertices.size(); i++) {
+        long long key = numClusterKeys + (long long)i;
+        if (maxEdgeLengths[i] < clusterWidth) {
+            vmath::vec3 p = mesh.vertices[i] - bbox.position;
+            long long ci = std::min((long long)(p.x * invw), ni - 1);
+            long long cj = std::min((long long)(p.y * invw), nj - 1);
+            long long ck = std::min((long long)(p.z * invw), nk - 1);
+            key = ci + ni * (cj + nj * ck);
+        }
+        vertexKeys[i] = std::pair<long long, int>(key, (int)i);
+    }
+    std::sort(vertexKeys.begin(), vertexKeys.end());
+
+    std::vector<int> vertexTranslationTable(mesh.vertices.size(), -1);
+    std::vector<vmath::vec3> clusteredVertices;
+    std::vector<vmath::vec3> clusteredVelocities;
+    size_t startidx = 0;
+    while (startidx < vertexKeys.size()) {
+        size_t endidx = startidx + 1;
+        while (endidx < vertexKeys.size() && vertexKeys[endidx].first == vertexKeys[startidx].first) {
+            endidx++;
+        }
+
+        vmath::vec3 psum, vsum;
+        for (size_t i = startidx; i < endidx; i++) {
+            int vidx = vertexKeys[i].second;
+            psum += mesh.vertices[vidx];
+            vsum += vertexVelocities[vidx];
+            vertexTranslationTable[vidx] = (int)clusteredVertices.size();
+        }
+
+        float inv = 1.0f / (float)(endidx - startidx);
+        clusteredVertices.push_back(inv * psum);
+        clusteredVelocities.push_back(inv * vsum);
+        startidx = endidx;
+    }
+
+    std::vector<Triangle> clusteredTriangles;
+    clusteredTriangles.reserve(mesh.triangles.size());
+    for (size_t i = 0; i < mesh.triangles.size(); i++) {
+        Triangle t = mesh.triangles[i];
+        t.tri[0] = vertexTranslationTable[t.tri[0]];
+        t.tri[1] = vertexTranslationTable[t.tri[1]];
+        t.tri[2] = vertexTranslationTable[t.tri[2]];
+        if (t.tri[0] == t.tri[1] || t.tri[1] == t.tri[2] || t.tri[2] == t.tri[0]) {
+            continue;
+        }
+        clusteredTriangles.push_back(t);
+    }
+
+    // Clusters that are only referenced by removed triangles are dropped
+    std::vector<int> clusterTranslationTable(clusteredVertices.size(), -1);
+    for (size_t i = 0; i < clusteredTriangles.size(); i++) {
+        for (int vidx = 0; vidx < 3; vidx++) {
+            clusterTranslationTable[clusteredTriangles[i].tri[vidx]] = 0;
+        }
+    }
+
+    mesh.vertices.clear();
+    vertexVelocities.clear();
+    for (size_t i = 0; i < clusteredVertices.size(); i++) {
+        if (clusterTranslationTable[i] == -1) {
+            continue;
+        }
+        clusterTranslationTable[i] = (int)mesh.vertices.size();
+        mesh.vertices.push_back(clusteredVertices[i]);
+        vertexVelocities.push_back(clusteredVelocities[i]);
+    }
+
+    for (size_t i = 0; i < clusteredTriangles.size(); i++) {
+        for (int vidx = 0; vidx < 3; vidx++) {
+            int cidx = clusteredTriangles[i].tri[vidx];
+            clusteredTriangles[i].tri[vidx] = clusterTranslationTable[cidx];
+        }
+    }
+
+    int numRemoved = (int)(mesh.triangles.size() - clusteredTriangles.size());
+    mesh.triangles = clusteredTriangles;
+
+    return numRemoved;
+}
+
+}
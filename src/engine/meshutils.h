@@ -107,4 +107,16 @@ namespace MeshUtils {
 
     void extrapolateGrid(Array3d<float> *grid, Array3d<bool> *valid, int numLayers);
 
+    /*
+        Simplifies regions of a mesh made of triangles much smaller than 
+        clusterWidth by merging their vertices into clusters of width 
+        clusterWidth. Vertices that belong to an edge longer than clusterWidth 
+        are left in place so that large triangles are unchanged. Degenerate 
+        triangles are removed. Vertex velocities are averaged per cluster.
+        Returns the number of removed triangles.
+    */
+    int decimateSmallTriangles(TriangleMesh &mesh, 
+                               std::vector<vmath::vec3> &vertexVelocities,
+                               double clusterWidth);
+
 }
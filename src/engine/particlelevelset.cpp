@@ -24,6 +24,8 @@ SOFTWARE.
 
 #include "particlelevelset.h"
 
+#include <algorithm>
+
 #include "levelsetutils.h"
 #include "interpolation.h"
 #include "polygonizer3d.h"
@@ -57,17 +59,17 @@ float ParticleLevelSet::operator()(GridIndex g) {
 
 float ParticleLevelSet::get(int i, int j, int k) {
     FLUIDSIM_ASSERT(Grid3d::isGridIndexInRange(i, j, k, _isize, _jsize, _ksize));
-    return _phi(i, j, k);
+    return _getPhi(i, j, k);
 }
 
 float ParticleLevelSet::get(GridIndex g) {
     FLUIDSIM_ASSERT(Grid3d::isGridIndexInRange(g, _isize, _jsize, _ksize));
-    return _phi(g);
+    return _getPhi(g.i, g.j, g.k);
 }
 
 float ParticleLevelSet::getFaceWeightU(int i, int j, int k) {
     FLUIDSIM_ASSERT(Grid3d::isGridIndexInRange(i, j, k, _isize + 1, _jsize, _ksize));
-    return LevelsetUtils::fractionInside(_phi(i - 1, j, k), _phi(i, j, k));
+    return LevelsetUtils::fractionInside(_getPhi(i - 1, j, k), _getPhi(i, j, k));
 }
 
 float ParticleLevelSet::getFaceWeightU(GridIndex g) {
@@ -76,7 +78,7 @@ float ParticleLevelSet::getFaceWeightU(GridIndex g) {
 
 float ParticleLevelSet::getFaceWeightV(int i, int j, int k) {
     FLUIDSIM_ASSERT(Grid3d::isGridIndexInRange(i, j, k, _isize, _jsize + 1, _ksize));
-    return LevelsetUtils::fractionInside(_phi(i, j - 1, k), _phi(i, j, k));
+    return LevelsetUtils::fractionInside(_getPhi(i, j - 1, k), _getPhi(i, j, k));
 }
 
 float ParticleLevelSet::getFaceWeightV(GridIndex g) {
@@ -85,7 +87,7 @@ float ParticleLevelSet::getFaceWeightV(GridIndex g) {
 
 float ParticleLevelSet::getFaceWeightW(int i, int j, int k) {
     FLUIDSIM_ASSERT(Grid3d::isGridIndexInRange(i, j, k, _isize, _jsize, _ksize + 1));
-    return LevelsetUtils::fractionInside(_phi(i, j, k - 1), _phi(i, j, k));
+    return LevelsetUtils::fractionInside(_getPhi(i, j, k - 1), _getPhi(i, j, k));
 }
 
 float ParticleLevelSet::getFaceWeightW(GridIndex g) {
@@ -103,28 +105,28 @@ void ParticleLevelSet::getNodalPhi(Array3d<float> &nodalPhi) {
 
                 float sum = 0.0;
                 if (Grid3d::isGridIndexInRange(i - 1, j - 1, k - 1, _isize, _jsize, _ksize)) {
-                    sum += _phi(i - 1, j - 1, k - 1);
+                    sum += _getPhi(i - 1, j - 1, k - 1);
                 }
                 if (Grid3d::isGridIndexInRange(i, j - 1, k - 1, _isize, _jsize, _ksize)) {
-                    sum += _phi(i, j - 1, k - 1);
+                    sum += _getPhi(i, j - 1, k - 1);
                 }
                 if (Grid3d::isGridIndexInRange(i - 1, j, k - 1, _isize, _jsize, _ksize)) {
-                    sum += _phi(i - 1, j, k - 1);
+                    sum += _getPhi(i - 1, j, k - 1);
                 }
                 if (Grid3d::isGridIndexInRange(i, j, k - 1, _isize, _jsize, _ksize)) {
-                    sum += _phi(i, j, k - 1);
+                    sum += _getPhi(i, j, k - 1);
                 }
                 if (Grid3d::isGridIndexInRange(i - 1, j - 1, k, _isize, _jsize, _ksize)) {
-                    sum += _phi(i - 1, j - 1, k);
+                    sum += _getPhi(i - 1, j - 1, k);
                 }
                 if (Grid3d::isGridIndexInRange(i, j - 1, k, _isize, _jsize, _ksize)) {
-                    sum += _phi(i, j - 1, k);
+                    sum += _getPhi(i, j - 1, k);
                 }
                 if (Grid3d::isGridIndexInRange(i - 1, j, k, _isize, _jsize, _ksize)) {
-                    sum += _phi(i - 1, j, k);
+                    sum += _getPhi(i - 1, j, k);
                 }
                 if (Grid3d::isGridIndexInRange(i, j, k, _isize, _jsize, _ksize)) {
-                    sum += _phi(i, j, k);
+                    sum += _getPhi(i, j, k);
                 }
 
                 nodalPhi.set(i, j, k, 0.125f * sum);
@@ -134,7 +136,31 @@ void ParticleLevelSet::getNodalPhi(Array3d<float> &nodalPhi) {
 }
 
 float ParticleLevelSet::trilinearInterpolate(vmath::vec3 pos) {
-    return Interpolation::trilinearInterpolate(pos - vmath::vec3(0.5*_dx, 0.5*_dx, 0.5*_dx), _dx, _phi);
+    if (!_isSparseStorageEnabled) {
+        return Interpolation::trilinearInterpolate(pos - vmath::vec3(0.5*_dx, 0.5*_dx, 0.5*_dx), _dx, _phi);
+    }
+
+    vmath::vec3 p = pos - vmath::vec3(0.5*_dx, 0.5*_dx, 0.5*_dx);
+    GridIndex g = Grid3d::positionToGridIndex(p, _dx);
+    vmath::vec3 gpos = Grid3d::GridIndexToPosition(g, _dx);
+
+    double inv_dx = 1.0 / _dx;
+    double ix = (p.x - gpos.x)*inv_dx;
+    double iy = (p.y - gpos.y)*inv_dx;
+    double iz = (p.z - gpos.z)*inv_dx;
+
+    // Out of range points are zero to match the dense interpolation
+    GridIndex offsets[8] = {GridIndex(0, 0, 0), GridIndex(1, 0, 0), GridIndex(0, 1, 0), GridIndex(0, 0, 1),
+                            GridIndex(1, 0, 1), GridIndex(0, 1, 1), GridIndex(1, 1, 0), GridIndex(1, 1, 1)};
+    double points[8] = {0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0};
+    for (int idx = 0; idx < 8; idx++) {
+        GridIndex n(g.i + offsets[idx].i, g.j + offsets[idx].j, g.k + offsets[idx].k);
+        if (Grid3d::isGridIndexInRange(n, _isize, _jsize, _ksize)) {
+            points[idx] = _sparsePhi(n);
+        }
+    }
+
+    return Interpolation::trilinearInterpolate(points, ix, iy, iz);
 }
 
 float ParticleLevelSet::getDistanceAtNode(int i, int j, int k) {
@@ -144,14 +170,14 @@ float ParticleLevelSet::getDistanceAtNode(int i, int j, int k) {
         return _getMaxDistance();
     }
 
-    return 0.125f * (_phi(i - 1, j - 1, k - 1) + 
-                     _phi(i    , j - 1, k - 1) + 
-                     _phi(i - 1, j    , k - 1) + 
-                     _phi(i    , j    , k - 1) +
-                     _phi(i - 1, j - 1, k    ) + 
-                     _phi(i    , j - 1, k    ) + 
-                     _phi(i - 1, j    , k    ) + 
-                     _phi(i    , j    , k    ));
+    return 0.125f * (_getPhi(i - 1, j - 1, k - 1) + 
+                     _getPhi(i    , j - 1, k - 1) + 
+                     _getPhi(i - 1, j    , k - 1) + 
+                     _getPhi(i    , j    , k - 1) +
+                     _getPhi(i - 1, j - 1, k    ) + 
+                     _getPhi(i    , j - 1, k    ) + 
+                     _getPhi(i - 1, j    , k    ) + 
+                     _getPhi(i    , j    , k    ));
 }
 
 float ParticleLevelSet::getDistanceAtNode(GridIndex g) {
@@ -175,6 +201,37 @@ void ParticleLevelSet::postProcessSignedDistanceField(MeshLevelSet &solidPhi) {
     FLUIDSIM_ASSERT(si == _isize && sj == _jsize && sk == _ksize);
 
     float eps = 0.005 * _dx;
+    if (_isSparseStorageEnabled) {
+        // Unallocated tiles hold the maximum distance and are unaffected, so only
+        // the allocated tiles need to be visited
+        std::vector<GridIndex> tiles;
+        _sparsePhi.getAllocatedTiles(tiles);
+        int tw = _sparsePhi.tilewidth;
+        for (size_t tidx = 0; tidx < tiles.size(); tidx++) {
+            GridIndex t = tiles[tidx];
+            int imax = std::min((t.i + 1) * tw, _isize);
+            int jmax = std::min((t.j + 1) * tw, _jsize);
+            int kmax = std::min((t.k + 1) * tw, _ksize);
+            for(int k = t.k * tw; k < kmax; k++) {
+                for(int j = t.j * tw; j < jmax; j++) {
+                    for(int i = t.i * tw; i < imax; i++) {
+                        if(_sparsePhi(i, j, k) < 0.5 * _dx) {
+                            if (solidPhi.getDistanceAtCellCenter(i, j, k) < 0) {
+                                _sparsePhi.set(i, j, k, -0.5f * _dx);
+                            }
+                        }
+
+                        float val = _sparsePhi(i, j, k);
+                        if (std::abs(val) < eps) {
+                            _sparsePhi.set(i, j, k, val > 0 ? eps : -eps);
+                        }
+                    }
+                }
+            }
+        }
+        return;
+    }
+
     for(int k = 0; k < _ksize; k++) {
         for(int j = 0; j < _jsize; j++) {
             for(int i = 0; i < _isize; i++) {
@@ -203,12 +260,20 @@ void ParticleLevelSet::calculateCurvatureGrid(Array3d<float> &surfacePhi,
                     kgrid.height == _jsize && 
                     kgrid.depth == _ksize);
 
+    // The level set solver requires a dense grid. In sparse mode the values
+    // are written to the output grid, which is then reinitialized in place
+    Array3d<float> *phi = &_phi;
+    if (_isSparseStorageEnabled) {
+        _sparsePhi.getDenseGrid(surfacePhi);
+        phi = &surfacePhi;
+    }
+
     float maxSurfaceCellDist = 2.0f * _dx;
     Array3d<bool> validNodes(_isize, _jsize, _ksize, false);
     for (int k = 0; k < _ksize; k++) {
         for (int j = 0; j < _jsize; j++) {
             for (int i = 0; i < _isize; i++) {
-                if (std::abs(_phi(i, j, k)) < maxSurfaceCellDist) {
+                if (std::abs(phi->get(i, j, k)) < maxSurfaceCellDist) {
                     validNodes.set(i, j, k, true);
                 }
             }
@@ -260,7 +325,7 @@ void ParticleLevelSet::calculateCurvatureGrid(Array3d<float> &surfacePhi,
 
     float width = _curvatureGridExactBand * _dx;
     LevelSetSolver solver;
-    solver.reinitializeUpwind(_phi, _dx, width, solverGridCells, surfacePhi);
+    solver.reinitializeUpwind(*phi, _dx, width, solverGridCells, surfacePhi);
 
     float outOfRangeDist = _outOfRangeDistance * _dx;
     for (int k = 0; k < _ksize; k++) {
@@ -291,25 +356,142 @@ void ParticleLevelSet::calculateCurvatureGrid(Array3d<float> &surfacePhi,
 }
 
 Array3d<float>* ParticleLevelSet::getPhiGrid() {
+    FLUIDSIM_ASSERT(!_isSparseStorageEnabled);
     return &_phi;
 }
 
+void ParticleLevelSet::getCellsInsideLiquid(std::vector<GridIndex> &cells) {
+    if (!_isSparseStorageEnabled) {
+        for (int k = 0; k < _ksize; k++) {
+            for (int j = 0; j < _jsize; j++) {
+                for (int i = 0; i < _isize; i++) {
+                    if (_phi(i, j, k) < 0.0f) {
+                        cells.push_back(GridIndex(i, j, k));
+                    }
+                }
+            }
+        }
+        return;
+    }
+
+    std::vector<GridIndex> tiles;
+    _sparsePhi.getAllocatedTiles(tiles);
+    size_t startidx = cells.size();
+    int tw = _sparsePhi.tilewidth;
+    for (size_t tidx = 0; tidx < tiles.size(); tidx++) {
+        GridIndex t = tiles[tidx];
+        int imax = std::min((t.i + 1) * tw, _isize);
+        int jmax = std::min((t.j + 1) * tw, _jsize);
+        int kmax = std::min((t.k + 1) * tw, _ksize);
+        for (int k = t.k * tw; k < kmax; k++) {
+            for (int j = t.j * tw; j < jmax; j++) {
+                for (int i = t.i * tw; i < imax; i++) {
+                    if (_sparsePhi(i, j, k) < 0.0f) {
+                        cells.push_back(GridIndex(i, j, k));
+                    }
+                }
+            }
+        }
+    }
+
+    // Match the ordering of a dense grid traversal
+    std::sort(cells.begin() + startidx, cells.end(), [](const GridIndex &a, const GridIndex &b) {
+        return a.k < b.k || (a.k == b.k && (a.j < b.j || (a.j == b.j && a.i < b.i)));
+    });
+}
+
+void ParticleLevelSet::enableSparseStorage() {
+    if (_isSparseStorageEnabled) {
+        return;
+    }
+
+    _sparsePhi = SparseArray3d<float>(_isize, _jsize, _ksize, _sparseTileWidth, _getMaxDistance());
+    for (int k = 0; k < _ksize; k++) {
+        for (int j = 0; j < _jsize; j++) {
+            for (int i = 0; i < _isize; i++) {
+                _sparsePhi.set(i, j, k, _phi(i, j, k));
+            }
+        }
+    }
+    _phi = Array3d<float>();
+    _isSparseStorageEnabled = true;
+}
+
+void ParticleLevelSet::disableSparseStorage() {
+    if (!_isSparseStorageEnabled) {
+        return;
+    }
+
+    _sparsePhi.getDenseGrid(_phi);
+    _sparsePhi = SparseArray3d<float>();
+    _isSparseStorageEnabled = false;
+}
+
+bool ParticleLevelSet::isSparseStorageEnabled() {
+    return _isSparseStorageEnabled;
+}
+
+int ParticleLevelSet::getNumAllocatedTiles() {
+    // Dense storage does not use tiles
+    if (!_isSparseStorageEnabled) {
+        return 0;
+    }
+    return _sparsePhi.getNumAllocatedTiles();
+}
+
+size_t ParticleLevelSet::getMemoryUsage() {
+    if (_isSparseStorageEnabled) {
+        return _sparsePhi.getMemoryUsage();
+    }
+    return sizeof(float) * (size_t)_phi.getNumElements();
+}
+
 void ParticleLevelSet::getGridDimensions(int *i, int *j, int *k) {
-    _phi.getGridDimensions(i, j, k);
+    *i = _isize; *j = _jsize; *k = _ksize;
 }
 
 void ParticleLevelSet::getCoarseGridDimensions(int *i, int *j, int *k) {
-    _phi.getCoarseGridDimensions(i, j, k);
+    *i = _isize / 2; *j = _jsize / 2; *k = _ksize / 2;
 }
 
 bool ParticleLevelSet::isDimensionsValidForCoarseGridGeneration() {
-    return _phi.isDimensionsValidForCoarseGridGeneration();
+    return _isize % 2 == 0 || _jsize % 2 == 0 || _ksize % 2 == 0;
 }
 
 void ParticleLevelSet::generateCoarseGrid(ParticleLevelSet &coarseGrid) {
     FLUIDSIM_ASSERT(isDimensionsValidForCoarseGridGeneration());
 
     Array3d<float> *coarsePhi = coarseGrid.getPhiGrid();
+    if (_isSparseStorageEnabled) {
+        int icoarse, jcoarse, kcoarse;
+        getCoarseGridDimensions(&icoarse, &jcoarse, &kcoarse);
+        FLUIDSIM_ASSERT(coarsePhi->width == icoarse && 
+                        coarsePhi->height == jcoarse && 
+                        coarsePhi->depth == kcoarse);
+
+        // Same averaging as Array3d::generateCoarseGrid, read from the tiles
+        for (int k = 0; k < kcoarse; k++) {
+            for (int j = 0; j < jcoarse; j++) {
+                for (int i = 0; i < icoarse; i++) {
+                    float sum = 0.0f;
+                    int neighbours = 0;
+                    for (int nk = 2*k - 1; nk <= 2*k + 1; nk++) {
+                        for (int nj = 2*j - 1; nj <= 2*j + 1; nj++) {
+                            for (int ni = 2*i - 1; ni <= 2*i + 1; ni++) {
+                                if (Grid3d::isGridIndexInRange(ni, nj, nk, _isize, _jsize, _ksize)) {
+                                    sum += _sparsePhi(ni, nj, nk);
+                                    neighbours++;
+                                }
+                            }
+                        }
+                    }
+                    coarsePhi->set(i, j, k, sum / (float)neighbours);
+                }
+            }
+        }
+        return;
+    }
+
     FLUIDSIM_ASSERT(_phi.isMatchingDimensionsForCoarseGrid(*coarsePhi));
 
     _phi.generateCoarseGrid(*coarsePhi);
@@ -332,9 +514,17 @@ float ParticleLevelSet::_getMaxDistance() {
     return 3.0 * _dx;
 }
 
+void ParticleLevelSet::_fillPhi(float value) {
+    if (_isSparseStorageEnabled) {
+        _sparsePhi.fill(value);
+    } else {
+        _phi.fill(value);
+    }
+}
+
 void ParticleLevelSet::_computeSignedDistanceFromParticles(std::vector<vmath::vec3> &particles, 
                                                            double radius) {
-    _phi.fill(_getMaxDistance());
+    _fillPhi(_getMaxDistance());
 
     if (particles.empty()) {
         return;
@@ -394,8 +584,8 @@ void ParticleLevelSet::_computeSignedDistanceFromParticles(std::vector<vmath::ve
                 GridIndex phiidx = GridIndex(localidx.i + gridOffset.i,
                                              localidx.j + gridOffset.j,
                                              localidx.k + gridOffset.k);
-                if (_phi.isIndexInRange(phiidx)) {
-                    _phi.set(phiidx, block.gridBlock.data[vidx]);
+                if (Grid3d::isGridIndexInRange(phiidx, _isize, _jsize, _ksize)) {
+                    _setPhi(phiidx.i, phiidx.j, phiidx.k, block.gridBlock.data[vidx]);
                 }
             }
         }
@@ -34,6 +34,7 @@ SOFTWARE.
 #include "array3d.h"
 #include "vmath.h"
 #include "blockarray3d.h"
+#include "sparsearray3d.h"
 #include "boundedbuffer.h"
 #include "particlesystem.h"
 
@@ -69,6 +70,14 @@ public:
     void calculateCurvatureGrid(Array3d<float> &surfacePhi, Array3d<float> &kgrid);
 
     Array3d<float>* getPhiGrid();
+    void getCellsInsideLiquid(std::vector<GridIndex> &cells);
+
+    void enableSparseStorage();
+    void disableSparseStorage();
+    bool isSparseStorageEnabled();
+    int getNumAllocatedTiles();
+    size_t getMemoryUsage();
+
     void getGridDimensions(int *i, int *j, int *k);
     void getCoarseGridDimensions(int *i, int *j, int *k);
     bool isDimensionsValidForCoarseGridGeneration();
@@ -101,6 +110,17 @@ private:
     };
 
     float _getMaxDistance();
+    inline float _getPhi(int i, int j, int k) {
+        return _isSparseStorageEnabled ? _sparsePhi(i, j, k) : _phi(i, j, k);
+    }
+    inline void _setPhi(int i, int j, int k, float value) {
+        if (_isSparseStorageEnabled) {
+            _sparsePhi.set(i, j, k, value);
+        } else {
+            _phi.set(i, j, k, value);
+        }
+    }
+    void _fillPhi(float value);
 
     void _computeSignedDistanceFromParticles(std::vector<vmath::vec3> &particles, 
                                              double radius);
@@ -139,6 +159,9 @@ private:
     int _ksize = 0;
     double _dx = 0.0;
     Array3d<float> _phi;
+    SparseArray3d<float> _sparsePhi;
+    bool _isSparseStorageEnabled = false;
+    int _sparseTileWidth = 8;
 
     int _curvatureGridExactBand = 3;
     int _curvatureGridExtrapolationLayers = 3;
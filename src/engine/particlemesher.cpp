@@ -24,6 +24,11 @@ SOFTWARE.
 
 #include "particlemesher.h"
 
+#include <map>
+#include <unordered_map>
+#include <algorithm>
+#include <limits>
+
 #include "trianglemesh.h"
 #include "polygonizer3d.h"
 #include "threadutils.h"
@@ -44,11 +49,23 @@ TriangleMesh ParticleMesher::meshParticles(ParticleMesherParameters params) {
     vmath::vec3 invscaleVect(1.0/scale, 1.0/scale, 1.0/scale);
 
     TriangleMesh mesh;
+    TriangleMesh previousChunkMesh;
     for (size_t i = 0; i < data.computeChunks.size(); i++) {
         MesherComputeChunk c = data.computeChunks[i];
         TriangleMesh chunkMesh = _polygonizeComputeChunk(c, data);
         chunkMesh.scale(scaleVect);
+
+        if (i > 0) {
+            MesherComputeChunk prev = data.computeChunks[i - 1];
+            if (prev.ratio != c.ratio && _isComputeChunkJoinedAtSeam(prev, c)) {
+                _stitchComputeChunkSeam(previousChunkMesh, chunkMesh, c);
+            }
+        }
+
         mesh.join(chunkMesh);
+        if (_isCameraAdaptive) {
+            previousChunkMesh = chunkMesh;
+        }
     }
     mesh.scale(invscaleVect);
 
@@ -84,6 +101,15 @@ void ParticleMesher::_initialize(ParticleMesherParameters params) {
 
     _particles = params.particles;
     _solidSDF = params.solidSDF;
+    _bufferArena = params.bufferArena != nullptr ? params.bufferArena : &_localBufferArena;
+
+    _isCameraAdaptive = params.isCameraAdaptive && !params.camera.isEmpty();
+    _camera = params.camera;
+    _cameraFrustumPadding = params.cameraFrustumPadding;
+    _cameraLODPixelSize = params.cameraLODPixelSize;
+    _cameraLODMaxLevel = std::max(params.cameraLODMaxLevel, 0);
+    _domainScale = params.domainScale;
+    _domainOffset = params.domainOffset;
 
     _subisize = _isize * _subdivisions + 1;
     _subjsize = _jsize * _subdivisions + 1;
@@ -143,19 +169,26 @@ void ParticleMesher::_initializeComputeChunkDataComputeChunks(MesherComputeChunk
     int bj = data.activeBlocks.height;
     int bk = data.activeBlocks.depth;
 
-    Direction splitdir = Direction::U;
+    Direction splitdir = _getComputeChunkSplitDirection(data);
     int splitwidth = bi;
-    if (bj > splitwidth) {
-        splitdir = Direction::V;
+    if (splitdir == Direction::V) {
         splitwidth = bj;
-    }
-    if (bk > splitwidth) {
-        splitdir = Direction::W;
+    } else if (splitdir == Direction::W) {
         splitwidth = bk;
     }
 
     int nchunks = _computechunks;
+    if (_isCameraAdaptive) {
+        nchunks = std::max(nchunks, _cameraAdaptiveMinComputeChunks);
+    }
     int chunkwidth = (int)ceil((float)splitwidth/(float)nchunks);
+    if (_isCameraAdaptive) {
+        // Seams between chunks must lie on the grid of the coarsest level
+        int maxratio = 1 << _cameraLODMaxLevel;
+        while ((_blockwidth * chunkwidth) % maxratio != 0) {
+            chunkwidth++;
+        }
+    }
     nchunks = (int)ceil((float)splitwidth/(float)chunkwidth);
 
     typedef std::pair<GridIndex, GridIndex> IndexPair;
@@ -243,38 +276,172 @@ void ParticleMesher::_initializeComputeChunkDataComputeChunks(MesherComputeChunk
         c.id = cidx;
         c.minBlockIndex = gmin;
         c.maxBlockIndex = gmax;
-        c.minGridIndex = GridIndex(_blockwidth * gmin.i, 
-                                   _blockwidth * gmin.j, 
-                                   _blockwidth * gmin.k);
-
-        if (cidx == chunkBounds.size() - 1) {
-            c.maxGridIndex = GridIndex(std::min(_blockwidth * gmax.i, _subisize), 
-                                       std::min(_blockwidth * gmax.j, _subjsize), 
-                                       std::min(_blockwidth * gmax.k, _subksize));
-        } else {
-            //c.maxGridIndex = GridIndex(std::min(_blockwidth * (gmax.i - 1) + 1, _subisize), 
-            //                           std::min(_blockwidth * (gmax.j - 1) + 1, _subjsize), 
-            //                           std::min(_blockwidth * (gmax.k - 1) + 1, _subksize));
-            c.maxGridIndex = GridIndex(std::min(_blockwidth * gmax.i, _subisize), 
-                                       std::min(_blockwidth * gmax.j, _subjsize), 
-                                       std::min(_blockwidth * gmax.k, _subksize));
-            if (splitdir == Direction::U) {
-                c.maxGridIndex.i = std::min(_blockwidth * (gmax.i - 1) + 1, _subisize);
-            } else if (splitdir == Direction::V) {
-                c.maxGridIndex.j = std::min(_blockwidth * (gmax.j - 1) + 1, _subjsize);
-            } else if (splitdir == Direction::W) {
-                c.maxGridIndex.k = std::min(_blockwidth * (gmax.k - 1) + 1, _subksize);
+        c.splitDirection = splitdir;
+        c.ratio = _getComputeChunkRatio(gmin, gmax, data);
+        _initializeComputeChunkGridIndices(c, gmin, gmax, cidx == chunkBounds.size() - 1);
+
+        data.computeChunks.push_back(c);
+    }
+
+    _initializeComputeChunkSeamRatios(data.computeChunks);
+}
+
+ParticleMesher::Direction ParticleMesher::_getComputeChunkSplitDirection(MesherComputeChunkData &data) {
+    int bi = data.activeBlocks.width;
+    int bj = data.activeBlocks.height;
+    int bk = data.activeBlocks.depth;
+
+    if (_isCameraAdaptive && !_camera.isOrthographic()) {
+        // Slicing perpendicular to the view direction groups regions of 
+        // similar camera depth into the same chunk
+        vmath::vec3 f = _camera.getForward();
+        Direction splitdir = Direction::U;
+        float maxval = fabs(f.x);
+        if (fabs(f.y) > maxval) {
+            splitdir = Direction::V;
+            maxval = fabs(f.y);
+        }
+        if (fabs(f.z) > maxval) {
+            splitdir = Direction::W;
+        }
+        return splitdir;
+    }
+
+    Direction splitdir = Direction::U;
+    int splitwidth = bi;
+    if (bj > splitwidth) {
+        splitdir = Direction::V;
+        splitwidth = bj;
+    }
+    if (bk > splitwidth) {
+        splitdir = Direction::W;
+        splitwidth = bk;
+    }
+
+    return splitdir;
+}
+
+int ParticleMesher::_getComputeChunkRatio(GridIndex gmin, GridIndex gmax, 
+                                          MesherComputeChunkData &data) {
+    if (!_isCameraAdaptive) {
+        return 1;
+    }
+
+    int ratio = 1 << _cameraLODMaxLevel;
+    for (int k = gmin.k; k < gmax.k; k++) {
+        for (int j = gmin.j; j < gmax.j; j++) {
+            for (int i = gmin.i; i < gmax.i; i++) {
+                if (!data.activeBlocks(i, j, k)) {
+                    continue;
+                }
+
+                ratio = std::min(ratio, _getBlockRatio(GridIndex(i, j, k)));
+                if (ratio == 1) {
+                    return ratio;
+                }
             }
         }
+    }
 
-        c.positionOffset = Grid3d::GridIndexToPosition(c.minGridIndex, _subdx);
-        c.splitDirection = splitdir;
-        c.isize = c.maxGridIndex.i - c.minGridIndex.i;
-        c.jsize = c.maxGridIndex.j - c.minGridIndex.j;
-        c.ksize = c.maxGridIndex.k - c.minGridIndex.k;
+    return ratio;
+}
 
-        data.computeChunks.push_back(c);
+int ParticleMesher::_getBlockRatio(GridIndex blockIndex) {
+    int maxratio = 1 << _cameraLODMaxLevel;
+    double blockdx = _blockwidth * _subdx;
+    vmath::vec3 blockmin = Grid3d::GridIndexToPosition(blockIndex, blockdx);
+
+    // The block is tested at its center and corners so that blocks that are
+    // large on screen are not missed when only partially inside the frustum
+    vmath::vec3 samples[9];
+    samples[0] = blockmin + vmath::vec3(0.5f, 0.5f, 0.5f) * (float)blockdx;
+    for (int i = 0; i < 8; i++) {
+        vmath::vec3 corner((float)(i & 1), (float)((i >> 1) & 1), (float)((i >> 2) & 1));
+        samples[i + 1] = blockmin + corner * (float)blockdx;
     }
+
+    bool isInsideFrustum = false;
+    double minPixelSize = std::numeric_limits<double>::infinity();
+    for (int i = 0; i < 9; i++) {
+        vmath::vec3 worldp = samples[i] * _domainScale + _domainOffset;
+        if (_camera.isPointInside(worldp, _cameraFrustumPadding)) {
+            isInsideFrustum = true;
+        }
+        minPixelSize = std::min(minPixelSize, _camera.getPixelSize(worldp));
+    }
+
+    if (!isInsideFrustum) {
+        return maxratio;
+    }
+
+    double cellSize = _subdx * _domainScale;
+    double maxCellSize = _cameraLODPixelSize * minPixelSize;
+    int ratio = 1;
+    while (ratio < maxratio && 2 * ratio * cellSize <= maxCellSize) {
+        ratio *= 2;
+    }
+
+    return ratio;
+}
+
+void ParticleMesher::_initializeComputeChunkGridIndices(MesherComputeChunk &c, 
+                                                        GridIndex gmin, GridIndex gmax,
+                                                        bool isLastChunk) {
+    c.minGridIndex = GridIndex(_blockwidth * gmin.i, 
+                               _blockwidth * gmin.j, 
+                               _blockwidth * gmin.k);
+
+    if (isLastChunk) {
+        c.maxGridIndex = GridIndex(std::min(_blockwidth * gmax.i, _subisize), 
+                                   std::min(_blockwidth * gmax.j, _subjsize), 
+                                   std::min(_blockwidth * gmax.k, _subksize));
+    } else {
+        //c.maxGridIndex = GridIndex(std::min(_blockwidth * (gmax.i - 1) + 1, _subisize), 
+        //                           std::min(_blockwidth * (gmax.j - 1) + 1, _subjsize), 
+        //                           std::min(_blockwidth * (gmax.k - 1) + 1, _subksize));
+        c.maxGridIndex = GridIndex(std::min(_blockwidth * gmax.i, _subisize), 
+                                   std::min(_blockwidth * gmax.j, _subjsize), 
+                                   std::min(_blockwidth * gmax.k, _subksize));
+        if (c.splitDirection == Direction::U) {
+            c.maxGridIndex.i = std::min(_blockwidth * (gmax.i - 1) + 1, _subisize);
+        } else if (c.splitDirection == Direction::V) {
+            c.maxGridIndex.j = std::min(_blockwidth * (gmax.j - 1) + 1, _subjsize);
+        } else if (c.splitDirection == Direction::W) {
+            c.maxGridIndex.k = std::min(_blockwidth * (gmax.k - 1) + 1, _subksize);
+        }
+    }
+
+    // Coarse chunks are aligned to a grid with spacing of ratio subdivided 
+    // cells so that grid nodes are shared with neighbouring chunks. The last
+    // node may extend past the domain by less than ratio cells.
+    int r = c.ratio;
+    for (int dim = 0; dim < 3; dim++) {
+        int minidx = (c.minGridIndex[dim] / r) * r;
+        int lastidx = c.maxGridIndex[dim] - 1;
+        lastidx = minidx + ((lastidx - minidx + r - 1) / r) * r;
+        c.minGridIndex[dim] = minidx;
+        c.maxGridIndex[dim] = lastidx + 1;
+    }
+
+    c.positionOffset = Grid3d::GridIndexToPosition(c.minGridIndex, _subdx);
+    c.dx = r * _subdx;
+    c.isize = (c.maxGridIndex.i - 1 - c.minGridIndex.i) / r + 1;
+    c.jsize = (c.maxGridIndex.j - 1 - c.minGridIndex.j) / r + 1;
+    c.ksize = (c.maxGridIndex.k - 1 - c.minGridIndex.k) / r + 1;
+}
+
+void ParticleMesher::_initializeComputeChunkSeamRatios(std::vector<MesherComputeChunk> &chunks) {
+    for (size_t i = 0; i < chunks.size(); i++) {
+        chunks[i].seamRatio = chunks[i].ratio;
+        if (i + 1 < chunks.size() && _isComputeChunkJoinedAtSeam(chunks[i], chunks[i + 1])) {
+            chunks[i].seamRatio = std::max(chunks[i].ratio, chunks[i + 1].ratio);
+        }
+    }
+}
+
+bool ParticleMesher::_isComputeChunkJoinedAtSeam(MesherComputeChunk &c1, MesherComputeChunk &c2) {
+    int dim = (int)c1.splitDirection;
+    return c2.minGridIndex[dim] == c1.maxGridIndex[dim] - 1;
 }
 
 TriangleMesh ParticleMesher::_polygonizeComputeChunk(MesherComputeChunk chunk, 
@@ -284,6 +451,7 @@ TriangleMesh ParticleMesher::_polygonizeComputeChunk(MesherComputeChunk chunk,
     _initializeScalarFieldData(chunk, data, fieldData);
 
     if (fieldData.particles.empty()) {
+        _releaseScalarFieldData(fieldData);
         return TriangleMesh();
     }
 
@@ -294,6 +462,8 @@ TriangleMesh ParticleMesher::_polygonizeComputeChunk(MesherComputeChunk chunk,
 
     TriangleMesh m = polygonizer.polygonizeSurface();
     m.translate(chunk.positionOffset);
+
+    _releaseScalarFieldData(fieldData);
     
     return m;
 }
@@ -317,7 +487,7 @@ void ParticleMesher::_initializeScalarFieldData(MesherComputeChunk chunk,
         return;
     }
 
-    fieldData.particles.reserve(count);
+    _bufferArena->acquire(count, fieldData.particles);
     for (size_t i = 0; i < _particles->size(); i++) {
         vmath::vec3 p = _particles->at(i);
         if (bbox.isPointInside(p)) {
@@ -330,30 +500,96 @@ void ParticleMesher::_initializeScalarFieldData(MesherComputeChunk chunk,
     params.jsize = chunk.jsize;
     params.ksize = chunk.ksize;
     params.blockwidth = _blockwidth;
+    _getComputeChunkActiveBlocks(chunk, data, params.activeblocks);
 
-    for (int k = chunk.minBlockIndex.k; k < chunk.maxBlockIndex.k; k++) {
-        for (int j = chunk.minBlockIndex.j; j < chunk.maxBlockIndex.j; j++) {
-            for (int i = chunk.minBlockIndex.i; i < chunk.maxBlockIndex.i; i++) {
-                if (data.activeBlocks(i, j, k)) {
-                    params.activeblocks.push_back(GridIndex(i - chunk.minBlockIndex.i,
-                                                            j - chunk.minBlockIndex.j,
-                                                            k - chunk.minBlockIndex.k));
-                }
-            }
-        }
-    }
+    std::vector<float> blockStorage;
+    size_t blocksize = _blockwidth * _blockwidth * _blockwidth;
+    _bufferArena->acquire(params.activeblocks.size() * blocksize, blockStorage);
 
     fieldData.computeChunk = chunk;
-    fieldData.scalarField = BlockArray3d<float>(params);
+    fieldData.scalarField = BlockArray3d<float>(params, blockStorage);
     fieldData.scalarField.fill(_getMaxDistanceValue());
 
-    fieldData.fieldValues = ScalarField(chunk.isize, chunk.jsize, chunk.ksize, _subdx);
+    fieldData.fieldValues = ScalarField(chunk.isize, chunk.jsize, chunk.ksize, chunk.dx);
     fieldData.fieldValues.fill(_getMaxDistanceValue());
     fieldData.fieldValues.setSurfaceThreshold(0.0);
     fieldData.fieldValues.setOffset(chunk.positionOffset);
     fieldData.fieldValues.setSolidSDF(*_solidSDF);
 }
 
+void ParticleMesher::_releaseScalarFieldData(ScalarFieldData &fieldData) {
+    std::vector<float> blockStorage;
+    fieldData.scalarField.swapData(blockStorage);
+    _bufferArena->release(blockStorage);
+    _bufferArena->release(fieldData.particles);
+}
+
+void ParticleMesher::_getComputeChunkActiveBlocks(MesherComputeChunk &chunk, 
+                                                  MesherComputeChunkData &data,
+                                                  std::vector<GridIndex> &activeBlocks) {
+    if (chunk.ratio == 1) {
+        for (int k = chunk.minBlockIndex.k; k < chunk.maxBlockIndex.k; k++) {
+            for (int j = chunk.minBlockIndex.j; j < chunk.maxBlockIndex.j; j++) {
+                for (int i = chunk.minBlockIndex.i; i < chunk.maxBlockIndex.i; i++) {
+                    if (data.activeBlocks(i, j, k)) {
+                        activeBlocks.push_back(GridIndex(i - chunk.minBlockIndex.i,
+                                                         j - chunk.minBlockIndex.j,
+                                                         k - chunk.minBlockIndex.k));
+                    }
+                }
+            }
+        }
+        return;
+    }
+
+    // A block of the coarse chunk grid covers ratio^3 blocks of the 
+    // subdivided grid and is active if any of these blocks are active
+    BlockArray3dParameters temp;
+    temp.isize = chunk.isize;
+    temp.jsize = chunk.jsize;
+    temp.ksize = chunk.ksize;
+    temp.blockwidth = _blockwidth;
+    Dims3d dims = BlockArray3d<float>::getBlockDimensions(temp);
+
+    int r = chunk.ratio;
+    int bw = _blockwidth;
+    GridIndex maxActiveBlock(data.activeBlocks.width - 1, 
+                             data.activeBlocks.height - 1, 
+                             data.activeBlocks.depth - 1);
+    for (int k = 0; k < dims.k; k++) {
+        for (int j = 0; j < dims.j; j++) {
+            for (int i = 0; i < dims.i; i++) {
+                GridIndex bmin(chunk.minGridIndex.i + i * bw * r,
+                               chunk.minGridIndex.j + j * bw * r,
+                               chunk.minGridIndex.k + k * bw * r);
+                GridIndex bmax(bmin.i + (bw - 1) * r,
+                               bmin.j + (bw - 1) * r,
+                               bmin.k + (bw - 1) * r);
+                for (int dim = 0; dim < 3; dim++) {
+                    bmin[dim] = std::min(bmin[dim] / bw, maxActiveBlock[dim]);
+                    bmax[dim] = std::min(bmax[dim] / bw, maxActiveBlock[dim]);
+                }
+
+                bool isActive = false;
+                for (int bk = bmin.k; bk <= bmax.k && !isActive; bk++) {
+                    for (int bj = bmin.j; bj <= bmax.j && !isActive; bj++) {
+                        for (int bi = bmin.i; bi <= bmax.i; bi++) {
+                            if (data.activeBlocks(bi, bj, bk)) {
+                                isActive = true;
+                                break;
+                            }
+                        }
+                    }
+                }
+
+                if (isActive) {
+                    activeBlocks.push_back(GridIndex(i, j, k));
+                }
+            }
+        }
+    }
+}
+
 float ParticleMesher::_getMaxDistanceValue() {
     return 3.0 * _radius;
 }
@@ -381,6 +617,7 @@ void ParticleMesher::_computeScalarField(ScalarFieldData &fieldData) {
         computeBlock.gridBlock = b;
         computeBlock.particleData = &(sortedParticles[blockToParticleIndex[b.id]]);
         computeBlock.numParticles = gridCountData.totalGridCount[b.id];
+        computeBlock.dx = fieldData.computeChunk.dx;
         computeBlockQueue.push(computeBlock);
         numComputeBlocks++;
     }
@@ -489,7 +726,7 @@ void ParticleMesher::_computeGridCountDataThread(int startidx, int endidx,
     countData->endidx = endidx;
 
     float sr = _searchRadiusFactor * (float)_radius;
-    float blockdx = _blockwidth * _subdx;
+    float blockdx = _blockwidth * fieldData->computeChunk.dx;
     for (int i = startidx; i < endidx; i++) {
         vmath::vec3 p = fieldData->particles[i];
         GridIndex blockIndex = Grid3d::positionToGridIndex(p, blockdx);
@@ -597,7 +834,8 @@ void ParticleMesher::_scalarFieldProducerThread(BoundedBuffer<ComputeBlock> *com
         for (size_t bidx = 0; bidx < computeBlocks.size(); bidx++) {
             ComputeBlock block = computeBlocks[bidx];
             GridIndex blockIndex = block.gridBlock.index;
-            vmath::vec3 blockPositionOffset = Grid3d::GridIndexToPosition(blockIndex, _blockwidth * _subdx);
+            double dx = block.dx;
+            vmath::vec3 blockPositionOffset = Grid3d::GridIndexToPosition(blockIndex, _blockwidth * dx);
 
             for (int pidx = 0; pidx < block.numParticles; pidx++) {
                 vmath::vec3 p = block.particleData[pidx];
@@ -605,8 +843,8 @@ void ParticleMesher::_scalarFieldProducerThread(BoundedBuffer<ComputeBlock> *com
 
                 vmath::vec3 pmin(p.x - sr, p.y - sr, p.z - sr);
                 vmath::vec3 pmax(p.x + sr, p.y + sr, p.z + sr);
-                GridIndex gmin = Grid3d::positionToGridIndex(pmin, _subdx);
-                GridIndex gmax = Grid3d::positionToGridIndex(pmax, _subdx);
+                GridIndex gmin = Grid3d::positionToGridIndex(pmin, dx);
+                GridIndex gmax = Grid3d::positionToGridIndex(pmax, dx);
                 gmax.i++;
                 gmax.j++;
                 gmax.k++;
@@ -619,7 +857,7 @@ void ParticleMesher::_scalarFieldProducerThread(BoundedBuffer<ComputeBlock> *com
                                 continue;
                             }
 
-                            vmath::vec3 gpos = Grid3d::GridIndexToPosition(i, j, k, _subdx);
+                            vmath::vec3 gpos = Grid3d::GridIndexToPosition(i, j, k, dx);
                             float dist = vmath::length(gpos - p) - r;
                             int flatidx = Grid3d::getFlatIndex(i, j, k, _blockwidth, _blockwidth);
                             if (dist < block.gridBlock.data[flatidx]) {
@@ -694,6 +932,7 @@ void ParticleMesher::_addComputeChunkScalarFieldToPreviewField(ScalarFieldData &
 
 void ParticleMesher::_updateSeamData(ScalarFieldData &fieldData) {
     _applySeamData(fieldData);
+    _resampleSeamPlane(fieldData);
     _commitSeamData(fieldData);
 }
 
@@ -719,18 +958,22 @@ void ParticleMesher::_applySeamData(ScalarFieldData &fieldData) {
         return;
     }
 
+    // Seam values are copied where the grid nodes of both chunks coincide 
+    // and are interpolated where this chunk is finer than the previous chunk
     Array3d<float>* fieldValues = fieldData.fieldValues.getPointerToScalarField();
-    for (int k = 0; k < _seamData.data.depth; k++) {
-        for (int j = 0; j < _seamData.data.height; j++) {
-            for (int i = 0; i < _seamData.data.width; i++) {
-                GridIndex fieldIndex(_seamData.minGridIndex.i + i - gmin.i,
-                                     _seamData.minGridIndex.j + j - gmin.j,
-                                     _seamData.minGridIndex.k + k - gmin.k);
-                if (!fieldValues->isIndexInRange(fieldIndex)) {
-                    continue;
+    GridIndex planeSize(fieldValues->width, fieldValues->height, fieldValues->depth);
+    planeSize[(int)dir] = 1;
+    int r = chunk.ratio;
+    for (int k = 0; k < planeSize.k; k++) {
+        for (int j = 0; j < planeSize.j; j++) {
+            for (int i = 0; i < planeSize.i; i++) {
+                GridIndex g(gmin.i + r * i, gmin.j + r * j, gmin.k + r * k);
+                float value;
+                bool isValid = _interpolateSeamPlaneValue(_seamData.data, _seamData.minGridIndex, 
+                                                          _seamData.ratio, dir, g, &value);
+                if (isValid) {
+                    fieldValues->set(i, j, k, value);
                 }
-
-                fieldValues->set(fieldIndex, _seamData.data(i, j, k));
             }
         }
     }
@@ -758,8 +1001,11 @@ void ParticleMesher::_commitSeamData(ScalarFieldData &fieldData) {
     _seamData.direction = dir;
     _seamData.minGridIndex = gmin;
     _seamData.maxGridIndex = gmax;
+    _seamData.ratio = chunk.ratio;
 
-    _seamData.data = Array3d<float>(gmax.i - gmin.i, gmax.j - gmin.j, gmax.k - gmin.k);
+    GridIndex planeSize(fieldValues->width, fieldValues->height, fieldValues->depth);
+    planeSize[(int)dir] = 1;
+    _seamData.data = Array3d<float>(planeSize.i, planeSize.j, planeSize.k);
     for (int k = 0; k < _seamData.data.depth; k++) {
         for (int j = 0; j < _seamData.data.height; j++) {
             for (int i = 0; i < _seamData.data.width; i++) {
@@ -772,4 +1018,372 @@ void ParticleMesher::_commitSeamData(ScalarFieldData &fieldData) {
     }
 
     _seamData.isInitialized = true;
-}
\ No newline at end of file
+}
+
+void ParticleMesher::_resampleSeamPlane(ScalarFieldData &fieldData) {
+    MesherComputeChunk chunk = fieldData.computeChunk;
+    if (chunk.seamRatio == chunk.ratio) {
+        return;
+    }
+
+    // The next chunk is coarser. The last plane is replaced by the bilinear
+    // interpolation of its values at the coarse grid nodes so that both 
+    // chunks generate the same surface crossings along the coarse grid edges.
+    Array3d<float>* fieldValues = fieldData.fieldValues.getPointerToScalarField();
+    Direction dir = chunk.splitDirection;
+    int dim = (int)dir;
+    int udim = dim == 0 ? 1 : 0;
+    int vdim = dim == 2 ? 1 : 2;
+    int r = chunk.ratio;
+    int R = chunk.seamRatio;
+
+    GridIndex planeSize(fieldValues->width, fieldValues->height, fieldValues->depth);
+    GridIndex fieldOffset(0, 0, 0);
+    fieldOffset[dim] = planeSize[dim] - 1;
+    planeSize[dim] = 1;
+
+    GridIndex planeMin = chunk.minGridIndex;
+    planeMin[dim] = chunk.maxGridIndex[dim] - 1;
+
+    GridIndex coarseMin = planeMin;
+    GridIndex coarseSize(1, 1, 1);
+    for (int d = 0; d < 3; d++) {
+        if (d == dim) {
+            continue;
+        }
+        int lastidx = planeMin[d] + r * (planeSize[d] - 1);
+        coarseMin[d] = ((planeMin[d] + R - 1) / R) * R;
+        coarseSize[d] = lastidx >= coarseMin[d] ? (lastidx - coarseMin[d]) / R + 1 : 0;
+    }
+
+    if (coarseSize[udim] == 0 || coarseSize[vdim] == 0) {
+        return;
+    }
+
+    Array3d<float> coarsePlane(coarseSize.i, coarseSize.j, coarseSize.k);
+    for (int k = 0; k < coarseSize.k; k++) {
+        for (int j = 0; j < coarseSize.j; j++) {
+            for (int i = 0; i < coarseSize.i; i++) {
+                GridIndex c(i, j, k);
+                GridIndex fieldIndex = fieldOffset;
+                fieldIndex[udim] = (coarseMin[udim] + R * c[udim] - planeMin[udim]) / r;
+                fieldIndex[vdim] = (coarseMin[vdim] + R * c[vdim] - planeMin[vdim]) / r;
+                coarsePlane.set(i, j, k, fieldValues->get(fieldIndex));
+            }
+        }
+    }
+
+    for (int k = 0; k < planeSize.k; k++) {
+        for (int j = 0; j < planeSize.j; j++) {
+            for (int i = 0; i < planeSize.i; i++) {
+                GridIndex g(planeMin.i + r * i, planeMin.j + r * j, planeMin.k + r * k);
+                float value;
+                if (_interpolateSeamPlaneValue(coarsePlane, coarseMin, R, dir, g, &value)) {
+                    fieldValues->set(fieldOffset.i + i, fieldOffset.j + j, fieldOffset.k + k, value);
+                }
+            }
+        }
+    }
+}
+
+bool ParticleMesher::_interpolateSeamPlaneValue(Array3d<float> &plane, GridIndex planeMin, 
+                                                int planeRatio, Direction dir, 
+                                                GridIndex g, float *value) {
+    int dim = (int)dir;
+    int udim = dim == 0 ? 1 : 0;
+    int vdim = dim == 2 ? 1 : 2;
+    int du = g[udim] - planeMin[udim];
+    int dv = g[vdim] - planeMin[vdim];
+    if (du < 0 || dv < 0) {
+        return false;
+    }
+
+    GridIndex p00(0, 0, 0);
+    p00[udim] = du / planeRatio;
+    p00[vdim] = dv / planeRatio;
+    int ru = du % planeRatio;
+    int rv = dv % planeRatio;
+
+    GridIndex p11 = p00;
+    if (ru > 0) {
+        p11[udim]++;
+    }
+    if (rv > 0) {
+        p11[vdim]++;
+    }
+    if (!plane.isIndexInRange(p00) || !plane.isIndexInRange(p11)) {
+        return false;
+    }
+
+    if (ru == 0 && rv == 0) {
+        *value = plane.get(p00);
+        return true;
+    }
+
+    GridIndex p10 = p00;
+    p10[udim] = p11[udim];
+    GridIndex p01 = p00;
+    p01[vdim] = p11[vdim];
+
+    float fu = (float)ru / (float)planeRatio;
+    float fv = (float)rv / (float)planeRatio;
+    *value = (1.0f - fu) * (1.0f - fv) * plane.get(p00) + 
+             fu * (1.0f - fv) * plane.get(p10) + 
+             (1.0f - fu) * fv * plane.get(p01) + 
+             fu * fv * plane.get(p11);
+
+    return true;
+}
+
+void ParticleMesher::_stitchComputeChunkSeam(TriangleMesh &previousMesh, TriangleMesh &mesh, 
+                                             MesherComputeChunk &chunk) {
+    int dim = (int)chunk.splitDirection;
+    int udim = dim == 0 ? 1 : 0;
+    int vdim = dim == 2 ? 1 : 2;
+    float planePosition = (float)(chunk.minGridIndex[dim] * _localdx);
+    float eps = _seamWeldTolerance * (float)_localdx;
+
+    std::vector<std::pair<int, int> > previousEdges;
+    std::vector<std::pair<int, int> > edges;
+    _getSeamBoundaryEdges(previousMesh, dim, planePosition, eps, previousEdges);
+    _getSeamBoundaryEdges(mesh, dim, planePosition, eps, edges);
+    if (previousEdges.empty() && edges.empty()) {
+        return;
+    }
+
+    // Seam vertices of both meshes are welded. Vertices of mesh are welded
+    // first so that the crack triangles are connected to mesh where possible.
+    std::vector<vmath::vec3> seamVertices;
+    std::vector<int> seamVertexMeshIndex;
+    std::unordered_map<long long, std::vector<int> > weldGrid;
+    auto getWeldKey = [](long long qu, long long qv) {
+        return (qu << 32) ^ (qv & 0xFFFFFFFFLL);
+    };
+    auto weldVertex = [&](vmath::vec3 p, int meshIndex) {
+        long long qu = (long long)floor(p[udim] / eps);
+        long long qv = (long long)floor(p[vdim] / eps);
+        for (long long du = -1; du <= 1; du++) {
+            for (long long dv = -1; dv <= 1; dv++) {
+                auto it = weldGrid.find(getWeldKey(qu + du, qv + dv));
+                if (it == weldGrid.end()) {
+                    continue;
+                }
+                for (size_t i = 0; i < it->second.size(); i++) {
+                    vmath::vec3 sp = seamVertices[it->second[i]];
+                    if (fabs(sp[udim] - p[udim]) < eps && fabs(sp[vdim] - p[vdim]) < eps) {
+                        return it->second[i];
+                    }
+                }
+            }
+        }
+
+        int id = (int)seamVertices.size();
+        seamVertices.push_back(p);
+        seamVertexMeshIndex.push_back(meshIndex);
+        weldGrid[getWeldKey(qu, qv)].push_back(id);
+        return id;
+    };
+
+    // The cracks are bounded by the seam boundary edges of both meshes. 
+    // Reversing the edges gives loops that are oriented consistently with 
+    // the neighbouring triangles.
+    std::vector<std::pair<int, int> > loopEdges;
+    std::unordered_map<int, int> meshToSeamVertex;
+    for (size_t i = 0; i < edges.size(); i++) {
+        int ids[2];
+        int vidx[2] = {edges[i].first, edges[i].second};
+        for (int e = 0; e < 2; e++) {
+            auto it = meshToSeamVertex.find(vidx[e]);
+            if (it == meshToSeamVertex.end()) {
+                ids[e] = weldVertex(mesh.vertices[vidx[e]], vidx[e]);
+                meshToSeamVertex[vidx[e]] = ids[e];
+            } else {
+                ids[e] = it->second;
+            }
+        }
+        if (ids[0] != ids[1]) {
+            loopEdges.push_back(std::pair<int, int>(ids[1], ids[0]));
+        }
+    }
+
+    std::unordered_map<int, int> previousMeshToSeamVertex;
+    for (size_t i = 0; i < previousEdges.size(); i++) {
+        int ids[2];
+        int vidx[2] = {previousEdges[i].first, previousEdges[i].second};
+        for (int e = 0; e < 2; e++) {
+            auto it = previousMeshToSeamVertex.find(vidx[e]);
+            if (it == previousMeshToSeamVertex.end()) {
+                ids[e] = weldVertex(previousMesh.vertices[vidx[e]], -1);
+                previousMeshToSeamVertex[vidx[e]] = ids[e];
+            } else {
+                ids[e] = it->second;
+            }
+        }
+        if (ids[0] != ids[1]) {
+            loopEdges.push_back(std::pair<int, int>(ids[1], ids[0]));
+        }
+    }
+
+    // Edges that are shared by both meshes border no crack
+    std::map<std::pair<int, int>, int> edgeCounts;
+    for (size_t i = 0; i < loopEdges.size(); i++) {
+        edgeCounts[loopEdges[i]]++;
+    }
+
+    std::vector<std::vector<int> > outEdges(seamVertices.size());
+    for (auto it = edgeCounts.begin(); it != edgeCounts.end(); ++it) {
+        int count = it->second;
+        auto rev = edgeCounts.find(std::pair<int, int>(it->first.second, it->first.first));
+        if (rev != edgeCounts.end()) {
+            count -= std::min(count, rev->second);
+        }
+        for (int i = 0; i < count; i++) {
+            outEdges[it->first.first].push_back(it->first.second);
+        }
+    }
+
+    // Loops that cannot be closed are skipped. These can occur where the 
+    // surface is clamped against obstacles.
+    std::vector<Triangle> seamTriangles;
+    for (size_t startidx = 0; startidx < outEdges.size(); startidx++) {
+        int start = (int)startidx;
+        while (!outEdges[start].empty()) {
+            std::vector<int> loop({start});
+            int current = start;
+            bool isClosed = false;
+            while (!outEdges[current].empty()) {
+                int next = outEdges[current].back();
+                outEdges[current].pop_back();
+                if (next == start) {
+                    isClosed = true;
+                    break;
+                }
+
+                auto it = std::find(loop.begin(), loop.end(), next);
+                if (it != loop.end()) {
+                    std::vector<int> subloop(it, loop.end());
+                    _triangulateSeamLoop(subloop, seamVertices, dim, seamTriangles);
+                    loop.erase(it + 1, loop.end());
+                } else {
+                    loop.push_back(next);
+                }
+                current = next;
+            }
+
+            if (isClosed) {
+                _triangulateSeamLoop(loop, seamVertices, dim, seamTriangles);
+            }
+        }
+    }
+
+    for (size_t i = 0; i < seamTriangles.size(); i++) {
+        Triangle t = seamTriangles[i];
+        for (int tidx = 0; tidx < 3; tidx++) {
+            int id = t.tri[tidx];
+            if (seamVertexMeshIndex[id] == -1) {
+                mesh.vertices.push_back(seamVertices[id]);
+                seamVertexMeshIndex[id] = (int)mesh.vertices.size() - 1;
+            }
+            t.tri[tidx] = seamVertexMeshIndex[id];
+        }
+        mesh.triangles.push_back(t);
+    }
+}
+
+void ParticleMesher::_getSeamBoundaryEdges(TriangleMesh &mesh, int dim, float planePosition, 
+                                           float eps, std::vector<std::pair<int, int> > &edges) {
+    std::vector<bool> isOnPlane(mesh.vertices.size(), false);
+    for (size_t i = 0; i < mesh.vertices.size(); i++) {
+        isOnPlane[i] = fabs(mesh.vertices[i][dim] - planePosition) < eps;
+    }
+
+    std::vector<std::pair<int, int> > candidates;
+    std::map<std::pair<int, int>, int> edgeCounts;
+    for (size_t i = 0; i < mesh.triangles.size(); i++) {
+        Triangle t = mesh.triangles[i];
+        for (int e = 0; e < 3; e++) {
+            int v1 = t.tri[e];
+            int v2 = t.tri[(e + 1) % 3];
+            if (isOnPlane[v1] && isOnPlane[v2]) {
+                candidates.push_back(std::pair<int, int>(v1, v2));
+                edgeCounts[std::pair<int, int>(std::min(v1, v2), std::max(v1, v2))]++;
+            }
+        }
+    }
+
+    for (size_t i = 0; i < candidates.size(); i++) {
+        int v1 = candidates[i].first;
+        int v2 = candidates[i].second;
+        if (edgeCounts[std::pair<int, int>(std::min(v1, v2), std::max(v1, v2))] == 1) {
+            edges.push_back(candidates[i]);
+        }
+    }
+}
+
+void ParticleMesher::_triangulateSeamLoop(std::vector<int> &loop, 
+                                          std::vector<vmath::vec3> &vertices, 
+                                          int dim, std::vector<Triangle> &triangles) {
+    if (loop.size() < 3) {
+        return;
+    }
+
+    int udim = dim == 0 ? 1 : 0;
+    int vdim = dim == 2 ? 1 : 2;
+    auto cross2d = [&](int a, int b, int c) {
+        vmath::vec3 pa = vertices[a];
+        vmath::vec3 pb = vertices[b];
+        vmath::vec3 pc = vertices[c];
+        return (double)(pb[udim] - pa[udim]) * (double)(pc[vdim] - pa[vdim]) - 
+               (double)(pb[vdim] - pa[vdim]) * (double)(pc[udim] - pa[udim]);
+    };
+
+    double area = 0.0;
+    for (size_t i = 1; i + 1 < loop.size(); i++) {
+        area += cross2d(loop[0], loop[i], loop[i + 1]);
+    }
+    double orientation = area >= 0.0 ? 1.0 : -1.0;
+
+    // Ear clipping, falling back to a fan for degenerate remainders
+    std::vector<int> polygon = loop;
+    while (polygon.size() > 3) {
+        int n = (int)polygon.size();
+        bool isEarFound = false;
+        for (int i = 0; i < n; i++) {
+            int a = polygon[(i + n - 1) % n];
+            int b = polygon[i];
+            int c = polygon[(i + 1) % n];
+            if (orientation * cross2d(a, b, c) <= 0.0) {
+                continue;
+            }
+
+            bool isEar = true;
+            for (int j = 0; j < n; j++) {
+                int p = polygon[j];
+                if (p == a || p == b || p == c) {
+                    continue;
+                }
+                if (orientation * cross2d(a, b, p) >= 0.0 && 
+                        orientation * cross2d(b, c, p) >= 0.0 && 
+                        orientation * cross2d(c, a, p) >= 0.0) {
+                    isEar = false;
+                    break;
+                }
+            }
+
+            if (isEar) {
+                triangles.push_back(Triangle(a, b, c));
+                polygon.erase(polygon.begin() + i);
+                isEarFound = true;
+                break;
+            }
+        }
+
+        if (!isEarFound) {
+            break;
+        }
+    }
+
+    for (size_t i = 1; i + 1 < polygon.size(); i++) {
+        triangles.push_back(Triangle(polygon[0], polygon[i], polygon[i + 1]));
+    }
+}
@@ -25,12 +25,16 @@ SOFTWARE.
 #pragma once
 
 #include <vector>
+#include <utility>
 
 #include "vmath.h"
 #include "array3d.h"
 #include "blockarray3d.h"
 #include "scalarfield.h"
 #include "boundedbuffer.h"
+#include "camerafrustum.h"
+#include "bufferarena.h"
+#include "triangle.h"
 
 class TriangleMesh;
 class MeshLevelSet;
@@ -47,9 +51,25 @@ struct ParticleMesherParameters {
 
     bool isPreviewMesherEnabled = false;
     double previewdx = 0.0;
+
+    // Camera adaptive meshing: each compute chunk is polygonized at the 
+    // coarsest level (cell size of subdivided dx * 2^level) whose cells 
+    // do not exceed cameraLODPixelSize pixels on screen. The camera is in 
+    // world space and particles are transformed into world space by 
+    // domainScale and domainOffset.
+    bool isCameraAdaptive = false;
+    CameraFrustum camera;
+    double cameraFrustumPadding = 0.1;
+    double cameraLODPixelSize = 4.0;
+    int cameraLODMaxLevel = 2;
+    double domainScale = 1.0;
+    vmath::vec3 domainOffset;
     
     std::vector<vmath::vec3> *particles;
     MeshLevelSet *solidSDF;
+
+    // Optional arena for recycling compute chunk buffers between chunks
+    BufferArena *bufferArena = nullptr;
 };
 
 class ParticleMesher {
@@ -73,6 +93,13 @@ private:
         int isize = 0;
         int jsize = 0;
         int ksize = 0;
+
+        // Polygonization cell size is ratio * _subdx. seamRatio is the ratio
+        // that the last plane of the chunk must be resampled to so that it
+        // matches the next chunk.
+        int ratio = 1;
+        int seamRatio = 1;
+        double dx = 0.0;
     };
 
     struct MesherComputeChunkData {
@@ -107,6 +134,7 @@ private:
         GridBlock<float> gridBlock;
         vmath::vec3 *particleData;
         int numParticles = 0;
+        double dx = 0.0;
     };
 
     struct ScalarFieldSeam {
@@ -114,6 +142,7 @@ private:
         GridIndex minGridIndex;
         GridIndex maxGridIndex;
         Array3d<float> data;
+        int ratio = 1;
         bool isInitialized = false;
 
         void reset() {
@@ -121,6 +150,7 @@ private:
             minGridIndex = GridIndex(-1, -1, -1);
             maxGridIndex = GridIndex(-1, -1, -1);
             data = Array3d<float>();
+            ratio = 1;
             isInitialized = false;
         }
     };
@@ -132,10 +162,20 @@ private:
     void _generateComputeChunkData(MesherComputeChunkData &data);
     void _initializeComputeChunkDataActiveBlocks(MesherComputeChunkData &data);
     void _initializeComputeChunkDataComputeChunks(MesherComputeChunkData &data);
+    Direction _getComputeChunkSplitDirection(MesherComputeChunkData &data);
+    int _getComputeChunkRatio(GridIndex gmin, GridIndex gmax, MesherComputeChunkData &data);
+    int _getBlockRatio(GridIndex blockIndex);
+    void _initializeComputeChunkGridIndices(MesherComputeChunk &c, GridIndex gmin, GridIndex gmax,
+                                            bool isLastChunk);
+    void _initializeComputeChunkSeamRatios(std::vector<MesherComputeChunk> &chunks);
+    bool _isComputeChunkJoinedAtSeam(MesherComputeChunk &c1, MesherComputeChunk &c2);
 
     TriangleMesh _polygonizeComputeChunk(MesherComputeChunk chunk, MesherComputeChunkData &data);
     void _initializeScalarFieldData(MesherComputeChunk chunk, MesherComputeChunkData &data,
                                     ScalarFieldData &fieldData);
+    void _releaseScalarFieldData(ScalarFieldData &fieldData);
+    void _getComputeChunkActiveBlocks(MesherComputeChunk &chunk, MesherComputeChunkData &data,
+                                      std::vector<GridIndex> &activeBlocks);
     float _getMaxDistanceValue();
     void _computeScalarField(ScalarFieldData &fieldData);
     void _computeGridCountData(ScalarFieldData &fieldData, 
@@ -157,6 +197,15 @@ private:
     void _updateSeamData(ScalarFieldData &fieldData);
     void _applySeamData(ScalarFieldData &fieldData);
     void _commitSeamData(ScalarFieldData &fieldData);
+    void _resampleSeamPlane(ScalarFieldData &fieldData);
+    bool _interpolateSeamPlaneValue(Array3d<float> &plane, GridIndex planeMin, int planeRatio,
+                                    Direction dir, GridIndex g, float *value);
+    void _stitchComputeChunkSeam(TriangleMesh &previousMesh, TriangleMesh &mesh, 
+                                 MesherComputeChunk &chunk);
+    void _getSeamBoundaryEdges(TriangleMesh &mesh, int dim, float planePosition, float eps,
+                               std::vector<std::pair<int, int> > &edges);
+    void _triangulateSeamLoop(std::vector<int> &loop, std::vector<vmath::vec3> &vertices, 
+                              int dim, std::vector<Triangle> &triangles);
 
 
     // Meshing Parameters
@@ -184,12 +233,24 @@ private:
 
     std::vector<vmath::vec3> *_particles;
     MeshLevelSet *_solidSDF;
+    BufferArena *_bufferArena = nullptr;
+    BufferArena _localBufferArena;
+
+    bool _isCameraAdaptive = false;
+    CameraFrustum _camera;
+    double _cameraFrustumPadding = 0.1;
+    double _cameraLODPixelSize = 4.0;
+    int _cameraLODMaxLevel = 2;
+    double _domainScale = 1.0;
+    vmath::vec3 _domainOffset;
 
     // Internal Parameters
     int _blockwidth = 10;
     int _numComputeBlocksPerJob = 10;
     double _localdx = 0.1;
     float _searchRadiusFactor = 1.5f;
+    int _cameraAdaptiveMinComputeChunks = 16;
+    float _seamWeldTolerance = 1e-3f;
     ScalarFieldSeam _seamData;
 
 };
@@ -39,6 +39,8 @@ void ParticleSystem::update() {
     _expandVectors(_uLongLongAttributes, _uLongLongDefaults, size);
     _expandVectors(_floatAttributes, _floatDefaults, size);
     _expandVectors(_vector3Attributes, _vector3Defaults, size);
+    _expandVectors(_vector3HalfAttributes, _vector3HalfDefaults, size);
+    _expandVectors(_floatHalfAttributes, _floatHalfDefaults, size);
     _size = size;
 }
 
@@ -53,6 +55,8 @@ size_t ParticleSystem::evaluateSize() {
     size = std::max(size, _getMaxVectorSize(_uLongLongAttributes));
     size = std::max(size, _getMaxVectorSize(_floatAttributes));
     size = std::max(size, _getMaxVectorSize(_vector3Attributes));
+    size = std::max(size, _getMaxVectorSize(_vector3HalfAttributes));
+    size = std::max(size, _getMaxVectorSize(_floatHalfAttributes));
     return size;
 }
 
@@ -70,6 +74,8 @@ void ParticleSystem::resize(size_t n) {
     _resizeVectors(_uLongLongAttributes, n);
     _resizeVectors(_floatAttributes, n);
     _resizeVectors(_vector3Attributes, n);
+    _resizeVectors(_vector3HalfAttributes, n);
+    _resizeVectors(_floatHalfAttributes, n);
     update();
 }
 
@@ -83,6 +89,8 @@ void ParticleSystem::reserve(size_t n) {
     _reserveVectors(_uLongLongAttributes, n);
     _reserveVectors(_floatAttributes, n);
     _reserveVectors(_vector3Attributes, n);
+    _reserveVectors(_vector3HalfAttributes, n);
+    _reserveVectors(_floatHalfAttributes, n);
 }
 
 void ParticleSystem::removeParticles(std::vector<bool> &toRemove) {
@@ -95,9 +103,28 @@ void ParticleSystem::removeParticles(std::vector<bool> &toRemove) {
     _removeParticlesFromVectorList(_uLongLongAttributes, toRemove);
     _removeParticlesFromVectorList(_floatAttributes, toRemove);
     _removeParticlesFromVectorList(_vector3Attributes, toRemove);
+    _removeParticlesFromVectorList(_vector3HalfAttributes, toRemove);
+    _removeParticlesFromVectorList(_floatHalfAttributes, toRemove);
     update();
 }
 
+void ParticleSystem::reorder(std::vector<size_t> &order) {
+    update();
+    FLUIDSIM_ASSERT(order.size() == _size);
+
+    _reorderVectorList(_charAttributes, order);
+    _reorderVectorList(_ucharAttributes, order);
+    _reorderVectorList(_boolAttributes, order);
+    _reorderVectorList(_intAttributes, order);
+    _reorderVectorList(_idAttributes, order);
+    _reorderVectorList(_uint16Attributes, order);
+    _reorderVectorList(_uLongLongAttributes, order);
+    _reorderVectorList(_floatAttributes, order);
+    _reorderVectorList(_vector3Attributes, order);
+    _reorderVectorList(_vector3HalfAttributes, order);
+    _reorderVectorList(_floatHalfAttributes, order);
+}
+
 void ParticleSystem::printParticle(size_t index) {
     for (size_t aidx = 0; aidx < _attributes.size(); aidx++) {
         ParticleSystemAttribute att = _attributes[aidx];
@@ -157,6 +184,18 @@ void ParticleSystem::printParticle(size_t index) {
                     std::cout << att.name << " \t" << value << std::endl;
                     break;
                 }
+            case AttributeDataType::VECTOR3HALF:
+                {
+                    HalfVector3 value = _vector3HalfAttributes[att.id][index];
+                    std::cout << att.name << " \t" << value << std::endl;
+                    break;
+                }
+            case AttributeDataType::FLOATHALF:
+                {
+                    HalfFloat16 value = _floatHalfAttributes[att.id][index];
+                    std::cout << att.name << " \t" << value << std::endl;
+                    break;
+                }
             default:
                 std::cout << "Error: Undefined Attribute \t" << att.name << std::endl; 
                 break;
@@ -280,6 +319,26 @@ bool ParticleSystem::isSchemaEqual(ParticleSystem &other, bool strict) {
                     }
                     break;
                 }
+            case AttributeDataType::VECTOR3HALF:
+                {
+                    HalfVector3 *thisDefault, *otherDefault;
+                    getAttributeDefault(thisAtt, thisDefault);
+                    other.getAttributeDefault(otherAtt, otherDefault);
+                    if (vmath::length(thisDefault->toVec3() - otherDefault->toVec3()) > eps) {
+                        return false;
+                    }
+                    break;
+                }
+            case AttributeDataType::FLOATHALF:
+                {
+                    HalfFloat16 *thisDefault, *otherDefault;
+                    getAttributeDefault(thisAtt, thisDefault);
+                    other.getAttributeDefault(otherAtt, otherDefault);
+                    if (std::abs(thisDefault->toFloat() - otherDefault->toFloat()) > eps) {
+                        return false;
+                    }
+                    break;
+                }
             default:
                 {
                     break;
@@ -361,6 +420,20 @@ ParticleSystem ParticleSystem::generateEmptyCopy() {
                     newSystem.addAttributeVector3(att.name, *def);
                     break;
                 }
+            case AttributeDataType::VECTOR3HALF:
+                {
+                    HalfVector3 *def;
+                    getAttributeDefault(att, def);
+                    newSystem.addAttributeVector3Half(att.name, def->toVec3());
+                    break;
+                }
+            case AttributeDataType::FLOATHALF:
+                {
+                    HalfFloat16 *def;
+                    getAttributeDefault(att, def);
+                    newSystem.addAttributeFloatHalf(att.name, def->toFloat());
+                    break;
+                }
             default:
                 {
                     std::string msg = "Error: Invalid ParticleSystemAttribute in generateEmptyCopy()";
@@ -390,6 +463,8 @@ void ParticleSystem::merge(ParticleSystem &other) {
     _mergeVectors(_uLongLongAttributes, other._uLongLongAttributes);
     _mergeVectors(_floatAttributes, other._floatAttributes);
     _mergeVectors(_vector3Attributes, other._vector3Attributes);
+    _mergeVectors(_vector3HalfAttributes, other._vector3HalfAttributes);
+    _mergeVectors(_floatHalfAttributes, other._floatHalfAttributes);
     update();
 }
 
@@ -510,6 +585,32 @@ ParticleSystemAttribute ParticleSystem::addAttributeVector3(std::string name, vm
     return att;
 }
 
+ParticleSystemAttribute ParticleSystem::addAttributeVector3Half(std::string name, vmath::vec3 defaultValue) {
+    ParticleSystemAttribute att;
+    att.id = _vector3HalfAttributes.size();
+    att.name = name;
+    att.type = AttributeDataType::VECTOR3HALF;
+
+    _attributes.push_back(att);
+    _vector3HalfAttributes.push_back(std::vector<HalfVector3>());
+    _vector3HalfDefaults.push_back(HalfVector3(defaultValue));
+
+    return att;
+}
+
+ParticleSystemAttribute ParticleSystem::addAttributeFloatHalf(std::string name, float defaultValue) {
+    ParticleSystemAttribute att;
+    att.id = _floatHalfAttributes.size();
+    att.name = name;
+    att.type = AttributeDataType::FLOATHALF;
+
+    _attributes.push_back(att);
+    _floatHalfAttributes.push_back(std::vector<HalfFloat16>());
+    _floatHalfDefaults.push_back(HalfFloat16(defaultValue));
+
+    return att;
+}
+
 std::vector<char> *ParticleSystem::getAttributeValuesChar(ParticleSystemAttribute &att) {
     _validateAttribute(att);
     return &(_charAttributes[att.id]);
@@ -600,6 +701,26 @@ std::vector<vmath::vec3> *ParticleSystem::getAttributeValuesVector3(std::string
     return getAttributeValuesVector3(att);
 }
 
+std::vector<HalfVector3> *ParticleSystem::getAttributeValuesVector3Half(ParticleSystemAttribute &att) {
+    _validateAttribute(att);
+    return &(_vector3HalfAttributes[att.id]);
+}
+
+std::vector<HalfVector3> *ParticleSystem::getAttributeValuesVector3Half(std::string name) {
+    ParticleSystemAttribute att = _getAttributeByName(name);
+    return getAttributeValuesVector3Half(att);
+}
+
+std::vector<HalfFloat16> *ParticleSystem::getAttributeValuesFloatHalf(ParticleSystemAttribute &att) {
+    _validateAttribute(att);
+    return &(_floatHalfAttributes[att.id]);
+}
+
+std::vector<HalfFloat16> *ParticleSystem::getAttributeValuesFloatHalf(std::string name) {
+    ParticleSystemAttribute att = _getAttributeByName(name);
+    return getAttributeValuesFloatHalf(att);
+}
+
 
 ParticleSystemAttribute ParticleSystem::_getAttributeByName(std::string name) {
     for (size_t i = 0; i < _attributes.size(); i++) {
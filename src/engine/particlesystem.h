@@ -31,6 +31,7 @@ SOFTWARE.
 #include <cstdint>
 
 #include "vmath.h"
+#include "halfvector3.h"
 #include "fluidsimassert.h"
 
 
@@ -44,7 +45,9 @@ enum class AttributeDataType : char {
     FLOAT     = 0x06, 
     VECTOR3   = 0x07,
     UINT16    = 0x08,
-    ULONGLONG = 0x09
+    ULONGLONG = 0x09,
+    VECTOR3HALF = 0x0A,
+    FLOATHALF = 0x0B
 };
 
 
@@ -75,6 +78,9 @@ public:
     void resize(size_t n);
     void reserve(size_t n);
     void removeParticles(std::vector<bool> &toRemove);
+
+    // Permute all attribute values so that particle order[i] becomes particle i
+    void reorder(std::vector<size_t> &order);
     void printParticle(size_t index);
 
     std::vector<ParticleSystemAttribute> getAttributes() { return _attributes; }
@@ -92,6 +98,8 @@ public:
     ParticleSystemAttribute addAttributeULongLong(std::string name, unsigned long long int defaultValue=0);
     ParticleSystemAttribute addAttributeFloat(std::string name, float defaultValue=0.0f);
     ParticleSystemAttribute addAttributeVector3(std::string name, vmath::vec3 defaultValue=vmath::vec3());
+    ParticleSystemAttribute addAttributeVector3Half(std::string name, vmath::vec3 defaultValue=vmath::vec3());
+    ParticleSystemAttribute addAttributeFloatHalf(std::string name, float defaultValue=0.0f);
 
     std::vector<char> *getAttributeValuesChar(ParticleSystemAttribute &att);
     std::vector<char> *getAttributeValuesChar(std::string name);
@@ -120,6 +128,12 @@ public:
     std::vector<vmath::vec3> *getAttributeValuesVector3(ParticleSystemAttribute &att);
     std::vector<vmath::vec3> *getAttributeValuesVector3(std::string name);
 
+    std::vector<HalfVector3> *getAttributeValuesVector3Half(ParticleSystemAttribute &att);
+    std::vector<HalfVector3> *getAttributeValuesVector3Half(std::string name);
+
+    std::vector<HalfFloat16> *getAttributeValuesFloatHalf(ParticleSystemAttribute &att);
+    std::vector<HalfFloat16> *getAttributeValuesFloatHalf(std::string name);
+
     template<class T>
     void getAttributeValues(ParticleSystemAttribute &att, std::vector<T> *&values) {
         FLUIDSIM_ASSERT(att.type != AttributeDataType::UNDEFINED);
@@ -152,6 +166,12 @@ public:
             case AttributeDataType::VECTOR3:
                 values = (std::vector<T>*)getAttributeValuesVector3(att);
                 break;
+            case AttributeDataType::VECTOR3HALF:
+                values = (std::vector<T>*)getAttributeValuesVector3Half(att);
+                break;
+            case AttributeDataType::FLOATHALF:
+                values = (std::vector<T>*)getAttributeValuesFloatHalf(att);
+                break;
             default:
                 {
                     std::string msg = "Error: Invalid ParticleSystemAttribute in getAttributeValues()";
@@ -196,6 +216,12 @@ public:
             case AttributeDataType::VECTOR3:
                 value = (T*)&(_vector3Defaults[att.id]);
                 break;
+            case AttributeDataType::VECTOR3HALF:
+                value = (T*)&(_vector3HalfDefaults[att.id]);
+                break;
+            case AttributeDataType::FLOATHALF:
+                value = (T*)&(_floatHalfDefaults[att.id]);
+                break;
             default:
                 {
                     std::string msg = "Error: Invalid ParticleSystemAttribute in getAttributeDefault()";
@@ -293,6 +319,24 @@ private:
         }
     }
 
+    template<class T>
+    inline void _reorderVector(T &vector, std::vector<size_t> &order) {
+        FLUIDSIM_ASSERT(vector.size() == order.size());
+
+        T reordered(vector.size());
+        for (size_t i = 0; i < order.size(); i++) {
+            reordered[i] = vector[order[i]];
+        }
+        vector.swap(reordered);
+    }
+
+    template<class T>
+    inline void _reorderVectorList(T &vectorList, std::vector<size_t> &order) {
+        for (size_t i = 0; i < vectorList.size(); i++) {
+            _reorderVector(vectorList[i], order);
+        }
+    }
+
     template<class T>
     inline void _mergeVectors(T &vectorList1, T &vectorList2) {
         for (size_t i = 0; i < vectorList1.size(); i++) {
@@ -313,6 +357,8 @@ private:
     std::vector<std::vector<unsigned long long int> > _uLongLongAttributes;
     std::vector<std::vector<float> > _floatAttributes;
     std::vector<std::vector<vmath::vec3> > _vector3Attributes;
+    std::vector<std::vector<HalfVector3> > _vector3HalfAttributes;
+    std::vector<std::vector<HalfFloat16> > _floatHalfAttributes;
 
     std::vector<char> _charDefaults;
     std::vector<unsigned char> _ucharDefaults;
@@ -323,6 +369,8 @@ private:
     std::vector<unsigned long long int> _uLongLongDefaults;
     std::vector<float> _floatDefaults;
     std::vector<vmath::vec3> _vector3Defaults;
+    std::vector<HalfVector3> _vector3HalfDefaults;
+    std::vector<HalfFloat16> _floatHalfDefaults;
 
     std::string _defaultPositionName = "POSITION";
     std::string _defaultVelocityName = "VELOCITY";
@@ -45,17 +45,17 @@ inline T dot(std::vector<T> &x, std::vector<T> &y) {
         return sum;
     }
 
-    std::vector<std::thread> threads(numthreads);
     std::vector<T> results(numthreads, 0);
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, x.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&dotThread<T>,
-                                 intervals[i], intervals[i + 1], &x, &y, &(results[i]));
-    }
+    ThreadUtils::parallelFor(0, numthreads, [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            dotThread<T>(intervals[i], intervals[i + 1], &x, &y, &(results[i]));
+        }
+    });
 
+    // Partial sums are added in a fixed order so that results are repeatable
     T sum = 0;
     for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
         sum += results[i];
     }
 
@@ -92,19 +92,18 @@ inline int indexAbsMax(std::vector<T> &x) {
         return maxind;
     }
 
-    std::vector<std::thread> threads(numthreads);
     std::vector<T> maxvals(numthreads, 0);
     std::vector<int> maxinds(numthreads, -1);
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, x.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&indexAbsMaxThread<T>,
-                                 intervals[i], intervals[i + 1], &x, &(maxvals[i]), &(maxinds[i]));
-    }
+    ThreadUtils::parallelFor(0, numthreads, [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            indexAbsMaxThread<T>(intervals[i], intervals[i + 1], &x, &(maxvals[i]), &(maxinds[i]));
+        }
+    });
 
     int maxindex = 0;
     T maxvalue = 0;
     for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
         if (maxvals[i] > maxvalue) {
             maxvalue = maxvals[i];
             maxindex = maxinds[i];
@@ -144,16 +143,9 @@ inline void addScaled(float alpha, std::vector<T> &x, std::vector<T> &y) {
         return;
     }
 
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, x.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&addScaledThread<T>,
-                                 intervals[i], intervals[i + 1], alpha, &x, &y);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)x.size(), [&](int startidx, int endidx) {
+        addScaledThread<T>(startidx, endidx, alpha, &x, &y);
+    }, ELEMENTS_PER_THREAD / 4);
 }
 
 }
@@ -0,0 +1,352 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#pragma once
+
+// Geometric multigrid V-cycle preconditioner for 7-point Poisson systems on a
+// grid, such as the pressure system. Each matrix row corresponds to a grid cell.
+//
+// Coarse levels are built by aggregating 2x2x2 blocks of cells into a single
+// coarse cell and forming the coarse operator with the Galerkin product
+// P^T * A * P, where P is piecewise constant interpolation. Aggregates follow
+// the liquid domain so that the coarse levels respect free surface and solid
+// boundaries without any rediscretization. The Galerkin operator of a 7-point
+// operator remains a 7-point operator on the coarse grid.
+//
+// Red-black Gauss-Seidel is used as the smoother so that each colour can be
+// updated in parallel. Pre-smoothing sweeps red then black and post-smoothing
+// sweeps black then red, which keeps the V-cycle symmetric as required for use
+// as a conjugate gradient preconditioner.
+
+#include <vector>
+#include <cmath>
+#include <algorithm>
+#include <utility>
+
+#include "sparsematrix.h"
+#include "../array3d.h"
+#include "../threadutils.h"
+#include "../fluidsimassert.h"
+
+template<class T>
+struct MultigridLevel {
+    FixedSparseMatrix<T> matrix;
+    std::vector<T> invdiag;
+    std::vector<GridIndex> cells;
+    std::vector<unsigned int> redRows;
+    std::vector<unsigned int> blackRows;
+
+    // Index of the coarse level row that each row is aggregated into
+    std::vector<unsigned int> coarseIndex;
+
+    // Rows of the finer level that are aggregated into each row of this level
+    std::vector<unsigned int> childstart;
+    std::vector<unsigned int> childindex;
+
+    std::vector<T> x, b, r;
+};
+
+template<class T>
+class MultigridPreconditioner {
+
+public:
+
+    MultigridPreconditioner() {}
+
+    void setSmoothingIterations(int n) {
+        _numSmoothingIterations = std::max(n, 1);
+    }
+
+    int getNumLevels() {
+        return (int)_levels.size();
+    }
+
+    void formPreconditioner(const SparseMatrix<T> &matrix, const std::vector<GridIndex> &cells) {
+        FLUIDSIM_ASSERT(matrix.n == cells.size());
+
+        _levels.clear();
+        _levels.push_back(MultigridLevel<T>());
+        MultigridLevel<T> *fine = &(_levels.back());
+        fine->matrix.fromMatrix(matrix);
+        fine->cells = cells;
+        _initializeLevel(*fine);
+
+        while (fine->matrix.n > _maxCoarsestLevelSize && (int)_levels.size() < _maxNumLevels) {
+            MultigridLevel<T> coarse;
+            if (!_generateCoarseLevel(*fine, coarse)) {
+                break;
+            }
+
+            _levels.push_back(std::move(coarse));
+            _initializeLevel(_levels.back());
+            fine = &(_levels.back());
+        }
+    }
+
+    void applyPreconditioner(const std::vector<T> &x, std::vector<T> &result) {
+        FLUIDSIM_ASSERT(!_levels.empty());
+        FLUIDSIM_ASSERT(x.size() == _levels[0].matrix.n);
+
+        _levels[0].b = x;
+        _vcycle(0);
+        result = _levels[0].x;
+    }
+
+private:
+
+    void _initializeLevel(MultigridLevel<T> &level) {
+        unsigned int n = level.matrix.n;
+        level.invdiag.assign(n, 0);
+        level.x.assign(n, 0);
+        level.b.assign(n, 0);
+        level.r.assign(n, 0);
+
+        level.redRows.clear();
+        level.blackRows.clear();
+        for (unsigned int i = 0; i < n; i++) {
+            for (unsigned int p = level.matrix.rowstart[i]; p < level.matrix.rowstart[i + 1]; p++) {
+                if (level.matrix.colindex[p] == i && level.matrix.value[p] > 0) {
+                    level.invdiag[i] = 1 / level.matrix.value[p];
+                }
+            }
+
+            GridIndex g = level.cells[i];
+            if ((g.i + g.j + g.k) % 2 == 0) {
+                level.redRows.push_back(i);
+            } else {
+                level.blackRows.push_back(i);
+            }
+        }
+    }
+
+    bool _generateCoarseLevel(MultigridLevel<T> &fine, MultigridLevel<T> &coarse) {
+        unsigned int nfine = fine.matrix.n;
+        int isize = 0; int jsize = 0; int ksize = 0;
+        for (unsigned int i = 0; i < nfine; i++) {
+            GridIndex g = fine.cells[i];
+            isize = std::max(isize, g.i / 2 + 1);
+            jsize = std::max(jsize, g.j / 2 + 1);
+            ksize = std::max(ksize, g.k / 2 + 1);
+        }
+
+        Array3d<int> aggregateGrid(isize, jsize, ksize, -1);
+        fine.coarseIndex.resize(nfine);
+        coarse.cells.clear();
+        for (unsigned int i = 0; i < nfine; i++) {
+            GridIndex g = fine.cells[i];
+            GridIndex c(g.i / 2, g.j / 2, g.k / 2);
+            int cidx = aggregateGrid(c);
+            if (cidx == -1) {
+                cidx = (int)coarse.cells.size();
+                aggregateGrid.set(c, cidx);
+                coarse.cells.push_back(c);
+            }
+            fine.coarseIndex[i] = (unsigned int)cidx;
+        }
+
+        unsigned int ncoarse = (unsigned int)coarse.cells.size();
+        if (ncoarse == 0 || ncoarse >= nfine) {
+            return false;
+        }
+
+        coarse.childstart.assign(ncoarse + 1, 0);
+        for (unsigned int i = 0; i < nfine; i++) {
+            coarse.childstart[fine.coarseIndex[i] + 1]++;
+        }
+        for (unsigned int i = 0; i < ncoarse; i++) {
+            coarse.childstart[i + 1] += coarse.childstart[i];
+        }
+
+        coarse.childindex.resize(nfine);
+        std::vector<unsigned int> childcount(ncoarse, 0);
+        for (unsigned int i = 0; i < nfine; i++) {
+            unsigned int cidx = fine.coarseIndex[i];
+            coarse.childindex[coarse.childstart[cidx] + childcount[cidx]] = i;
+            childcount[cidx]++;
+        }
+
+        // Galerkin product, computed in two passes: row sizes, then values
+        coarse.matrix.resize(ncoarse);
+        std::vector<unsigned int> rowcount(ncoarse, 0);
+        _parallelForRows(ncoarse, [&](unsigned int startidx, unsigned int endidx) {
+            std::vector<unsigned int> cols;
+            std::vector<T> values;
+            for (unsigned int cidx = startidx; cidx < endidx; cidx++) {
+                _computeCoarseRow(fine, coarse, cidx, cols, values);
+                rowcount[cidx] = (unsigned int)cols.size();
+            }
+        });
+
+        coarse.matrix.rowstart[0] = 0;
+        for (unsigned int i = 0; i < ncoarse; i++) {
+            coarse.matrix.rowstart[i + 1] = coarse.matrix.rowstart[i] + rowcount[i];
+        }
+        coarse.matrix.value.resize(coarse.matrix.rowstart[ncoarse]);
+        coarse.matrix.colindex.resize(coarse.matrix.rowstart[ncoarse]);
+
+        _parallelForRows(ncoarse, [&](unsigned int startidx, unsigned int endidx) {
+            std::vector<unsigned int> cols;
+            std::vector<T> values;
+            for (unsigned int cidx = startidx; cidx < endidx; cidx++) {
+                _computeCoarseRow(fine, coarse, cidx, cols, values);
+                unsigned int offset = coarse.matrix.rowstart[cidx];
+                for (size_t p = 0; p < cols.size(); p++) {
+                    coarse.matrix.colindex[offset + p] = cols[p];
+                    coarse.matrix.value[offset + p] = values[p];
+                }
+            }
+        });
+
+        return true;
+    }
+
+    void _computeCoarseRow(MultigridLevel<T> &fine, MultigridLevel<T> &coarse, unsigned int cidx,
+                           std::vector<unsigned int> &cols, std::vector<T> &values) {
+        cols.clear();
+        values.clear();
+        for (unsigned int c = coarse.childstart[cidx]; c < coarse.childstart[cidx + 1]; c++) {
+            unsigned int row = coarse.childindex[c];
+            for (unsigned int p = fine.matrix.rowstart[row]; p < fine.matrix.rowstart[row + 1]; p++) {
+                unsigned int col = fine.coarseIndex[fine.matrix.colindex[p]];
+                size_t idx = 0;
+                while (idx < cols.size() && cols[idx] != col) {
+                    idx++;
+                }
+
+                if (idx == cols.size()) {
+                    cols.push_back(col);
+                    values.push_back(fine.matrix.value[p]);
+                } else {
+                    values[idx] += fine.matrix.value[p];
+                }
+            }
+        }
+
+        // Sort entries by column
+        for (size_t i = 1; i < cols.size(); i++) {
+            for (size_t j = i; j > 0 && cols[j - 1] > cols[j]; j--) {
+                std::swap(cols[j - 1], cols[j]);
+                std::swap(values[j - 1], values[j]);
+            }
+        }
+    }
+
+    void _vcycle(int levelidx) {
+        MultigridLevel<T> &level = _levels[levelidx];
+        std::fill(level.x.begin(), level.x.end(), (T)0);
+
+        if (levelidx == (int)_levels.size() - 1) {
+            for (int i = 0; i < _numCoarsestLevelIterations; i++) {
+                _smooth(level, level.redRows);
+                _smooth(level, level.blackRows);
+                _smooth(level, level.blackRows);
+                _smooth(level, level.redRows);
+            }
+            return;
+        }
+
+        for (int i = 0; i < _numSmoothingIterations; i++) {
+            _smooth(level, level.redRows);
+            _smooth(level, level.blackRows);
+        }
+
+        MultigridLevel<T> &coarse = _levels[levelidx + 1];
+        _computeResidual(level);
+        _restrict(level, coarse);
+        _vcycle(levelidx + 1);
+        _prolongate(coarse, level);
+
+        for (int i = 0; i < _numSmoothingIterations; i++) {
+            _smooth(level, level.blackRows);
+            _smooth(level, level.redRows);
+        }
+    }
+
+    void _smooth(MultigridLevel<T> &level, std::vector<unsigned int> &rows) {
+        _parallelForRows((unsigned int)rows.size(), [&](unsigned int startidx, unsigned int endidx) {
+            FixedSparseMatrix<T> &A = level.matrix;
+            for (unsigned int idx = startidx; idx < endidx; idx++) {
+                unsigned int i = rows[idx];
+                T sum = level.b[i];
+                for (unsigned int p = A.rowstart[i]; p < A.rowstart[i + 1]; p++) {
+                    sum -= A.value[p] * level.x[A.colindex[p]];
+                }
+                level.x[i] += level.invdiag[i] * sum;
+            }
+        });
+    }
+
+    void _computeResidual(MultigridLevel<T> &level) {
+        _parallelForRows(level.matrix.n, [&](unsigned int startidx, unsigned int endidx) {
+            FixedSparseMatrix<T> &A = level.matrix;
+            for (unsigned int i = startidx; i < endidx; i++) {
+                T sum = level.b[i];
+                for (unsigned int p = A.rowstart[i]; p < A.rowstart[i + 1]; p++) {
+                    sum -= A.value[p] * level.x[A.colindex[p]];
+                }
+                level.r[i] = sum;
+            }
+        });
+    }
+
+    void _restrict(MultigridLevel<T> &fine, MultigridLevel<T> &coarse) {
+        _parallelForRows(coarse.matrix.n, [&](unsigned int startidx, unsigned int endidx) {
+            for (unsigned int cidx = startidx; cidx < endidx; cidx++) {
+                T sum = 0;
+                for (unsigned int c = coarse.childstart[cidx]; c < coarse.childstart[cidx + 1]; c++) {
+                    sum += fine.r[coarse.childindex[c]];
+                }
+                coarse.b[cidx] = sum;
+            }
+        });
+    }
+
+    void _prolongate(MultigridLevel<T> &coarse, MultigridLevel<T> &fine) {
+        // The Galerkin operator of piecewise constant aggregates is stiffer
+        // than the fine operator, so the coarse correction is scaled up
+        T scale = (T)_coarseCorrectionScale;
+        _parallelForRows(fine.matrix.n, [&](unsigned int startidx, unsigned int endidx) {
+            for (unsigned int i = startidx; i < endidx; i++) {
+                fine.x[i] += scale * coarse.x[fine.coarseIndex[i]];
+            }
+        });
+    }
+
+    template<class Function>
+    void _parallelForRows(unsigned int n, Function func) {
+        ThreadUtils::parallelFor(0, (int)n, [&func](int startidx, int endidx) {
+            func((unsigned int)startidx, (unsigned int)endidx);
+        }, (int)_minRowsPerThread);
+    }
+
+    std::vector<MultigridLevel<T> > _levels;
+
+    int _numSmoothingIterations = 2;
+    int _numCoarsestLevelIterations = 16;
+    unsigned int _maxCoarsestLevelSize = 1000;
+    int _maxNumLevels = 12;
+    double _coarseCorrectionScale = 1.8;
+    unsigned int _minRowsPerThread = 5000;
+
+};
@@ -21,6 +21,7 @@ purposes, all without asking permission. See Other Information below.
 #include <cmath>
 #include "sparsematrix.h"
 #include "blaswrapper.h"
+#include "multigridpreconditioner.h"
 #include "../fluidsimassert.h"
 
 //============================================================================
@@ -240,6 +241,169 @@ void solveLowerTransposeInPlace(const SparseColumnLowerFactor<T> &factor, std::v
     } while(i != 0);
 }
 
+//============================================================================
+// Level scheduled solution routines with lower triangular matrix.
+//
+// Rows are grouped into levels so that each row only depends on rows from 
+// earlier levels. Rows within a level are solved in parallel. For a 7-point 
+// grid stencil in natural ordering, levels are the diagonal wavefronts of the
+// grid. The results are the same as solveLower and solveLowerTransposeInPlace
+// up to floating point summation order.
+
+template<class T>
+struct SparseLowerFactorSchedule {
+    // Strictly lower triangle of the factor stored row by row
+    std::vector<T> value;
+    std::vector<unsigned int> colindex;
+    std::vector<unsigned int> rowstart;
+
+    // Rows of each level for L*result=rhs and for L^T*result=rhs
+    std::vector<unsigned int> lowerLevelRows;
+    std::vector<unsigned int> lowerLevelStart;
+    std::vector<unsigned int> transposeLevelRows;
+    std::vector<unsigned int> transposeLevelStart;
+};
+
+inline void _sortRowsByLevel(const std::vector<unsigned int> &levels, unsigned int numLevels,
+                      std::vector<unsigned int> &levelRows, 
+                      std::vector<unsigned int> &levelStart) {
+    levelStart.assign(numLevels + 1, 0);
+    for (size_t i = 0; i < levels.size(); i++) {
+        levelStart[levels[i] + 1]++;
+    }
+    for (unsigned int i = 0; i < numLevels; i++) {
+        levelStart[i + 1] += levelStart[i];
+    }
+
+    levelRows.resize(levels.size());
+    std::vector<unsigned int> levelCount(numLevels, 0);
+    for (size_t i = 0; i < levels.size(); i++) {
+        unsigned int level = levels[i];
+        levelRows[levelStart[level] + levelCount[level]] = (unsigned int)i;
+        levelCount[level]++;
+    }
+}
+
+template<class T>
+void buildLowerFactorSchedule(const SparseColumnLowerFactor<T> &factor, 
+                              SparseLowerFactorSchedule<T> &schedule) {
+    unsigned int n = factor.n;
+
+    // Transpose column storage into row storage
+    schedule.rowstart.assign(n + 1, 0);
+    for (size_t p = 0; p < factor.rowindex.size(); p++) {
+        schedule.rowstart[factor.rowindex[p] + 1]++;
+    }
+    for (unsigned int i = 0; i < n; i++) {
+        schedule.rowstart[i + 1] += schedule.rowstart[i];
+    }
+
+    schedule.value.resize(factor.value.size());
+    schedule.colindex.resize(factor.rowindex.size());
+    std::vector<unsigned int> rowCount(n, 0);
+    for (unsigned int col = 0; col < n; col++) {
+        for (unsigned int p = factor.colstart[col]; p < factor.colstart[col + 1]; p++) {
+            unsigned int row = factor.rowindex[p];
+            unsigned int dst = schedule.rowstart[row] + rowCount[row];
+            schedule.value[dst] = factor.value[p];
+            schedule.colindex[dst] = col;
+            rowCount[row]++;
+        }
+    }
+
+    std::vector<unsigned int> levels(n, 0);
+    unsigned int numLevels = 0;
+    for (unsigned int i = 0; i < n; i++) {
+        unsigned int level = 0;
+        for (unsigned int p = schedule.rowstart[i]; p < schedule.rowstart[i + 1]; p++) {
+            level = std::max(level, levels[schedule.colindex[p]] + 1);
+        }
+        levels[i] = level;
+        numLevels = std::max(numLevels, level + 1);
+    }
+    _sortRowsByLevel(levels, numLevels, schedule.lowerLevelRows, schedule.lowerLevelStart);
+
+    numLevels = 0;
+    unsigned int i = n;
+    while (i != 0) {
+        i--;
+        unsigned int level = 0;
+        for (unsigned int p = factor.colstart[i]; p < factor.colstart[i + 1]; p++) {
+            level = std::max(level, levels[factor.rowindex[p]] + 1);
+        }
+        levels[i] = level;
+        numLevels = std::max(numLevels, level + 1);
+    }
+    _sortRowsByLevel(levels, numLevels, schedule.transposeLevelRows, schedule.transposeLevelStart);
+}
+
+// solve L*result=rhs
+template<class T>
+void solveLowerParallel(const SparseColumnLowerFactor<T> &factor, 
+                        const SparseLowerFactorSchedule<T> &schedule,
+                        const std::vector<T> &rhs, std::vector<T> &result) {
+    FLUIDSIM_ASSERT(factor.n == rhs.size());
+    FLUIDSIM_ASSERT(factor.n == result.size());
+
+    int minRowsPerThread = 2048;
+    size_t numLevels = schedule.lowerLevelStart.size() - 1;
+    for (size_t level = 0; level < numLevels; level++) {
+        int levelBegin = schedule.lowerLevelStart[level];
+        int levelEnd = schedule.lowerLevelStart[level + 1];
+        ThreadUtils::parallelFor(levelBegin, levelEnd, [&](int startidx, int endidx) {
+            for (int idx = startidx; idx < endidx; idx++) {
+                unsigned int i = schedule.lowerLevelRows[idx];
+                T sum = rhs[i];
+                for (unsigned int p = schedule.rowstart[i]; p < schedule.rowstart[i + 1]; p++) {
+                    sum -= schedule.value[p] * result[schedule.colindex[p]];
+                }
+                result[i] = sum * factor.invdiag[i];
+            }
+        }, minRowsPerThread);
+    }
+}
+
+// solve L^T*result=rhs
+template<class T>
+void solveLowerTransposeInPlaceParallel(const SparseColumnLowerFactor<T> &factor, 
+                                        const SparseLowerFactorSchedule<T> &schedule,
+                                        std::vector<T> &x) {
+    FLUIDSIM_ASSERT(factor.n == x.size());
+
+    int minRowsPerThread = 2048;
+    size_t numLevels = schedule.transposeLevelStart.size() - 1;
+    for (size_t level = 0; level < numLevels; level++) {
+        int levelBegin = schedule.transposeLevelStart[level];
+        int levelEnd = schedule.transposeLevelStart[level + 1];
+        ThreadUtils::parallelFor(levelBegin, levelEnd, [&](int startidx, int endidx) {
+            for (int idx = startidx; idx < endidx; idx++) {
+                unsigned int i = schedule.transposeLevelRows[idx];
+                T sum = x[i];
+                for (unsigned int p = factor.colstart[i]; p < factor.colstart[i + 1]; p++) {
+                    sum -= factor.value[p] * x[factor.rowindex[p]];
+                }
+                x[i] = sum * factor.invdiag[i];
+            }
+        }, minRowsPerThread);
+    }
+}
+
+//============================================================================
+// Symmetric positive definite linear operator for matrix-free solves. The
+// matrix is not stored, products are computed directly from the operator's
+// stencil.
+
+template<class T>
+class LinearOperator {
+public:
+    virtual ~LinearOperator() {}
+    virtual unsigned int size() const = 0;
+
+    // result=A*x
+    virtual void multiply(const std::vector<T> &x, std::vector<T> &result) const = 0;
+    virtual void getDiagonal(std::vector<T> &diag) const = 0;
+};
+
 //============================================================================
 // Encapsulates the Conjugate Gradient algorithm with incomplete Cholesky
 // factorization preconditioner.
@@ -265,28 +429,96 @@ struct PCGSolver {
         minDiagonalRatio = diagRatio;
     }
 
+    // Use a multigrid V-cycle as the preconditioner instead of MIC(0). Each
+    // row of the matrix corresponds to the grid cell at the same index in cells.
+    void enableMultigridPreconditioner(const std::vector<GridIndex> &cells) {
+        multigridCells = &cells;
+        isMultigridPreconditionerEnabled = true;
+    }
+
+    void disableMultigridPreconditioner() {
+        multigridCells = nullptr;
+        isMultigridPreconditionerEnabled = false;
+    }
+
+    // Apply the MIC(0) preconditioner with level scheduled triangular solves
+    // that run in parallel. The serial solves are used when running on a 
+    // single thread.
+    void enableParallelMICPreconditioner() {
+        isParallelMICPreconditionerEnabled = true;
+    }
+
+    void disableParallelMICPreconditioner() {
+        isParallelMICPreconditionerEnabled = false;
+    }
+
     bool solve(const SparseMatrix<T> &matrix, const std::vector<T> &rhs, 
                std::vector<T> &result, T &residualOut, int &iterationsOut) {
 
-        unsigned int n = matrix.n;
+        fixedMatrix.fromMatrix(matrix);
+        return solvePCG(
+            matrix.n, rhs, result, residualOut, iterationsOut,
+            [this](std::vector<T> &x, std::vector<T> &y) { multiply(fixedMatrix, x, y); },
+            [this, &matrix]() { formPreconditioner(matrix); },
+            [this](const std::vector<T> &x, std::vector<T> &y) { applyPreconditioner(x, y); }
+        );
+    }
+
+    // Matrix-free solve. Only the diagonal of the operator is available, so
+    // a Jacobi preconditioner is used.
+    bool solve(const LinearOperator<T> &op, const std::vector<T> &rhs, 
+               std::vector<T> &result, T &residualOut, int &iterationsOut) {
+
+        return solvePCG(
+            op.size(), rhs, result, residualOut, iterationsOut,
+            [&op](std::vector<T> &x, std::vector<T> &y) { op.multiply(x, y); },
+            [this, &op]() { formJacobiPreconditioner(op); },
+            [this](const std::vector<T> &x, std::vector<T> &y) { applyJacobiPreconditioner(x, y); }
+        );
+    }
+
+protected:
+
+    template<class MultiplyFunc, class FormPreconditionerFunc, class ApplyPreconditionerFunc>
+    bool solvePCG(unsigned int n, const std::vector<T> &rhs, 
+                  std::vector<T> &result, T &residualOut, int &iterationsOut,
+                  MultiplyFunc multiplyOperator, 
+                  FormPreconditionerFunc formPreconditionerOperator,
+                  ApplyPreconditionerFunc applyPreconditionerOperator) {
+
         if (m.size() != n) { 
             m.resize(n); 
             s.resize(n); 
             z.resize(n); 
             r.resize(n); 
         }
-        //std::fill(result.begin(), result.end(), 0);
 
+        // The incoming result is used as the initial guess
         r = rhs;
+        double rhsNorm = BLAS::absMax(r);
+        if(rhsNorm == 0) {
+            std::fill(result.begin(), result.end(), 0);
+            residualOut = 0;
+            iterationsOut = 0;
+            return true;
+        }
+
+        if (BLAS::absMax(result) != 0) {
+            multiplyOperator(result, z);
+            BLAS::addScaled(-1.0, z, r);
+        }
+
+        // Tolerance is relative to the right hand side so that a good initial
+        // guess does not tighten the convergence criteria
+        double tol = toleranceFactor * rhsNorm;
         residualOut = BLAS::absMax(r);
-        if(residualOut == 0) {
+        if(residualOut <= std::min(tol, (double)maxErrorTolerance)) {
             iterationsOut = 0;
             return true;
         }
-        double tol = toleranceFactor * residualOut;
 
-        formPreconditioner(matrix);
-        applyPreconditioner(r, z);
+        formPreconditionerOperator();
+        applyPreconditionerOperator(r, z);
         double rho = BLAS::dot(z, r);
         if (rho == 0 || rho != rho) {
             iterationsOut = 0;
@@ -294,11 +526,10 @@ struct PCGSolver {
         }
 
         s = z;
-        fixedMatrix.fromMatrix(matrix);
 
         int iteration;
         for (iteration = 0; iteration < maxIterations; iteration++){
-            multiply(fixedMatrix, s, z);
+            multiplyOperator(s, z);
             double alpha = rho / BLAS::dot(s, z);
             BLAS::addScaled(alpha, s, result);
             BLAS::addScaled(-alpha, z, r);
@@ -309,7 +540,7 @@ struct PCGSolver {
                 return true; 
             }
 
-            applyPreconditioner(r, z);
+            applyPreconditionerOperator(r, z);
             double rhoNew = BLAS::dot(z, r);
             double beta = rhoNew / rho;
             BLAS::addScaled(beta, s, z); 
@@ -321,10 +552,14 @@ struct PCGSolver {
         return false;
     }
 
-protected:
-
     // internal structures
     SparseColumnLowerFactor<T> icfactor; // modified incomplete cholesky factor
+    MultigridPreconditioner<T> multigrid;
+    const std::vector<GridIndex> *multigridCells = nullptr;
+    bool isMultigridPreconditionerEnabled = false;
+    SparseLowerFactorSchedule<T> icschedule;
+    bool isParallelMICPreconditionerEnabled = false;
+    std::vector<T> jacobiInvDiag;
     std::vector<T> m, z, s, r; // temporary vectors for PCG
     FixedSparseMatrix<T> fixedMatrix; // used within loop
 
@@ -336,12 +571,44 @@ protected:
     T minDiagonalRatio;
 
     void formPreconditioner(const SparseMatrix<T> &matrix) {
+        if (isMultigridPreconditionerEnabled) {
+            multigrid.formPreconditioner(matrix, *multigridCells);
+            return;
+        }
         factorModifiedIncompleteColesky0(matrix, icfactor);
+        if (isParallelMICPreconditionerEnabled) {
+            buildLowerFactorSchedule(icfactor, icschedule);
+        }
     }
 
     void applyPreconditioner(const std::vector<T> &x, std::vector<T> &result) {
+        if (isMultigridPreconditionerEnabled) {
+            multigrid.applyPreconditioner(x, result);
+            return;
+        }
+        if (isParallelMICPreconditionerEnabled && ThreadUtils::getMaxThreadCount() > 1) {
+            solveLowerParallel(icfactor, icschedule, x, result);
+            solveLowerTransposeInPlaceParallel(icfactor, icschedule, result);
+            return;
+        }
         solveLower(icfactor, x, result);
         solveLowerTransposeInPlace(icfactor, result);
     }
 
+    void formJacobiPreconditioner(const LinearOperator<T> &op) {
+        op.getDiagonal(jacobiInvDiag);
+        for (size_t i = 0; i < jacobiInvDiag.size(); i++) {
+            jacobiInvDiag[i] = jacobiInvDiag[i] > 0 ? 1 / jacobiInvDiag[i] : 0;
+        }
+    }
+
+    void applyJacobiPreconditioner(const std::vector<T> &x, std::vector<T> &result) {
+        int minElementsPerThread = 100000;
+        ThreadUtils::parallelFor(0, (int)x.size(), [&](int startidx, int endidx) {
+            for (int i = startidx; i < endidx; i++) {
+                result[i] = jacobiInvDiag[i] * x[i];
+            }
+        }, minElementsPerThread);
+    }
+
 };
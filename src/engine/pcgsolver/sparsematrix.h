@@ -202,14 +202,7 @@ void multiply(FixedSparseMatrix<T> &matrix, std::vector<T> &x, std::vector<T> &r
         return;
     }
 
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, matrix.n, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&_multiplyThread<T>,
-                                 intervals[i], intervals[i + 1], &matrix, &x, &result);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)matrix.n, [&](int startidx, int endidx) {
+        _multiplyThread<T>(startidx, endidx, &matrix, &x, &result);
+    }, elementsPerThread / 4);
 }
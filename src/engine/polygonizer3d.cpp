@@ -391,29 +391,17 @@ void Polygonizer3d::_findSurfaceCells(Array3d<bool> &isSurfaceCell) {
                                       GridIndex(0, 1, 1),
                                       GridIndex(1, 1, 1)});
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, workQueue.size());
-    std::vector<std::thread> threads(numthreads);
-    FLUIDSIM_ASSERT(numthreads > 0);
-
     Array3d<bool> hasInsideNode(_isize, _jsize, _ksize, false);
     Array3d<bool> hasOutsideNode(_isize, _jsize, _ksize, false);
 
-    while (!workQueue.empty()) {
-
-        numthreads = (int)fmin(numCPU, workQueue.size());
-        for (int tidx = 0; tidx < numthreads; tidx++) {
-            GridIndex gridOffset = workQueue.back();
-            workQueue.pop_back();
-
-            threads[tidx] = std::thread(&Polygonizer3d::_getCellNodeStatusThread, this,
-                                        gridOffset, &hasInsideNode, &hasOutsideNode);
-        }
-
-        for (int tidx = 0; tidx < numthreads; tidx++) {
-            threads[tidx].join();
-        }
+    ThreadUtils::TaskGroup taskGroup;
+    for (size_t i = 0; i < workQueue.size(); i++) {
+        GridIndex gridOffset = workQueue[i];
+        taskGroup.run([this, gridOffset, &hasInsideNode, &hasOutsideNode]() {
+            _getCellNodeStatusThread(gridOffset, &hasInsideNode, &hasOutsideNode);
+        });
     }
+    taskGroup.wait();
 
     for (int k = 0; k < _ksize; k++) {
         for (int j = 0; j < _jsize; j++) {
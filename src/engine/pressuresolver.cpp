@@ -55,7 +55,9 @@ bool PressureSolver::solve(PressureSolverParameters params) {
     _conditionSolidVelocityField();
     _initializeSurfaceTensionClusterData();
 
-    std::vector<double> rhs(_matSize, 0);
+    std::vector<double> rhs;
+    _bufferArena->acquire(_matSize, rhs);
+    rhs.assign(_matSize, 0);
     _calculateNegativeDivergenceVector(rhs);
 
     double maxAbsCoeff = 0.0;
@@ -70,37 +72,44 @@ bool PressureSolver::solve(PressureSolverParameters params) {
         _solverIterations = 0;
         _solverError = 0.0f;
         _solverStatus = "Pressure Solver Iterations: 0\nEstimated Error: 0.0";
+        _bufferArena->release(rhs);
         return true;
     }
 
-    std::vector<double> soln(_matSize, 0);
+    std::vector<double> soln;
+    _bufferArena->acquire(_matSize, soln);
+    soln.assign(_matSize, 0);
     for (size_t i = 0; i < soln.size(); i++) {
         GridIndex g = _pressureCells[i];
         float pressure = _pressureGrid->get(g);
         soln[i] = pressure;
     }
 
-    SparseMatrixd matrix(_matSize, 7);
-    _calculateMatrixCoefficients(matrix);
-
-    bool success = _solveLinearSystem(matrix, rhs, soln);
-    if (!success) {
-        return false;
+    bool success = false;
+    if (_isMatrixFree) {
+        PressureOperator matrix(this);
+        _bufferArena->acquire(_matSize, matrix.diag);
+        _calculateMatrixDiagonal(matrix.diag);
+        success = _solveLinearSystemMatrixFree(matrix, rhs, soln);
+        _bufferArena->release(matrix.diag);
+    } else {
+        SparseMatrixd matrix(_matSize, 7);
+        _calculateMatrixCoefficients(matrix);
+        success = _solveLinearSystem(matrix, rhs, soln);
     }
 
-    return true;
+    _bufferArena->release(rhs);
+    _bufferArena->release(soln);
+
+    return success;
 }
 
 void PressureSolver::applySolutionToVelocityField() {
     FluidMaterialGrid mgrid(_isize, _jsize, _ksize);
-    for(int k = 0; k < _ksize; k++) {
-        for(int j = 0; j < _jsize; j++) {
-            for(int i = 0; i < _isize; i++) {
-                if (_liquidSDF->get(i, j, k) < 0.0) {
-                    mgrid.setFluid(i, j, k);
-                }
-            }
-        }
+    std::vector<GridIndex> liquidCells;
+    _liquidSDF->getCellsInsideLiquid(liquidCells);
+    for (size_t i = 0; i < liquidCells.size(); i++) {
+        mgrid.setFluid(liquidCells[i]);
     }
 
     _validVelocities->reset();
@@ -122,6 +131,8 @@ void PressureSolver::_initialize(PressureSolverParameters params) {
     _pressureSolveTolerance = params.tolerance;
     _pressureSolveAcceptableTolerance = params.acceptableTolerance;
     _maxCGIterations = params.maxIterations;
+    _preconditioner = params.preconditioner;
+    _isMatrixFree = params.isMatrixFree;
 
     _vFieldFluid = params.velocityFieldFluid;
     _vFieldSolid = params.velocityFieldSolid;
@@ -134,15 +145,15 @@ void PressureSolver::_initialize(PressureSolverParameters params) {
     _isSurfaceTensionEnabled = params.isSurfaceTensionEnabled;
     _surfaceTensionConstant = params.surfaceTensionConstant;
     _curvatureGrid = params.curvatureGrid;
+    _bufferArena = params.bufferArena != nullptr ? params.bufferArena : &_localBufferArena;
 
+    std::vector<GridIndex> liquidCells;
+    _liquidSDF->getCellsInsideLiquid(liquidCells);
     _pressureCells = GridIndexVector(_isize, _jsize, _ksize);
-    for(int k = 1; k < _ksize - 1; k++) {
-        for(int j = 1; j < _jsize - 1; j++) {
-            for(int i = 1; i < _isize - 1; i++) {
-                if(_liquidSDF->get(i, j, k) < 0) {
-                    _pressureCells.push_back(i, j, k);
-                }
-            }
+    for (size_t i = 0; i < liquidCells.size(); i++) {
+        GridIndex g = liquidCells[i];
+        if (!Grid3d::isGridIndexOnBorder(g, _isize, _jsize, _ksize)) {
+            _pressureCells.push_back(g);
         }
     }
 
@@ -606,19 +617,9 @@ void PressureSolver::_calculateSurfaceCellStatusThread(int startidx, int endidx,
 }
 
 void PressureSolver::_calculateNegativeDivergenceVector(std::vector<double> &rhs) {
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _pressureCells.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _pressureCells.size(), 
-                                                                      numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_calculateNegativeDivergenceVectorThread, this,
-                                 intervals[i], intervals[i + 1], &rhs);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)_pressureCells.size(), [&](int startidx, int endidx) {
+        _calculateNegativeDivergenceVectorThread(startidx, endidx, &rhs);
+    });
 }
 
 void PressureSolver::_calculateNegativeDivergenceVectorThread(int startidx, 
@@ -748,120 +749,219 @@ double PressureSolver::_getSurfaceTensionTerm(GridIndex g1, GridIndex g2) {
     return _surfaceTensionConstant * curvature;
 }
 
-void PressureSolver::_calculateMatrixCoefficients(SparseMatrixd &matrix) {
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _pressureCells.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _pressureCells.size(), 
-                                                                      numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_calculateMatrixCoefficientsThread, this,
-                                 intervals[i], intervals[i + 1], &matrix);
-    }
+void PressureSolver::PressureOperator::multiply(const std::vector<double> &x, 
+                                                std::vector<double> &result) const {
+    FLUIDSIM_ASSERT(x.size() == diag.size());
+    result.resize(diag.size());
 
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    int minRowsPerThread = 50000;
+    ThreadUtils::parallelFor(0, (int)diag.size(), [&](int startidx, int endidx) {
+        double offdiag[6];
+        int neighbours[6];
+        for (int idx = startidx; idx < endidx; idx++) {
+            GridIndex g = solver->_pressureCells[idx];
+            solver->_calculateMatrixRowOffDiagonals(g, offdiag, neighbours);
+
+            double sum = diag[idx] * x[idx];
+            for (int n = 0; n < 6; n++) {
+                if (neighbours[n] != -1) {
+                    sum += offdiag[n] * x[neighbours[n]];
+                }
+            }
+            result[idx] = sum;
+        }
+    }, minRowsPerThread);
 }
 
-void PressureSolver::_calculateMatrixCoefficientsThread(int startidx, int endidx,
-                                                        SparseMatrixd *matrix) {
+void PressureSolver::PressureOperator::getDiagonal(std::vector<double> &d) const {
+    d = diag;
+}
+
+void PressureSolver::_calculateMatrixRowCoefficients(GridIndex g, double *diagOut, 
+                                                     double offdiag[6], int neighbours[6]) {
     double factor = _deltaTime / (_dx * _dx);
     double eps = 1e-9;
-    for (int idx = startidx; idx < endidx; idx++) {
-        GridIndex g = _pressureCells[idx];
-        int i = g.i;
-        int j = g.j;
-        int k = g.k;
-        int index = _GridToVectorIndex(i, j, k);
+    int i = g.i;
+    int j = g.j;
+    int k = g.k;
+
+    GridIndex gRight( std::min(i + 1, _isize - 1), j,                           k);
+    GridIndex gLeft(  std::max(i - 1, 0),          j,                           k);
+    GridIndex gTop(   i,                           std::min(j + 1, _jsize - 1), k);
+    GridIndex gBottom(i,                           std::max(j - 1, 0),          k);
+    GridIndex gFront( i, j,                                                     std::min(k + 1, _ksize - 1));
+    GridIndex gBack(  i, j,                                                     std::max(k - 1, 0));
+
+    double rhoCenter = _densityGrid->get(g);
+    double rhoRight =  (rhoCenter + _densityGrid->get(gRight))  / 2.0;
+    double rhoLeft =   (rhoCenter + _densityGrid->get(gLeft))   / 2.0;
+    double rhoTop =    (rhoCenter + _densityGrid->get(gTop))    / 2.0;
+    double rhoBottom = (rhoCenter + _densityGrid->get(gBottom)) / 2.0;
+    double rhoFront =  (rhoCenter + _densityGrid->get(gFront))  / 2.0;
+    double rhoBack =   (rhoCenter + _densityGrid->get(gBack))   / 2.0;
+
+    double volRight =  _weightGrid->U(i + 1, j,     k    );
+    double volLeft =   _weightGrid->U(i,     j,     k    );
+    double volTop =    _weightGrid->V(i,     j + 1, k    );
+    double volBottom = _weightGrid->V(i,     j,     k    );
+    double volFront =  _weightGrid->W(i,     j,     k + 1);
+    double volBack =   _weightGrid->W(i,     j,     k    );
+
+    double phiCenter = _liquidSDF->get(i,     j,     k    );
+    double phiRight =  _liquidSDF->get(i + 1, j,     k    );
+    double phiLeft =   _liquidSDF->get(i - 1,     j, k    );
+    double phiTop =    _liquidSDF->get(i,     j + 1, k    );
+    double phiBottom = _liquidSDF->get(i,     j - 1, k    );
+    double phiFront =  _liquidSDF->get(i,     j,     k + 1);
+    double phiBack =   _liquidSDF->get(i,     j,     k - 1);
+
+    double diag = (volRight / rhoRight + volLeft / rhoLeft + volTop / rhoTop + volBottom / rhoBottom + volFront / rhoFront + volBack / rhoBack ) * factor;
+
+    for (int n = 0; n < 6; n++) {
+        offdiag[n] = 0.0;
+        neighbours[n] = -1;
+    }
 
-        GridIndex gRight( std::min(i + 1, _isize - 1), j,                           k);
-        GridIndex gLeft(  std::max(i - 1, 0),          j,                           k);
-        GridIndex gTop(   i,                           std::min(j + 1, _jsize - 1), k);
-        GridIndex gBottom(i,                           std::max(j - 1, 0),          k);
-        GridIndex gFront( i, j,                                                     std::min(k + 1, _ksize - 1));
-        GridIndex gBack(  i, j,                                                     std::max(k - 1, 0));
-
-        double rhoCenter = _densityGrid->get(g);
-        double rhoRight =  (rhoCenter + _densityGrid->get(gRight))  / 2.0;
-        double rhoLeft =   (rhoCenter + _densityGrid->get(gLeft))   / 2.0;
-        double rhoTop =    (rhoCenter + _densityGrid->get(gTop))    / 2.0;
-        double rhoBottom = (rhoCenter + _densityGrid->get(gBottom)) / 2.0;
-        double rhoFront =  (rhoCenter + _densityGrid->get(gFront))  / 2.0;
-        double rhoBack =   (rhoCenter + _densityGrid->get(gBack))   / 2.0;
+    // X+ neighbour
+    if (phiRight < 0.0) {
+        offdiag[0] = -(volRight / rhoRight) * factor;
+        neighbours[0] = _GridToVectorIndex(i + 1, j, k);
+    } else {
+        double theta = phiRight / (phiCenter + eps);
+        theta = _clamp(theta, -_maxtheta, _maxtheta);
+        diag -= (volRight / rhoRight) * factor * theta;
+    }
 
-        double volRight =  _weightGrid->U(i + 1, j,     k    );
-        double volLeft =   _weightGrid->U(i,     j,     k    );
-        double volTop =    _weightGrid->V(i,     j + 1, k    );
-        double volBottom = _weightGrid->V(i,     j,     k    );
-        double volFront =  _weightGrid->W(i,     j,     k + 1);
-        double volBack =   _weightGrid->W(i,     j,     k    );
+    // X- neighbour
+    if (phiLeft < 0.0) {
+        offdiag[1] = -(volLeft / rhoLeft) * factor;
+        neighbours[1] = _GridToVectorIndex(i - 1, j, k);
+    } else {
+        double theta = phiLeft / (phiCenter + eps);
+        theta = _clamp(theta, -_maxtheta, _maxtheta);
+        diag -= (volLeft / rhoLeft) * factor * theta;
+    }
 
-        double phiCenter = _liquidSDF->get(i,     j,     k    );
-        double phiRight =  _liquidSDF->get(i + 1, j,     k    );
-        double phiLeft =   _liquidSDF->get(i - 1,     j, k    );
-        double phiTop =    _liquidSDF->get(i,     j + 1, k    );
-        double phiBottom = _liquidSDF->get(i,     j - 1, k    );
-        double phiFront =  _liquidSDF->get(i,     j,     k + 1);
-        double phiBack =   _liquidSDF->get(i,     j,     k - 1);
-
-        double diag = (volRight / rhoRight + volLeft / rhoLeft + volTop / rhoTop + volBottom / rhoBottom + volFront / rhoFront + volBack / rhoBack ) * factor;
-
-        // X+ neighbour
-        if (phiRight < 0.0) {
-            matrix->add(index, _GridToVectorIndex(i + 1, j, k), -(volRight / rhoRight) * factor);
-        } else {
-            double theta = phiRight / (phiCenter + eps);
-            theta = _clamp(theta, -_maxtheta, _maxtheta);
-            diag -= (volRight / rhoRight) * factor * theta;
-        }
+    // Y+ neighbour
+    if (phiTop < 0.0) {
+        offdiag[2] = -(volTop / rhoTop) * factor;
+        neighbours[2] = _GridToVectorIndex(i, j + 1, k);
+    } else {
+        double theta = phiTop / (phiCenter + eps);
+        theta = _clamp(theta, -_maxtheta, _maxtheta);
+        diag -= (volTop / rhoTop) * factor * theta;
+    }
 
-        // X- neighbour
-        if (phiLeft < 0.0) {
-            matrix->add(index, _GridToVectorIndex(i - 1, j, k), -(volLeft / rhoLeft) * factor);
-        } else {
-            double theta = phiLeft / (phiCenter + eps);
-            theta = _clamp(theta, -_maxtheta, _maxtheta);
-            diag -= (volLeft / rhoLeft) * factor * theta;
-        }
+    // Y- neighbour
+    if (phiBottom < 0.0) {
+        offdiag[3] = -(volBottom / rhoBottom) * factor;
+        neighbours[3] = _GridToVectorIndex(i, j - 1, k);
+    } else {
+        double theta = phiBottom / (phiCenter + eps);
+        theta = _clamp(theta, -_maxtheta, _maxtheta);
+        diag -= (volBottom / rhoBottom) * factor * theta;
+    }
 
-        // Y+ neighbour
-        if (phiTop < 0.0) {
-            matrix->add(index, _GridToVectorIndex(i, j + 1, k), -(volTop / rhoTop) * factor);
-        } else {
-            double theta = phiTop / (phiCenter + eps);
-            theta = _clamp(theta, -_maxtheta, _maxtheta);
-            diag -= (volTop / rhoTop) * factor * theta;
-        }
+    // Z+ neighbour
+    if (phiFront < 0.0) {
+        offdiag[4] = -(volFront / rhoFront) * factor;
+        neighbours[4] = _GridToVectorIndex(i, j, k + 1);
+    } else {
+        double theta = phiFront / (phiCenter + eps);
+        theta = _clamp(theta, -_maxtheta, _maxtheta);
+        diag -= (volFront / rhoFront) * factor * theta;
+    }
 
-        // Y- neighbour
-        if (phiBottom < 0.0) {
-            matrix->add(index, _GridToVectorIndex(i, j - 1, k), -(volBottom / rhoBottom) * factor);
-        } else {
-            double theta = phiBottom / (phiCenter + eps);
-            theta = _clamp(theta, -_maxtheta, _maxtheta);
-            diag -= (volBottom / rhoBottom) * factor * theta;
-        }
+    // Z- neighbour
+    if (phiBack < 0.0) {
+        offdiag[5] = -(volBack / rhoBack) * factor;
+        neighbours[5] = _GridToVectorIndex(i, j, k - 1);
+    } else {
+        double theta = phiBack / (phiCenter + eps);
+        theta = _clamp(theta, -_maxtheta, _maxtheta);
+        diag -= (volBack / rhoBack) * factor * theta;
+    }
 
-        // Z+ neighbour
-        if (phiFront < 0.0) {
-            matrix->add(index, _GridToVectorIndex(i, j, k + 1), -(volFront / rhoFront) * factor);
-        } else {
-            double theta = phiFront / (phiCenter + eps);
-            theta = _clamp(theta, -_maxtheta, _maxtheta);
-            diag -= (volFront / rhoFront) * factor * theta;
-        }
+    *diagOut = std::max(diag, 0.0);
+}
+
+void PressureSolver::_calculateMatrixRowOffDiagonals(GridIndex g, double offdiag[6], 
+                                                     int neighbours[6]) {
+    // Off-diagonal terms of _calculateMatrixRowCoefficients without the
+    // diagonal, which only depends on the grids and is computed once per solve
+    double factor = _deltaTime / (_dx * _dx);
+    int i = g.i;
+    int j = g.j;
+    int k = g.k;
 
-        // Z- neighbour
-        if (phiBack < 0.0) {
-            matrix->add(index, _GridToVectorIndex(i, j, k - 1), -(volBack / rhoBack) * factor);
-        } else {
-            double theta = phiBack / (phiCenter + eps);
-            theta = _clamp(theta, -_maxtheta, _maxtheta);
-            diag -= (volBack / rhoBack) * factor * theta;
+    for (int n = 0; n < 6; n++) {
+        offdiag[n] = 0.0;
+        neighbours[n] = -1;
+    }
+
+    double rhoCenter = _densityGrid->get(g);
+    if (_liquidSDF->get(i + 1, j, k) < 0.0) {
+        double rho = (rhoCenter + _densityGrid->get(std::min(i + 1, _isize - 1), j, k)) / 2.0;
+        offdiag[0] = -(_weightGrid->U(i + 1, j, k) / rho) * factor;
+        neighbours[0] = _GridToVectorIndex(i + 1, j, k);
+    }
+    if (_liquidSDF->get(i - 1, j, k) < 0.0) {
+        double rho = (rhoCenter + _densityGrid->get(std::max(i - 1, 0), j, k)) / 2.0;
+        offdiag[1] = -(_weightGrid->U(i, j, k) / rho) * factor;
+        neighbours[1] = _GridToVectorIndex(i - 1, j, k);
+    }
+    if (_liquidSDF->get(i, j + 1, k) < 0.0) {
+        double rho = (rhoCenter + _densityGrid->get(i, std::min(j + 1, _jsize - 1), k)) / 2.0;
+        offdiag[2] = -(_weightGrid->V(i, j + 1, k) / rho) * factor;
+        neighbours[2] = _GridToVectorIndex(i, j + 1, k);
+    }
+    if (_liquidSDF->get(i, j - 1, k) < 0.0) {
+        double rho = (rhoCenter + _densityGrid->get(i, std::max(j - 1, 0), k)) / 2.0;
+        offdiag[3] = -(_weightGrid->V(i, j, k) / rho) * factor;
+        neighbours[3] = _GridToVectorIndex(i, j - 1, k);
+    }
+    if (_liquidSDF->get(i, j, k + 1) < 0.0) {
+        double rho = (rhoCenter + _densityGrid->get(i, j, std::min(k + 1, _ksize - 1))) / 2.0;
+        offdiag[4] = -(_weightGrid->W(i, j, k + 1) / rho) * factor;
+        neighbours[4] = _GridToVectorIndex(i, j, k + 1);
+    }
+    if (_liquidSDF->get(i, j, k - 1) < 0.0) {
+        double rho = (rhoCenter + _densityGrid->get(i, j, std::max(k - 1, 0))) / 2.0;
+        offdiag[5] = -(_weightGrid->W(i, j, k) / rho) * factor;
+        neighbours[5] = _GridToVectorIndex(i, j, k - 1);
+    }
+}
+
+void PressureSolver::_calculateMatrixDiagonal(std::vector<double> &diag) {
+    diag.resize(_pressureCells.size());
+    ThreadUtils::parallelFor(0, (int)_pressureCells.size(), [&](int startidx, int endidx) {
+        double offdiag[6];
+        int neighbours[6];
+        for (int idx = startidx; idx < endidx; idx++) {
+            _calculateMatrixRowCoefficients(_pressureCells[idx], &(diag[idx]), offdiag, neighbours);
         }
+    });
+}
+
+void PressureSolver::_calculateMatrixCoefficients(SparseMatrixd &matrix) {
+    ThreadUtils::parallelFor(0, (int)_pressureCells.size(), [&](int startidx, int endidx) {
+        _calculateMatrixCoefficientsThread(startidx, endidx, &matrix);
+    });
+}
+
+void PressureSolver::_calculateMatrixCoefficientsThread(int startidx, int endidx,
+                                                        SparseMatrixd *matrix) {
+    double diag;
+    double offdiag[6];
+    int neighbours[6];
+    for (int idx = startidx; idx < endidx; idx++) {
+        GridIndex g = _pressureCells[idx];
+        int index = _GridToVectorIndex(g);
+        _calculateMatrixRowCoefficients(g, &diag, offdiag, neighbours);
 
-        diag = std::max(diag, 0.0);
+        for (int n = 0; n < 6; n++) {
+            matrix->add(index, neighbours[n], offdiag[n]);
+        }
         matrix->set(index, index, diag);
     }
 }
@@ -880,9 +980,38 @@ bool PressureSolver::_solveLinearSystem(SparseMatrixd &matrix, std::vector<doubl
         // PCG Solve
         PCGSolver<double> solver;
         solver.setSolverParameters(_pressureSolveTolerance, _maxCGIterations);
+
+        std::vector<GridIndex> multigridCells;
+        if (_preconditioner == PressureSolverPreconditioner::Multigrid) {
+            _pressureCells.getVector(multigridCells);
+            solver.enableMultigridPreconditioner(multigridCells);
+        } else if (_preconditioner == PressureSolverPreconditioner::ParallelMIC) {
+            solver.enableParallelMICPreconditioner();
+        }
+
         success = solver.solve(matrix, rhs, soln, estimatedError, numIterations);
     }
 
+    return _finishLinearSystemSolve(soln, success, numIterations, estimatedError);
+}
+
+bool PressureSolver::_solveLinearSystemMatrixFree(PressureOperator &matrix, std::vector<double> &rhs, 
+                                                  std::vector<double> &soln) {
+    double estimatedError = -1.0f;
+    int numIterations = 0;
+
+    // The PCG solver applies a Jacobi preconditioner to a LinearOperator
+    FLUIDSIM_ASSERT(_preconditioner == PressureSolverPreconditioner::Jacobi);
+
+    PCGSolver<double> solver;
+    solver.setSolverParameters(_pressureSolveTolerance, _maxCGIterations);
+    bool success = solver.solve(matrix, rhs, soln, estimatedError, numIterations);
+
+    return _finishLinearSystemSolve(soln, success, numIterations, estimatedError);
+}
+
+bool PressureSolver::_finishLinearSystemSolve(std::vector<double> &soln, bool success, 
+                                              int numIterations, double estimatedError) {
     _pressureGrid->fill(0.0f);
     for (size_t i = 0; i < _pressureCells.size(); i++) {
         GridIndex g = _pressureCells[i];
@@ -1030,18 +1159,9 @@ void PressureSolver::_applyPressureToVelocityFieldMT(FluidMaterialGrid &mgrid, i
         gridsize = _isize * _jsize * (_ksize + 1);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_applyPressureToVelocityFieldThread, this,
-                                 intervals[i], intervals[i + 1], &mgrid, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, (int)gridsize, [&](int startidx, int endidx) {
+        _applyPressureToVelocityFieldThread(startidx, endidx, &mgrid, dir);
+    });
 }
 
 void PressureSolver::_applyPressureToVelocityFieldThread(int startidx, int endidx, 
@@ -34,12 +34,13 @@ SOFTWARE.
 
 #pragma once
 
-#include "pcgsolver/sparsematrix.h"
+#include "pcgsolver/pcgsolver.h"
 #include "gridindexkeymap.h"
 #include "gridindexvector.h"
 #include "fluidmaterialgrid.h"
 #include "vmath.h"
 #include "fluidsimassert.h"
+#include "bufferarena.h"
 
 class MACVelocityField;
 struct ValidVelocityComponentGrid;
@@ -96,17 +97,26 @@ struct WeightGrid {
 };
 
 
+enum class PressureSolverPreconditioner : char { 
+    MIC         = 0x00, 
+    Multigrid   = 0x01,
+    ParallelMIC = 0x02,
+    Jacobi      = 0x03      // Matrix-free solver only
+};
+
 struct PressureSolverParameters {
     double cellwidth;
     double deltaTime;
     double tolerance;
     double acceptableTolerance;
     int maxIterations;
+    PressureSolverPreconditioner preconditioner = PressureSolverPreconditioner::MIC;
+    bool isMatrixFree = false;
     
     MACVelocityField *velocityFieldFluid;
     MACVelocityField *velocityFieldSolid;
     ValidVelocityComponentGrid *validVelocities;
-    Array3d<float> *liquidSDF;
+    ParticleLevelSet *liquidSDF;
     WeightGrid *weightGrid;
     Array3d<float> *pressureGrid;
     Array3d<float> *densityGrid;
@@ -114,6 +124,9 @@ struct PressureSolverParameters {
     bool isSurfaceTensionEnabled = false;
     double surfaceTensionConstant;
     Array3d<float> *curvatureGrid;
+
+    // Optional arena for recycling solver vectors between solves
+    BufferArena *bufferArena = nullptr;
 };
 
 /********************************************************************************
@@ -139,6 +152,24 @@ public:
 
 private:
 
+    // Pressure matrix that is not assembled. The diagonal is computed once per
+    // solve. Off-diagonal coefficients are computed from the liquid SDF, weight,
+    // and density grids each time the matrix is applied.
+    struct PressureOperator : public LinearOperator<double> {
+        PressureSolver *solver = nullptr;
+        std::vector<double> diag;
+
+        PressureOperator() {}
+        PressureOperator(PressureSolver *s) : solver(s) {}
+
+        virtual unsigned int size() const {
+            return (unsigned int)solver->_pressureCells.size();
+        }
+
+        virtual void multiply(const std::vector<double> &x, std::vector<double> &result) const;
+        virtual void getDiagonal(std::vector<double> &diag) const;
+    };
+
     inline int _GridToVectorIndex(GridIndex g) {
         return _keymap.find(g);
     }
@@ -183,11 +214,19 @@ private:
     void _calculateNegativeDivergenceVectorThread(int startidx, 
                                                   int endidx, std::vector<double> *rhs);
     double _getSurfaceTensionTerm(GridIndex g1, GridIndex g2);
+    void _calculateMatrixRowCoefficients(GridIndex g, double *diag, 
+                                         double offdiag[6], int neighbours[6]);
+    void _calculateMatrixRowOffDiagonals(GridIndex g, double offdiag[6], int neighbours[6]);
+    void _calculateMatrixDiagonal(std::vector<double> &diag);
     void _calculateMatrixCoefficients(SparseMatrixd &matrix);
     void _calculateMatrixCoefficientsThread(int startidx, int endidx,
                                             SparseMatrixd *matrix);
     bool _solveLinearSystem(SparseMatrixd &matrix, std::vector<double> &rhs, 
                             std::vector<double> &soln);
+    bool _solveLinearSystemMatrixFree(PressureOperator &matrix, std::vector<double> &rhs, 
+                                      std::vector<double> &soln);
+    bool _finishLinearSystemSolve(std::vector<double> &soln, bool success, 
+                                  int numIterations, double estimatedError);
 
     bool _solveLinearSystemJacobi(SparseMatrixd &matrix, std::vector<double> &b, 
                                   std::vector<double> &x, int *iterations, double *error);
@@ -206,6 +245,8 @@ private:
     double _pressureSolveTolerance = 1e-9;
     double _pressureSolveAcceptableTolerance = 1.0;
     int _maxCGIterations = 200;
+    PressureSolverPreconditioner _preconditioner = PressureSolverPreconditioner::MIC;
+    bool _isMatrixFree = false;
     double _maxtheta = 25;
     int _surfaceTensionClusterThreshold = 36;
     int _blockwidth = 4;
@@ -213,7 +254,7 @@ private:
     MACVelocityField *_vFieldFluid;
     MACVelocityField *_vFieldSolid;
     ValidVelocityComponentGrid *_validVelocities;
-    Array3d<float> *_liquidSDF;
+    ParticleLevelSet *_liquidSDF;
     WeightGrid *_weightGrid;
     Array3d<float> *_pressureGrid;
     Array3d<float> *_densityGrid;
@@ -222,6 +263,9 @@ private:
     double _surfaceTensionConstant;
     Array3d<float> *_curvatureGrid;
 
+    BufferArena *_bufferArena = nullptr;
+    BufferArena _localBufferArena;
+
     GridIndexVector _pressureCells;
     int _matSize = 0;
     GridIndexKeyMap _keymap;
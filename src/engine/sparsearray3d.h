@@ -0,0 +1,198 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+
+#pragma once
+
+#include <vector>
+#include <algorithm>
+
+#include "array3d.h"
+#include "grid3d.h"
+
+/*
+    SparseArray3d stores a grid as tiles of tilewidth^3 values. Tiles are
+    allocated on demand when a value that differs from the background value
+    is written. Unallocated tiles read as the background value, so memory
+    and traversal cost scale with the number of occupied tiles rather than
+    with the grid volume.
+
+    Writing to an unallocated tile may allocate and is not thread safe.
+    Concurrent reads, and concurrent writes to already allocated tiles,
+    are safe.
+*/
+template <class T>
+class SparseArray3d
+{
+public:
+    SparseArray3d() {
+    }
+
+    SparseArray3d(int i, int j, int k, int tilewidth, T backgroundValue) :
+                    width(i), height(j), depth(k), tilewidth(tilewidth) {
+        _tilesize = tilewidth * tilewidth * tilewidth;
+        _tileGrid = Array3d<int>((i + tilewidth - 1) / tilewidth,
+                                 (j + tilewidth - 1) / tilewidth,
+                                 (k + tilewidth - 1) / tilewidth, -1);
+        _backgroundValue = backgroundValue;
+    }
+
+    void fill(T value) {
+        _tileGrid.fill(-1);
+        _tileIndices.clear();
+        _tiledata.clear();
+        _backgroundValue = value;
+    }
+
+    T getBackgroundValue() {
+        return _backgroundValue;
+    }
+
+    T operator()(int i, int j, int k) {
+        return get(i, j, k);
+    }
+
+    T operator()(GridIndex g) {
+        return get(g.i, g.j, g.k);
+    }
+
+    T get(int i, int j, int k) {
+        if (!Grid3d::isGridIndexInRange(i, j, k, width, height, depth)) {
+            return _backgroundValue;
+        }
+
+        int id = _tileGrid(i / tilewidth, j / tilewidth, k / tilewidth);
+        if (id == -1) {
+            return _backgroundValue;
+        }
+
+        return _tiledata[_getDataOffset(id, i, j, k)];
+    }
+
+    T get(GridIndex g) {
+        return get(g.i, g.j, g.k);
+    }
+
+    void set(int i, int j, int k, T value) {
+        if (!Grid3d::isGridIndexInRange(i, j, k, width, height, depth)) {
+            return;
+        }
+
+        int *id = _tileGrid.getPointer(i / tilewidth, j / tilewidth, k / tilewidth);
+        if (*id == -1) {
+            if (value == _backgroundValue) {
+                return;
+            }
+            *id = _allocateTile(GridIndex(i / tilewidth, j / tilewidth, k / tilewidth));
+        }
+
+        _tiledata[_getDataOffset(*id, i, j, k)] = value;
+    }
+
+    void set(GridIndex g, T value) {
+        set(g.i, g.j, g.k, value);
+    }
+
+    bool isTileAllocated(int ti, int tj, int tk) {
+        return _tileGrid(ti, tj, tk) != -1;
+    }
+
+    bool isTileAllocated(GridIndex t) {
+        return isTileAllocated(t.i, t.j, t.k);
+    }
+
+    // Tile indices are returned in allocation order
+    void getAllocatedTiles(std::vector<GridIndex> &tiles) {
+        tiles.insert(tiles.end(), _tileIndices.begin(), _tileIndices.end());
+    }
+
+    int getNumAllocatedTiles() {
+        return (int)_tileIndices.size();
+    }
+
+    void getTileDimensions(int *i, int *j, int *k) {
+        _tileGrid.getGridDimensions(i, j, k);
+    }
+
+    void getGridDimensions(int *i, int *j, int *k) {
+        *i = width; *j = height; *k = depth;
+    }
+
+    // The grid is only reallocated if its dimensions do not match
+    void getDenseGrid(Array3d<T> &grid) {
+        if (grid.width == width && grid.height == height && grid.depth == depth) {
+            grid.fill(_backgroundValue);
+        } else {
+            grid = Array3d<T>(width, height, depth, _backgroundValue);
+        }
+        for (size_t tidx = 0; tidx < _tileIndices.size(); tidx++) {
+            GridIndex t = _tileIndices[tidx];
+            int id = _tileGrid(t);
+            int imax = std::min((t.i + 1) * tilewidth, width);
+            int jmax = std::min((t.j + 1) * tilewidth, height);
+            int kmax = std::min((t.k + 1) * tilewidth, depth);
+            for (int k = t.k * tilewidth; k < kmax; k++) {
+                for (int j = t.j * tilewidth; j < jmax; j++) {
+                    for (int i = t.i * tilewidth; i < imax; i++) {
+                        grid.set(i, j, k, _tiledata[_getDataOffset(id, i, j, k)]);
+                    }
+                }
+            }
+        }
+    }
+
+    size_t getMemoryUsage() {
+        return sizeof(T) * _tiledata.capacity() + 
+               sizeof(GridIndex) * _tileIndices.capacity() +
+               sizeof(int) * (size_t)_tileGrid.getNumElements();
+    }
+
+    int width = 0;
+    int height = 0;
+    int depth = 0;
+    int tilewidth = 1;
+
+private:
+
+    int _allocateTile(GridIndex t) {
+        int id = (int)_tileIndices.size();
+        _tileIndices.push_back(t);
+        _tiledata.resize(_tiledata.size() + _tilesize, _backgroundValue);
+        return id;
+    }
+
+    inline int _getDataOffset(int tileid, int i, int j, int k) {
+        int ti = i % tilewidth;
+        int tj = j % tilewidth;
+        int tk = k % tilewidth;
+        return _tilesize * tileid + ti + tilewidth * (tj + tilewidth * tk);
+    }
+
+    int _tilesize = 1;
+    T _backgroundValue = T();
+
+    Array3d<int> _tileGrid;
+    std::vector<GridIndex> _tileIndices;
+    std::vector<T> _tiledata;
+};
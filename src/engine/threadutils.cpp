@@ -25,6 +25,8 @@ SOFTWARE.
 #include "threadutils.h"
 
 #include <cmath>
+#include <chrono>
+#include <algorithm>
 
 #include "fluidsimassert.h"
 
@@ -70,4 +72,369 @@ std::vector<int> ThreadUtils::splitRangeIntoIntervals(int rangeBegin, int rangeE
     }
 
     return intervals;
-}
\ No newline at end of file
+}
+/********************************************************************************
+	ThreadPool
+********************************************************************************/
+
+namespace ThreadUtils {
+	thread_local ThreadPool *_currentThreadPool = nullptr;
+	thread_local int _currentWorkerID = -1;
+
+	std::mutex _threadPoolMutex;
+
+	// Allocated once and never deleted so that worker threads are not joined 
+	// during static destruction when the library is unloaded
+	std::shared_ptr<ThreadPool> *_threadPool = nullptr;
+
+	// Number of parallelFor intervals per thread
+	int _intervalsPerThread = 4;
+}
+
+ThreadUtils::ThreadPool::ThreadPool(int numWorkers) : _numQueuedTasks(0), 
+													  _numActiveTasks(0) {
+	numWorkers = std::max(numWorkers, 0);
+	for (int i = 0; i < numWorkers + 1; i++) {
+		_queues.push_back(std::unique_ptr<TaskQueue>(new TaskQueue()));
+	}
+
+	for (int i = 0; i < numWorkers; i++) {
+		_workers.push_back(std::thread(&ThreadPool::_workerThread, this, i));
+	}
+}
+
+ThreadUtils::ThreadPool::~ThreadPool() {
+	{
+		std::lock_guard<std::mutex> lock(_sleepMutex);
+		_isStopped = true;
+	}
+	_sleepCondition.notify_all();
+
+	for (size_t i = 0; i < _workers.size(); i++) {
+		_workers[i].join();
+	}
+}
+
+int ThreadUtils::ThreadPool::getNumWorkers() {
+	return (int)_workers.size();
+}
+
+bool ThreadUtils::ThreadPool::isIdle() {
+	return _numQueuedTasks == 0 && _numActiveTasks == 0;
+}
+
+void ThreadUtils::ThreadPool::submit(std::function<void()> task) {
+	int queueid = _getCurrentQueueID();
+	{
+		std::lock_guard<std::mutex> lock(_queues[queueid]->mutex);
+		_queues[queueid]->tasks.push_back(std::move(task));
+	}
+
+	{
+		std::lock_guard<std::mutex> lock(_sleepMutex);
+		_numQueuedTasks++;
+	}
+	_sleepCondition.notify_one();
+}
+
+bool ThreadUtils::ThreadPool::runPendingTask() {
+	std::function<void()> task;
+	if (!_getTask(_getCurrentQueueID(), task)) {
+		return false;
+	}
+
+	_runTask(task);
+	return true;
+}
+
+int ThreadUtils::ThreadPool::_getCurrentQueueID() {
+	if (_currentThreadPool == this && _currentWorkerID >= 0) {
+		return _currentWorkerID;
+	}
+	return (int)_queues.size() - 1;
+}
+
+bool ThreadUtils::ThreadPool::_getTask(int queueid, std::function<void()> &task) {
+	if (_numQueuedTasks == 0) {
+		return false;
+	}
+
+	// Newest task from own queue
+	{
+		TaskQueue *queue = _queues[queueid].get();
+		std::lock_guard<std::mutex> lock(queue->mutex);
+		if (!queue->tasks.empty()) {
+			task = std::move(queue->tasks.back());
+			queue->tasks.pop_back();
+			_numActiveTasks++;
+			_numQueuedTasks--;
+			return true;
+		}
+	}
+
+	// Oldest task from another queue, starting from the next queue so that 
+	// thieves spread over the queues
+	int numQueues = (int)_queues.size();
+	for (int i = 1; i < numQueues; i++) {
+		TaskQueue *queue = _queues[(queueid + i) % numQueues].get();
+		std::lock_guard<std::mutex> lock(queue->mutex);
+		if (!queue->tasks.empty()) {
+			task = std::move(queue->tasks.front());
+			queue->tasks.pop_front();
+			_numActiveTasks++;
+			_numQueuedTasks--;
+			return true;
+		}
+	}
+
+	return false;
+}
+
+void ThreadUtils::ThreadPool::_runTask(std::function<void()> &task) {
+	task();
+	_numActiveTasks--;
+}
+
+void ThreadUtils::ThreadPool::_workerThread(int workerid) {
+	_currentThreadPool = this;
+	_currentWorkerID = workerid;
+
+	std::function<void()> task;
+	for (;;) {
+		if (_getTask(workerid, task)) {
+			_runTask(task);
+			task = nullptr;
+			continue;
+		}
+
+		std::unique_lock<std::mutex> lock(_sleepMutex);
+		_sleepCondition.wait(lock, [this]() { 
+			return _isStopped || _numQueuedTasks > 0; 
+		});
+
+		if (_isStopped && _numQueuedTasks == 0) {
+			return;
+		}
+	}
+}
+
+std::shared_ptr<ThreadUtils::ThreadPool> ThreadUtils::getThreadPool() {
+	std::lock_guard<std::mutex> lock(_threadPoolMutex);
+
+	// The calling thread also runs tasks while waiting on a TaskGroup
+	int numWorkers = getMaxThreadCount() - 1;
+	if (_threadPool == nullptr) {
+		_threadPool = new std::shared_ptr<ThreadPool>(new ThreadPool(numWorkers));
+	} else if ((*_threadPool)->getNumWorkers() != numWorkers && (*_threadPool)->isIdle()) {
+		// Thread count has changed. The previous pool is released once it is
+		// no longer referenced by a TaskGroup.
+		*_threadPool = std::shared_ptr<ThreadPool>(new ThreadPool(numWorkers));
+	}
+
+	return *_threadPool;
+}
+
+/********************************************************************************
+	TaskGroup
+********************************************************************************/
+
+ThreadUtils::TaskGroup::TaskGroup() : _numPendingTasks(0) {
+	_pool = getThreadPool();
+}
+
+ThreadUtils::TaskGroup::~TaskGroup() {
+	// Tasks reference this group and must complete before it is destroyed
+	_waitForTasks();
+}
+
+void ThreadUtils::TaskGroup::run(std::function<void()> task) {
+	_numPendingTasks++;
+	_pool->submit([this, task]() {
+		try {
+			task();
+		} catch (...) {
+			std::lock_guard<std::mutex> lock(_mutex);
+			if (!_exception) {
+				_exception = std::current_exception();
+			}
+		}
+
+		// Notify while holding the lock so that the group cannot be destroyed
+		// before the notification has been sent
+		std::lock_guard<std::mutex> lock(_mutex);
+		_numPendingTasks--;
+		if (_numPendingTasks == 0) {
+			_condition.notify_all();
+		}
+	});
+}
+
+void ThreadUtils::TaskGroup::wait() {
+	_waitForTasks();
+
+	std::exception_ptr exception;
+	{
+		std::lock_guard<std::mutex> lock(_mutex);
+		exception = _exception;
+		_exception = nullptr;
+	}
+
+	if (exception) {
+		std::rethrow_exception(exception);
+	}
+}
+
+void ThreadUtils::TaskGroup::_waitForTasks() {
+	for (;;) {
+		while (_numPendingTasks > 0 && _pool->runPendingTask()) {}
+
+		std::unique_lock<std::mutex> lock(_mutex);
+		if (_numPendingTasks == 0) {
+			return;
+		}
+
+		// Remaining tasks are running on other threads. Wake up periodically
+		// to help with tasks that are queued by nested task groups.
+		_condition.wait_for(lock, std::chrono::milliseconds(1));
+	}
+}
+
+/********************************************************************************
+	TaskGraph
+********************************************************************************/
+
+ThreadUtils::TaskGraph::TaskGraph() {
+}
+
+ThreadUtils::TaskGraph::~TaskGraph() {
+}
+
+int ThreadUtils::TaskGraph::addTask(std::string name, 
+									std::function<void()> task, 
+									std::vector<int> dependencies) {
+	int taskid = (int)_tasks.size();
+	std::unique_ptr<Task> t(new Task());
+	t->info.name = name;
+	t->function = task;
+	t->numPendingDependencies = 0;
+
+	for (size_t i = 0; i < dependencies.size(); i++) {
+		int depid = dependencies[i];
+		if (depid < 0) {
+			continue;
+		}
+
+		FLUIDSIM_ASSERT(depid < taskid);
+		t->info.dependencies.push_back(depid);
+		_tasks[depid]->dependents.push_back(taskid);
+	}
+
+	_tasks.push_back(std::move(t));
+
+	return taskid;
+}
+
+void ThreadUtils::TaskGraph::run() {
+	for (size_t i = 0; i < _tasks.size(); i++) {
+		_tasks[i]->numPendingDependencies = (int)_tasks[i]->info.dependencies.size();
+		_tasks[i]->info.startTime = 0.0;
+		_tasks[i]->info.endTime = 0.0;
+	}
+
+	_runStartTime = std::chrono::steady_clock::now();
+
+	TaskGroup group;
+	for (size_t i = 0; i < _tasks.size(); i++) {
+		if (_tasks[i]->info.dependencies.empty()) {
+			int taskid = (int)i;
+			group.run([this, taskid, &group]() {
+				_runTask(taskid, &group);
+			});
+		}
+	}
+
+	group.wait();
+	_runTime = _getElapsedTime();
+}
+
+void ThreadUtils::TaskGraph::clear() {
+	_tasks.clear();
+	_runTime = 0.0;
+}
+
+int ThreadUtils::TaskGraph::getNumTasks() {
+	return (int)_tasks.size();
+}
+
+ThreadUtils::TaskGraph::TaskInfo ThreadUtils::TaskGraph::getTaskInfo(int taskid) {
+	FLUIDSIM_ASSERT(taskid >= 0 && taskid < (int)_tasks.size());
+	return _tasks[taskid]->info;
+}
+
+std::vector<ThreadUtils::TaskGraph::TaskInfo> ThreadUtils::TaskGraph::getTaskInfo() {
+	std::vector<TaskInfo> info;
+	info.reserve(_tasks.size());
+	for (size_t i = 0; i < _tasks.size(); i++) {
+		info.push_back(_tasks[i]->info);
+	}
+	return info;
+}
+
+double ThreadUtils::TaskGraph::getRunTime() {
+	return _runTime;
+}
+
+void ThreadUtils::TaskGraph::_runTask(int taskid, TaskGroup *group) {
+	Task *task = _tasks[taskid].get();
+	task->info.startTime = _getElapsedTime();
+	task->function();
+	task->info.endTime = _getElapsedTime();
+
+	// Dependents are added to the group before this task completes so that
+	// the group cannot finish waiting while tasks remain to be scheduled
+	for (size_t i = 0; i < task->dependents.size(); i++) {
+		int depid = task->dependents[i];
+		if (--(_tasks[depid]->numPendingDependencies) == 0) {
+			group->run([this, depid, group]() {
+				_runTask(depid, group);
+			});
+		}
+	}
+}
+
+double ThreadUtils::TaskGraph::_getElapsedTime() {
+	std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - _runStartTime;
+	return elapsed.count();
+}
+
+void ThreadUtils::parallelFor(int rangeBegin, int rangeEnd, 
+							  const std::function<void(int, int)> &func,
+							  int minIntervalSize) {
+	int rangeSize = rangeEnd - rangeBegin;
+	if (rangeSize <= 0) {
+		return;
+	}
+
+	minIntervalSize = std::max(minIntervalSize, 1);
+	int numthreads = getMaxThreadCount();
+	int maxIntervals = (int)std::ceil((double)rangeSize / (double)minIntervalSize);
+	int numIntervals = std::min(numthreads * _intervalsPerThread, maxIntervals);
+	if (numthreads <= 1 || numIntervals <= 1) {
+		func(rangeBegin, rangeEnd);
+		return;
+	}
+
+	std::vector<int> intervals = splitRangeIntoIntervals(rangeBegin, rangeEnd, numIntervals);
+	TaskGroup group;
+	for (int i = 1; i < numIntervals; i++) {
+		int startidx = intervals[i];
+		int endidx = intervals[i + 1];
+		group.run([&func, startidx, endidx]() {
+			func(startidx, endidx);
+		});
+	}
+
+	// The calling thread processes the first interval
+	func(intervals[0], intervals[1]);
+	group.wait();
+}
@@ -36,17 +36,153 @@ SOFTWARE.
 #endif
 
 #include <vector>
+#include <deque>
+#include <string>
+#include <chrono>
+#include <memory>
+#include <atomic>
+#include <exception>
 #include <functional>
 
 namespace ThreadUtils {
 
-    extern int _maxThreadCount;
-    extern bool _isMaxThreadCountInitialized;
+	extern int _maxThreadCount;
+	extern bool _isMaxThreadCountInitialized;
 
-    extern void _initializeMaxThreadCount();
-    extern int getMaxThreadCount();
-    extern void setMaxThreadCount(int n);
-    extern std::vector<int> splitRangeIntoIntervals(int rangeBegin, 
-                                                    int rangeEnd, 
-                                                    int numIntervals);
+	extern void _initializeMaxThreadCount();
+	extern int getMaxThreadCount();
+	extern void setMaxThreadCount(int n);
+	extern std::vector<int> splitRangeIntoIntervals(int rangeBegin, 
+													int rangeEnd, 
+													int numIntervals);
+
+	/*
+		Persistent pool of worker threads with a task queue per worker.
+		A worker takes tasks from the back of its own queue and steals tasks 
+		from the front of other queues when its own queue is empty. Tasks 
+		submitted from threads outside of the pool are placed in a shared 
+		queue that all workers steal from.
+
+		The pool is normally used through TaskGroup and parallelFor.
+	*/
+	class ThreadPool {
+	public:
+		ThreadPool(int numWorkers);
+		~ThreadPool();
+
+		int getNumWorkers();
+		bool isIdle();
+		void submit(std::function<void()> task);
+
+		// Run a single queued task on the calling thread. Returns false if
+		// there were no queued tasks.
+		bool runPendingTask();
+
+	private:
+
+		struct TaskQueue {
+			std::mutex mutex;
+			std::deque<std::function<void()> > tasks;
+		};
+
+		void _workerThread(int workerid);
+		bool _getTask(int queueid, std::function<void()> &task);
+		void _runTask(std::function<void()> &task);
+		int _getCurrentQueueID();
+
+		std::vector<std::unique_ptr<TaskQueue> > _queues;
+		std::vector<std::thread> _workers;
+		std::atomic<int> _numQueuedTasks;
+		std::atomic<int> _numActiveTasks;
+		std::mutex _sleepMutex;
+		std::condition_variable _sleepCondition;
+		bool _isStopped = false;
+	};
+
+	extern std::shared_ptr<ThreadPool> getThreadPool();
+
+	/*
+		Group of tasks that run on the thread pool. wait() blocks until all 
+		tasks in the group have completed, running queued tasks on the calling
+		thread in the meantime, so groups may be nested within tasks. If a task
+		throws, the first exception is rethrown by wait().
+	*/
+	class TaskGroup {
+	public:
+		TaskGroup();
+		~TaskGroup();
+
+		void run(std::function<void()> task);
+		void wait();
+
+	private:
+		void _waitForTasks();
+
+		std::shared_ptr<ThreadPool> _pool;
+		std::atomic<int> _numPendingTasks;
+		std::mutex _mutex;
+		std::condition_variable _condition;
+		std::exception_ptr _exception;
+	};
+
+	/*
+		Directed acyclic graph of named tasks that run on the thread pool. A
+		task is started once all of its dependencies have completed, so tasks
+		that do not depend on each other may run concurrently. Dependencies 
+		must refer to tasks that were added earlier, which keeps the graph 
+		acyclic. Negative dependency ids are ignored so that optional tasks 
+		can be referred to without checking whether they were added.
+
+		The start and end time of each task, measured from the start of run(),
+		are recorded for profiling.
+	*/
+	class TaskGraph {
+	public:
+		struct TaskInfo {
+			std::string name;
+			std::vector<int> dependencies;
+			double startTime = 0.0;
+			double endTime = 0.0;
+		};
+
+		TaskGraph();
+		~TaskGraph();
+
+		int addTask(std::string name, 
+					std::function<void()> task, 
+					std::vector<int> dependencies = std::vector<int>());
+		void run();
+		void clear();
+
+		int getNumTasks();
+		TaskInfo getTaskInfo(int taskid);
+		std::vector<TaskInfo> getTaskInfo();
+		double getRunTime();
+
+	private:
+
+		struct Task {
+			TaskInfo info;
+			std::function<void()> function;
+			std::vector<int> dependents;
+			std::atomic<int> numPendingDependencies;
+		};
+
+		void _runTask(int taskid, TaskGroup *group);
+		double _getElapsedTime();
+
+		std::vector<std::unique_ptr<Task> > _tasks;
+		std::chrono::steady_clock::time_point _runStartTime;
+		double _runTime = 0.0;
+	};
+
+	/*
+		Split [rangeBegin, rangeEnd) into intervals and call func(startidx, endidx)
+		for each interval on the thread pool. The range is split into more
+		intervals than threads so that uneven work is balanced by work 
+		stealing. Intervals contain at least minIntervalSize elements.
+	*/
+	extern void parallelFor(int rangeBegin, int rangeEnd, 
+							const std::function<void(int, int)> &func,
+							int minIntervalSize = 1);
 }
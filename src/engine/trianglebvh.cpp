@@ -0,0 +1,277 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#include "trianglebvh.h"
+
+#include <algorithm>
+#include <limits>
+
+#include "triangle.h"
+#include "collision.h"
+
+TriangleBVH::TriangleBVH() {
+}
+
+TriangleBVH::~TriangleBVH() {
+}
+
+void TriangleBVH::build(std::vector<vmath::vec3> &vertices, 
+                        std::vector<Triangle> &triangles, 
+                        vmath::vec3 offset) {
+    clear();
+    if (triangles.empty()) {
+        return;
+    }
+
+    int numTriangles = (int)triangles.size();
+    _triangleIndices = std::vector<int>(numTriangles);
+    _triangleCentroids = std::vector<vmath::vec3>(numTriangles);
+    for (int i = 0; i < numTriangles; i++) {
+        Triangle t = triangles[i];
+        _triangleIndices[i] = i;
+        _triangleCentroids[i] = (vertices[t.tri[0]] + vertices[t.tri[1]] + vertices[t.tri[2]]) / 3.0f - offset;
+    }
+
+    _nodes.reserve(2 * numTriangles / _maxTrianglesPerLeaf + 1);
+    _nodes.push_back(Node());
+
+    std::vector<BuildItem> stack;
+    BuildItem root;
+    root.node = 0;
+    root.start = 0;
+    root.end = numTriangles;
+    stack.push_back(root);
+
+    while (!stack.empty()) {
+        BuildItem item = stack.back();
+        stack.pop_back();
+
+        _initializeNodeBounds(_nodes[item.node], item.start, item.end);
+        int count = item.end - item.start;
+        if (count <= _maxTrianglesPerLeaf) {
+            _nodes[item.node].start = item.start;
+            _nodes[item.node].count = count;
+            continue;
+        }
+
+        // Median split along the longest axis of the centroid bounds
+        int axis = _getSplitAxis(item.start, item.end);
+        int mid = item.start + count / 2;
+        std::vector<vmath::vec3> *centroids = &_triangleCentroids;
+        std::nth_element(
+            _triangleIndices.begin() + item.start, 
+            _triangleIndices.begin() + mid, 
+            _triangleIndices.begin() + item.end,
+            [centroids, axis](int a, int b) {
+                return centroids->at(a)[axis] < centroids->at(b)[axis];
+            }
+        );
+
+        int left = (int)_nodes.size();
+        _nodes[item.node].left = left;
+        _nodes.push_back(Node());
+        _nodes.push_back(Node());
+
+        BuildItem leftItem, rightItem;
+        leftItem.node = left;
+        leftItem.start = item.start;
+        leftItem.end = mid;
+        rightItem.node = left + 1;
+        rightItem.start = mid;
+        rightItem.end = item.end;
+        stack.push_back(leftItem);
+        stack.push_back(rightItem);
+    }
+
+    // Triangle vertices are stored in leaf order so that leaf tests read 
+    // contiguous memory
+    _triangleVertices = std::vector<vmath::vec3>(3 * numTriangles);
+    for (int i = 0; i < numTriangles; i++) {
+        Triangle t = triangles[_triangleIndices[i]];
+        _triangleVertices[3 * i + 0] = vertices[t.tri[0]] - offset;
+        _triangleVertices[3 * i + 1] = vertices[t.tri[1]] - offset;
+        _triangleVertices[3 * i + 2] = vertices[t.tri[2]] - offset;
+    }
+
+    for (size_t i = 0; i < _nodes.size(); i++) {
+        Node *n = &(_nodes[i]);
+        if (n->count == 0) {
+            continue;
+        }
+
+        vmath::vec3 minp = _triangleVertices[3 * n->start];
+        vmath::vec3 maxp = minp;
+        for (int vidx = 3 * n->start; vidx < 3 * (n->start + n->count); vidx++) {
+            vmath::vec3 v = _triangleVertices[vidx];
+            minp = vmath::vec3(fmin(minp.x, v.x), fmin(minp.y, v.y), fmin(minp.z, v.z));
+            maxp = vmath::vec3(fmax(maxp.x, v.x), fmax(maxp.y, v.y), fmax(maxp.z, v.z));
+        }
+        n->minp = minp;
+        n->maxp = maxp;
+    }
+
+    // Interior bounds are refit bottom up from the triangle bounds. Children 
+    // are always stored after their parent.
+    for (int i = (int)_nodes.size() - 1; i >= 0; i--) {
+        Node *n = &(_nodes[i]);
+        if (n->count > 0) {
+            continue;
+        }
+
+        Node *a = &(_nodes[n->left]);
+        Node *b = &(_nodes[n->left + 1]);
+        n->minp = vmath::vec3(fmin(a->minp.x, b->minp.x), 
+                              fmin(a->minp.y, b->minp.y), 
+                              fmin(a->minp.z, b->minp.z));
+        n->maxp = vmath::vec3(fmax(a->maxp.x, b->maxp.x), 
+                              fmax(a->maxp.y, b->maxp.y), 
+                              fmax(a->maxp.z, b->maxp.z));
+    }
+
+    _triangleCentroids.clear();
+    _triangleCentroids.shrink_to_fit();
+}
+
+void TriangleBVH::clear() {
+    _nodes.clear();
+    _triangleIndices.clear();
+    _triangleVertices.clear();
+    _triangleCentroids.clear();
+}
+
+bool TriangleBVH::isEmpty() {
+    return _nodes.empty();
+}
+
+int TriangleBVH::getNumTriangles() {
+    return (int)_triangleIndices.size();
+}
+
+int TriangleBVH::getNumNodes() {
+    return (int)_nodes.size();
+}
+
+int TriangleBVH::getClosestTriangle(vmath::vec3 p, float maxDistance, float *distance) {
+    *distance = maxDistance;
+    if (_nodes.empty()) {
+        return -1;
+    }
+
+    int closestIndex = -1;
+    float closestDistance = maxDistance;
+    float closestDistanceSquared = maxDistance * maxDistance;
+
+    // Median splits keep the tree depth near log2 of the leaf count, and at
+    // most one sibling is pending per level
+    int stack[64];
+    int stackSize = 0;
+    stack[stackSize++] = 0;
+    while (stackSize > 0) {
+        Node *n = &(_nodes[stack[--stackSize]]);
+        if (_pointToBoxDistanceSquared(p, *n) >= closestDistanceSquared) {
+            continue;
+        }
+
+        if (n->count > 0) {
+            for (int i = n->start; i < n->start + n->count; i++) {
+                float d = _pointToTriangleDistance(p, i);
+                if (d < closestDistance) {
+                    closestDistance = d;
+                    closestDistanceSquared = d * d;
+                    closestIndex = i;
+                }
+            }
+            continue;
+        }
+
+        // The nearer child is pushed last so that it is visited first and 
+        // tightens the search radius for its sibling
+        int a = n->left;
+        int b = n->left + 1;
+        float da = _pointToBoxDistanceSquared(p, _nodes[a]);
+        float db = _pointToBoxDistanceSquared(p, _nodes[b]);
+        if (da < db) {
+            std::swap(a, b);
+            std::swap(da, db);
+        }
+
+        if (da < closestDistanceSquared) {
+            stack[stackSize++] = a;
+        }
+        if (db < closestDistanceSquared) {
+            stack[stackSize++] = b;
+        }
+    }
+
+    if (closestIndex == -1) {
+        return -1;
+    }
+
+    *distance = closestDistance;
+    return _triangleIndices[closestIndex];
+}
+
+void TriangleBVH::_initializeNodeBounds(Node &node, int start, int end) {
+    vmath::vec3 minp = _triangleCentroids[_triangleIndices[start]];
+    vmath::vec3 maxp = minp;
+    for (int i = start + 1; i < end; i++) {
+        vmath::vec3 c = _triangleCentroids[_triangleIndices[i]];
+        minp = vmath::vec3(fmin(minp.x, c.x), fmin(minp.y, c.y), fmin(minp.z, c.z));
+        maxp = vmath::vec3(fmax(maxp.x, c.x), fmax(maxp.y, c.y), fmax(maxp.z, c.z));
+    }
+
+    node.minp = minp;
+    node.maxp = maxp;
+}
+
+int TriangleBVH::_getSplitAxis(int start, int end) {
+    Node bounds;
+    _initializeNodeBounds(bounds, start, end);
+    vmath::vec3 extents = bounds.maxp - bounds.minp;
+
+    int axis = 0;
+    if (extents.y > extents.x && extents.y >= extents.z) {
+        axis = 1;
+    } else if (extents.z > extents.x && extents.z > extents.y) {
+        axis = 2;
+    }
+    return axis;
+}
+
+float TriangleBVH::_pointToBoxDistanceSquared(vmath::vec3 &p, Node &node) {
+    float dx = fmax(fmax(node.minp.x - p.x, 0.0f), p.x - node.maxp.x);
+    float dy = fmax(fmax(node.minp.y - p.y, 0.0f), p.y - node.maxp.y);
+    float dz = fmax(fmax(node.minp.z - p.z, 0.0f), p.z - node.maxp.z);
+    return dx * dx + dy * dy + dz * dz;
+}
+
+float TriangleBVH::_pointToTriangleDistance(vmath::vec3 &p, int sortedIndex) {
+    vmath::vec3 closest = Collision::findClosestPointOnTriangle(
+        p, 
+        _triangleVertices[3 * sortedIndex + 0], 
+        _triangleVertices[3 * sortedIndex + 1], 
+        _triangleVertices[3 * sortedIndex + 2]
+    );
+    return vmath::length(p - closest);
+}
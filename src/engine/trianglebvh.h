@@ -0,0 +1,86 @@
+/*
+MIT License
+
+Copyright (C) 2025 Ryan L. Guy & Dennis Fassbaender
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#pragma once
+
+#include <vector>
+
+#include "vmath.h"
+
+struct Triangle;
+
+/*
+    Bounding volume hierarchy over the triangles of a mesh. Used to find the
+    closest triangle to a point without testing every triangle, which keeps
+    the cost of distance queries near logarithmic in the triangle count.
+*/
+class TriangleBVH
+{
+public:
+    TriangleBVH();
+    ~TriangleBVH();
+
+    void build(std::vector<vmath::vec3> &vertices, 
+               std::vector<Triangle> &triangles, 
+               vmath::vec3 offset = vmath::vec3());
+    void clear();
+    bool isEmpty();
+    int getNumTriangles();
+    int getNumNodes();
+
+    /*
+        Returns the index of the closest triangle to p, or -1 if there are no
+        triangles closer than maxDistance. The distance to the closest 
+        triangle is stored in distance.
+    */
+    int getClosestTriangle(vmath::vec3 p, float maxDistance, float *distance);
+
+private:
+
+    struct Node {
+        vmath::vec3 minp;
+        vmath::vec3 maxp;
+        int left = -1;          // index of the left child for interior nodes
+        int start = 0;          // first sorted triangle for leaf nodes
+        int count = 0;          // number of triangles, 0 for interior nodes
+    };
+
+    struct BuildItem {
+        int node;
+        int start;
+        int end;
+    };
+
+    void _initializeNodeBounds(Node &node, int start, int end);
+    int _getSplitAxis(int start, int end);
+    float _pointToBoxDistanceSquared(vmath::vec3 &p, Node &node);
+    float _pointToTriangleDistance(vmath::vec3 &p, int sortedIndex);
+
+    std::vector<Node> _nodes;
+    std::vector<int> _triangleIndices;
+    std::vector<vmath::vec3> _triangleVertices;
+    std::vector<vmath::vec3> _triangleCentroids;
+
+    int _maxTrianglesPerLeaf = 4;
+};
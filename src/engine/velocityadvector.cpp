@@ -48,6 +48,7 @@ void VelocityAdvector::_initializeParameters(VelocityAdvectorParameters params)
     _validVelocities = params.validVelocities;
     _particleRadius = params.particleRadius;
     _velocityTransferMethod = params.velocityTransferMethod;
+    _bufferArena = params.bufferArena != nullptr ? params.bufferArena : &_localBufferArena;
     
     _dx = _vfield->getGridCellSize();
     _chunkdx = _dx * _chunkWidth;
@@ -59,7 +60,21 @@ void VelocityAdvector::_initializeParameters(VelocityAdvectorParameters params)
     _points = *positions;
     _velocities = *velocities;
 
-    if (_isAPIC()) {
+    if (_isAPIC() && _particles->getAttribute("AFFINEX").type == AttributeDataType::VECTOR3HALF) {
+        std::vector<HalfVector3> *affineX, *affineY, *affineZ;
+        _particles->getAttributeValues("AFFINEX", affineX);
+        _particles->getAttributeValues("AFFINEY", affineY);
+        _particles->getAttributeValues("AFFINEZ", affineZ);
+
+        _affineX.resize(affineX->size());
+        _affineY.resize(affineY->size());
+        _affineZ.resize(affineZ->size());
+        for (size_t i = 0; i < affineX->size(); i++) {
+            _affineX[i] = affineX->at(i).toVec3();
+            _affineY[i] = affineY->at(i).toVec3();
+            _affineZ[i] = affineZ->at(i).toVec3();
+        }
+    } else if (_isAPIC()) {
         std::vector<vmath::vec3> *affineX, *affineY, *affineZ;
         _particles->getAttributeValues("AFFINEX", affineX);
         _particles->getAttributeValues("AFFINEY", affineY);
@@ -172,6 +187,12 @@ void VelocityAdvector::_advectGrid(Direction dir) {
         computeBlockQueue.notifyFinished();
         producerThreads[i].join();
     }
+
+    std::vector<ScalarData> blockStorage;
+    blockphi.swapData(blockStorage);
+    _bufferArena->release(blockStorage);
+    _bufferArena->release(sortedParticleData);
+    _bufferArena->release(sortedAffineData);
 }
 
 vmath::vec3 VelocityAdvector::_getDirectionOffset(Direction dir) {
@@ -232,8 +253,12 @@ void VelocityAdvector::_initializeBlockGrid(BlockArray3d<ScalarData> &blockphi,
         }
     }
 
+    std::vector<ScalarData> blockStorage;
+    size_t blocksize = _chunkWidth * _chunkWidth * _chunkWidth;
+    _bufferArena->acquire(params.activeblocks.size() * blocksize, blockStorage);
+
     ScalarData emptyData;
-    blockphi = BlockArray3d<ScalarData>(params);
+    blockphi = BlockArray3d<ScalarData>(params, blockStorage);
     blockphi.fill(emptyData);
 }
 
@@ -376,7 +401,8 @@ void VelocityAdvector::_sortParticlesIntoBlocks(ParticleGridCountData &countdata
     int totalParticleCount = currentIndex;
 
     vmath::vec3 offset = _getDirectionOffset(dir);
-    sortedParticleData = std::vector<PointData>(totalParticleCount);
+    _bufferArena->acquire(totalParticleCount, sortedParticleData);
+    sortedParticleData.resize(totalParticleCount);
 
     if (_isFLIP()) {
 
@@ -415,7 +441,8 @@ void VelocityAdvector::_sortParticlesIntoBlocks(ParticleGridCountData &countdata
 
     } else if (_isAPIC()) {
 
-        sortedAffineData = std::vector<AffineData>(totalParticleCount);
+        _bufferArena->acquire(totalParticleCount, sortedAffineData);
+        sortedAffineData.resize(totalParticleCount);
         for (int tidx = 0; tidx < countdata.numthreads; tidx++) {
             GridCountData *countData = &(countdata.threadGridCountData[tidx]);
 
@@ -58,6 +58,7 @@ USE OR OTHER DEALINGS IN THE SOFTWARE.
 #include "boundedbuffer.h"
 #include "macvelocityfield.h"
 #include "particlesystem.h"
+#include "bufferarena.h"
 
 
 enum class VelocityAdvectorTransferMethod : char { 
@@ -71,6 +72,9 @@ struct VelocityAdvectorParameters {
     ValidVelocityComponentGrid *validVelocities;
     double particleRadius = 1.0;
     VelocityAdvectorTransferMethod velocityTransferMethod = VelocityAdvectorTransferMethod::FLIP;
+
+    // Optional arena for recycling compute block grids between advections
+    BufferArena *bufferArena = nullptr;
 };
 
 
@@ -174,6 +178,8 @@ private:
     std::vector<vmath::vec3> _points;
     std::vector<vmath::vec3> _velocities;
     VelocityAdvectorTransferMethod _velocityTransferMethod = VelocityAdvectorTransferMethod::FLIP;
+    BufferArena *_bufferArena = nullptr;
+    BufferArena _localBufferArena;
 
     // APIC Data
     std::vector<vmath::vec3> _affineX;
@@ -62,20 +62,31 @@ bool ViscositySolver::applyViscosityToVelocityField(ViscositySolverParameters pa
         return true;
     }
 
-    SparseMatrixf matrix(matsize, 15);
-    std::vector<float> rhs(matsize, 0);
-    std::vector<float> soln(matsize, 0);
-
-    _initializeLinearSystem(matrix, rhs);
+    std::vector<float> rhs, soln;
+    _bufferArena->acquire(matsize, rhs);
+    _bufferArena->acquire(matsize, soln);
+    rhs.assign(matsize, 0);
+    soln.assign(matsize, 0);
+
+    bool success = false;
+    if (_isMatrixFree) {
+        ViscosityStencil stencil(this, matsize);
+        _initializeLinearSystem(nullptr, &stencil, rhs);
+        success = _solveLinearSystemMatrixFree(stencil, rhs, soln);
+    } else {
+        SparseMatrixf matrix(matsize, 15);
+        _initializeLinearSystem(&matrix, nullptr, rhs);
+        success = _solveLinearSystem(matrix, rhs, soln);
+    }
 
-    bool success = _solveLinearSystem(matrix, rhs, soln);
-    if (!success) {
-        return false;
+    if (success) {
+        _applySolutionToVelocityField(soln);
     }
 
-    _applySolutionToVelocityField(soln);
+    _bufferArena->release(rhs);
+    _bufferArena->release(soln);
 
-    return true;
+    return success;
 }
 
 std::string ViscositySolver::getSolverStatus() {
@@ -97,10 +108,13 @@ void ViscositySolver::_initialize(ViscositySolverParameters params) {
     _viscosity = params.viscosity;
     _solverTolerance = params.errorTolerance;
     _maxSolverIterations = params.maxIterations;
+    _isMatrixFree = params.isMatrixFree;
+    _bufferArena = params.bufferArena != nullptr ? params.bufferArena : &_localBufferArena;
 }
 
 void ViscositySolver::_computeFaceStateGrid() {
-    Array3d<float> solidCenterPhi(_isize, _jsize, _ksize);
+    Array3d<float> solidCenterPhi;
+    _bufferArena->acquire(_isize, _jsize, _ksize, solidCenterPhi);
     _computeSolidCenterPhi(solidCenterPhi);
 
     _state = FaceStateGrid(_isize, _jsize, _ksize);
@@ -109,6 +123,8 @@ void ViscositySolver::_computeFaceStateGrid() {
     _computeFaceStateGridMT(solidCenterPhi, U);
     _computeFaceStateGridMT(solidCenterPhi, V);
     _computeFaceStateGridMT(solidCenterPhi, W);
+
+    _bufferArena->release(solidCenterPhi);
 }
 
 void ViscositySolver::_computeFaceStateGridMT(Array3d<float> &solidCenterPhi, int dir) {
@@ -472,13 +488,15 @@ void ViscositySolver::_computeMatrixIndexTable() {
     _matrixIndex = MatrixIndexer(_isize, _jsize, _ksize, gridToMatrixIndex);
 }
 
-void ViscositySolver::_initializeLinearSystem(SparseMatrixf &matrix, std::vector<float> &rhs) {
-    _initializeLinearSystemU(matrix, rhs);
-    _initializeLinearSystemV(matrix, rhs);
-    _initializeLinearSystemW(matrix, rhs);
+void ViscositySolver::_initializeLinearSystem(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                              std::vector<float> &rhs) {
+    _initializeLinearSystemU(matrix, stencil, rhs);
+    _initializeLinearSystemV(matrix, stencil, rhs);
+    _initializeLinearSystemW(matrix, stencil, rhs);
 }
 
-void ViscositySolver::_initializeLinearSystemU(SparseMatrixf &matrix, std::vector<float> &rhs) {
+void ViscositySolver::_initializeLinearSystemU(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                               std::vector<float> &rhs) {
     std::vector<GridIndex> indices;
     for (int k = 1; k < _ksize; k++) {
         for (int j = 1; j < _jsize; j++) {
@@ -496,7 +514,7 @@ void ViscositySolver::_initializeLinearSystemU(SparseMatrixf &matrix, std::vecto
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, indices.size(), numthreads);
     for (int i = 0; i < numthreads; i++) {
         threads[i] = std::thread(&ViscositySolver::_initializeLinearSystemThreadU, this,
-                                 intervals[i], intervals[i + 1], &indices, &matrix, &rhs);
+                                 intervals[i], intervals[i + 1], &indices, matrix, stencil, &rhs);
     }
 
     for (int i = 0; i < numthreads; i++) {
@@ -504,7 +522,8 @@ void ViscositySolver::_initializeLinearSystemU(SparseMatrixf &matrix, std::vecto
     }
 }
 
-void ViscositySolver::_initializeLinearSystemV(SparseMatrixf &matrix, std::vector<float> &rhs) {
+void ViscositySolver::_initializeLinearSystemV(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                               std::vector<float> &rhs) {
     std::vector<GridIndex> indices;
     for (int k = 1; k < _ksize; k++) {
         for (int j = 1; j < _jsize; j++) {
@@ -522,7 +541,7 @@ void ViscositySolver::_initializeLinearSystemV(SparseMatrixf &matrix, std::vecto
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, indices.size(), numthreads);
     for (int i = 0; i < numthreads; i++) {
         threads[i] = std::thread(&ViscositySolver::_initializeLinearSystemThreadV, this,
-                                 intervals[i], intervals[i + 1], &indices, &matrix, &rhs);
+                                 intervals[i], intervals[i + 1], &indices, matrix, stencil, &rhs);
     }
 
     for (int i = 0; i < numthreads; i++) {
@@ -530,7 +549,8 @@ void ViscositySolver::_initializeLinearSystemV(SparseMatrixf &matrix, std::vecto
     }
 }
 
-void ViscositySolver::_initializeLinearSystemW(SparseMatrixf &matrix, std::vector<float> &rhs) {
+void ViscositySolver::_initializeLinearSystemW(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                               std::vector<float> &rhs) {
     std::vector<GridIndex> indices;
     for (int k = 1; k < _ksize; k++) {
         for (int j = 1; j < _jsize; j++) {
@@ -548,7 +568,7 @@ void ViscositySolver::_initializeLinearSystemW(SparseMatrixf &matrix, std::vecto
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, indices.size(), numthreads);
     for (int i = 0; i < numthreads; i++) {
         threads[i] = std::thread(&ViscositySolver::_initializeLinearSystemThreadW, this,
-                                 intervals[i], intervals[i + 1], &indices, &matrix, &rhs);
+                                 intervals[i], intervals[i + 1], &indices, matrix, stencil, &rhs);
     }
 
     for (int i = 0; i < numthreads; i++) {
@@ -559,6 +579,7 @@ void ViscositySolver::_initializeLinearSystemW(SparseMatrixf &matrix, std::vecto
 void ViscositySolver::_initializeLinearSystemThreadU(int startidx, int endidx, 
                                                      std::vector<GridIndex> *indices,
                                                      SparseMatrixf *matrix, 
+                                                     ViscosityStencil *stencil,
                                                      std::vector<float> *rhs) {
     MatrixIndexer &mj = _matrixIndex;
     FaceState FLUID = FaceState::fluid;
@@ -608,23 +629,38 @@ void ViscositySolver::_initializeLinearSystemThreadU(int startidx, int endidx,
         float factorBack   = factor * viscBack * volBack;
 
         float diag = _volumes.U(i, j, k) + factorRight + factorLeft + factorTop + factorBottom + factorFront + factorBack;
-        matrix->set(row, row, diag);
-        if (_state.U(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k    ), -factorRight ); }
-        if (_state.U(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i - 1, j,     k    ), -factorLeft  ); }
-        if (_state.U(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.U(i,     j + 1, k    ), -factorTop   ); }
-        if (_state.U(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.U(i,     j - 1, k    ), -factorBottom); }
-        if (_state.U(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.U(i,     j,     k + 1), -factorFront ); }
-        if (_state.U(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.U(i,     j,     k - 1), -factorBack  ); }
-
-        if (_state.V(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k    ), -factorTop   ); }
-        if (_state.V(i - 1, j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i - 1, j + 1, k    ),  factorTop   ); }
-        if (_state.V(i,     j,     k    ) == FLUID) { matrix->add(row, mj.V(i,     j,     k    ),  factorBottom); }
-        if (_state.V(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.V(i - 1, j,     k    ), -factorBottom); }
-        
-        if (_state.W(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k + 1), -factorFront ); }
-        if (_state.W(i - 1, j,     k + 1) == FLUID) { matrix->add(row, mj.W(i - 1, j,     k + 1),  factorFront ); }
-        if (_state.W(i,     j,     k    ) == FLUID) { matrix->add(row, mj.W(i,     j,     k    ),  factorBack  ); }
-        if (_state.W(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.W(i - 1, j,     k    ), -factorBack  ); }
+        if (stencil != nullptr) {
+            StencilRow &s = stencil->rows[row];
+            s.g = GridIndex(i, j, k);
+            s.dir = 0;
+            s.diag = diag;
+            s.right = factorRight;
+            s.left = factorLeft;
+            s.top = factorTop;
+            s.bottom = factorBottom;
+            s.front = factorFront;
+            s.back = factorBack;
+        }
+
+        if (matrix != nullptr) {
+            matrix->set(row, row, diag);
+            if (_state.U(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k    ), -factorRight ); }
+            if (_state.U(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i - 1, j,     k    ), -factorLeft  ); }
+            if (_state.U(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.U(i,     j + 1, k    ), -factorTop   ); }
+            if (_state.U(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.U(i,     j - 1, k    ), -factorBottom); }
+            if (_state.U(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.U(i,     j,     k + 1), -factorFront ); }
+            if (_state.U(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.U(i,     j,     k - 1), -factorBack  ); }
+
+            if (_state.V(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k    ), -factorTop   ); }
+            if (_state.V(i - 1, j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i - 1, j + 1, k    ),  factorTop   ); }
+            if (_state.V(i,     j,     k    ) == FLUID) { matrix->add(row, mj.V(i,     j,     k    ),  factorBottom); }
+            if (_state.V(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.V(i - 1, j,     k    ), -factorBottom); }
+
+            if (_state.W(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k + 1), -factorFront ); }
+            if (_state.W(i - 1, j,     k + 1) == FLUID) { matrix->add(row, mj.W(i - 1, j,     k + 1),  factorFront ); }
+            if (_state.W(i,     j,     k    ) == FLUID) { matrix->add(row, mj.W(i,     j,     k    ),  factorBack  ); }
+            if (_state.W(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.W(i - 1, j,     k    ), -factorBack  ); }
+        }
 
         float rval = _volumes.U(i, j, k) * _velocityField->U(i, j, k);
         if (_state.U(i + 1, j,     k)     == SOLID) { rval -= -factorRight  * _velocityField->U(i + 1, j,     k    ); }
@@ -650,6 +686,7 @@ void ViscositySolver::_initializeLinearSystemThreadU(int startidx, int endidx,
 void ViscositySolver::_initializeLinearSystemThreadV(int startidx, int endidx, 
                                                      std::vector<GridIndex> *indices,
                                                      SparseMatrixf *matrix, 
+                                                     ViscosityStencil *stencil,
                                                      std::vector<float> *rhs) {
     MatrixIndexer &mj = _matrixIndex;
     FaceState FLUID = FaceState::fluid;
@@ -699,23 +736,38 @@ void ViscositySolver::_initializeLinearSystemThreadV(int startidx, int endidx,
         float factorBack   = factor * viscBack*volBack;
 
         float diag = _volumes.V(i, j, k) + factorRight + factorLeft + factorTop + factorBottom + factorFront + factorBack;
-        matrix->set(row, row, diag);
-        if (_state.V(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.V(i + 1, j,     k    ), -factorRight ); }
-        if (_state.V(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.V(i - 1, j,     k    ), -factorLeft  ); }
-        if (_state.V(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k    ), -factorTop   ); }
-        if (_state.V(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j - 1, k    ), -factorBottom); }
-        if (_state.V(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.V(i,     j,     k + 1), -factorFront ); }
-        if (_state.V(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.V(i,     j,     k - 1), -factorBack  ); }
-
-        if (_state.U(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k    ), -factorRight ); }
-        if (_state.U(i + 1, j - 1, k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j - 1, k    ),  factorRight ); }
-        if (_state.U(i,     j,     k    ) == FLUID) { matrix->add(row, mj.U(i,     j,     k    ),  factorLeft  ); }
-        if (_state.U(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.U(i,     j - 1, k    ), -factorLeft  ); }
-    
-        if (_state.W(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k + 1), -factorFront ); }
-        if (_state.W(i,     j - 1, k + 1) == FLUID) { matrix->add(row, mj.W(i,     j - 1, k + 1),  factorFront ); }
-        if (_state.W(i,     j,     k    ) == FLUID) { matrix->add(row, mj.W(i,     j,     k    ),  factorBack  ); }
-        if (_state.W(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.W(i,     j - 1, k    ), -factorBack  ); }
+        if (stencil != nullptr) {
+            StencilRow &s = stencil->rows[row];
+            s.g = GridIndex(i, j, k);
+            s.dir = 1;
+            s.diag = diag;
+            s.right = factorRight;
+            s.left = factorLeft;
+            s.top = factorTop;
+            s.bottom = factorBottom;
+            s.front = factorFront;
+            s.back = factorBack;
+        }
+
+        if (matrix != nullptr) {
+            matrix->set(row, row, diag);
+            if (_state.V(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.V(i + 1, j,     k    ), -factorRight ); }
+            if (_state.V(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.V(i - 1, j,     k    ), -factorLeft  ); }
+            if (_state.V(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k    ), -factorTop   ); }
+            if (_state.V(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j - 1, k    ), -factorBottom); }
+            if (_state.V(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.V(i,     j,     k + 1), -factorFront ); }
+            if (_state.V(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.V(i,     j,     k - 1), -factorBack  ); }
+
+            if (_state.U(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k    ), -factorRight ); }
+            if (_state.U(i + 1, j - 1, k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j - 1, k    ),  factorRight ); }
+            if (_state.U(i,     j,     k    ) == FLUID) { matrix->add(row, mj.U(i,     j,     k    ),  factorLeft  ); }
+            if (_state.U(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.U(i,     j - 1, k    ), -factorLeft  ); }
+
+            if (_state.W(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k + 1), -factorFront ); }
+            if (_state.W(i,     j - 1, k + 1) == FLUID) { matrix->add(row, mj.W(i,     j - 1, k + 1),  factorFront ); }
+            if (_state.W(i,     j,     k    ) == FLUID) { matrix->add(row, mj.W(i,     j,     k    ),  factorBack  ); }
+            if (_state.W(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.W(i,     j - 1, k    ), -factorBack  ); }
+        }
 
         float rval = _volumes.V(i, j, k) * _velocityField->V(i, j, k);
         if (_state.V(i + 1, j,     k)     == SOLID) { rval -= -factorRight  * _velocityField->V(i + 1, j,     k    ); }
@@ -741,6 +793,7 @@ void ViscositySolver::_initializeLinearSystemThreadV(int startidx, int endidx,
 void ViscositySolver::_initializeLinearSystemThreadW(int startidx, int endidx, 
                                                      std::vector<GridIndex> *indices,
                                                      SparseMatrixf *matrix, 
+                                                     ViscosityStencil *stencil,
                                                      std::vector<float> *rhs) {
     MatrixIndexer &mj = _matrixIndex;
     FaceState FLUID = FaceState::fluid;
@@ -790,23 +843,38 @@ void ViscositySolver::_initializeLinearSystemThreadW(int startidx, int endidx,
         float factorBack   = 2 * factor * viscBack*volBack;
 
         float diag = _volumes.W(i, j, k) + factorRight + factorLeft + factorTop + factorBottom + factorFront + factorBack;
-        matrix->set(row, row, diag);
-        if (_state.W(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.W(i + 1, j,     k    ), -factorRight ); }
-        if (_state.W(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.W(i - 1, j,     k    ), -factorLeft  ); }
-        if (_state.W(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.W(i,     j + 1, k    ), -factorTop   ); }
-        if (_state.W(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.W(i,     j - 1, k    ), -factorBottom); }
-        if (_state.W(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k + 1), -factorFront ); }
-        if (_state.W(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k - 1), -factorBack  ); }
-
-        if (_state.U(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k    ), -factorRight ); } 
-        if (_state.U(i + 1, j,     k - 1) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k - 1),  factorRight ); }
-        if (_state.U(i,     j,     k    ) == FLUID) { matrix->add(row, mj.U(i,     j,     k    ),  factorLeft  ); }
-        if (_state.U(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.U(i,     j,     k - 1), -factorLeft  ); }
-        
-        if (_state.V(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k    ), -factorTop   ); }
-        if (_state.V(i,     j + 1, k - 1) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k - 1),  factorTop   ); }
-        if (_state.V(i,     j,     k    ) == FLUID) { matrix->add(row, mj.V(i,     j,     k    ),  factorBottom); }
-        if (_state.V(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.V(i,     j,     k - 1), -factorBottom); }
+        if (stencil != nullptr) {
+            StencilRow &s = stencil->rows[row];
+            s.g = GridIndex(i, j, k);
+            s.dir = 2;
+            s.diag = diag;
+            s.right = factorRight;
+            s.left = factorLeft;
+            s.top = factorTop;
+            s.bottom = factorBottom;
+            s.front = factorFront;
+            s.back = factorBack;
+        }
+
+        if (matrix != nullptr) {
+            matrix->set(row, row, diag);
+            if (_state.W(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.W(i + 1, j,     k    ), -factorRight ); }
+            if (_state.W(i - 1, j,     k    ) == FLUID) { matrix->add(row, mj.W(i - 1, j,     k    ), -factorLeft  ); }
+            if (_state.W(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.W(i,     j + 1, k    ), -factorTop   ); }
+            if (_state.W(i,     j - 1, k    ) == FLUID) { matrix->add(row, mj.W(i,     j - 1, k    ), -factorBottom); }
+            if (_state.W(i,     j,     k + 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k + 1), -factorFront ); }
+            if (_state.W(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.W(i,     j,     k - 1), -factorBack  ); }
+
+            if (_state.U(i + 1, j,     k    ) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k    ), -factorRight ); } 
+            if (_state.U(i + 1, j,     k - 1) == FLUID) { matrix->add(row, mj.U(i + 1, j,     k - 1),  factorRight ); }
+            if (_state.U(i,     j,     k    ) == FLUID) { matrix->add(row, mj.U(i,     j,     k    ),  factorLeft  ); }
+            if (_state.U(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.U(i,     j,     k - 1), -factorLeft  ); }
+
+            if (_state.V(i,     j + 1, k    ) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k    ), -factorTop   ); }
+            if (_state.V(i,     j + 1, k - 1) == FLUID) { matrix->add(row, mj.V(i,     j + 1, k - 1),  factorTop   ); }
+            if (_state.V(i,     j,     k    ) == FLUID) { matrix->add(row, mj.V(i,     j,     k    ),  factorBottom); }
+            if (_state.V(i,     j,     k - 1) == FLUID) { matrix->add(row, mj.V(i,     j,     k - 1), -factorBottom); }
+        }
 
         float rval = _volumes.W(i, j, k) * _velocityField->W(i, j, k);
         if (_state.W(i + 1, j,     k)     == SOLID) { rval -= -factorRight  * _velocityField->W(i + 1, j,     k    ); }
@@ -829,6 +897,122 @@ void ViscositySolver::_initializeLinearSystemThreadW(int startidx, int endidx,
     }
 }
 
+void ViscositySolver::ViscosityStencil::multiply(const std::vector<float> &x, 
+                                                 std::vector<float> &result) const {
+    FLUIDSIM_ASSERT(x.size() == rows.size());
+    result.resize(rows.size());
+
+    int minRowsPerThread = 20000;
+    ThreadUtils::parallelFor(0, (int)rows.size(), [&](int startidx, int endidx) {
+        for (int row = startidx; row < endidx; row++) {
+            const StencilRow &s = rows[row];
+            if (s.dir == 0) {
+                result[row] = solver->_multiplyStencilRowU(s, row, x);
+            } else if (s.dir == 1) {
+                result[row] = solver->_multiplyStencilRowV(s, row, x);
+            } else if (s.dir == 2) {
+                result[row] = solver->_multiplyStencilRowW(s, row, x);
+            } else {
+                result[row] = 0.0f;
+            }
+        }
+    }, minRowsPerThread);
+}
+
+void ViscositySolver::ViscosityStencil::getDiagonal(std::vector<float> &diag) const {
+    diag.resize(rows.size());
+    for (size_t i = 0; i < rows.size(); i++) {
+        diag[i] = rows[i].diag;
+    }
+}
+
+float ViscositySolver::_multiplyStencilRowU(const StencilRow &s, int row, const std::vector<float> &x) {
+    MatrixIndexer &mj = _matrixIndex;
+    FaceState FLUID = FaceState::fluid;
+    auto term = [&x](int col, float value) { return col != -1 ? value * x[col] : 0.0f; };
+
+    int i = s.g.i;
+    int j = s.g.j;
+    int k = s.g.k;
+    float sum = s.diag * x[row];
+    if (_state.U(i + 1, j,     k    ) == FLUID) { sum += term(mj.U(i + 1, j,     k    ), -s.right ); }
+    if (_state.U(i - 1, j,     k    ) == FLUID) { sum += term(mj.U(i - 1, j,     k    ), -s.left  ); }
+    if (_state.U(i,     j + 1, k    ) == FLUID) { sum += term(mj.U(i,     j + 1, k    ), -s.top   ); }
+    if (_state.U(i,     j - 1, k    ) == FLUID) { sum += term(mj.U(i,     j - 1, k    ), -s.bottom); }
+    if (_state.U(i,     j,     k + 1) == FLUID) { sum += term(mj.U(i,     j,     k + 1), -s.front ); }
+    if (_state.U(i,     j,     k - 1) == FLUID) { sum += term(mj.U(i,     j,     k - 1), -s.back  ); }
+
+    if (_state.V(i,     j + 1, k    ) == FLUID) { sum += term(mj.V(i,     j + 1, k    ), -s.top   ); }
+    if (_state.V(i - 1, j + 1, k    ) == FLUID) { sum += term(mj.V(i - 1, j + 1, k    ),  s.top   ); }
+    if (_state.V(i,     j,     k    ) == FLUID) { sum += term(mj.V(i,     j,     k    ),  s.bottom); }
+    if (_state.V(i - 1, j,     k    ) == FLUID) { sum += term(mj.V(i - 1, j,     k    ), -s.bottom); }
+
+    if (_state.W(i,     j,     k + 1) == FLUID) { sum += term(mj.W(i,     j,     k + 1), -s.front ); }
+    if (_state.W(i - 1, j,     k + 1) == FLUID) { sum += term(mj.W(i - 1, j,     k + 1),  s.front ); }
+    if (_state.W(i,     j,     k    ) == FLUID) { sum += term(mj.W(i,     j,     k    ),  s.back  ); }
+    if (_state.W(i - 1, j,     k    ) == FLUID) { sum += term(mj.W(i - 1, j,     k    ), -s.back  ); }
+
+    return sum;
+}
+
+float ViscositySolver::_multiplyStencilRowV(const StencilRow &s, int row, const std::vector<float> &x) {
+    MatrixIndexer &mj = _matrixIndex;
+    FaceState FLUID = FaceState::fluid;
+    auto term = [&x](int col, float value) { return col != -1 ? value * x[col] : 0.0f; };
+
+    int i = s.g.i;
+    int j = s.g.j;
+    int k = s.g.k;
+    float sum = s.diag * x[row];
+    if (_state.V(i + 1, j,     k    ) == FLUID) { sum += term(mj.V(i + 1, j,     k    ), -s.right ); }
+    if (_state.V(i - 1, j,     k    ) == FLUID) { sum += term(mj.V(i - 1, j,     k    ), -s.left  ); }
+    if (_state.V(i,     j + 1, k    ) == FLUID) { sum += term(mj.V(i,     j + 1, k    ), -s.top   ); }
+    if (_state.V(i,     j - 1, k    ) == FLUID) { sum += term(mj.V(i,     j - 1, k    ), -s.bottom); }
+    if (_state.V(i,     j,     k + 1) == FLUID) { sum += term(mj.V(i,     j,     k + 1), -s.front ); }
+    if (_state.V(i,     j,     k - 1) == FLUID) { sum += term(mj.V(i,     j,     k - 1), -s.back  ); }
+
+    if (_state.U(i + 1, j,     k    ) == FLUID) { sum += term(mj.U(i + 1, j,     k    ), -s.right ); }
+    if (_state.U(i + 1, j - 1, k    ) == FLUID) { sum += term(mj.U(i + 1, j - 1, k    ),  s.right ); }
+    if (_state.U(i,     j,     k    ) == FLUID) { sum += term(mj.U(i,     j,     k    ),  s.left  ); }
+    if (_state.U(i,     j - 1, k    ) == FLUID) { sum += term(mj.U(i,     j - 1, k    ), -s.left  ); }
+
+    if (_state.W(i,     j,     k + 1) == FLUID) { sum += term(mj.W(i,     j,     k + 1), -s.front ); }
+    if (_state.W(i,     j - 1, k + 1) == FLUID) { sum += term(mj.W(i,     j - 1, k + 1),  s.front ); }
+    if (_state.W(i,     j,     k    ) == FLUID) { sum += term(mj.W(i,     j,     k    ),  s.back  ); }
+    if (_state.W(i,     j - 1, k    ) == FLUID) { sum += term(mj.W(i,     j - 1, k    ), -s.back  ); }
+
+    return sum;
+}
+
+float ViscositySolver::_multiplyStencilRowW(const StencilRow &s, int row, const std::vector<float> &x) {
+    MatrixIndexer &mj = _matrixIndex;
+    FaceState FLUID = FaceState::fluid;
+    auto term = [&x](int col, float value) { return col != -1 ? value * x[col] : 0.0f; };
+
+    int i = s.g.i;
+    int j = s.g.j;
+    int k = s.g.k;
+    float sum = s.diag * x[row];
+    if (_state.W(i + 1, j,     k    ) == FLUID) { sum += term(mj.W(i + 1, j,     k    ), -s.right ); }
+    if (_state.W(i - 1, j,     k    ) == FLUID) { sum += term(mj.W(i - 1, j,     k    ), -s.left  ); }
+    if (_state.W(i,     j + 1, k    ) == FLUID) { sum += term(mj.W(i,     j + 1, k    ), -s.top   ); }
+    if (_state.W(i,     j - 1, k    ) == FLUID) { sum += term(mj.W(i,     j - 1, k    ), -s.bottom); }
+    if (_state.W(i,     j,     k + 1) == FLUID) { sum += term(mj.W(i,     j,     k + 1), -s.front ); }
+    if (_state.W(i,     j,     k - 1) == FLUID) { sum += term(mj.W(i,     j,     k - 1), -s.back  ); }
+
+    if (_state.U(i + 1, j,     k    ) == FLUID) { sum += term(mj.U(i + 1, j,     k    ), -s.right ); }
+    if (_state.U(i + 1, j,     k - 1) == FLUID) { sum += term(mj.U(i + 1, j,     k - 1),  s.right ); }
+    if (_state.U(i,     j,     k    ) == FLUID) { sum += term(mj.U(i,     j,     k    ),  s.left  ); }
+    if (_state.U(i,     j,     k - 1) == FLUID) { sum += term(mj.U(i,     j,     k - 1), -s.left  ); }
+
+    if (_state.V(i,     j + 1, k    ) == FLUID) { sum += term(mj.V(i,     j + 1, k    ), -s.top   ); }
+    if (_state.V(i,     j + 1, k - 1) == FLUID) { sum += term(mj.V(i,     j + 1, k - 1),  s.top   ); }
+    if (_state.V(i,     j,     k    ) == FLUID) { sum += term(mj.V(i,     j,     k    ),  s.bottom); }
+    if (_state.V(i,     j,     k - 1) == FLUID) { sum += term(mj.V(i,     j,     k - 1), -s.bottom); }
+
+    return sum;
+}
+
 bool ViscositySolver::_solveLinearSystem(SparseMatrixf &matrix, std::vector<float> &rhs, 
                                          std::vector<float> &soln) {
 
@@ -838,6 +1022,24 @@ bool ViscositySolver::_solveLinearSystem(SparseMatrixf &matrix, std::vector<floa
     float estimatedError;
     int numIterations;
     bool success = solver.solve(matrix, rhs, soln, estimatedError, numIterations);
+
+    return _finishLinearSystemSolve(success, numIterations, estimatedError);
+}
+
+bool ViscositySolver::_solveLinearSystemMatrixFree(ViscosityStencil &stencil, std::vector<float> &rhs, 
+                                                   std::vector<float> &soln) {
+
+    PCGSolver<float> solver;
+    solver.setSolverParameters(_solverTolerance, _maxSolverIterations);
+
+    float estimatedError;
+    int numIterations;
+    bool success = solver.solve(stencil, rhs, soln, estimatedError, numIterations);
+
+    return _finishLinearSystemSolve(success, numIterations, estimatedError);
+}
+
+bool ViscositySolver::_finishLinearSystemSolve(bool success, int numIterations, float estimatedError) {
     _solverIterations = numIterations;
     _solverError = (float)estimatedError;
 
@@ -28,6 +28,7 @@ SOFTWARE.
 #include "array3d.h"
 #include "pcgsolver/pcgsolver.h"
 #include "vmath.h"
+#include "bufferarena.h"
 
 class MACVelocityField;
 class ParticleLevelSet;
@@ -43,6 +44,10 @@ struct ViscositySolverParameters {
     Array3d<float> *viscosity;
     double errorTolerance = 1e-4;
     int maxIterations = 900;
+    bool isMatrixFree = false;
+
+    // Optional arena for recycling temporary grids and vectors between solves
+    BufferArena *bufferArena = nullptr;
 };
 
 class ViscositySolver {
@@ -186,6 +191,38 @@ private:
         }
     };
 
+    // Coefficients of a row of the viscosity matrix towards the faces to the
+    // right (+i), left, top (+j), bottom, front (+k), and back of the row's face
+    struct StencilRow {
+        GridIndex g;
+        int dir = -1;    // 0 = U, 1 = V, 2 = W
+        float diag = 0.0f;
+        float right = 0.0f;
+        float left = 0.0f;
+        float top = 0.0f;
+        float bottom = 0.0f;
+        float front = 0.0f;
+        float back = 0.0f;
+    };
+
+    // Viscosity matrix stored as the stencil coefficients of each row. Matrix 
+    // entries are formed from the coefficients, the face states, and the matrix 
+    // index table when the operator is applied.
+    struct ViscosityStencil : public LinearOperator<float> {
+        ViscositySolver *solver = nullptr;
+        std::vector<StencilRow> rows;
+
+        ViscosityStencil() {}
+        ViscosityStencil(ViscositySolver *s, int size) : solver(s), rows(size) {}
+
+        virtual unsigned int size() const {
+            return (unsigned int)rows.size();
+        }
+
+        virtual void multiply(const std::vector<float> &x, std::vector<float> &result) const;
+        virtual void getDiagonal(std::vector<float> &diag) const;
+    };
+
     void _initialize(ViscositySolverParameters params);
     void _computeFaceStateGrid();
     void _computeFaceStateGridMT(Array3d<float> &solidCenterPhi, int dir);
@@ -211,25 +248,39 @@ private:
 
     void _destroyVolumeGrid();
     void _computeMatrixIndexTable();
-    void _initializeLinearSystem(SparseMatrixf &matrix, std::vector<float> &rhs);
-    void _initializeLinearSystemU(SparseMatrixf &matrix, std::vector<float> &rhs);
-    void _initializeLinearSystemV(SparseMatrixf &matrix, std::vector<float> &rhs);
-    void _initializeLinearSystemW(SparseMatrixf &matrix, std::vector<float> &rhs);
+    void _initializeLinearSystem(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                 std::vector<float> &rhs);
+    void _initializeLinearSystemU(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                  std::vector<float> &rhs);
+    void _initializeLinearSystemV(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                  std::vector<float> &rhs);
+    void _initializeLinearSystemW(SparseMatrixf *matrix, ViscosityStencil *stencil, 
+                                  std::vector<float> &rhs);
     void _initializeLinearSystemThreadU(int startidx, int endidx,
                                         std::vector<GridIndex> *indices,
                                         SparseMatrixf *matrix, 
+                                        ViscosityStencil *stencil,
                                         std::vector<float> *rhs);
     void _initializeLinearSystemThreadV(int startidx, int endidx,
                                         std::vector<GridIndex> *indices,
                                         SparseMatrixf *matrix, 
+                                        ViscosityStencil *stencil,
                                         std::vector<float> *rhs);
     void _initializeLinearSystemThreadW(int startidx, int endidx,
                                         std::vector<GridIndex> *indices,
                                         SparseMatrixf *matrix, 
+                                        ViscosityStencil *stencil,
                                         std::vector<float> *rhs);
 
+    float _multiplyStencilRowU(const StencilRow &s, int row, const std::vector<float> &x);
+    float _multiplyStencilRowV(const StencilRow &s, int row, const std::vector<float> &x);
+    float _multiplyStencilRowW(const StencilRow &s, int row, const std::vector<float> &x);
+
     bool _solveLinearSystem(SparseMatrixf &matrix, std::vector<float> &rhs, 
                             std::vector<float> &soln);
+    bool _solveLinearSystemMatrixFree(ViscosityStencil &stencil, std::vector<float> &rhs, 
+                                      std::vector<float> &soln);
+    bool _finishLinearSystemSolve(bool success, int numIterations, float estimatedError);
     void _applySolutionToVelocityField(std::vector<float> &soln);
 
     int _isize;
@@ -241,6 +292,8 @@ private:
     ParticleLevelSet *_liquidSDF;
     MeshLevelSet *_solidSDF;
     Array3d<float> *_viscosity;
+    BufferArena *_bufferArena = nullptr;
+    BufferArena _localBufferArena;
 
     FaceStateGrid _state;
     ViscosityVolumeGrid _volumes;
@@ -250,6 +303,7 @@ private:
     double _solverTolerance = 1e-4;
     double _acceptableTolerace = 10.0;
     int _maxSolverIterations = 900;
+    bool _isMatrixFree = false;
 
     std::string _solverStatus;
     int _solverIterations = 0;